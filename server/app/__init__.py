@@ -29,6 +29,26 @@ def create_app(config_class=Config):
     jwt.init_app(app)
     CORS(app, origins=app.config['CORS_ORIGINS'])
 
+    # Password hashing (bcrypt worker pool)
+    from app.utils.passwords import password_hasher
+    password_hasher.init_app(app)
+
+    # Identity cache (per-worker user / session ownership lookups)
+    from app.utils.identity import identity_cache
+    identity_cache.init_app(app)
+
+    # Pull response cache (optional, Redis)
+    from app.utils.cache import pull_cache
+    pull_cache.init_app(app)
+
+    # Sync log writer (optional buffering, memory or Redis)
+    from app.utils.log_writer import sync_log_writer
+    sync_log_writer.init_app(app)
+
+    # Sync notifications (optional, Redis pub/sub + SSE)
+    from app.utils.notify import notifier
+    notifier.init_app(app)
+
     # Initialize Swagger API
     from app.swagger import api
     api.init_app(app)
@@ -37,13 +37,68 @@ class Config:
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
 
+    # Password Hashing (bcrypt 워커 풀)
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))  # 변경 시 다음 로그인에 재해시
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))  # 워커 프로세스당 동시 해시 수
+    PASSWORD_HASH_MAX_WAITING = int(os.getenv('PASSWORD_HASH_MAX_WAITING', 64))  # 초과 시 503
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 5.0))  # seconds, 시작 대기 상한 (gevent 워커)
+
+    # Identity Cache (워커 프로세스 내 사용자 정보 조회 캐시)
+    IDENTITY_CACHE_ENABLED = os.getenv('IDENTITY_CACHE_ENABLED', 'True') == 'True'
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 30))  # seconds
+    IDENTITY_CACHE_MAX_ENTRIES = int(os.getenv('IDENTITY_CACHE_MAX_ENTRIES', 10000))  # LRU
+
+    # Sensor Analysis (Celery 분석 작업)
+    ANALYSIS_CHUNK_SIZE = int(os.getenv('ANALYSIS_CHUNK_SIZE', 10000))  # 서버 측 커서 청크 행 수
+    ANALYSIS_STREAMING_THRESHOLD = int(os.getenv('ANALYSIS_STREAMING_THRESHOLD', 500000))  # 샘플 수 초과 시 청크 스트리밍 분석
+    ANALYSIS_CACHE_ENABLED = os.getenv('ANALYSIS_CACHE_ENABLED', 'True') == 'True'  # 세션 데이터 버전별 결과 저장 (analysis_results)
+    ANALYSIS_SQL_AGGREGATES = os.getenv('ANALYSIS_SQL_AGGREGATES', 'True') == 'True'  # PostgreSQL에서 필드 통계를 DB 집계로 계산
+    BATCH_ANALYSIS_CONCURRENCY = int(os.getenv('BATCH_ANALYSIS_CONCURRENCY', 4))  # 일괄 분석 동시 하위 작업 수 (DB 부하 상한)
+    BATCH_ANALYSIS_MAX_SESSIONS = int(os.getenv('BATCH_ANALYSIS_MAX_SESSIONS', 1000))  # 일괄 분석 요청당 세션 수 상한
+    STATISTICS_SNAPSHOT_ENABLED = os.getenv('STATISTICS_SNAPSHOT_ENABLED', 'True') == 'True'  # 사용자 데이터 버전별 통계 스냅샷
+    RESAMPLE_MAX_POINTS = int(os.getenv('RESAMPLE_MAX_POINTS', 1000000))  # 정렬 내보내기 격자 점 수 상한
+
     # Redis & Celery
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
     CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
+    # Password Hash Slots (Redis, 모든 워커의 동시 해시 수 제한, 0이면 사용 안 함)
+    PASSWORD_HASH_GLOBAL_LIMIT = int(os.getenv('PASSWORD_HASH_GLOBAL_LIMIT', 0))
+    PASSWORD_HASH_REDIS_URL = os.getenv('PASSWORD_HASH_REDIS_URL', REDIS_URL)
+    PASSWORD_HASH_SLOT_LEASE = int(os.getenv('PASSWORD_HASH_SLOT_LEASE', 30))  # seconds, 반환되지 않은 슬롯 회수
+
+    # Pull Response Cache (Redis, 선택 사항)
+    PULL_CACHE_ENABLED = os.getenv('PULL_CACHE_ENABLED', 'False') == 'True'
+    PULL_CACHE_REDIS_URL = os.getenv('PULL_CACHE_REDIS_URL', REDIS_URL)
+    PULL_CACHE_TTL = int(os.getenv('PULL_CACHE_TTL', 3600))  # seconds
+    PULL_CACHE_MAX_BYTES = int(os.getenv('PULL_CACHE_MAX_BYTES', 268435456))  # 256MB, LRU eviction
+    SYNC_STATUS_CACHE_TTL = int(os.getenv('SYNC_STATUS_CACHE_TTL', 10))  # seconds, /status 응답 (0이면 캐시 안 함)
+
+    # Sync Log Writer (off: 요청 트랜잭션에 기록, memory/redis: 버퍼 + 백그라운드 일괄 저장)
+    SYNC_LOG_BUFFER = os.getenv('SYNC_LOG_BUFFER', 'off')
+    SYNC_LOG_REDIS_URL = os.getenv('SYNC_LOG_REDIS_URL', REDIS_URL)
+    SYNC_LOG_BATCH_SIZE = int(os.getenv('SYNC_LOG_BATCH_SIZE', 500))
+    SYNC_LOG_FLUSH_INTERVAL = float(os.getenv('SYNC_LOG_FLUSH_INTERVAL', 2.0))  # seconds (0이면 수동 flush만)
+    SYNC_LOG_MAX_BUFFER = int(os.getenv('SYNC_LOG_MAX_BUFFER', 100000))  # memory 모드 상한
+
+    # Sync Notifications (Redis pub/sub -> SSE, 선택 사항)
+    NOTIFY_ENABLED = os.getenv('NOTIFY_ENABLED', 'False') == 'True'
+    NOTIFY_REDIS_URL = os.getenv('NOTIFY_REDIS_URL', REDIS_URL)
+    NOTIFY_HEARTBEAT = int(os.getenv('NOTIFY_HEARTBEAT', 15))  # seconds, keepalive 주기
+    NOTIFY_STREAM_TIMEOUT = int(os.getenv('NOTIFY_STREAM_TIMEOUT', 300))  # seconds, 이후 재연결
+    NOTIFY_QUEUE_SIZE = int(os.getenv('NOTIFY_QUEUE_SIZE', 100))  # 연결당 대기 알림 수
+    NOTIFY_REPLAY_LIMIT = int(os.getenv('NOTIFY_REPLAY_LIMIT', 100))  # 재연결 시 Last-Event-ID 이후 재생 수
+
+    # Response Compression (Accept-Encoding: zstd, br, gzip)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True') == 'True'
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))  # 1-9
+    COMPRESSION_BR_QUALITY = int(os.getenv('COMPRESSION_BR_QUALITY', 5))  # 0-11 (brotli 설치 시)
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3))  # 1-22 (zstandard 설치 시)
+
     # File Upload
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', './uploads')
+    ML_FEATURES_FOLDER = os.getenv('ML_FEATURES_FOLDER', './ml_features')  # ML 윈도 특징 파일 (.npy / Parquet)
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 104857600))  # 100MB
     ALLOWED_EXTENSIONS = {'json', 'wav', 'mp3', 'aac'}
 
@@ -58,6 +113,12 @@ class Config:
     DEFAULT_PAGE_SIZE = 50
     MAX_PAGE_SIZE = 200
 
+    # Pull: 응답당 최대 센서 레코드 수 (max_records 상한)
+    MAX_PULL_RECORDS = int(os.getenv('MAX_PULL_RECORDS', 100000))
+
+    # Pull: 다운샘플링 시 (세션, 센서 타입)당 최대 샘플 수 (max_points 상한)
+    MAX_PULL_POINTS = int(os.getenv('MAX_PULL_POINTS', 10000))
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -76,6 +137,13 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    BCRYPT_ROUNDS = 4
+    PASSWORD_HASH_GLOBAL_LIMIT = 0
+    IDENTITY_CACHE_ENABLED = False
+    PULL_CACHE_ENABLED = False
+    SYNC_STATUS_CACHE_TTL = 0
+    SYNC_LOG_BUFFER = 'off'
+    NOTIFY_ENABLED = False
 
 
 # Config dictionary
@@ -6,5 +6,15 @@ from app.models.user import User
 from app.models.session import RecordingSession
 from app.models.sensor_data import SensorData
 from app.models.sync_log import SyncLog
+from app.models.change_log import ChangeCounter, SyncChange
+from app.models.trajectory import SessionTrajectory
+from app.models.anomaly import AnomalyInterval
+from app.models.analysis_result import AnalysisResult
+from app.models.statistics_snapshot import StatisticsSnapshot
+from app.models.spectral import SpectralFeatures
 
-__all__ = ['User', 'RecordingSession', 'SensorData', 'SyncLog']
+__all__ = [
+    'User', 'RecordingSession', 'SensorData', 'SyncLog', 'ChangeCounter', 'SyncChange',
+    'SessionTrajectory', 'AnomalyInterval', 'AnalysisResult', 'StatisticsSnapshot',
+    'SpectralFeatures',
+]
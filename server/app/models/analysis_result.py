@@ -0,0 +1,43 @@
+"""
+Analysis Result Model
+"""
+
+from datetime import datetime
+from app import db
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class AnalysisResult(db.Model):
+    """분석 작업 결과 캐시 (세션 / 분석 종류 / 파라미터별 1행, 세션 데이터 버전이 같을 때만 유효)"""
+
+    __tablename__ = 'analysis_results'
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('recording_sessions.id', ondelete='CASCADE'),
+                           nullable=False)
+    analysis_type = db.Column(db.String(50), nullable=False)  # analyze_sensor_data, detect_anomalies, ...
+    params_key = db.Column(db.String(64), nullable=False)  # 정규화한 파라미터 JSON의 SHA-256
+    params = db.Column(JSONB, default=dict)
+
+    # 계산 시점의 세션 데이터 버전 (RecordingSession.change_seq)
+    data_version = db.Column(db.BigInteger, nullable=False)
+    result = db.Column(JSONB, nullable=False)
+
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'analysis_type', 'params_key', name='uq_analysis_result'),
+    )
+
+    def to_dict(self):
+        """딕셔너리 변환"""
+        return {
+            'session_id': self.session_id,
+            'analysis_type': self.analysis_type,
+            'params': self.params,
+            'data_version': self.data_version,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None,
+        }
+
+    def __repr__(self):
+        return f'<AnalysisResult {self.analysis_type} session={self.session_id} v{self.data_version}>'
@@ -0,0 +1,60 @@
+"""
+Anomaly Interval Model
+"""
+
+from datetime import datetime
+from app import db
+
+
+class AnomalyInterval(db.Model):
+    """이상 구간 (연속으로 임계값을 넘은 샘플 구간, 세션 / 센서 타입 / 탐지 방법별)"""
+
+    __tablename__ = 'anomaly_intervals'
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('recording_sessions.id', ondelete='CASCADE'),
+                           nullable=False)
+    sensor_type = db.Column(db.String(50), nullable=False)
+    method = db.Column(db.String(20), nullable=False)  # zscore, ewma, mad
+
+    # Interval (Unix timestamp in milliseconds)
+    start_ts = db.Column(db.BigInteger, nullable=False)
+    end_ts = db.Column(db.BigInteger, nullable=False)
+    sample_count = db.Column(db.Integer, nullable=False)
+
+    # Peak
+    max_score = db.Column(db.Float, nullable=False)
+    peak_ts = db.Column(db.BigInteger, nullable=False)
+    peak_value = db.Column(db.Float)
+
+    # Detector parameters
+    window = db.Column(db.Integer, nullable=False)
+    threshold = db.Column(db.Float, nullable=False)
+
+    detected_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_anomaly_session_type_start', 'session_id', 'sensor_type', 'start_ts'),
+    )
+
+    def to_dict(self):
+        """딕셔너리 변환"""
+        return {
+            'id': self.id,
+            'session_id': self.session_id,
+            'sensor_type': self.sensor_type,
+            'method': self.method,
+            'start_ts': self.start_ts,
+            'end_ts': self.end_ts,
+            'duration_ms': self.end_ts - self.start_ts,
+            'sample_count': self.sample_count,
+            'max_score': self.max_score,
+            'peak_ts': self.peak_ts,
+            'peak_value': self.peak_value,
+            'window': self.window,
+            'threshold': self.threshold,
+            'detected_at': self.detected_at.isoformat() if self.detected_at else None,
+        }
+
+    def __repr__(self):
+        return f'<AnomalyInterval {self.sensor_type} {self.method} {self.start_ts}-{self.end_ts}>'
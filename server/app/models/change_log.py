@@ -0,0 +1,100 @@
+"""
+Change Log Models
+"""
+
+from datetime import datetime
+from app import db
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import IntegrityError
+
+
+class ChangeCounter(db.Model):
+    """변경 시퀀스 카운터 (이름별 행 하나, 변경 피드는 사용자마다 'user:<id>')"""
+
+    __tablename__ = 'change_counters'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, default=0, nullable=False)
+
+    @classmethod
+    def allocate(cls, count: int = 1, name: str = 'global') -> int:
+        """
+        연속된 시퀀스 번호 count개 할당 (현재 트랜잭션에 포함)
+
+        UPDATE ... RETURNING으로 카운터 행을 잠그고 커밋 때까지 유지하므로
+        다른 트랜잭션은 이 트랜잭션이 끝난 뒤에 다음 번호를 받는다. 따라서 번호 순서와
+        커밋 순서가 같고, 클라이언트가 since 이후를 조회할 때 늦게 커밋된 변경을 놓치지 않는다.
+        사용자별 카운터를 쓰면 같은 사용자의 트랜잭션끼리만 기다리며, 잠금 시간을 줄이려면
+        커밋 직전에 호출한다.
+
+        Args:
+            count: 할당할 번호 수
+            name: 카운터 이름
+
+        Returns:
+            int: 할당된 첫 번호 (first ~ first + count - 1)
+        """
+        stmt = update(cls).where(cls.name == name).values(
+            value=cls.value + count
+        ).returning(cls.value).execution_options(synchronize_session=False)
+
+        value = db.session.execute(stmt).scalar()
+        if value is None:
+            # 최초 사용: 카운터 행 생성 (동시 생성 시 다른 쪽 행을 갱신)
+            try:
+                with db.session.begin_nested():
+                    db.session.add(cls(name=name, value=count))
+                value = count
+            except IntegrityError:
+                value = db.session.execute(stmt).scalar()
+
+        return value - count + 1
+
+    def __repr__(self):
+        return f'<ChangeCounter {self.name}={self.value}>'
+
+
+class SyncChange(db.Model):
+    """변경 기록 (세션 / 센서 샘플 배치), /api/sync/changes 피드 (seq는 사용자별 시퀀스)"""
+
+    __tablename__ = 'sync_changes'
+
+    # 기본 키 (user_id, seq): 사용자 피드 조회 인덱스 겸용
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    seq = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+
+    # 세션 삭제 후에도 남도록 세션 UUID를 직접 저장 (FK 없음)
+    session_uuid = db.Column(UUID(as_uuid=True), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # 'session' or 'samples'
+    op = db.Column(db.String(10), nullable=False, default='upsert')  # 'upsert' or 'delete'
+
+    # Sample batch info (kind='samples')
+    sensor_type = db.Column(db.String(50))
+    count = db.Column(db.Integer)
+    ts_min = db.Column(db.BigInteger)
+    ts_max = db.Column(db.BigInteger)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    @classmethod
+    def latest_seq(cls, user_id: int) -> int:
+        """사용자의 마지막 변경 시퀀스 (없으면 0)"""
+        return db.session.query(db.func.max(cls.seq)).filter(cls.user_id == user_id).scalar() or 0
+
+    def to_dict(self):
+        """딕셔너리 변환 (값이 없는 필드는 생략)"""
+        result = {
+            'seq': self.seq,
+            'kind': self.kind,
+            'op': self.op,
+            'session_id': str(self.session_uuid),
+        }
+        for key in ('sensor_type', 'count', 'ts_min', 'ts_max'):
+            value = getattr(self, key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    def __repr__(self):
+        return f'<SyncChange {self.seq} {self.kind}:{self.op}>'
@@ -24,12 +24,14 @@ class SensorData(db.Model):
 
     # Sync info
     is_uploaded = db.Column(db.Boolean, default=True, index=True)
+    change_seq = db.Column(db.BigInteger)  # 이 행을 마지막으로 쓴 샘플 배치의 변경 시퀀스
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     # Composite index for duplicate check
     __table_args__ = (
         db.Index('idx_session_sensor_timestamp', 'session_id', 'sensor_type', 'timestamp'),
         db.Index('idx_created_at', 'created_at'),
+        db.Index('idx_session_change_seq', 'session_id', 'change_seq'),
     )
 
     def to_dict(self):
@@ -33,6 +33,7 @@ class RecordingSession(db.Model):
     # Sync status
     is_uploaded = db.Column(db.Boolean, default=False)
     last_synced_at = db.Column(db.DateTime)
+    change_seq = db.Column(db.BigInteger)  # 마지막 변경 시퀀스 (sync_changes.seq)
 
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
@@ -41,6 +42,12 @@ class RecordingSession(db.Model):
     # Relationships
     sensor_data = db.relationship('SensorData', backref='session', lazy='dynamic', cascade='all, delete-orphan')
 
+    # Composite index for keyset pagination (pull)
+    __table_args__ = (
+        db.Index('idx_user_updated_at_id', 'user_id', 'updated_at', 'id'),
+        db.Index('idx_user_change_seq', 'user_id', 'change_seq'),
+    )
+
     def to_dict(self, include_data=False):
         """딕셔너리 변환"""
         result = {
@@ -0,0 +1,59 @@
+"""
+Spectral Features Model
+"""
+
+from datetime import datetime
+from app import db
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class SpectralFeatures(db.Model):
+    """세션 센서 타입별 윈도 주파수 특징 (세션 / 센서 타입당 1행, 윈도별 배열은 압축 바이너리)"""
+
+    __tablename__ = 'spectral_features'
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('recording_sessions.id', ondelete='CASCADE'),
+                           nullable=False)
+    sensor_type = db.Column(db.String(50), nullable=False)
+
+    # 계산 시점의 데이터 버전 (RecordingSession.change_seq, 샘플 수)
+    change_seq = db.Column(db.BigInteger)
+    sample_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Parameters
+    sample_rate = db.Column(db.Float, nullable=False)  # Hz
+    window_size = db.Column(db.Integer, nullable=False)  # 샘플 수
+    hop = db.Column(db.Integer, nullable=False)  # 윈도 간격 (샘플 수)
+    bands = db.Column(JSONB, default=list)  # [[low_hz, high_hz], ...]
+
+    # Results
+    window_count = db.Column(db.Integer, default=0, nullable=False)
+    features = db.Column(db.LargeBinary)  # 윈도별 배열 (np.savez_compressed, encode_features)
+    welch_psd = db.Column(JSONB)  # {'frequencies': [...], 'psd': [...]}, 전체 윈도 평균
+    dominant_frequency = db.Column(db.Float)  # Welch PSD 최대 주파수 (DC 제외)
+
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'sensor_type', name='uq_spectral_session_type'),
+    )
+
+    def to_dict(self):
+        """딕셔너리 변환 (윈도별 배열 제외)"""
+        return {
+            'session_id': self.session_id,
+            'sensor_type': self.sensor_type,
+            'sample_count': self.sample_count,
+            'sample_rate': self.sample_rate,
+            'window_size': self.window_size,
+            'hop': self.hop,
+            'bands': self.bands,
+            'window_count': self.window_count,
+            'dominant_frequency': self.dominant_frequency,
+            'welch_psd': self.welch_psd,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None,
+        }
+
+    def __repr__(self):
+        return f'<SpectralFeatures {self.sensor_type} session={self.session_id} windows={self.window_count}>'
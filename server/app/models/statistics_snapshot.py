@@ -0,0 +1,40 @@
+"""
+Statistics Snapshot Model
+"""
+
+from datetime import datetime
+from app import db
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class StatisticsSnapshot(db.Model):
+    """사용자 통계 스냅샷 (사용자 / 파라미터별 1행, 사용자 데이터 버전이 같을 때만 유효)"""
+
+    __tablename__ = 'statistics_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    params_key = db.Column(db.String(64), nullable=False)  # 정규화한 파라미터 JSON의 SHA-256
+    params = db.Column(JSONB, default=dict)  # start_date, end_date, bucket
+
+    # 계산 시점의 사용자 데이터 버전 (User.data_version)
+    data_version = db.Column(db.BigInteger, nullable=False)
+    result = db.Column(JSONB, nullable=False)
+
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'params_key', name='uq_statistics_snapshot'),
+    )
+
+    def to_dict(self):
+        """딕셔너리 변환"""
+        return {
+            'user_id': self.user_id,
+            'params': self.params,
+            'data_version': self.data_version,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None,
+        }
+
+    def __repr__(self):
+        return f'<StatisticsSnapshot user={self.user_id} v{self.data_version}>'
@@ -18,6 +18,7 @@ class SyncLog(db.Model):
     # Sync info
     sync_type = db.Column(db.String(20), nullable=False)  # 'push' or 'pull'
     session_id = db.Column(db.Integer, db.ForeignKey('recording_sessions.id'), index=True)
+    request_id = db.Column(db.String(36), index=True)  # 클라이언트 요청 ID (UUID / ULID)
 
     # Statistics
     records_count = db.Column(db.Integer, default=0)
@@ -34,6 +35,11 @@ class SyncLog(db.Model):
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (
+        # 사용자별 최근 로그 조회 (/status)
+        db.Index('idx_sync_logs_user_created', 'user_id', 'created_at'),
+    )
+
     def to_dict(self):
         """딕셔너리 변환"""
         return {
@@ -41,6 +47,7 @@ class SyncLog(db.Model):
             'user_id': self.user_id,
             'sync_type': self.sync_type,
             'session_id': self.session_id,
+            'request_id': self.request_id,
             'records_count': self.records_count,
             'duplicates_count': self.duplicates_count,
             'errors_count': self.errors_count,
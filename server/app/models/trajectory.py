@@ -0,0 +1,67 @@
+"""
+Session Trajectory Model
+"""
+
+from datetime import datetime
+from app import db
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class SessionTrajectory(db.Model):
+    """세션 GPS 궤적 분석 결과 (세션당 1행, 데이터가 바뀌면 다시 계산)"""
+
+    __tablename__ = 'session_trajectories'
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('recording_sessions.id', ondelete='CASCADE'),
+                           nullable=False, unique=True, index=True)
+
+    # 계산 시점의 데이터 버전 (RecordingSession.change_seq, GPS 샘플 수)
+    change_seq = db.Column(db.BigInteger)
+    sample_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Summary
+    distance_km = db.Column(db.Float, default=0.0)
+    duration_ms = db.Column(db.BigInteger, default=0)
+    moving_time_ms = db.Column(db.BigInteger, default=0)
+    avg_speed_mps = db.Column(db.Float)
+    max_speed_mps = db.Column(db.Float)
+    elevation_gain_m = db.Column(db.Float)
+    elevation_loss_m = db.Column(db.Float)
+    stop_count = db.Column(db.Integer, default=0)
+    stops = db.Column(JSONB, default=list)  # [{'start_ts', 'end_ts', 'duration_ms', 'latitude', 'longitude'}]
+
+    # Bounding box
+    min_latitude = db.Column(db.Float)
+    min_longitude = db.Column(db.Float)
+    max_latitude = db.Column(db.Float)
+    max_longitude = db.Column(db.Float)
+
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        """딕셔너리 변환"""
+        return {
+            'session_id': self.session_id,
+            'change_seq': self.change_seq,
+            'sample_count': self.sample_count,
+            'distance_km': self.distance_km,
+            'duration_ms': self.duration_ms,
+            'moving_time_ms': self.moving_time_ms,
+            'avg_speed_mps': self.avg_speed_mps,
+            'max_speed_mps': self.max_speed_mps,
+            'elevation_gain_m': self.elevation_gain_m,
+            'elevation_loss_m': self.elevation_loss_m,
+            'stop_count': self.stop_count,
+            'stops': self.stops or [],
+            'bbox': {
+                'min_latitude': self.min_latitude,
+                'min_longitude': self.min_longitude,
+                'max_latitude': self.max_latitude,
+                'max_longitude': self.max_longitude,
+            },
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None,
+        }
+
+    def __repr__(self):
+        return f'<SessionTrajectory session={self.session_id} {self.distance_km}km>'
@@ -3,6 +3,7 @@ User Model
 """
 
 from datetime import datetime
+from flask import current_app
 from app import db
 import bcrypt
 
@@ -18,6 +19,7 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     device_id = db.Column(db.String(100), unique=True, index=True)
     is_active = db.Column(db.Boolean, default=True)
+    data_version = db.Column(db.BigInteger, default=0, nullable=False)  # Push마다 증가 (Pull ETag)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -25,13 +27,43 @@ class User(db.Model):
     sessions = db.relationship('RecordingSession', backref='user', lazy='dynamic')
 
     def set_password(self, password: str):
-        """비밀번호 해시화"""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """
+        비밀번호 해시화 (호출 스레드에서 BCRYPT_ROUNDS 비용으로 실행)
+
+        인증 라우트는 요청 스레드를 막지 않도록 app.utils.passwords.password_hasher (워커 풀)를 사용
+        """
+        salt = bcrypt.gensalt(rounds=current_app.config.get('BCRYPT_ROUNDS', 12))
+        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
     def check_password(self, password: str) -> bool:
         """비밀번호 확인"""
         return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
 
+    @classmethod
+    def get_data_version(cls, user_id: int) -> int:
+        """사용자 데이터 버전 조회 (users PK 단일 조회)"""
+        version = db.session.query(cls.data_version).filter(cls.id == user_id).scalar()
+        return version or 0
+
+    @classmethod
+    def bump_data_version(cls, user_ids):
+        """
+        사용자 데이터 버전 증가 (현재 트랜잭션에 포함)
+
+        Args:
+            user_ids: 사용자 ID 또는 ID 목록
+        """
+        if isinstance(user_ids, int):
+            user_ids = [user_ids]
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return
+
+        cls.query.filter(cls.id.in_(user_ids)).update(
+            {cls.data_version: cls.data_version + 1},
+            synchronize_session=False
+        )
+
     def to_dict(self):
         """딕셔너리 변환"""
         return {
@@ -6,6 +6,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
+from app.utils.identity import identity_cache
+from app.utils.passwords import PasswordHasherBusy, password_hasher
 
 bp = Blueprint('auth', __name__)
 
@@ -36,7 +38,10 @@ def register():
         email=data['email'],
         device_id=data['device_id']
     )
-    user.set_password(data['password'])
+    try:
+        user.password_hash = password_hasher.hash(data['password'])
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503, {'Retry-After': '1'}
 
     db.session.add(user)
     db.session.commit()
@@ -63,11 +68,19 @@ def login():
 
     user = User.query.filter_by(username=data['username']).first()
 
-    if not user or not user.check_password(data['password']):
-        return jsonify({'error': 'Invalid username or password'}), 401
+    try:
+        if not user or not password_hasher.check(data['password'], user.password_hash):
+            return jsonify({'error': 'Invalid username or password'}), 401
 
-    if not user.is_active:
-        return jsonify({'error': 'User account is disabled'}), 403
+        if not user.is_active:
+            return jsonify({'error': 'User account is disabled'}), 403
+
+        # Rehash with the current cost factor (BCRYPT_ROUNDS changed)
+        if password_hasher.needs_rehash(user.password_hash):
+            user.password_hash = password_hasher.hash(data['password'])
+            db.session.commit()
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503, {'Retry-After': '1'}
 
     # Generate tokens
     access_token = create_access_token(identity=user.id)
@@ -98,9 +111,23 @@ def refresh():
 def get_current_user():
     """현재 사용자 정보 조회"""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    profile = identity_cache.user_profile(current_user_id)
 
-    if not user:
+    if not profile:
         return jsonify({'error': 'User not found'}), 404
 
-    return jsonify(user.to_dict()), 200
+    return jsonify(profile), 200
+
+
+@bp.route('/hasher/stats', methods=['GET'])
+@jwt_required()
+def hasher_stats():
+    """비밀번호 해시 풀 지표 (이 워커 기준 대기/실행/거절 수, 대기 시간)"""
+    return jsonify(password_hasher.stats()), 200
+
+
+@bp.route('/identity/stats', methods=['GET'])
+@jwt_required()
+def identity_stats():
+    """사용자 / 세션 소유 조회 캐시 지표 (이 워커 기준 적중/미스)"""
+    return jsonify(identity_cache.stats()), 200
@@ -3,16 +3,38 @@ Swagger-documented API Routes
 Flask-RESTX를 사용한 API 문서화
 """
 
-from flask import request
+from flask import request, current_app
 from flask_restx import Namespace, Resource
+from werkzeug.http import quote_etag
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token, create_refresh_token
 from datetime import datetime
 from app import db
 from app.models.user import User
 from app.models.session import RecordingSession
 from app.models.sensor_data import SensorData
-from app.models.sync_log import SyncLog
+from app.models.change_log import SyncChange
 from app.swagger.models import *
+from app.utils.cache import pull_cache
+from app.utils.identity import identity_cache
+from app.utils.passwords import PasswordHasherBusy, password_hasher
+from app.utils.changes import record_push_changes, changes_since
+from app.utils.analysis_cache import invalidate_analysis_results
+from app.utils.notify import notifier, parse_last_event_id, replay_events
+from app.utils.status import build_sync_status
+from app.utils.log_writer import sync_log_writer, sync_record, resolve_request_id
+from app.utils.arrow import ARROW_STREAM_MIMETYPE, arrow_available, iter_aligned_arrow, iter_pull_arrow, wants_arrow
+from app.utils.compression import (
+    compressed_json_response,
+    encoded_etag,
+    negotiate_encoding,
+    negotiated_response
+)
+from app.utils.downsample import parse_sample_filter
+from app.utils.pagination import InvalidCursorError, decode_cursor
+from app.utils.pull import parse_data_cursors, build_pull_page, pull_etag
+from app.utils.resample import EXPORT_FORMATS, align_session, aligned_to_dict, iter_aligned_csv, parse_align_args
+from app.utils.spectral import DEFAULT_WINDOW_SIZE, build_spectral_response, validate_spectral
+from app.tasks.data_processing import extract_spectral_features
 from sqlalchemy import and_
 
 # ============================================================
@@ -27,6 +49,7 @@ class AuthRegister(Resource):
     @auth_ns.expect(auth_register)
     @auth_ns.response(201, 'Success', auth_response)
     @auth_ns.response(400, 'Bad Request', error_response)
+    @auth_ns.response(503, 'Password hashing busy (Retry-After)', error_response)
     def post(self):
         """사용자 등록"""
         data = request.get_json()
@@ -48,7 +71,10 @@ class AuthRegister(Resource):
             email=data['email'],
             device_id=data['device_id']
         )
-        user.set_password(data['password'])
+        try:
+            user.password_hash = password_hasher.hash(data['password'])
+        except PasswordHasherBusy:
+            return {'error': 'Server busy, please retry'}, 503, {'Retry-After': '1'}
 
         db.session.add(user)
         db.session.commit()
@@ -70,6 +96,7 @@ class AuthLogin(Resource):
     @auth_ns.expect(auth_login)
     @auth_ns.response(200, 'Success', auth_response)
     @auth_ns.response(401, 'Unauthorized', error_response)
+    @auth_ns.response(503, 'Password hashing busy (Retry-After)', error_response)
     def post(self):
         """로그인"""
         data = request.get_json()
@@ -79,8 +106,16 @@ class AuthLogin(Resource):
 
         user = User.query.filter_by(username=data['username']).first()
 
-        if not user or not user.check_password(data['password']):
-            return {'error': 'Invalid username or password'}, 401
+        try:
+            if not user or not password_hasher.check(data['password'], user.password_hash):
+                return {'error': 'Invalid username or password'}, 401
+
+            # Rehash with the current cost factor (BCRYPT_ROUNDS changed)
+            if password_hasher.needs_rehash(user.password_hash):
+                user.password_hash = password_hasher.hash(data['password'])
+                db.session.commit()
+        except PasswordHasherBusy:
+            return {'error': 'Server busy, please retry'}, 503, {'Retry-After': '1'}
 
         # Generate tokens
         access_token = create_access_token(identity=user.id)
@@ -116,12 +151,32 @@ class AuthMe(Resource):
     def get(self):
         """현재 사용자 정보"""
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        profile = identity_cache.user_profile(current_user_id)
 
-        if not user:
+        if not profile:
             return {'error': 'User not found'}, 404
 
-        return user.to_dict(), 200
+        return profile, 200
+
+
+@auth_ns.route('/hasher/stats')
+class AuthHasherStats(Resource):
+    @auth_ns.doc('password_hasher_stats', security='Bearer')
+    @auth_ns.response(200, 'Success', hasher_stats_response)
+    @jwt_required()
+    def get(self):
+        """비밀번호 해시 풀 지표 (이 워커 기준 대기/실행/거절 수, 대기 시간)"""
+        return password_hasher.stats(), 200
+
+
+@auth_ns.route('/identity/stats')
+class AuthIdentityStats(Resource):
+    @auth_ns.doc('identity_cache_stats', security='Bearer')
+    @auth_ns.response(200, 'Success', identity_stats_response)
+    @jwt_required()
+    def get(self):
+        """사용자 / 세션 소유 조회 캐시 지표 (이 워커 기준 적중/미스)"""
+        return identity_cache.stats(), 200
 
 
 # ============================================================
@@ -159,14 +214,10 @@ class SyncPush(Resource):
             if 'session_id' not in session_data or 'start_time' not in session_data:
                 return {'error': 'Missing session_id or start_time'}, 400
 
-            # Create sync log
-            sync_log = SyncLog(
-                user_id=current_user_id,
-                sync_type='push',
-                started_at=sync_start_time
-            )
-            db.session.add(sync_log)
-            db.session.flush()
+            try:
+                request_id = resolve_request_id(request.headers, data)
+            except ValueError as e:
+                return {'error': str(e)}, 400
 
             # Find or create recording session
             session = RecordingSession.query.filter_by(
@@ -194,8 +245,6 @@ class SyncPush(Resource):
                 session.notes = session_data.get('notes', session.notes)
                 session.updated_at = datetime.utcnow()
 
-            sync_log.session_id = session.id
-
             # Process sensor data
             inserted_count = 0
             updated_count = 0
@@ -209,7 +258,9 @@ class SyncPush(Resource):
                     data_by_type[sensor_type] = []
                 data_by_type[sensor_type].append(item)
 
-            # Process each sensor type
+            # Process each sensor type (new rows are saved after change sequence allocation)
+            pending_records = []
+            changed_by_type = {}
             for sensor_type, items in data_by_type.items():
                 timestamps = [item['timestamp'] for item in items]
                 existing_data = SensorData.query.filter(
@@ -243,29 +294,59 @@ class SyncPush(Resource):
                         new_records.append(new_record)
                         inserted_count += 1
 
-                if new_records:
-                    db.session.bulk_save_objects(new_records)
+                pending_records.extend(new_records)
+                changed_by_type[sensor_type] = new_records + list(existing_lookup.values())
+
+            # Bump per-user data version (Pull ETag)
+            User.bump_data_version(current_user_id)
+
+            # Stored analysis results are for the previous data version
+            invalidate_analysis_results(session.id)
 
             # Update session
-            session.data_count = SensorData.query.filter_by(session_id=session.id).count()
+            # (new rows are inserted below, after the change sequence is allocated)
+            session.data_count = SensorData.query.filter_by(session_id=session.id).count() + len(pending_records)
             session.last_synced_at = datetime.utcnow()
             session.is_uploaded = True
 
-            # Update sync log
-            sync_log.records_count = len(sensor_data_list)
-            sync_log.duplicates_count = duplicate_count
-            sync_log.errors_count = 0
-            sync_log.status = 'success'
-            sync_log.completed_at = datetime.utcnow()
-            sync_log.metadata = {
+            # Sync log (single INSERT in this transaction, or buffered for a bulk write)
+            log_metadata = {
                 'inserted': inserted_count,
                 'updated': updated_count,
                 'sensor_types': list(data_by_type.keys()),
                 'total_size_bytes': len(request.data)
             }
+            sync_log_id = sync_log_writer.write(sync_record(
+                current_user_id, 'push', request_id, sync_start_time,
+                session_id=session.id,
+                records_count=len(sensor_data_list),
+                duplicates_count=duplicate_count,
+                metadata=log_metadata
+            ))
+
+            # Change sequence: session + one sample batch per sensor type.
+            # Allocated last on the per-user counter (row lock held until commit),
+            # and before the bulk insert so new rows carry their change_seq
+            change_seq = record_push_changes(current_user_id, session, changed_by_type)
+
+            # Bulk insert new records
+            if pending_records:
+                db.session.bulk_save_objects(pending_records)
 
             db.session.commit()
 
+            # Invalidate cached pull pages / session data
+            pull_cache.invalidate_user(current_user_id)
+            pull_cache.invalidate_session(session.id)
+
+            # Notify the user's other devices (SSE via Redis pub/sub)
+            notifier.publish(current_user_id, {
+                'type': 'push',
+                'session_id': str(session.session_id),
+                'change_seq': change_seq,
+                'records': len(sensor_data_list)
+            })
+
             return {
                 'message': 'Sync completed successfully',
                 'session_id': str(session.session_id),
@@ -274,17 +355,21 @@ class SyncPush(Resource):
                 'updated': updated_count,
                 'duplicates': duplicate_count,
                 'errors': 0,
-                'sync_log_id': sync_log.id,
-                'session_data_count': session.data_count
+                'sync_log_id': sync_log_id,
+                'request_id': request_id,
+                'session_data_count': session.data_count,
+                'change_seq': change_seq
             }, 200
 
         except Exception as e:
             db.session.rollback()
-            if 'sync_log' in locals():
-                sync_log.status = 'failed'
-                sync_log.error_message = str(e)
-                sync_log.errors_count = len(sensor_data_list) if 'sensor_data_list' in locals() else 0
-                sync_log.completed_at = datetime.utcnow()
+            if 'request_id' in locals():
+                sync_log_writer.write(sync_record(
+                    current_user_id, 'push', request_id, sync_start_time,
+                    status='failed',
+                    errors_count=len(sensor_data_list),
+                    error_message=str(e)
+                ))
                 db.session.commit()
 
             return {'error': 'Internal server error', 'details': str(e)}, 500
@@ -295,13 +380,20 @@ class SyncPull(Resource):
     @sync_ns.doc('sync_pull', security='Bearer')
     @sync_ns.expect(sync_pull_request)
     @sync_ns.response(200, 'Success', sync_pull_response)
+    @sync_ns.response(304, 'Not Modified (If-None-Match matched)')
     @sync_ns.response(400, 'Bad Request', error_response)
+    @sync_ns.response(406, 'Arrow output not available', error_response)
     @jwt_required()
     def post(self):
         """
         센서 데이터 Pull (서버 → 클라이언트)
 
-        델타 동기화, 페이지네이션
+        델타 동기화, 페이지네이션 (page 오프셋 또는 cursor 키셋),
+        세션별 데이터 커서와 응답당 레코드 예산 (max_records),
+        센서 타입/시간 범위 필터와 다운샘플링 (max_points, downsample),
+        ETag / If-None-Match 조건부 요청 (변경 없으면 304),
+        Accept-Encoding 협상 압축 (zstd, br, gzip),
+        Accept: application/vnd.apache.arrow.stream 이면 Arrow IPC 스트림
         """
         current_user_id = get_jwt_identity()
         sync_start_time = datetime.utcnow()
@@ -309,120 +401,144 @@ class SyncPull(Resource):
         try:
             data = request.get_json() or {}
 
+            try:
+                request_id = resolve_request_id(request.headers, data)
+            except ValueError as e:
+                return {'error': str(e)}, 400
+
             last_sync_time = data.get('last_sync_time')
             session_ids = data.get('session_ids', [])
             page = data.get('page', 1)
             page_size = data.get('page_size', 50)
             include_data = data.get('include_data', True)
+            use_cursor = 'cursor' in data
+            max_records = data.get('max_records')
 
             if page < 1:
                 return {'error': 'Page must be >= 1'}, 400
             if page_size < 1 or page_size > 100:
                 return {'error': 'Page size must be between 1 and 100'}, 400
 
-            # Create sync log
-            sync_log = SyncLog(
-                user_id=current_user_id,
-                sync_type='pull',
-                started_at=sync_start_time,
-                metadata={
-                    'last_sync_time': last_sync_time,
-                    'page': page,
-                    'page_size': page_size,
-                    'include_data': include_data
-                }
-            )
-            db.session.add(sync_log)
-            db.session.flush()
-
-            # Build query
-            query = RecordingSession.query.filter_by(user_id=current_user_id)
-
+            cursor = None
+            if use_cursor and data['cursor']:
+                try:
+                    cursor = decode_cursor(data['cursor'])
+                except InvalidCursorError:
+                    return {'error': 'Invalid cursor'}, 400
+
+            if max_records is not None:
+                max_limit = current_app.config['MAX_PULL_RECORDS']
+                if not isinstance(max_records, int) or max_records < 1 or max_records > max_limit:
+                    return {'error': f'max_records must be between 1 and {max_limit}'}, 400
+
+            try:
+                data_cursors = parse_data_cursors(data.get('data_cursors'))
+            except InvalidCursorError:
+                return {'error': 'Invalid data_cursors'}, 400
+
+            try:
+                sample_filter = parse_sample_filter(data, current_app.config['MAX_PULL_POINTS'])
+            except ValueError as e:
+                return {'error': str(e)}, 400
+
+            last_sync_dt = None
             if last_sync_time:
                 try:
                     last_sync_dt = datetime.fromisoformat(last_sync_time.replace('Z', '+00:00'))
-                    query = query.filter(RecordingSession.updated_at > last_sync_dt)
                 except ValueError:
                     return {'error': 'Invalid last_sync_time format. Use ISO 8601.'}, 400
 
-            if session_ids:
-                query = query.filter(RecordingSession.session_id.in_(session_ids))
-
-            query = query.order_by(RecordingSession.updated_at.desc())
-
-            total = query.count()
-            offset = (page - 1) * page_size
-            sessions = query.offset(offset).limit(page_size).all()
-
-            # Build response
-            sessions_data = []
-            total_records = 0
-
-            for session in sessions:
-                session_dict = {
-                    'session_id': str(session.session_id),
-                    'start_time': session.start_time.isoformat() + 'Z',
-                    'end_time': session.end_time.isoformat() + 'Z' if session.end_time else None,
-                    'is_active': session.is_active,
-                    'enabled_sensors': session.enabled_sensors,
-                    'sample_rate': session.sample_rate,
-                    'data_count': session.data_count,
-                    'notes': session.notes,
-                    'is_uploaded': session.is_uploaded,
-                    'created_at': session.created_at.isoformat() + 'Z',
-                    'updated_at': session.updated_at.isoformat() + 'Z'
-                }
-
-                if include_data:
-                    sensor_data = SensorData.query.filter_by(
-                        session_id=session.id
-                    ).order_by(SensorData.timestamp.asc()).all()
-
-                    session_dict['sensor_data'] = [
-                        {
-                            'sensor_type': sd.sensor_type,
-                            'timestamp': sd.timestamp,
-                            'data': sd.data
-                        }
-                        for sd in sensor_data
-                    ]
-                    total_records += len(sensor_data)
-                else:
-                    session_dict['sensor_data'] = []
-
-                sessions_data.append(session_dict)
-
-            has_more = (offset + page_size) < total
-
-            # Update sync log
-            sync_log.records_count = total_records
-            sync_log.status = 'success'
-            sync_log.completed_at = datetime.utcnow()
-            sync_log.metadata.update({
+            # Response format: Arrow IPC stream if preferred by Accept header
+            use_arrow = wants_arrow(request.accept_mimetypes)
+            if use_arrow and not arrow_available():
+                return {'error': 'Arrow output is not available (pyarrow not installed)'}, 406
+
+            # Conditional pull: unchanged data version -> 304 (no sensor_data query, no sync log)
+            etag = pull_etag(current_user_id, User.get_data_version(current_user_id), data)
+            # Arrow / 압축 본문은 바이트가 다르므로 형식, Content-Encoding별 ETag
+            response_etag = encoded_etag(f'{etag}-arrow' if use_arrow else etag,
+                                         negotiate_encoding(request.accept_encodings))
+            if request.if_none_match.contains(response_etag):
+                return None, 304, {'ETag': quote_etag(response_etag)}
+
+            # Serve page from cache or build it (sessions + sensor data)
+            page_result = pull_cache.get_page(current_user_id, etag)
+            cache_hit = page_result is not None
+            if not cache_hit:
+                page_result = build_pull_page(
+                    current_user_id,
+                    last_sync_dt=last_sync_dt,
+                    session_ids=session_ids,
+                    cursor=cursor,
+                    use_cursor=use_cursor,
+                    page=page,
+                    page_size=page_size,
+                    include_data=include_data,
+                    data_cursors=data_cursors,
+                    max_records=max_records,
+                    sample_filter=sample_filter
+                )
+                pull_cache.set_page(current_user_id, etag, page_result)
+
+            total_records = page_result.pop('total_records')
+            sessions_data = page_result['sessions']
+            total = page_result.get('total')
+            has_more = page_result['has_more']
+
+            # Sync log (single INSERT in this transaction, or buffered for a bulk write)
+            log_metadata = {
+                'last_sync_time': last_sync_time,
+                'page': None if use_cursor else page,
+                'page_size': page_size,
+                'cursor': use_cursor,
+                'include_data': include_data,
                 'sessions_count': len(sessions_data),
                 'total_records': total_records,
                 'total_sessions': total,
-                'has_more': has_more
-            })
+                'has_more': has_more,
+                'cache_hit': cache_hit,
+                'format': 'arrow' if use_arrow else 'json'
+            }
+            sync_log_id = sync_log_writer.write(sync_record(
+                current_user_id, 'pull', request_id, sync_start_time,
+                records_count=total_records,
+                metadata=log_metadata
+            ))
 
             db.session.commit()
 
-            return {
-                'sessions': sessions_data,
-                'server_timestamp': datetime.utcnow().isoformat() + 'Z',
-                'page': page,
-                'page_size': page_size,
-                'total': total,
-                'has_more': has_more,
-                'sync_log_id': sync_log.id
-            }, 200
+            response = dict(
+                page_result,
+                server_timestamp=datetime.utcnow().isoformat() + 'Z',
+                sync_log_id=sync_log_id,
+                request_id=request_id
+            )
+
+            headers = {'ETag': quote_etag(response_etag), 'Vary': 'Accept'}
+
+            if use_arrow:
+                # Session stream + one columnar stream per sensor type
+                return negotiated_response(
+                    iter_pull_arrow(response, float32=bool(data.get('arrow_float32'))),
+                    ARROW_STREAM_MIMETYPE,
+                    headers=headers
+                )
+
+            # Accept-Encoding 협상 (zstd/br/gzip 스트리밍 압축)
+            compressed = compressed_json_response(response, headers=headers)
+            if compressed is not None:
+                return compressed
+
+            return response, 200, headers
 
         except Exception as e:
             db.session.rollback()
-            if 'sync_log' in locals():
-                sync_log.status = 'failed'
-                sync_log.error_message = str(e)
-                sync_log.completed_at = datetime.utcnow()
+            if 'request_id' in locals():
+                sync_log_writer.write(sync_record(
+                    current_user_id, 'pull', request_id, sync_start_time,
+                    status='failed',
+                    error_message=str(e)
+                ))
                 db.session.commit()
 
             return {'error': 'Internal server error', 'details': str(e)}, 500
@@ -437,21 +553,206 @@ class SyncStatus(Resource):
         """동기화 상태 조회"""
         current_user_id = get_jwt_identity()
 
-        # Get recent sync logs
-        recent_syncs = SyncLog.query.filter_by(
-            user_id=current_user_id
-        ).order_by(
-            SyncLog.created_at.desc()
-        ).limit(10).all()
+        return build_sync_status(current_user_id), 200
 
-        # Get session statistics
-        total_sessions = RecordingSession.query.filter_by(user_id=current_user_id).count()
-        active_sessions = RecordingSession.query.filter_by(user_id=current_user_id, is_active=True).count()
-        uploaded_sessions = RecordingSession.query.filter_by(user_id=current_user_id, is_uploaded=True).count()
 
-        return {
-            'total_sessions': total_sessions,
-            'active_sessions': active_sessions,
-            'uploaded_sessions': uploaded_sessions,
-            'recent_syncs': [log.to_dict() for log in recent_syncs]
-        }, 200
+@sync_ns.route('/changes')
+class SyncChanges(Resource):
+    @sync_ns.doc('sync_changes', security='Bearer', params={
+        'since': '마지막으로 처리한 시퀀스 (기본값 0)',
+        'limit': '최대 변경 수 (1-1000, 기본값 500)'
+    })
+    @sync_ns.response(200, 'Success', sync_changes_response)
+    @sync_ns.response(400, 'Bad Request', error_response)
+    @jwt_required()
+    def get(self):
+        """
+        변경 피드 조회 (since 이후 세션 / 센서 샘플 배치 변경)
+
+        시퀀스는 커밋 순서대로 증가하므로 next_since를 체크포인트로 사용
+        """
+        current_user_id = get_jwt_identity()
+
+        try:
+            since = int(request.args.get('since', 0))
+            limit = int(request.args.get('limit', 500))
+        except ValueError:
+            return {'error': 'since and limit must be integers'}, 400
+
+        if since < 0:
+            return {'error': 'since must be a non-negative integer'}, 400
+        if limit < 1 or limit > 1000:
+            return {'error': 'limit must be between 1 and 1000'}, 400
+
+        return changes_since(current_user_id, since, limit), 200
+
+
+@sync_ns.route('/events')
+class SyncEvents(Resource):
+    @sync_ns.doc('sync_events', security='Bearer')
+    @sync_ns.produces(['text/event-stream'])
+    @sync_ns.response(200, 'Event stream')
+    @sync_ns.response(503, 'Notifications are not enabled', error_response)
+    @jwt_required()
+    def get(self):
+        """
+        동기화 알림 SSE 스트림 (text/event-stream)
+
+        다른 기기의 Push 커밋 시 알림 (Redis pub/sub으로 모든 워커에 전달),
+        연결 직후 ready 이벤트로 마지막 change_seq 전달, 이벤트 id = change_seq,
+        재연결 시 Last-Event-ID 이후 놓친 변경을 change 이벤트로 재생
+        """
+        if not notifier.enabled:
+            return {'error': 'Notifications are not enabled'}, 503
+
+        current_user_id = get_jwt_identity()
+
+        # Subscribe before reading the feed so nothing falls in between (duplicates share change_seq)
+        q = notifier.subscribe(current_user_id)
+        last_event_id = parse_last_event_id(
+            request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+        )
+        missed = replay_events(current_user_id, last_event_id, notifier.replay_limit)
+        ready = {'type': 'ready', 'change_seq': SyncChange.latest_seq(current_user_id)}
+
+        response = current_app.response_class(
+            notifier.stream(q, missed + [ready]),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        response.call_on_close(lambda: notifier.unsubscribe(current_user_id, q))
+        return response
+
+
+@sync_ns.route('/cache/stats')
+class SyncCacheStats(Resource):
+    @sync_ns.doc('sync_cache_stats', security='Bearer')
+    @sync_ns.response(200, 'Success', cache_stats_response)
+    @jwt_required()
+    def get(self):
+        """Pull 캐시 지표 조회 (적중률, 절약 바이트, 제거 횟수)"""
+        return pull_cache.stats(), 200
+
+
+@sync_ns.route('/sessions/<string:session_uuid>/spectral')
+class SessionSpectral(Resource):
+    @sync_ns.doc('session_spectral', security='Bearer', params={
+        'sensor_type': '센서 타입 (생략 시 저장된 전체)',
+        'windows': 'true면 윈도별 특징 포함 (기본값 false)',
+        'start_ts': '윈도 범위 시작 (ms)',
+        'end_ts': '윈도 범위 끝 (ms)'
+    })
+    @sync_ns.response(200, 'Success', spectral_response)
+    @sync_ns.response(400, 'Bad Request', error_response)
+    @sync_ns.response(404, 'Not Found', error_response)
+    @jwt_required()
+    def get(self, session_uuid):
+        """세션 주파수 특징 조회 (우세 주파수, 대역 에너지, Welch PSD)"""
+        current_user_id = get_jwt_identity()
+
+        session = RecordingSession.query.filter_by(user_id=current_user_id, session_id=session_uuid).first()
+        if not session:
+            return {'error': 'Session not found'}, 404
+
+        try:
+            start_ts = int(request.args['start_ts']) if 'start_ts' in request.args else None
+            end_ts = int(request.args['end_ts']) if 'end_ts' in request.args else None
+        except ValueError:
+            return {'error': 'start_ts and end_ts must be integers'}, 400
+
+        response = build_spectral_response(
+            session,
+            sensor_type=request.args.get('sensor_type'),
+            start_ts=start_ts,
+            end_ts=end_ts,
+            include_windows=request.args.get('windows', 'false').lower() == 'true'
+        )
+        if response is None:
+            return {'error': 'No spectral features found'}, 404
+        return response, 200
+
+    @sync_ns.doc('request_spectral', security='Bearer')
+    @sync_ns.expect(spectral_request)
+    @sync_ns.response(202, 'Accepted', task_result)
+    @sync_ns.response(400, 'Bad Request', error_response)
+    @sync_ns.response(404, 'Not Found', error_response)
+    @sync_ns.response(503, 'Task queue unavailable', error_response)
+    @jwt_required()
+    def post(self, session_uuid):
+        """세션 주파수 특징 추출 요청 (Celery 작업 예약, 세션 sample_rate 기준)"""
+        current_user_id = get_jwt_identity()
+
+        session = RecordingSession.query.filter_by(user_id=current_user_id, session_id=session_uuid).first()
+        if not session:
+            return {'error': 'Session not found'}, 404
+
+        data = request.get_json(silent=True) or {}
+        try:
+            _, window_size, hop, bands = validate_spectral(
+                session.sample_rate, int(data.get('window_size', DEFAULT_WINDOW_SIZE)), data.get('hop'),
+                data.get('bands')
+            )
+        except (TypeError, ValueError) as e:
+            return {'error': str(e)}, 400
+
+        try:
+            task = extract_spectral_features.delay(
+                session.id, sensor_types=data.get('sensor_types'), window_size=window_size, hop=hop,
+                bands=bands, refresh=bool(data.get('refresh', False))
+            )
+        except Exception as e:
+            return {'error': 'Task queue unavailable', 'details': str(e)}, 503
+
+        return {'task_id': task.id, 'status': 'PENDING'}, 202
+
+
+@sync_ns.route('/sessions/<string:session_uuid>/aligned')
+class SessionAligned(Resource):
+    @sync_ns.doc('export_aligned', security='Bearer', params={
+        'sensor_types': '쉼표 구분 센서 타입 (생략 시 전체)',
+        'method': 'nearest / linear / zoh (기본값 linear)',
+        'rate_hz': '격자 주파수 (기본값 세션 sample_rate)',
+        'start_ts': '격자 시작 (ms, 생략 시 모든 센서 타입이 겹치는 구간)',
+        'end_ts': '격자 끝 (ms)',
+        'max_gap_ms': '이보다 먼 샘플은 사용하지 않음 (null)',
+        'format': 'json / csv / arrow (생략 시 Accept 헤더 기준)'
+    })
+    @sync_ns.response(200, 'Success', aligned_response)
+    @sync_ns.response(400, 'Bad Request', error_response)
+    @sync_ns.response(404, 'Not Found', error_response)
+    @sync_ns.response(406, 'Arrow output not available', error_response)
+    @jwt_required()
+    def get(self, session_uuid):
+        """세션 센서 데이터를 공통 시간 격자로 정렬해 내보내기 (JSON / CSV / Arrow)"""
+        current_user_id = get_jwt_identity()
+
+        session = RecordingSession.query.filter_by(user_id=current_user_id, session_id=session_uuid).first()
+        if not session:
+            return {'error': 'Session not found'}, 404
+
+        export_format = request.args.get('format') or ('arrow' if wants_arrow(request.accept_mimetypes) else 'json')
+        if export_format not in EXPORT_FORMATS:
+            return {'error': f'format must be one of: {", ".join(EXPORT_FORMATS)}'}, 400
+        if export_format == 'arrow' and not arrow_available():
+            return {'error': 'Arrow output is not available (pyarrow not installed)'}, 406
+
+        try:
+            aligned = align_session(session, **parse_align_args(request.args),
+                                    chunk_size=current_app.config.get('ANALYSIS_CHUNK_SIZE', 10000),
+                                    max_points=current_app.config.get('RESAMPLE_MAX_POINTS', 1000000))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        if export_format == 'csv':
+            response = negotiated_response(iter_aligned_csv(aligned), 'text/csv', headers={
+                'Content-Disposition': f'attachment; filename="{session.session_id}_aligned.csv"'
+            })
+        elif export_format == 'arrow':
+            response = negotiated_response(iter_aligned_arrow(aligned), ARROW_STREAM_MIMETYPE)
+        else:
+            payload = aligned_to_dict(session, aligned)
+            response = compressed_json_response(payload)
+            if response is None:
+                return payload, 200, {'Vary': 'Accept'}
+        response.vary.add('Accept')
+        return response
@@ -3,14 +3,33 @@ Sync Routes - Phase 41: Push API
 센서 데이터 동기화 API
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from app import db
 from app.models.user import User
 from app.models.session import RecordingSession
 from app.models.sensor_data import SensorData
-from app.models.sync_log import SyncLog
+from app.models.change_log import SyncChange
+from app.utils.cache import pull_cache
+from app.utils.changes import record_push_changes, changes_since
+from app.utils.analysis_cache import invalidate_analysis_results
+from app.utils.notify import notifier, parse_last_event_id, replay_events
+from app.utils.status import build_sync_status
+from app.utils.log_writer import sync_log_writer, sync_record, resolve_request_id
+from app.utils.arrow import ARROW_STREAM_MIMETYPE, arrow_available, iter_aligned_arrow, iter_pull_arrow, wants_arrow
+from app.utils.compression import (
+    compressed_json_response,
+    encoded_etag,
+    negotiate_encoding,
+    negotiated_response
+)
+from app.utils.downsample import parse_sample_filter
+from app.utils.pagination import InvalidCursorError, decode_cursor
+from app.utils.pull import parse_data_cursors, build_pull_page, pull_etag
+from app.utils.resample import EXPORT_FORMATS, align_session, aligned_to_dict, iter_aligned_csv, parse_align_args
+from app.utils.spectral import DEFAULT_WINDOW_SIZE, build_spectral_response, validate_spectral
+from app.tasks.data_processing import extract_spectral_features
 from sqlalchemy import and_
 from sqlalchemy.exc import IntegrityError
 
@@ -82,14 +101,10 @@ def push_data():
         if 'session_id' not in session_data or 'start_time' not in session_data:
             return jsonify({'error': 'Missing session_id or start_time'}), 400
 
-        # Create sync log
-        sync_log = SyncLog(
-            user_id=current_user_id,
-            sync_type='push',
-            started_at=sync_start_time
-        )
-        db.session.add(sync_log)
-        db.session.flush()  # Get sync_log.id
+        try:
+            request_id = resolve_request_id(request.headers, data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Find or create recording session
         session = RecordingSession.query.filter_by(
@@ -119,8 +134,6 @@ def push_data():
             session.notes = session_data.get('notes', session.notes)
             session.updated_at = datetime.utcnow()
 
-        sync_log.session_id = session.id
-
         # Process sensor data in batch
         inserted_count = 0
         updated_count = 0
@@ -135,7 +148,9 @@ def push_data():
                 data_by_type[sensor_type] = []
             data_by_type[sensor_type].append(item)
 
-        # Process each sensor type
+        # Process each sensor type (new rows are saved after change sequence allocation)
+        pending_records = []
+        changed_by_type = {}
         for sensor_type, items in data_by_type.items():
             # Get existing data for duplicate check
             timestamps = [item['timestamp'] for item in items]
@@ -178,31 +193,61 @@ def push_data():
                     new_records.append(new_record)
                     inserted_count += 1
 
-            # Bulk insert new records
-            if new_records:
-                db.session.bulk_save_objects(new_records)
+            pending_records.extend(new_records)
+            changed_by_type[sensor_type] = new_records + list(existing_lookup.values())
+
+        # Bump per-user data version (Pull ETag)
+        User.bump_data_version(current_user_id)
+
+        # Stored analysis results are for the previous data version
+        invalidate_analysis_results(session.id)
 
         # Update session data_count
-        session.data_count = SensorData.query.filter_by(session_id=session.id).count()
+        # (new rows are inserted below, after the change sequence is allocated)
+        session.data_count = SensorData.query.filter_by(session_id=session.id).count() + len(pending_records)
         session.last_synced_at = datetime.utcnow()
         session.is_uploaded = True
 
-        # Update sync log
-        sync_log.records_count = len(sensor_data_list)
-        sync_log.duplicates_count = duplicate_count
-        sync_log.errors_count = error_count
-        sync_log.status = 'success'
-        sync_log.completed_at = datetime.utcnow()
-        sync_log.metadata = {
+        # Sync log (single INSERT in this transaction, or buffered for a bulk write)
+        log_metadata = {
             'inserted': inserted_count,
             'updated': updated_count,
             'sensor_types': list(data_by_type.keys()),
             'total_size_bytes': len(request.data)
         }
+        sync_log_id = sync_log_writer.write(sync_record(
+            current_user_id, 'push', request_id, sync_start_time,
+            session_id=session.id,
+            records_count=len(sensor_data_list),
+            duplicates_count=duplicate_count,
+            errors_count=error_count,
+            metadata=log_metadata
+        ))
+
+        # Change sequence: session + one sample batch per sensor type.
+        # Allocated last on the per-user counter (row lock held until commit),
+        # and before the bulk insert so new rows carry their change_seq
+        change_seq = record_push_changes(current_user_id, session, changed_by_type)
+
+        # Bulk insert new records
+        if pending_records:
+            db.session.bulk_save_objects(pending_records)
 
         # Commit transaction
         db.session.commit()
 
+        # Invalidate cached pull pages / session data
+        pull_cache.invalidate_user(current_user_id)
+        pull_cache.invalidate_session(session.id)
+
+        # Notify the user's other devices (SSE via Redis pub/sub)
+        notifier.publish(current_user_id, {
+            'type': 'push',
+            'session_id': str(session.session_id),
+            'change_seq': change_seq,
+            'records': len(sensor_data_list)
+        })
+
         return jsonify({
             'message': 'Sync completed successfully',
             'session_id': str(session.session_id),
@@ -211,19 +256,23 @@ def push_data():
             'updated': updated_count,
             'duplicates': duplicate_count,
             'errors': error_count,
-            'sync_log_id': sync_log.id,
-            'session_data_count': session.data_count
+            'sync_log_id': sync_log_id,
+            'request_id': request_id,
+            'session_data_count': session.data_count,
+            'change_seq': change_seq
         }), 200
 
     except IntegrityError as e:
         db.session.rollback()
 
         # Update sync log
-        if 'sync_log' in locals():
-            sync_log.status = 'failed'
-            sync_log.error_message = str(e)
-            sync_log.errors_count = len(sensor_data_list) if 'sensor_data_list' in locals() else 0
-            sync_log.completed_at = datetime.utcnow()
+        if 'request_id' in locals():
+            sync_log_writer.write(sync_record(
+                current_user_id, 'push', request_id, sync_start_time,
+                status='failed',
+                errors_count=len(sensor_data_list),
+                error_message=str(e)
+            ))
             db.session.commit()
 
         return jsonify({
@@ -235,11 +284,13 @@ def push_data():
         db.session.rollback()
 
         # Update sync log
-        if 'sync_log' in locals():
-            sync_log.status = 'failed'
-            sync_log.error_message = str(e)
-            sync_log.errors_count = len(sensor_data_list) if 'sensor_data_list' in locals() else 0
-            sync_log.completed_at = datetime.utcnow()
+        if 'request_id' in locals():
+            sync_log_writer.write(sync_record(
+                current_user_id, 'push', request_id, sync_start_time,
+                status='failed',
+                errors_count=len(sensor_data_list),
+                error_message=str(e)
+            ))
             db.session.commit()
 
         return jsonify({
@@ -256,7 +307,7 @@ def pull_data():
 
     서버에서 클라이언트로 데이터 전송 (델타 동기화)
     - last_sync_time 이후 변경된 세션만 전송
-    - 페이지네이션 지원
+    - 페이지네이션 지원 (page 오프셋 또는 cursor 키셋)
     - 서버 타임스탬프 반환
 
     Request Body:
@@ -265,9 +316,44 @@ def pull_data():
         "session_ids": ["uuid1", "uuid2"],          # Optional, specific sessions
         "page": 1,
         "page_size": 50,
-        "include_data": true                         # Include sensor data or just metadata
+        "cursor": null,                              # Optional, keyset mode (null = first page)
+        "include_data": true,                        # Include sensor data or just metadata
+        "max_records": 10000,                        # Optional, sensor record budget per response
+        "data_cursors": {                            # Optional, resume per-session sensor data
+            "uuid1": {"sensor_type": "accelerometer", "timestamp": 1699876543210}
+        },
+        "sensor_types": ["accelerometer"],           # Optional, sensor type filter
+        "start_ts": 1699876543210,                   # Optional, timestamp range (ms, inclusive)
+        "end_ts": 1699876643210,
+        "since_seq": 42,                             # Optional, only changes after this sequence
+        "max_points": 500,                           # Optional, max samples per session/sensor type
+        "downsample": "stride",                      # "stride" (every Nth) or "bucket" (mean/min/max)
+        "arrow_float32": false                       # Optional, float32 axes for Arrow output
     }
 
+    cursor 키가 있으면 키셋 모드로 동작한다: (updated_at, id) 기준 인덱스 탐색,
+    COUNT 없음, page_size + 1개 조회로 has_more 계산. 응답의 next_cursor를
+    다음 요청의 cursor로 전달한다. (이 모드에서는 page/total이 반환되지 않음)
+
+    응답의 ETag를 If-None-Match 헤더로 보내면, 마지막 Push 이후 변경이 없을 때
+    304 Not Modified를 반환한다 (센서 데이터 조회/동기화 로그 기록 없음).
+
+    Accept-Encoding 헤더가 있으면 zstd, br, gzip 중 서버에서 사용 가능한 인코딩으로
+    응답을 스트리밍 압축한다 (Content-Encoding, Vary: Accept-Encoding).
+
+    Accept: application/vnd.apache.arrow.stream 이면 JSON 대신 Arrow IPC 스트림을
+    반환한다: 세션 메타데이터 스트림 (스키마 메타데이터 koodtx.page에 페이지 정보)
+    뒤에 센서 타입마다 (session_id, timestamp int64, 축 값) 열 지향 스트림이 이어진다.
+    arrow_float32=true이면 축 값을 float32로 보낸다 (기본 float64).
+
+    max_records 또는 data_cursors가 있으면 세션 데이터는 (sensor_type, timestamp)
+    순으로 전달되고, 예산을 넘는 세션은 data_complete=false와 data_cursor를 반환한다
+    (예산은 세션 id 순으로 소비, 받지 못한 세션의 data_cursor는 처음 위치).
+
+    max_points가 있으면 (세션, 센서 타입)마다 최대 max_points개만 반환한다.
+    stride는 SQL에서 N번째 샘플만 선택하고, bucket은 동일 샘플 수 구간의
+    평균(data)과 min/max/count를 반환한다. data_cursors/max_records와 함께 쓸 수 없다.
+
     Response:
     {
         "sessions": [
@@ -279,14 +365,17 @@ def pull_data():
                 "sample_rate": 100,
                 "data_count": 5000,
                 "notes": "Morning workout",
-                "sensor_data": [...]  # If include_data=true
+                "sensor_data": [...],  # If include_data=true
+                "data_cursor": null,   # Resume position when data_complete=false
+                "data_complete": true
             }
         ],
         "server_timestamp": "2025-11-13T12:00:00Z",
         "page": 1,
         "page_size": 50,
         "total": 150,
-        "has_more": true
+        "has_more": true,
+        "next_cursor": "opaque-token"
     }
     """
     current_user_id = get_jwt_identity()
@@ -296,11 +385,18 @@ def pull_data():
         # Parse request data
         data = request.get_json() or {}
 
+        try:
+            request_id = resolve_request_id(request.headers, data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         last_sync_time = data.get('last_sync_time')
         session_ids = data.get('session_ids', [])
         page = data.get('page', 1)
         page_size = data.get('page_size', 50)
         include_data = data.get('include_data', True)
+        use_cursor = 'cursor' in data
+        max_records = data.get('max_records')
 
         # Validate pagination
         if page < 1:
@@ -308,123 +404,128 @@ def pull_data():
         if page_size < 1 or page_size > 100:
             return jsonify({'error': 'Page size must be between 1 and 100'}), 400
 
-        # Create sync log
-        sync_log = SyncLog(
-            user_id=current_user_id,
-            sync_type='pull',
-            started_at=sync_start_time,
-            metadata={
-                'last_sync_time': last_sync_time,
-                'page': page,
-                'page_size': page_size,
-                'include_data': include_data
-            }
-        )
-        db.session.add(sync_log)
-        db.session.flush()
-
-        # Build query for sessions
-        query = RecordingSession.query.filter_by(user_id=current_user_id)
-
-        # Filter by last_sync_time (delta sync)
+        cursor = None
+        if use_cursor and data['cursor']:
+            try:
+                cursor = decode_cursor(data['cursor'])
+            except InvalidCursorError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+        if max_records is not None:
+            max_limit = current_app.config['MAX_PULL_RECORDS']
+            if not isinstance(max_records, int) or max_records < 1 or max_records > max_limit:
+                return jsonify({'error': f'max_records must be between 1 and {max_limit}'}), 400
+
+        try:
+            data_cursors = parse_data_cursors(data.get('data_cursors'))
+        except InvalidCursorError:
+            return jsonify({'error': 'Invalid data_cursors'}), 400
+
+        try:
+            sample_filter = parse_sample_filter(data, current_app.config['MAX_PULL_POINTS'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        last_sync_dt = None
         if last_sync_time:
             try:
                 last_sync_dt = datetime.fromisoformat(last_sync_time.replace('Z', '+00:00'))
-                query = query.filter(RecordingSession.updated_at > last_sync_dt)
             except ValueError:
                 return jsonify({'error': 'Invalid last_sync_time format. Use ISO 8601.'}), 400
 
-        # Filter by specific session_ids (if provided)
-        if session_ids:
-            query = query.filter(RecordingSession.session_id.in_(session_ids))
-
-        # Order by updated_at descending (most recent first)
-        query = query.order_by(RecordingSession.updated_at.desc())
-
-        # Get total count before pagination
-        total = query.count()
-
-        # Apply pagination
-        offset = (page - 1) * page_size
-        sessions = query.offset(offset).limit(page_size).all()
-
-        # Build response
-        sessions_data = []
-        total_records = 0
-
-        for session in sessions:
-            session_dict = {
-                'session_id': str(session.session_id),
-                'start_time': session.start_time.isoformat() + 'Z',
-                'end_time': session.end_time.isoformat() + 'Z' if session.end_time else None,
-                'is_active': session.is_active,
-                'enabled_sensors': session.enabled_sensors,
-                'sample_rate': session.sample_rate,
-                'data_count': session.data_count,
-                'notes': session.notes,
-                'is_uploaded': session.is_uploaded,
-                'created_at': session.created_at.isoformat() + 'Z',
-                'updated_at': session.updated_at.isoformat() + 'Z'
-            }
-
-            # Include sensor data if requested
-            if include_data:
-                sensor_data = SensorData.query.filter_by(
-                    session_id=session.id
-                ).order_by(
-                    SensorData.timestamp.asc()
-                ).all()
-
-                session_dict['sensor_data'] = [
-                    {
-                        'sensor_type': sd.sensor_type,
-                        'timestamp': sd.timestamp,
-                        'data': sd.data
-                    }
-                    for sd in sensor_data
-                ]
-
-                total_records += len(sensor_data)
-            else:
-                session_dict['sensor_data'] = []
-
-            sessions_data.append(session_dict)
+        # Response format: Arrow IPC stream if preferred by Accept header
+        use_arrow = wants_arrow(request.accept_mimetypes)
+        if use_arrow and not arrow_available():
+            return jsonify({'error': 'Arrow output is not available (pyarrow not installed)'}), 406
+
+        # Conditional pull: unchanged data version -> 304 (no sensor_data query, no sync log)
+        etag = pull_etag(current_user_id, User.get_data_version(current_user_id), data)
+        # Arrow / 압축 본문은 바이트가 다르므로 형식, Content-Encoding별 ETag
+        response_etag = encoded_etag(f'{etag}-arrow' if use_arrow else etag,
+                                     negotiate_encoding(request.accept_encodings))
+        if request.if_none_match.contains(response_etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(response_etag)
+            return response
+
+        # Serve page from cache or build it (sessions + sensor data)
+        page_result = pull_cache.get_page(current_user_id, etag)
+        cache_hit = page_result is not None
+        if not cache_hit:
+            page_result = build_pull_page(
+                current_user_id,
+                last_sync_dt=last_sync_dt,
+                session_ids=session_ids,
+                cursor=cursor,
+                use_cursor=use_cursor,
+                page=page,
+                page_size=page_size,
+                include_data=include_data,
+                data_cursors=data_cursors,
+                max_records=max_records,
+                sample_filter=sample_filter
+            )
+            pull_cache.set_page(current_user_id, etag, page_result)
 
-        # Calculate has_more
-        has_more = (offset + page_size) < total
+        total_records = page_result.pop('total_records')
+        sessions_data = page_result['sessions']
+        total = page_result.get('total')
+        has_more = page_result['has_more']
 
-        # Update sync log
-        sync_log.records_count = total_records
-        sync_log.status = 'success'
-        sync_log.completed_at = datetime.utcnow()
-        sync_log.metadata.update({
+        # Sync log (single INSERT in this transaction, or buffered for a bulk write)
+        log_metadata = {
+            'last_sync_time': last_sync_time,
+            'page': None if use_cursor else page,
+            'page_size': page_size,
+            'cursor': use_cursor,
+            'include_data': include_data,
             'sessions_count': len(sessions_data),
             'total_records': total_records,
             'total_sessions': total,
-            'has_more': has_more
-        })
+            'has_more': has_more,
+            'cache_hit': cache_hit,
+            'format': 'arrow' if use_arrow else 'json'
+        }
+        sync_log_id = sync_log_writer.write(sync_record(
+            current_user_id, 'pull', request_id, sync_start_time,
+            records_count=total_records,
+            metadata=log_metadata
+        ))
 
         # Commit transaction
         db.session.commit()
 
-        return jsonify({
-            'sessions': sessions_data,
-            'server_timestamp': datetime.utcnow().isoformat() + 'Z',
-            'page': page,
-            'page_size': page_size,
-            'total': total,
-            'has_more': has_more,
-            'sync_log_id': sync_log.id
-        }), 200
+        response = dict(
+            page_result,
+            server_timestamp=datetime.utcnow().isoformat() + 'Z',
+            sync_log_id=sync_log_id,
+            request_id=request_id
+        )
+
+        if use_arrow:
+            # Session stream + one columnar stream per sensor type
+            response = negotiated_response(
+                iter_pull_arrow(response, float32=bool(data.get('arrow_float32'))),
+                ARROW_STREAM_MIMETYPE
+            )
+        else:
+            # Accept-Encoding 협상 (zstd/br/gzip 스트리밍 압축)
+            compressed = compressed_json_response(response)
+            response = compressed if compressed is not None else jsonify(response)
+        response.vary.add('Accept')
+        response.set_etag(response_etag)
+        return response, 200
 
     except Exception as e:
         db.session.rollback()
 
         # Update sync log
-        if 'sync_log' in locals():
-            sync_log.status = 'failed'
-            sync_log.error_message = str(e)
-            sync_log.completed_at = datetime.utcnow()
+        if 'request_id' in locals():
+            sync_log_writer.write(sync_record(
+                current_user_id, 'pull', request_id, sync_start_time,
+                status='failed',
+                error_message=str(e)
+            ))
             db.session.commit()
 
         return jsonify({
@@ -439,21 +540,242 @@ def sync_status():
     """동기화 상태 조회"""
     current_user_id = get_jwt_identity()
 
-    # Get recent sync logs
-    recent_syncs = SyncLog.query.filter_by(
-        user_id=current_user_id
-    ).order_by(
-        SyncLog.created_at.desc()
-    ).limit(10).all()
-
-    # Get session statistics
-    total_sessions = RecordingSession.query.filter_by(user_id=current_user_id).count()
-    active_sessions = RecordingSession.query.filter_by(user_id=current_user_id, is_active=True).count()
-    uploaded_sessions = RecordingSession.query.filter_by(user_id=current_user_id, is_uploaded=True).count()
-
-    return jsonify({
-        'total_sessions': total_sessions,
-        'active_sessions': active_sessions,
-        'uploaded_sessions': uploaded_sessions,
-        'recent_syncs': [log.to_dict() for log in recent_syncs]
-    }), 200
+    return jsonify(build_sync_status(current_user_id)), 200
+
+
+@bp.route('/changes', methods=['GET'])
+@jwt_required()
+def sync_changes():
+    """
+    변경 피드 조회
+
+    전역 변경 시퀀스 기준으로 since 이후의 세션 / 센서 샘플 배치 변경을 반환한다.
+    시퀀스는 커밋 순서대로 증가하므로 next_since를 체크포인트로 저장하면
+    벽시계 시간이나 커밋 순서와 무관하게 변경을 빠짐없이 받을 수 있다.
+
+    Query:
+        since: 마지막으로 처리한 시퀀스 (기본값 0)
+        limit: 최대 변경 수 (1-1000, 기본값 500)
+
+    Response:
+    {
+        "changes": [
+            {"seq": 41, "kind": "session", "op": "upsert", "session_id": "uuid"},
+            {"seq": 42, "kind": "samples", "op": "upsert", "session_id": "uuid",
+             "sensor_type": "accelerometer", "count": 500,
+             "ts_min": 1699876543210, "ts_max": 1699876548200}
+        ],
+        "next_since": 42,
+        "has_more": false
+    }
+    """
+    current_user_id = get_jwt_identity()
+
+    try:
+        since = int(request.args.get('since', 0))
+        limit = int(request.args.get('limit', 500))
+    except ValueError:
+        return jsonify({'error': 'since and limit must be integers'}), 400
+
+    if since < 0:
+        return jsonify({'error': 'since must be a non-negative integer'}), 400
+    if limit < 1 or limit > 1000:
+        return jsonify({'error': 'limit must be between 1 and 1000'}), 400
+
+    return jsonify(changes_since(current_user_id, since, limit)), 200
+
+
+@bp.route('/events', methods=['GET'])
+@jwt_required()
+def sync_events():
+    """
+    동기화 알림 SSE 스트림 (text/event-stream)
+
+    같은 사용자의 다른 기기에서 Push가 커밋되면 알림을 보낸다. 클라이언트는 타이머로
+    Pull을 반복하지 않고 알림을 받았을 때만 /changes 또는 Pull을 호출한다.
+    알림은 Redis pub/sub으로 모든 gunicorn 워커에 전달된다 (NOTIFY_ENABLED).
+
+    - 연결 직후 ready 이벤트로 현재 마지막 change_seq 전달
+    - 이벤트 id = change_seq. 재연결 시 Last-Event-ID 헤더 (또는 last_event_id 쿼리) 이후 놓친 변경을
+      변경 피드에서 change 이벤트로 재생 (최대 NOTIFY_REPLAY_LIMIT개, 나머지는 /changes)
+    - heartbeat마다 keepalive 주석, NOTIFY_STREAM_TIMEOUT 후 종료 (retry 후 재연결)
+    - 자신의 Push 알림도 오므로 Push 응답의 change_seq와 비교해 무시할 수 있음
+
+    Event:
+        id: 42
+        event: sync
+        data: {"type": "push", "session_id": "uuid", "change_seq": 42, "records": 500}
+    """
+    if not notifier.enabled:
+        return jsonify({'error': 'Notifications are not enabled'}), 503
+
+    current_user_id = get_jwt_identity()
+
+    # Subscribe before reading the feed so nothing falls in between (duplicates share change_seq)
+    q = notifier.subscribe(current_user_id)
+    last_event_id = parse_last_event_id(
+        request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    )
+    missed = replay_events(current_user_id, last_event_id, notifier.replay_limit)
+    ready = {'type': 'ready', 'change_seq': SyncChange.latest_seq(current_user_id)}
+
+    response = current_app.response_class(
+        notifier.stream(q, missed + [ready]),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    response.call_on_close(lambda: notifier.unsubscribe(current_user_id, q))
+    return response
+
+
+@bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def cache_stats():
+    """Pull 캐시 지표 조회 (적중률, 절약 바이트, 제거 횟수)"""
+    return jsonify(pull_cache.stats()), 200
+
+
+@bp.route('/sessions/<session_uuid>/spectral', methods=['GET'])
+@jwt_required()
+def session_spectral(session_uuid):
+    """
+    세션 주파수 특징 조회 (extract_spectral_features 결과)
+
+    Query:
+        sensor_type: 센서 타입 (생략 시 저장된 전체)
+        windows: true면 윈도별 특징 포함 (기본값 false)
+        start_ts, end_ts: 윈도 범위 (ms, windows=true일 때)
+
+    Response:
+    {
+        "session_id": "uuid",
+        "features": [
+            {"sensor_type": "accelerometer", "sample_rate": 100, "window_size": 256, "hop": 128,
+             "bands": [[0.0, 0.5], ...], "window_count": 42, "dominant_frequency": 1.95,
+             "welch_psd": {"frequencies": [...], "psd": [...]}, "stale": false,
+             "windows": [{"start_ts": ..., "end_ts": ..., "dominant_frequency": ..., "band_energy": [...]}]}
+        ]
+    }
+    """
+    current_user_id = get_jwt_identity()
+
+    session = RecordingSession.query.filter_by(user_id=current_user_id, session_id=session_uuid).first()
+    if not session:
+        return jsonify({'error': 'Session not found'}), 404
+
+    try:
+        start_ts = int(request.args['start_ts']) if 'start_ts' in request.args else None
+        end_ts = int(request.args['end_ts']) if 'end_ts' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'start_ts and end_ts must be integers'}), 400
+
+    response = build_spectral_response(
+        session,
+        sensor_type=request.args.get('sensor_type'),
+        start_ts=start_ts,
+        end_ts=end_ts,
+        include_windows=request.args.get('windows', 'false').lower() == 'true'
+    )
+    if response is None:
+        return jsonify({'error': 'No spectral features found'}), 404
+    return jsonify(response), 200
+
+
+@bp.route('/sessions/<session_uuid>/spectral', methods=['POST'])
+@jwt_required()
+def request_spectral(session_uuid):
+    """
+    세션 주파수 특징 추출 요청 (Celery 작업 예약)
+
+    Request Body (모두 선택):
+    {
+        "sensor_types": ["accelerometer"],
+        "window_size": 256,
+        "hop": 128,
+        "bands": [[0.0, 0.5], [0.5, 3.0]],
+        "refresh": false
+    }
+
+    Response (202):
+    {"task_id": "uuid", "status": "PENDING"}
+    """
+    current_user_id = get_jwt_identity()
+
+    session = RecordingSession.query.filter_by(user_id=current_user_id, session_id=session_uuid).first()
+    if not session:
+        return jsonify({'error': 'Session not found'}), 404
+
+    data = request.get_json(silent=True) or {}
+    try:
+        _, window_size, hop, bands = validate_spectral(
+            session.sample_rate, int(data.get('window_size', DEFAULT_WINDOW_SIZE)), data.get('hop'), data.get('bands')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        task = extract_spectral_features.delay(
+            session.id, sensor_types=data.get('sensor_types'), window_size=window_size, hop=hop,
+            bands=bands, refresh=bool(data.get('refresh', False))
+        )
+    except Exception as e:
+        return jsonify({'error': 'Task queue unavailable', 'details': str(e)}), 503
+
+    return jsonify({'task_id': task.id, 'status': 'PENDING'}), 202
+
+
+@bp.route('/sessions/<session_uuid>/aligned', methods=['GET'])
+@jwt_required()
+def export_aligned(session_uuid):
+    """
+    세션 센서 데이터를 공통 시간 격자로 정렬해 내보내기
+
+    Query:
+        sensor_types: 쉼표 구분 센서 타입 (생략 시 전체)
+        method: nearest / linear / zoh (기본값 linear)
+        rate_hz: 격자 주파수 (기본값 세션 sample_rate)
+        start_ts, end_ts: 격자 범위 (ms, 생략 시 모든 센서 타입이 겹치는 구간)
+        max_gap_ms: 이보다 먼 샘플은 사용하지 않음 (null)
+        format: json / csv / arrow (생략 시 Accept 헤더 기준 json 또는 arrow)
+
+    Response (json):
+    {
+        "session_id": "uuid",
+        "sensor_types": ["accelerometer", "gyroscope"],
+        "method": "linear", "rate_hz": 50.0, "start_ts": ..., "end_ts": ..., "count": 500,
+        "coverage": {"accelerometer": [first_ts, last_ts]},
+        "timestamps": [...],
+        "columns": {"accelerometer_x": [...], "gyroscope_z": [...]}
+    }
+    """
+    current_user_id = get_jwt_identity()
+
+    session = RecordingSession.query.filter_by(user_id=current_user_id, session_id=session_uuid).first()
+    if not session:
+        return jsonify({'error': 'Session not found'}), 404
+
+    export_format = request.args.get('format') or ('arrow' if wants_arrow(request.accept_mimetypes) else 'json')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'format must be one of: {", ".join(EXPORT_FORMATS)}'}), 400
+    if export_format == 'arrow' and not arrow_available():
+        return jsonify({'error': 'Arrow output is not available (pyarrow not installed)'}), 406
+
+    try:
+        aligned = align_session(session, **parse_align_args(request.args),
+                                chunk_size=current_app.config.get('ANALYSIS_CHUNK_SIZE', 10000),
+                                max_points=current_app.config.get('RESAMPLE_MAX_POINTS', 1000000))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if export_format == 'csv':
+        response = negotiated_response(iter_aligned_csv(aligned), 'text/csv', headers={
+            'Content-Disposition': f'attachment; filename="{session.session_id}_aligned.csv"'
+        })
+    elif export_format == 'arrow':
+        response = negotiated_response(iter_aligned_arrow(aligned), ARROW_STREAM_MIMETYPE)
+    else:
+        payload = aligned_to_dict(session, aligned)
+        compressed = compressed_json_response(payload)
+        response = compressed if compressed is not None else jsonify(payload)
+    response.vary.add('Accept')
+    return response, 200
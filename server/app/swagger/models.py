@@ -37,6 +37,32 @@ auth_refresh = api.model('AuthRefresh', {
     'refresh_token': fields.String(required=True, description='리프레시 토큰')
 })
 
+lookup_cache_stats = api.model('LookupCacheStats', {
+    'entries': fields.Integer(description='저장된 항목 수'),
+    'hits': fields.Integer(description='적중 수'),
+    'misses': fields.Integer(description='미스 수'),
+    'hit_rate': fields.Float(description='적중률'),
+    'evictions': fields.Integer(description='LRU 제거 횟수')
+})
+
+identity_stats_response = api.model('IdentityStatsResponse', {
+    'enabled': fields.Boolean(description='캐시 활성화 여부'),
+    'users': fields.Nested(lookup_cache_stats, description='사용자 정보 (user_id)')
+})
+
+hasher_stats_response = api.model('HasherStatsResponse', {
+    'rounds': fields.Integer(description='bcrypt 비용 (BCRYPT_ROUNDS)'),
+    'workers': fields.Integer(description='동시 해시 수 상한'),
+    'global_limit': fields.Integer(description='모든 워커의 동시 해시 수 상한 (0이면 사용 안 함)'),
+    'waiting': fields.Integer(description='대기 중인 해시 작업 수'),
+    'running': fields.Integer(description='실행 중인 해시 작업 수'),
+    'completed': fields.Integer(description='완료된 해시 작업 수'),
+    'rejected': fields.Integer(description='대기열 초과로 거절된 수 (503)'),
+    'avg_queue_ms': fields.Float(description='평균 대기 시간 (ms)'),
+    'max_queue_ms': fields.Float(description='최대 대기 시간 (ms)'),
+    'avg_run_ms': fields.Float(description='평균 해시 시간 (ms)')
+})
+
 # ============================================================
 # Sync Models
 # ============================================================
@@ -67,7 +93,8 @@ recording_session = api.model('RecordingSession', {
 sync_push_request = api.model('SyncPushRequest', {
     'session': fields.Nested(recording_session, required=True, description='세션 정보'),
     'sensor_data': fields.List(fields.Nested(sensor_data_item), required=True,
-                                description='센서 데이터 배열')
+                                description='센서 데이터 배열'),
+    'request_id': fields.String(description='클라이언트 요청 ID (UUID/ULID, X-Request-ID 헤더로도 가능)')
 })
 
 sync_push_response = api.model('SyncPushResponse', {
@@ -78,8 +105,10 @@ sync_push_response = api.model('SyncPushResponse', {
     'updated': fields.Integer(description='업데이트된 레코드 수'),
     'duplicates': fields.Integer(description='중복 레코드 수'),
     'errors': fields.Integer(description='에러 수'),
-    'sync_log_id': fields.Integer(description='동기화 로그 ID'),
-    'session_data_count': fields.Integer(description='세션의 총 데이터 수')
+    'sync_log_id': fields.Integer(description='동기화 로그 ID (로그 버퍼 사용 시 null)'),
+    'request_id': fields.String(description='요청 ID (X-Request-ID 또는 서버 생성)'),
+    'session_data_count': fields.Integer(description='세션의 총 데이터 수'),
+    'change_seq': fields.Integer(description='이 Push의 마지막 변경 시퀀스')
 })
 
 sync_pull_request = api.model('SyncPullRequest', {
@@ -89,7 +118,24 @@ sync_pull_request = api.model('SyncPullRequest', {
                                 example=['uuid1', 'uuid2']),
     'page': fields.Integer(description='페이지 번호', default=1, example=1),
     'page_size': fields.Integer(description='페이지 크기 (1-100)', default=50, example=50),
-    'include_data': fields.Boolean(description='센서 데이터 포함 여부', default=True, example=True)
+    'cursor': fields.String(description='키셋 커서 (키가 있으면 커서 모드, null이면 첫 페이지)',
+                            example=None),
+    'include_data': fields.Boolean(description='센서 데이터 포함 여부', default=True, example=True),
+    'max_records': fields.Integer(description='응답당 최대 센서 레코드 수 (선택)', example=10000),
+    'data_cursors': fields.Raw(description='세션별 데이터 커서 {session_id: {sensor_type, timestamp}}',
+                               example={'uuid1': {'sensor_type': 'accelerometer',
+                                                  'timestamp': 1699876543210}}),
+    'sensor_types': fields.List(fields.String, description='센서 타입 필터 (선택)',
+                                 example=['accelerometer']),
+    'start_ts': fields.Integer(description='시작 타임스탬프 (밀리초, 포함)', example=1699876543210),
+    'end_ts': fields.Integer(description='종료 타임스탬프 (밀리초, 포함)', example=1699876643210),
+    'since_seq': fields.Integer(description='이 변경 시퀀스 이후 변경된 세션 / 센서 데이터만 (선택)', example=42),
+    'max_points': fields.Integer(description='(세션, 센서 타입)당 최대 샘플 수 (다운샘플링)', example=500),
+    'downsample': fields.String(description='다운샘플링 방식 (stride: N번째 샘플, bucket: 구간 mean/min/max)',
+                                enum=['stride', 'bucket'], default='stride', example='stride'),
+    'arrow_float32': fields.Boolean(description='Arrow 응답의 축 값을 float32로 전송 (기본 float64)',
+                                    default=False, example=False),
+    'request_id': fields.String(description='클라이언트 요청 ID (UUID/ULID, X-Request-ID 헤더로도 가능)')
 })
 
 session_with_data = api.model('SessionWithData', {
@@ -104,17 +150,22 @@ session_with_data = api.model('SessionWithData', {
     'is_uploaded': fields.Boolean(description='업로드 완료 여부'),
     'created_at': fields.String(description='생성 시간'),
     'updated_at': fields.String(description='업데이트 시간'),
-    'sensor_data': fields.List(fields.Nested(sensor_data_item), description='센서 데이터')
+    'change_seq': fields.Integer(description='마지막 변경 시퀀스'),
+    'sensor_data': fields.List(fields.Nested(sensor_data_item), description='센서 데이터'),
+    'data_cursor': fields.Raw(description='데이터 이어받기 위치 {sensor_type, timestamp} (완료 시 null)'),
+    'data_complete': fields.Boolean(description='세션 데이터 전송 완료 여부')
 })
 
 sync_pull_response = api.model('SyncPullResponse', {
     'sessions': fields.List(fields.Nested(session_with_data), description='세션 목록'),
     'server_timestamp': fields.String(description='서버 타임스탬프 (ISO 8601)'),
-    'page': fields.Integer(description='현재 페이지'),
+    'page': fields.Integer(description='현재 페이지 (오프셋 모드)'),
     'page_size': fields.Integer(description='페이지 크기'),
-    'total': fields.Integer(description='전체 세션 수'),
+    'total': fields.Integer(description='전체 세션 수 (오프셋 모드)'),
     'has_more': fields.Boolean(description='추가 페이지 존재 여부'),
-    'sync_log_id': fields.Integer(description='동기화 로그 ID')
+    'next_cursor': fields.String(description='다음 페이지 커서 (마지막 페이지면 null)'),
+    'sync_log_id': fields.Integer(description='동기화 로그 ID (로그 버퍼 사용 시 null)'),
+    'request_id': fields.String(description='요청 ID (X-Request-ID 또는 서버 생성)')
 })
 
 sync_status_response = api.model('SyncStatusResponse', {
@@ -124,6 +175,92 @@ sync_status_response = api.model('SyncStatusResponse', {
     'recent_syncs': fields.List(fields.Raw, description='최근 동기화 로그')
 })
 
+cache_stats_response = api.model('CacheStatsResponse', {
+    'enabled': fields.Boolean(description='캐시 활성화 여부'),
+    'hits': fields.Integer(description='적중 수'),
+    'misses': fields.Integer(description='미스 수'),
+    'hit_rate': fields.Float(description='적중률'),
+    'bytes_saved': fields.Integer(description='캐시에서 제공한 누적 바이트'),
+    'bytes_stored': fields.Integer(description='현재 저장 바이트'),
+    'max_bytes': fields.Integer(description='저장 상한 바이트 (LRU 제거 기준)'),
+    'keys': fields.Integer(description='저장된 키 수'),
+    'evictions': fields.Integer(description='LRU 제거 횟수')
+})
+
+sync_change = api.model('SyncChange', {
+    'seq': fields.Integer(description='변경 시퀀스 (전역, 커밋 순서대로 증가)'),
+    'kind': fields.String(description='변경 대상', enum=['session', 'samples']),
+    'op': fields.String(description='변경 종류', enum=['upsert', 'delete']),
+    'session_id': fields.String(description='세션 UUID'),
+    'sensor_type': fields.String(description='센서 타입 (samples)'),
+    'count': fields.Integer(description='배치 행 수 (samples)'),
+    'ts_min': fields.Integer(description='배치 최소 타임스탬프 (samples)'),
+    'ts_max': fields.Integer(description='배치 최대 타임스탬프 (samples)')
+})
+
+sync_changes_response = api.model('SyncChangesResponse', {
+    'changes': fields.List(fields.Nested(sync_change), description='변경 목록 (seq 오름차순)'),
+    'next_since': fields.Integer(description='다음 요청의 since'),
+    'has_more': fields.Boolean(description='추가 변경 존재 여부')
+})
+
+# ============================================================
+# Spectral Models
+# ============================================================
+
+spectral_request = api.model('SpectralRequest', {
+    'sensor_types': fields.List(fields.String, description='대상 센서 타입 (생략 시 세션의 IMU 센서 전체)',
+                                example=['accelerometer']),
+    'window_size': fields.Integer(description='윈도 샘플 수 (16-8192)', default=256, example=256),
+    'hop': fields.Integer(description='윈도 간격 (기본값 window_size / 2)', example=128),
+    'bands': fields.List(fields.List(fields.Float), description='대역 에너지 구간 [[low_hz, high_hz], ...]',
+                         example=[[0.0, 0.5], [0.5, 3.0], [3.0, 8.0], [8.0, 20.0]]),
+    'refresh': fields.Boolean(description='저장된 결과 무시', default=False)
+})
+
+spectral_window = api.model('SpectralWindow', {
+    'start_ts': fields.Integer(description='윈도 시작 타임스탬프 (ms)'),
+    'end_ts': fields.Integer(description='윈도 끝 타임스탬프 (ms)'),
+    'dominant_frequency': fields.Float(description='우세 주파수 (Hz, DC 제외)'),
+    'dominant_power': fields.Float(description='우세 주파수 PSD'),
+    'total_energy': fields.Float(description='전체 에너지 (PSD 적분)'),
+    'spectral_centroid': fields.Float(description='스펙트럼 중심 (Hz)'),
+    'band_energy': fields.List(fields.Float, description='대역별 에너지 (bands 순)')
+})
+
+spectral_features = api.model('SpectralFeatures', {
+    'sensor_type': fields.String(description='센서 타입'),
+    'sample_count': fields.Integer(description='샘플 수'),
+    'sample_rate': fields.Float(description='샘플링 주파수 (Hz, 세션 sample_rate)'),
+    'window_size': fields.Integer(description='윈도 샘플 수'),
+    'hop': fields.Integer(description='윈도 간격'),
+    'bands': fields.Raw(description='대역 에너지 구간'),
+    'window_count': fields.Integer(description='윈도 수'),
+    'dominant_frequency': fields.Float(description='Welch PSD 우세 주파수 (Hz)'),
+    'welch_psd': fields.Raw(description='{frequencies, psd} (전체 윈도 평균)'),
+    'stale': fields.Boolean(description='계산 이후 세션 데이터 변경 여부'),
+    'computed_at': fields.DateTime(description='계산 시각'),
+    'windows': fields.List(fields.Nested(spectral_window), description='윈도별 특징 (windows=true)')
+})
+
+spectral_response = api.model('SpectralResponse', {
+    'session_id': fields.String(description='세션 UUID'),
+    'features': fields.List(fields.Nested(spectral_features), description='센서 타입별 주파수 특징')
+})
+
+aligned_response = api.model('AlignedResponse', {
+    'session_id': fields.String(description='세션 UUID'),
+    'sensor_types': fields.List(fields.String, description='정렬한 센서 타입'),
+    'method': fields.String(description='nearest / linear / zoh'),
+    'rate_hz': fields.Float(description='격자 주파수 (Hz)'),
+    'start_ts': fields.Integer(description='격자 시작 (ms)'),
+    'end_ts': fields.Integer(description='격자 끝 (ms)'),
+    'count': fields.Integer(description='격자 점 수'),
+    'coverage': fields.Raw(description='센서 타입별 [첫 샘플, 마지막 샘플] (ms)'),
+    'timestamps': fields.List(fields.Integer, description='격자 타임스탬프 (ms)'),
+    'columns': fields.Raw(description='{sensor_type}_{field}별 값 목록 (샘플이 없으면 null)')
+})
+
 # ============================================================
 # Error Models
 # ============================================================
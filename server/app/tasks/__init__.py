@@ -6,7 +6,24 @@ Celery Tasks
 from app.tasks.data_processing import (
     analyze_sensor_data,
     generate_statistics,
-    detect_anomalies
+    detect_anomalies,
+    calculate_trajectory,
+    detect_anomaly_intervals,
+    extract_spectral_features
+)
+
+from app.tasks.batch_analysis import (
+    analyze_sessions_batch,
+    analyze_session_slice,
+    merge_cohort_report,
+    batch_progress
+)
+
+from app.tasks.ml_features import (
+    extract_ml_features,
+    extract_ml_features_batch,
+    extract_features_slice,
+    merge_feature_report
 )
 
 from app.tasks.file_cleanup import (
@@ -20,6 +37,21 @@ __all__ = [
     'analyze_sensor_data',
     'generate_statistics',
     'detect_anomalies',
+    'calculate_trajectory',
+    'detect_anomaly_intervals',
+    'extract_spectral_features',
+
+    # Batch analysis tasks
+    'analyze_sessions_batch',
+    'analyze_session_slice',
+    'merge_cohort_report',
+    'batch_progress',
+
+    # ML feature tasks
+    'extract_ml_features',
+    'extract_ml_features_batch',
+    'extract_features_slice',
+    'merge_feature_report',
 
     # File cleanup tasks
     'cleanup_old_sensor_data',
@@ -0,0 +1,219 @@
+"""
+Phase 44: 세션 일괄 분석 작업
+여러 세션의 analyze_sensor_data를 Celery chord로 나눠 실행하고 코호트 보고서로 합침 (동시 실행 수 제한)
+"""
+
+from celery import chord
+from celery.utils import uuid
+from celery_app import celery
+from app.models.session import RecordingSession
+from app.tasks.data_processing import analyze_sensor_data
+from app.utils.online_stats import RunningStats
+from flask import current_app
+from datetime import datetime
+
+
+@celery.task(name='app.tasks.batch_analysis.analyze_sessions_batch')
+def analyze_sessions_batch(session_ids: list = None, user_id: int = None, max_concurrency: int = None,
+                           refresh: bool = False):
+    """
+    여러 세션 일괄 분석 (fan-out / fan-in)
+
+    세션 목록을 최대 max_concurrency개 묶음으로 나눠 묶음마다 하위 작업(analyze_session_slice) 하나를
+    실행하고, 모두 끝나면 merge_cohort_report가 결과를 합친다 (chord). 묶음 안의 세션은 순서대로
+    분석하므로 동시에 DB를 읽는 분석은 묶음 수를 넘지 않는다. 이 작업은 결과를 기다리지 않는다.
+
+    Args:
+        session_ids: RecordingSession ID 목록
+        user_id: 사용자 ID (session_ids 생략 시 사용자의 전체 세션)
+        max_concurrency: 동시 하위 작업 수 (생략 시 BATCH_ANALYSIS_CONCURRENCY)
+        refresh: True면 저장된 분석 결과를 무시
+
+    Returns:
+        dict: batch_id (보고서 작업 ID), slice_task_ids, slice_sizes, total_sessions
+              (batch_progress()에 그대로 전달)
+    """
+    try:
+        session_ids = resolve_batch_sessions(session_ids, user_id)
+        slices = split_sessions(session_ids, max_concurrency)
+        return submit_batch([analyze_session_slice.s(ids, refresh=refresh) for ids in slices],
+                            merge_cohort_report.s(total_sessions=len(session_ids)), slices)
+
+    except Exception as e:
+        return {'error': str(e), 'user_id': user_id}
+
+
+def resolve_batch_sessions(session_ids: list = None, user_id: int = None) -> list:
+    """
+    일괄 작업 대상 세션 ID (중복 제거, 요청 순서 유지)
+
+    Args:
+        session_ids: RecordingSession ID 목록
+        user_id: 사용자 ID (session_ids 생략 시 사용자의 전체 세션, ID 순)
+
+    Returns:
+        list: 세션 ID 목록
+
+    Raises:
+        ValueError: 대상이 없거나 BATCH_ANALYSIS_MAX_SESSIONS를 넘는 경우
+    """
+    if session_ids is None:
+        if user_id is None:
+            raise ValueError('session_ids or user_id is required')
+        session_ids = [row.id for row in RecordingSession.query.filter_by(user_id=user_id)
+                       .order_by(RecordingSession.id).with_entities(RecordingSession.id)]
+
+    session_ids = list(dict.fromkeys(int(session_id) for session_id in session_ids))
+    if not session_ids:
+        raise ValueError('No sessions found')
+
+    max_sessions = current_app.config.get('BATCH_ANALYSIS_MAX_SESSIONS', 1000)
+    if len(session_ids) > max_sessions:
+        raise ValueError(f'Too many sessions (max {max_sessions})')
+    return session_ids
+
+
+def split_sessions(session_ids: list, max_concurrency: int = None) -> list:
+    """
+    세션을 동시 실행 상한 개수 이하의 묶음으로 나누기 (번갈아 배분)
+
+    Args:
+        session_ids: 세션 ID 목록
+        max_concurrency: 묶음 수 상한 (생략 시 BATCH_ANALYSIS_CONCURRENCY)
+
+    Returns:
+        list: 묶음별 세션 ID 목록
+    """
+    limit = max_concurrency or current_app.config.get('BATCH_ANALYSIS_CONCURRENCY', 4)
+    slice_count = max(1, min(int(limit), len(session_ids)))
+    return [session_ids[index::slice_count] for index in range(slice_count)]
+
+
+def submit_batch(header: list, callback, slices: list) -> dict:
+    """
+    묶음 작업 chord 실행 (결과를 기다리지 않음)
+
+    Args:
+        header: 묶음별 하위 작업 시그니처
+        callback: 모든 하위 작업 결과 목록을 받는 보고서 작업 시그니처
+        slices: 묶음별 세션 ID 목록 (header 순)
+
+    Returns:
+        dict: batch_id, slice_task_ids, slice_sizes, total_sessions (batch_progress() 입력)
+    """
+    # 작업 ID를 미리 정해 두어 진행률을 조회할 수 있게 함
+    header = [signature.set(task_id=uuid()) for signature in header]
+    batch_id = uuid()
+    chord(header)(callback.set(task_id=batch_id))
+
+    return {
+        'batch_id': batch_id,
+        'slice_task_ids': [signature.id for signature in header],
+        'slice_sizes': [len(ids) for ids in slices],
+        'total_sessions': sum(len(ids) for ids in slices),
+        'submitted_at': datetime.utcnow().isoformat()
+    }
+
+
+@celery.task(name='app.tasks.batch_analysis.analyze_session_slice', bind=True)
+def analyze_session_slice(self, session_ids: list, refresh: bool = False):
+    """
+    세션 묶음 순차 분석 (세션마다 PROGRESS 상태 갱신)
+
+    Args:
+        session_ids: RecordingSession ID 목록
+        refresh: True면 저장된 분석 결과를 무시
+
+    Returns:
+        list: 세션별 analyze_sensor_data 결과
+    """
+    results = []
+    for done, session_id in enumerate(session_ids, start=1):
+        results.append(analyze_sensor_data(session_id, refresh=refresh))
+        if not self.request.called_directly and not self.request.is_eager:
+            self.update_state(state='PROGRESS', meta={'done': done, 'total': len(session_ids)})
+    return results
+
+
+@celery.task(name='app.tasks.batch_analysis.merge_cohort_report')
+def merge_cohort_report(slice_results: list, total_sessions: int = None):
+    """
+    세션별 분석 결과를 코호트 보고서로 합치기
+
+    3축 센서 통계는 세션별 (개수, 평균, 표준편차, min, max)를 RunningStats로 병합하므로
+    전체 샘플을 한 번에 계산한 값과 같다 (값이 없는 축은 센서 타입 샘플 수 기준 근사).
+
+    Args:
+        slice_results: analyze_session_slice 결과 목록 (묶음별 세션 결과 리스트)
+        total_sessions: 요청한 세션 수
+
+    Returns:
+        dict: 분석 / 캐시 사용 / 실패 세션 수, 센서 타입별 세션 수, 샘플 수, 통계
+    """
+    results = [result for results in slice_results for result in results]
+    failed = [{'session_id': result.get('session_id'), 'error': result['error']}
+              for result in results if 'error' in result]
+    analyzed = [result for result in results if 'error' not in result]
+
+    cohort = {}
+    for result in analyzed:
+        for sensor_type, analysis in result['analysis'].items():
+            entry = cohort.setdefault(sensor_type, {'sessions': 0, 'count': 0, 'duration_ms': 0, 'stats': {}})
+            entry['sessions'] += 1
+            entry['count'] += analysis['count']
+            entry['duration_ms'] += analysis['duration_ms']
+
+            for key, values in analysis.get('statistics', {}).items():
+                if key == 'distance_km':
+                    entry['distance_km'] = round(entry.get('distance_km', 0.0) + values, 2)
+                elif values and 'std' in values:
+                    stats = RunningStats.from_moments(analysis['count'], values['mean'], values['std'],
+                                                      values['min'], values['max'])
+                    entry['stats'].setdefault(key, RunningStats()).merge(stats)
+
+    sensor_types = {}
+    for sensor_type, entry in sorted(cohort.items()):
+        stats = entry.pop('stats')
+        if stats:
+            entry['statistics'] = {key: field_stats.to_dict() for key, field_stats in stats.items()}
+        sensor_types[sensor_type] = entry
+
+    return {
+        'total_sessions': total_sessions if total_sessions is not None else len(results),
+        'analyzed_sessions': len(analyzed),
+        'cached_sessions': sum(1 for result in analyzed if result.get('cached')),
+        'failed_sessions': failed,
+        'total_records': sum(result['total_records'] for result in analyzed),
+        'sensor_types': sensor_types,
+        'generated_at': datetime.utcnow().isoformat()
+    }
+
+
+def batch_progress(batch: dict) -> dict:
+    """
+    일괄 분석 진행률 (결과 백엔드의 하위 작업 상태 기준)
+
+    Args:
+        batch: analyze_sessions_batch 결과
+
+    Returns:
+        dict: done / total 세션 수, percent, state (보고서 작업 상태), report (완료 시 코호트 보고서)
+    """
+    done = 0
+    for task_id, size in zip(batch['slice_task_ids'], batch['slice_sizes']):
+        result = celery.AsyncResult(task_id)
+        if result.successful():
+            done += size
+        elif result.state == 'PROGRESS' and isinstance(result.info, dict):
+            done += result.info.get('done', 0)
+
+    report = celery.AsyncResult(batch['batch_id'])
+    total = batch['total_sessions']
+    return {
+        'batch_id': batch['batch_id'],
+        'done': done,
+        'total': total,
+        'percent': round(done / total * 100, 1) if total else 100.0,
+        'state': report.state,
+        'report': report.result if report.successful() else None
+    }
@@ -1,24 +1,55 @@
 """
 Phase 44: 센서 데이터 처리 작업
-Pandas를 사용한 통계 분석 및 이상 탐지
+NumPy 배열 기반 통계 분석 및 이상 탐지 (필요한 필드만 SQL에서 추출, 대용량 세션은 청크 스트리밍)
 """
 
 from celery_app import celery
 from app import db
-from app.models.sensor_data import SensorData
 from app.models.session import RecordingSession
+from app.utils.sensor_arrays import ANALYSIS_BATCH_SIZE, iter_sensor_columns, load_sensor_arrays, sensor_type_counts
+from app.utils.online_stats import RunningStats
+from app.utils.aggregates import aggregate_backend, field_aggregates
+from app.utils.analysis_cache import cached_analysis
+from app.utils.user_statistics import cached_statistics, session_statistics
+from app.utils.anomaly import (
+    DEFAULT_WINDOW, SIGNAL_FIELDS, detect_intervals, save_anomaly_intervals, validate_detector
+)
+from app.utils.spectral import DEFAULT_WINDOW_SIZE, SPECTRAL_SENSORS, session_spectral_features
+from app.utils.trajectory import TRAJECTORY_FIELDS, TrajectoryAccumulator, save_trajectory, session_trajectory
+from flask import current_app
 from datetime import datetime, timedelta
-import pandas as pd
 import numpy as np
 
 
+# 3축 센서 (분석 대상 필드 x, y, z)
+THREE_AXIS_SENSORS = ['accelerometer', 'gyroscope', 'magnetometer', 'gravity', 'linear_acceleration']
+
+# 이상치 탐지 / 메트릭 대상 센서
+MOTION_SENSORS = ['accelerometer', 'gyroscope', 'magnetometer']
+
+# 센서 타입별 분석 필드 (SQL에서 이 필드만 추출)
+ANALYSIS_FIELDS = {
+    **{sensor_type: ('x', 'y', 'z') for sensor_type in THREE_AXIS_SENSORS},
+    'gps': TRAJECTORY_FIELDS,
+}
+
+# detect_anomaly_intervals 결과에 포함하는 센서 타입별 구간 수 (전체는 anomaly_intervals 테이블)
+ANOMALY_RESULT_INTERVALS = 100
+
+
 @celery.task(name='app.tasks.data_processing.analyze_sensor_data')
-def analyze_sensor_data(session_id: int):
+def analyze_sensor_data(session_id: int, streaming: bool = None, refresh: bool = False):
     """
     센서 데이터 분석
 
+    스트리밍 모드에서는 센서 타입별로 ANALYSIS_CHUNK_SIZE행씩 읽어 누적 통계만 갱신하므로
+    메모리가 청크 크기로 제한된다 (결과 형식은 같음).
+    세션 데이터가 바뀌지 않았으면 저장된 결과를 반환한다 (analysis_results).
+
     Args:
         session_id: RecordingSession ID
+        streaming: 스트리밍 모드 여부 (None이면 샘플 수가 ANALYSIS_STREAMING_THRESHOLD 초과 시)
+        refresh: True면 저장된 결과를 무시하고 다시 계산
 
     Returns:
         dict: 분석 결과
@@ -29,225 +60,322 @@ def analyze_sensor_data(session_id: int):
         if not session:
             return {'error': 'Session not found', 'session_id': session_id}
 
-        # 센서 데이터 조회
-        sensor_data = SensorData.query.filter_by(session_id=session_id).all()
+        result = cached_analysis(session, 'analyze_sensor_data', {},
+                                 lambda: _analyze_session(session, streaming), refresh=refresh)
+        db.session.commit()
+        return result
 
-        if not sensor_data:
-            return {'error': 'No sensor data found', 'session_id': session_id}
+    except Exception as e:
+        db.session.rollback()
+        return {'error': str(e), 'session_id': session_id}
 
-        # 센서 타입별로 그룹화
-        data_by_type = {}
-        for data in sensor_data:
-            sensor_type = data.sensor_type
-            if sensor_type not in data_by_type:
-                data_by_type[sensor_type] = []
-            data_by_type[sensor_type].append({
-                'timestamp': data.timestamp,
-                'data': data.data
-            })
-
-        # 각 센서 타입별 분석
-        analysis_results = {}
-        for sensor_type, data_list in data_by_type.items():
-            analysis_results[sensor_type] = _analyze_sensor_type(sensor_type, data_list)
 
-        return {
-            'session_id': session_id,
-            'session_uuid': str(session.session_id),
-            'total_records': len(sensor_data),
-            'sensor_types': list(data_by_type.keys()),
-            'analysis': analysis_results,
-            'analyzed_at': datetime.utcnow().isoformat()
-        }
+def _analyze_session(session: RecordingSession, streaming: bool = None) -> dict:
+    """
+    세션 센서 데이터 분석 (analyze_sensor_data 본문, 커밋은 호출자)
 
-    except Exception as e:
-        return {'error': str(e), 'session_id': session_id}
+    Args:
+        session: RecordingSession
+        streaming: 스트리밍 모드 여부 (None이면 자동)
+
+    Returns:
+        dict: 분석 결과
+    """
+    session_id = session.id
+    counts = sensor_type_counts(session_id)
+
+    if not counts:
+        return {'error': 'No sensor data found', 'session_id': session_id}
+
+    chunk_size = current_app.config.get('ANALYSIS_CHUNK_SIZE', ANALYSIS_BATCH_SIZE)
+    if streaming is None:
+        streaming = sum(counts.values()) > current_app.config.get('ANALYSIS_STREAMING_THRESHOLD', 500000)
+
+    # 각 센서 타입별 분석
+    analysis_results = {}
+    remaining = counts
+    if aggregate_backend() == 'sql':
+        # GPS(궤적에 원본 좌표 필요) 외에는 DB 집계만 가져옴
+        aggregated = [sensor_type for sensor_type in counts if sensor_type != 'gps']
+        for sensor_type, aggregate in field_aggregates(session_id, ANALYSIS_FIELDS, aggregated).items():
+            analysis_results[sensor_type] = _summarize(sensor_type, {**aggregate, 'trajectory': None})
+        remaining = {sensor_type: count for sensor_type, count in counts.items() if sensor_type == 'gps'}
+
+    if streaming:
+        for sensor_type in remaining:
+            accumulators = _new_accumulators(sensor_type)
+            for columns in iter_sensor_columns(session_id, sensor_type,
+                                               ANALYSIS_FIELDS.get(sensor_type, ()), chunk_size):
+                _accumulate(sensor_type, accumulators, columns)
+            if accumulators['count']:
+                analysis_results[sensor_type] = _summarize(sensor_type, accumulators)
+    else:
+        arrays = load_sensor_arrays(session_id, ANALYSIS_FIELDS, chunk_size=chunk_size, counts=remaining)
+        for sensor_type, columns in arrays.items():
+            if len(columns['timestamp']):
+                analysis_results[sensor_type] = _analyze_sensor_type(sensor_type, columns)
+    analysis_results = {sensor_type: analysis_results[sensor_type]
+                        for sensor_type in counts if sensor_type in analysis_results}
+
+    # GPS 궤적 결과 저장 (calculate_trajectory에서 재사용)
+    trajectory = analysis_results.get('gps', {}).get('trajectory')
+    if trajectory is not None:
+        save_trajectory(session, trajectory, analysis_results['gps']['count'])
+
+    return {
+        'session_id': session_id,
+        'session_uuid': str(session.session_id),
+        'total_records': sum(result['count'] for result in analysis_results.values()),
+        'sensor_types': list(analysis_results.keys()),
+        'analysis': analysis_results,
+        'analyzed_at': datetime.utcnow().isoformat()
+    }
+
+
+def _new_accumulators(sensor_type: str) -> dict:
+    """센서 타입별 누적 통계 (개수, 첫 / 마지막 타임스탬프, 필드 통계, GPS 궤적)"""
+    fields = [key for key in ANALYSIS_FIELDS.get(sensor_type, ()) if key != 'altitude']
+    return {
+        'count': 0,
+        'first_ts': None,
+        'last_ts': None,
+        'stats': {key: RunningStats() for key in fields},
+        'trajectory': TrajectoryAccumulator() if sensor_type == 'gps' else None,
+    }
 
 
-def _analyze_sensor_type(sensor_type: str, data_list: list) -> dict:
+def _accumulate(sensor_type: str, accumulators: dict, columns: dict):
     """
-    특정 센서 타입 데이터 분석
+    청크 하나로 누적 통계 갱신
 
     Args:
         sensor_type: 센서 타입
-        data_list: 센서 데이터 리스트
+        accumulators: _new_accumulators() 결과
+        columns: {'timestamp', 필드...} 배열 (타임스탬프 오름차순)
+    """
+    timestamps = columns['timestamp']
+    if not len(timestamps):
+        return
+
+    accumulators['count'] += len(timestamps)
+    if accumulators['first_ts'] is None:
+        accumulators['first_ts'] = int(timestamps[0])
+    accumulators['last_ts'] = int(timestamps[-1])
+
+    stats = accumulators['stats']
+    if sensor_type == 'gps':
+        # 위도 / 경도가 모두 있는 샘플만
+        valid = ~np.isnan(columns['latitude']) & ~np.isnan(columns['longitude'])
+        stats['latitude'].update(columns['latitude'][valid])
+        stats['longitude'].update(columns['longitude'][valid])
+        accumulators['trajectory'].update(timestamps, columns['latitude'],
+                                          columns['longitude'], columns['altitude'])
+    else:
+        for key, field_stats in stats.items():
+            field_stats.update(columns[key])
+
+
+def _summarize(sensor_type: str, accumulators: dict) -> dict:
+    """
+    누적 통계를 분석 결과로 변환
+
+    Args:
+        sensor_type: 센서 타입
+        accumulators: _accumulate()로 갱신한 누적 통계
 
     Returns:
         dict: 분석 결과
     """
-    df = pd.DataFrame(data_list)
+    count = accumulators['count']
+    duration_ms = accumulators['last_ts'] - accumulators['first_ts']
+    stats = accumulators['stats']
 
     # 3축 센서 (accelerometer, gyroscope, magnetometer, etc.)
-    if sensor_type in ['accelerometer', 'gyroscope', 'magnetometer', 'gravity', 'linear_acceleration']:
-        x_values = [d['x'] for d in df['data']]
-        y_values = [d['y'] for d in df['data']]
-        z_values = [d['z'] for d in df['data']]
-
+    if sensor_type in THREE_AXIS_SENSORS:
         return {
-            'count': len(df),
-            'duration_ms': int(df['timestamp'].max() - df['timestamp'].min()),
+            'count': count,
+            'duration_ms': duration_ms,
             'statistics': {
-                'x': {
-                    'mean': float(np.mean(x_values)),
-                    'std': float(np.std(x_values)),
-                    'min': float(np.min(x_values)),
-                    'max': float(np.max(x_values)),
-                },
-                'y': {
-                    'mean': float(np.mean(y_values)),
-                    'std': float(np.std(y_values)),
-                    'min': float(np.min(y_values)),
-                    'max': float(np.max(y_values)),
-                },
-                'z': {
-                    'mean': float(np.mean(z_values)),
-                    'std': float(np.std(z_values)),
-                    'min': float(np.min(z_values)),
-                    'max': float(np.max(z_values)),
-                },
+                axis: stats[axis].to_dict()
+                for axis in ('x', 'y', 'z')
             }
         }
 
     # GPS 센서
-    elif sensor_type == 'gps':
-        lat_values = [d['latitude'] for d in df['data'] if 'latitude' in d]
-        lon_values = [d['longitude'] for d in df['data'] if 'longitude' in d]
-
-        if lat_values and lon_values:
-            return {
-                'count': len(df),
-                'duration_ms': int(df['timestamp'].max() - df['timestamp'].min()),
-                'statistics': {
-                    'latitude': {
-                        'mean': float(np.mean(lat_values)),
-                        'min': float(np.min(lat_values)),
-                        'max': float(np.max(lat_values)),
-                    },
-                    'longitude': {
-                        'mean': float(np.mean(lon_values)),
-                        'min': float(np.min(lon_values)),
-                        'max': float(np.max(lon_values)),
-                    },
-                    'distance_km': _calculate_total_distance(lat_values, lon_values)
-                }
-            }
+    elif sensor_type == 'gps' and stats['latitude'].count:
+        trajectory = accumulators['trajectory']
+        return {
+            'count': count,
+            'duration_ms': duration_ms,
+            'statistics': {
+                'latitude': stats['latitude'].to_dict(keys=('mean', 'min', 'max')),
+                'longitude': stats['longitude'].to_dict(keys=('mean', 'min', 'max')),
+                'distance_km': round(trajectory.distance_km, 2)
+            },
+            'trajectory': trajectory.result()
+        }
 
     # 기타 센서 (일반 통계)
     return {
-        'count': len(df),
-        'duration_ms': int(df['timestamp'].max() - df['timestamp'].min()),
-        'first_timestamp': int(df['timestamp'].min()),
-        'last_timestamp': int(df['timestamp'].max()),
+        'count': count,
+        'duration_ms': duration_ms,
+        'first_timestamp': accumulators['first_ts'],
+        'last_timestamp': accumulators['last_ts'],
     }
 
 
-def _calculate_total_distance(latitudes: list, longitudes: list) -> float:
+def _analyze_sensor_type(sensor_type: str, columns: dict) -> dict:
     """
-    GPS 좌표로부터 총 이동 거리 계산 (Haversine formula)
+    특정 센서 타입 데이터 분석 (배열 전체를 한 청크로 집계)
 
     Args:
-        latitudes: 위도 리스트
-        longitudes: 경도 리스트
+        sensor_type: 센서 타입
+        columns: load_sensor_arrays()의 센서 타입 항목 ({'timestamp', 필드...})
 
     Returns:
-        float: 총 이동 거리 (km)
+        dict: 분석 결과
     """
-    if len(latitudes) < 2:
-        return 0.0
+    accumulators = _new_accumulators(sensor_type)
+    _accumulate(sensor_type, accumulators, columns)
+    return _summarize(sensor_type, accumulators)
 
-    total_distance = 0.0
-    R = 6371.0  # 지구 반지름 (km)
 
-    for i in range(1, len(latitudes)):
-        lat1, lon1 = np.radians(latitudes[i - 1]), np.radians(longitudes[i - 1])
-        lat2, lon2 = np.radians(latitudes[i]), np.radians(longitudes[i])
+@celery.task(name='app.tasks.data_processing.calculate_trajectory')
+def calculate_trajectory(session_id: int, refresh: bool = False):
+    """
+    세션 GPS 궤적 분석 (거리, 속도, 고도 상승, 정지 구간, 경계 상자)
 
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
+    저장된 결과가 현재 데이터 버전과 같으면 다시 계산하지 않는다.
 
-        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    Args:
+        session_id: RecordingSession ID
+        refresh: True면 항상 다시 계산
+
+    Returns:
+        dict: 궤적 결과
+    """
+    try:
+        session = RecordingSession.query.get(session_id)
+        if not session:
+            return {'error': 'Session not found', 'session_id': session_id}
 
-        total_distance += R * c
+        trajectory = session_trajectory(session, refresh=refresh)
+        db.session.commit()
 
-    return round(total_distance, 2)
+        if trajectory is None:
+            return {'error': 'No GPS data found', 'session_id': session_id}
+
+        return {
+            'session_id': session_id,
+            'session_uuid': str(session.session_id),
+            'trajectory': trajectory.to_dict()
+        }
+
+    except Exception as e:
+        db.session.rollback()
+        return {'error': str(e), 'session_id': session_id}
 
 
 @celery.task(name='app.tasks.data_processing.generate_statistics')
-def generate_statistics(user_id: int, start_date: str = None, end_date: str = None):
+def generate_statistics(user_id: int, start_date: str = None, end_date: str = None, bucket: str = None,
+                        refresh: bool = False):
     """
     사용자의 센서 데이터 통계 생성
 
+    세션 행을 가져오지 않고 SQL 집계로 계산하며, 사용자 데이터 버전이 바뀌지 않았으면
+    같은 파라미터의 저장된 스냅샷을 반환한다 (statistics_snapshots).
+
     Args:
         user_id: 사용자 ID
         start_date: 시작 날짜 (ISO format, optional)
         end_date: 종료 날짜 (ISO format, optional)
+        bucket: day / week 구간별 통계 추가 (optional)
+        refresh: True면 저장된 스냅샷을 무시하고 다시 계산
 
     Returns:
         dict: 통계 결과
     """
     try:
-        # 세션 조회
-        query = RecordingSession.query.filter_by(user_id=user_id)
+        params = {'start_date': start_date, 'end_date': end_date, 'bucket': bucket}
+        result = cached_statistics(user_id, params,
+                                   lambda: _generate_statistics(user_id, start_date, end_date, bucket),
+                                   refresh=refresh)
+        db.session.commit()
+        return result
 
-        if start_date:
-            query = query.filter(RecordingSession.start_time >= datetime.fromisoformat(start_date))
-        if end_date:
-            query = query.filter(RecordingSession.start_time <= datetime.fromisoformat(end_date))
+    except Exception as e:
+        db.session.rollback()
+        return {'error': str(e), 'user_id': user_id}
 
-        sessions = query.all()
 
-        if not sessions:
-            return {
-                'user_id': user_id,
-                'total_sessions': 0,
-                'message': 'No sessions found'
-            }
+def _generate_statistics(user_id: int, start_date: str, end_date: str, bucket: str) -> dict:
+    """
+    사용자 통계 계산 (generate_statistics 본문)
 
-        # 통계 계산
-        total_sessions = len(sessions)
-        total_data_count = sum(s.data_count for s in sessions)
-        total_duration_ms = sum(
-            (s.end_time - s.start_time).total_seconds() * 1000
-            for s in sessions
-            if s.end_time
-        )
-
-        # 센서 타입별 세션 수
-        sensor_types_count = {}
-        for session in sessions:
-            for sensor_type in session.enabled_sensors:
-                sensor_types_count[sensor_type] = sensor_types_count.get(sensor_type, 0) + 1
+    Returns:
+        dict: 통계 결과
+    """
+    start = datetime.fromisoformat(start_date) if start_date else None
+    end = datetime.fromisoformat(end_date) if end_date else None
 
+    # 구간별 집계의 합이 전체 (구간이 있어도 쿼리는 같은 2회)
+    buckets = session_statistics(user_id, start, end, bucket)
+    if not buckets:
         return {
             'user_id': user_id,
-            'period': {
-                'start': start_date,
-                'end': end_date,
-            },
-            'statistics': {
-                'total_sessions': total_sessions,
-                'total_data_records': total_data_count,
-                'total_duration_ms': int(total_duration_ms),
-                'total_duration_hours': round(total_duration_ms / (1000 * 60 * 60), 2),
-                'average_session_duration_ms': int(total_duration_ms / total_sessions) if total_sessions > 0 else 0,
-                'sensor_types_usage': sensor_types_count,
-            },
-            'generated_at': datetime.utcnow().isoformat()
+            'total_sessions': 0,
+            'message': 'No sessions found'
         }
 
-    except Exception as e:
-        return {'error': str(e), 'user_id': user_id}
+    totals = {'sessions': 0, 'data_records': 0, 'duration_ms': 0, 'sensor_types_usage': {}}
+    for entry in buckets.values():
+        for key in ('sessions', 'data_records', 'duration_ms'):
+            totals[key] += entry[key]
+        for sensor_type, count in entry['sensor_types_usage'].items():
+            totals['sensor_types_usage'][sensor_type] = totals['sensor_types_usage'].get(sensor_type, 0) + count
+
+    result = {
+        'user_id': user_id,
+        'period': {
+            'start': start_date,
+            'end': end_date,
+        },
+        'statistics': _statistics_summary(totals),
+        'generated_at': datetime.utcnow().isoformat()
+    }
+
+    if bucket:
+        result['bucket'] = bucket
+        result['buckets'] = [{'start': key, **_statistics_summary(entry)} for key, entry in buckets.items()]
+
+    return result
+
+
+def _statistics_summary(entry: dict) -> dict:
+    """session_statistics() 항목을 통계 응답 형식으로 변환"""
+    total_sessions = entry['sessions']
+    total_duration_ms = entry['duration_ms']
+    return {
+        'total_sessions': total_sessions,
+        'total_data_records': entry['data_records'],
+        'total_duration_ms': total_duration_ms,
+        'total_duration_hours': round(total_duration_ms / (1000 * 60 * 60), 2),
+        'average_session_duration_ms': int(total_duration_ms / total_sessions) if total_sessions > 0 else 0,
+        'sensor_types_usage': entry['sensor_types_usage'],
+    }
 
 
 @celery.task(name='app.tasks.data_processing.detect_anomalies')
-def detect_anomalies(session_id: int, sensitivity: float = 3.0):
+def detect_anomalies(session_id: int, sensitivity: float = 3.0, refresh: bool = False):
     """
     센서 데이터에서 이상치 탐지 (Z-score 방법)
 
+    세션 데이터가 바뀌지 않았으면 같은 sensitivity의 저장된 결과를 반환한다.
+
     Args:
         session_id: RecordingSession ID
         sensitivity: Z-score 임계값 (기본값: 3.0 표준편차)
+        refresh: True면 저장된 결과를 무시하고 다시 계산
 
     Returns:
         dict: 이상치 탐지 결과
@@ -258,55 +386,184 @@ def detect_anomalies(session_id: int, sensitivity: float = 3.0):
         if not session:
             return {'error': 'Session not found', 'session_id': session_id}
 
-        # 센서 데이터 조회
-        sensor_data = SensorData.query.filter_by(session_id=session_id).all()
+        result = cached_analysis(session, 'detect_anomalies', {'sensitivity': float(sensitivity)},
+                                 lambda: _detect_anomalies(session, sensitivity), refresh=refresh)
+        db.session.commit()
+        return result
 
-        if not sensor_data:
-            return {'error': 'No sensor data found', 'session_id': session_id}
+    except Exception as e:
+        db.session.rollback()
+        return {'error': str(e), 'session_id': session_id}
+
+
+def _detect_anomalies(session: RecordingSession, sensitivity: float) -> dict:
+    """
+    Magnitude Z-score 이상치 탐지 (detect_anomalies 본문)
+
+    Args:
+        session: RecordingSession
+        sensitivity: Z-score 임계값
+
+    Returns:
+        dict: 이상치 탐지 결과
+    """
+    session_id = session.id
+
+    # 3축 센서 필드 배열 조회 (없는 값은 0)
+    if not sensor_type_counts(session_id):
+        return {'error': 'No sensor data found', 'session_id': session_id}
+
+    arrays = load_sensor_arrays(session_id, ANALYSIS_FIELDS, sensor_types=MOTION_SENSORS)
+
+    # 센서 타입별 이상치 탐지
+    anomalies_by_type = {}
+
+    for sensor_type, columns in arrays.items():
+        x_values, y_values, z_values = (np.nan_to_num(columns[axis], nan=0.0) for axis in ('x', 'y', 'z'))
+
+        # Magnitude 계산
+        magnitudes = np.sqrt(x_values ** 2 + y_values ** 2 + z_values ** 2)
+
+        # Z-score 계산
+        mean = np.mean(magnitudes)
+        std = np.std(magnitudes)
+
+        if std > 0:
+            z_scores = np.abs((magnitudes - mean) / std)
+            anomaly_indices = np.where(z_scores > sensitivity)[0]
+
+            if len(anomaly_indices) > 0:
+                anomalies_by_type[sensor_type] = {
+                    'count': int(len(anomaly_indices)),
+                    'percentage': round(len(anomaly_indices) / len(magnitudes) * 100, 2),
+                    'mean': float(mean),
+                    'std': float(std),
+                    'max_z_score': float(np.max(z_scores[anomaly_indices])),
+                    'timestamps': [int(ts) for ts in columns['timestamp'][anomaly_indices[:10]]]  # 최대 10개만
+                }
+
+    return {
+        'session_id': session_id,
+        'session_uuid': str(session.session_id),
+        'sensitivity': sensitivity,
+        'anomalies': anomalies_by_type,
+        'total_anomalies': sum(a['count'] for a in anomalies_by_type.values()),
+        'detected_at': datetime.utcnow().isoformat()
+    }
+
+
+@celery.task(name='app.tasks.data_processing.detect_anomaly_intervals')
+def detect_anomaly_intervals(session_id: int, method: str = 'zscore', window: int = DEFAULT_WINDOW,
+                             threshold: float = None, sensor_types: list = None):
+    """
+    윈도 기반 이상 구간 탐지 (숫자 신호가 있는 모든 센서 타입, 결과는 anomaly_intervals에 저장)
 
-        # 센서 타입별 이상치 탐지
-        anomalies_by_type = {}
+    센서 타입마다 ANALYSIS_CHUNK_SIZE행씩 읽으며 직전 window개 샘플 기준 점수를 계산하고,
+    임계값을 넘은 연속 샘플을 구간으로 묶는다. 같은 방법의 이전 결과는 교체된다.
 
-        for sensor_type in set(d.sensor_type for d in sensor_data):
-            type_data = [d for d in sensor_data if d.sensor_type == sensor_type]
+    Args:
+        session_id: RecordingSession ID
+        method: zscore (이동 평균 / 표준편차), ewma (지수 가중), mad (이동 중앙값 / MAD)
+        window: 기준 윈도 (샘플 수)
+        threshold: 점수 임계값 (생략 시 zscore / ewma 3.0, mad 3.5)
+        sensor_types: 대상 센서 타입 (생략 시 신호 필드를 아는 전체 타입)
 
-            # 3축 센서
-            if sensor_type in ['accelerometer', 'gyroscope', 'magnetometer']:
-                x_values = np.array([d.data.get('x', 0) for d in type_data])
-                y_values = np.array([d.data.get('y', 0) for d in type_data])
-                z_values = np.array([d.data.get('z', 0) for d in type_data])
+    Returns:
+        dict: 센서 타입별 샘플 수, 이상 샘플 수, 구간 수, 구간 (최대 ANOMALY_RESULT_INTERVALS개)
+    """
+    try:
+        session = RecordingSession.query.get(session_id)
+        if not session:
+            return {'error': 'Session not found', 'session_id': session_id}
 
-                # Magnitude 계산
-                magnitudes = np.sqrt(x_values ** 2 + y_values ** 2 + z_values ** 2)
+        threshold = validate_detector(method, window, threshold)
+        chunk_size = current_app.config.get('ANALYSIS_CHUNK_SIZE', ANALYSIS_BATCH_SIZE)
 
-                # Z-score 계산
-                mean = np.mean(magnitudes)
-                std = np.std(magnitudes)
+        counts = sensor_type_counts(session_id, sensor_types)
+        targets = [sensor_type for sensor_type in counts if sensor_type in SIGNAL_FIELDS]
 
-                if std > 0:
-                    z_scores = np.abs((magnitudes - mean) / std)
-                    anomaly_indices = np.where(z_scores > sensitivity)[0]
+        if not targets:
+            return {'error': 'No sensor data found', 'session_id': session_id}
 
-                    if len(anomaly_indices) > 0:
-                        anomalies_by_type[sensor_type] = {
-                            'count': int(len(anomaly_indices)),
-                            'percentage': round(len(anomaly_indices) / len(type_data) * 100, 2),
-                            'mean': float(mean),
-                            'std': float(std),
-                            'max_z_score': float(np.max(z_scores[anomaly_indices])),
-                            'timestamps': [int(type_data[i].timestamp) for i in anomaly_indices[:10]]  # 최대 10개만
-                        }
+        results = {}
+        for sensor_type in targets:
+            detected = detect_intervals(session_id, sensor_type, method, window, threshold, chunk_size=chunk_size)
+            intervals = detected['intervals']
+            save_anomaly_intervals(session_id, sensor_type, method, window, threshold, intervals)
+            results[sensor_type] = {
+                'samples': detected['samples'],
+                'anomalous_samples': detected['anomalous_samples'],
+                'interval_count': len(intervals),
+                'truncated': detected['truncated'],
+                'intervals': intervals[:ANOMALY_RESULT_INTERVALS],
+            }
+        db.session.commit()
 
         return {
             'session_id': session_id,
             'session_uuid': str(session.session_id),
-            'sensitivity': sensitivity,
-            'anomalies': anomalies_by_type,
-            'total_anomalies': sum(a['count'] for a in anomalies_by_type.values()),
+            'method': method,
+            'window': window,
+            'threshold': threshold,
+            'anomalies': results,
+            'total_intervals': sum(r['interval_count'] for r in results.values()),
             'detected_at': datetime.utcnow().isoformat()
         }
 
     except Exception as e:
+        db.session.rollback()
+        return {'error': str(e), 'session_id': session_id}
+
+
+@celery.task(name='app.tasks.data_processing.extract_spectral_features')
+def extract_spectral_features(session_id: int, sensor_types: list = None, window_size: int = DEFAULT_WINDOW_SIZE,
+                              hop: int = None, bands: list = None, refresh: bool = False):
+    """
+    IMU 센서 윈도 주파수 특징 추출 (결과는 spectral_features에 센서 타입별 1행 저장)
+
+    세션 sample_rate 기준으로 hop 간격 윈도마다 FFT 우세 주파수, 대역 에너지, 스펙트럼 중심을 계산하고
+    전체 윈도 평균으로 Welch PSD를 만든다. 저장된 결과가 현재 데이터 / 파라미터와 같으면 재사용한다.
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_types: 대상 센서 타입 (생략 시 세션의 SPECTRAL_SENSORS 전체)
+        window_size: 윈도 샘플 수 (기본값: 256)
+        hop: 윈도 간격 (기본값: window_size / 2)
+        bands: 대역 에너지 구간 [[low_hz, high_hz], ...]
+        refresh: True면 항상 다시 계산
+
+    Returns:
+        dict: 센서 타입별 윈도 수, 우세 주파수, Welch PSD
+    """
+    try:
+        session = RecordingSession.query.get(session_id)
+        if not session:
+            return {'error': 'Session not found', 'session_id': session_id}
+
+        chunk_size = current_app.config.get('ANALYSIS_CHUNK_SIZE', ANALYSIS_BATCH_SIZE)
+        targets = [sensor_type for sensor_type in sensor_type_counts(session_id, sensor_types)
+                   if sensor_type in SPECTRAL_SENSORS]
+
+        if not targets:
+            return {'error': 'No IMU sensor data found', 'session_id': session_id}
+
+        features = {}
+        for sensor_type in targets:
+            row = session_spectral_features(session, sensor_type, window_size, hop, bands,
+                                            chunk_size=chunk_size, refresh=refresh)
+            if row is not None:
+                features[sensor_type] = row.to_dict()
+        db.session.commit()
+
+        return {
+            'session_id': session_id,
+            'session_uuid': str(session.session_id),
+            'features': features,
+            'extracted_at': datetime.utcnow().isoformat()
+        }
+
+    except Exception as e:
+        db.session.rollback()
         return {'error': str(e), 'session_id': session_id}
 
 
@@ -326,49 +583,29 @@ def calculate_session_metrics(session_id: int):
         if not session:
             return {'error': 'Session not found'}
 
-        sensor_data = SensorData.query.filter_by(session_id=session_id).all()
+        counts = sensor_type_counts(session_id)
 
-        if not sensor_data:
+        if not counts:
             return {'error': 'No sensor data found'}
 
-        # 센서 타입별 메트릭
+        # 센서 타입별 메트릭 (없는 값은 0, PostgreSQL은 DB 집계)
         metrics = {}
 
-        for sensor_type in set(d.sensor_type for d in sensor_data):
-            type_data = [d for d in sensor_data if d.sensor_type == sensor_type]
-
-            if sensor_type in ['accelerometer', 'gyroscope', 'magnetometer']:
-                x_values = [d.data.get('x', 0) for d in type_data]
-                y_values = [d.data.get('y', 0) for d in type_data]
-                z_values = [d.data.get('z', 0) for d in type_data]
-
-                metrics[sensor_type] = {
-                    'sample_count': len(type_data),
-                    'x': {
-                        'mean': float(np.mean(x_values)),
-                        'std': float(np.std(x_values)),
-                        'min': float(np.min(x_values)),
-                        'max': float(np.max(x_values)),
-                        'peak_to_peak': float(np.max(x_values) - np.min(x_values)),
-                    },
-                    'y': {
-                        'mean': float(np.mean(y_values)),
-                        'std': float(np.std(y_values)),
-                        'min': float(np.min(y_values)),
-                        'max': float(np.max(y_values)),
-                        'peak_to_peak': float(np.max(y_values) - np.min(y_values)),
-                    },
-                    'z': {
-                        'mean': float(np.mean(z_values)),
-                        'std': float(np.std(z_values)),
-                        'min': float(np.min(z_values)),
-                        'max': float(np.max(z_values)),
-                        'peak_to_peak': float(np.max(z_values) - np.min(z_values)),
-                    }
+        chunk_size = current_app.config.get('ANALYSIS_CHUNK_SIZE', ANALYSIS_BATCH_SIZE)
+        aggregates = field_aggregates(session_id, ANALYSIS_FIELDS,
+                                      [sensor_type for sensor_type in counts if sensor_type in MOTION_SENSORS],
+                                      fill_value=0.0, chunk_size=chunk_size)
+        for sensor_type, aggregate in aggregates.items():
+            metrics[sensor_type] = {'sample_count': aggregate['count']}
+            for axis in ('x', 'y', 'z'):
+                stats = aggregate['stats'][axis]
+                metrics[sensor_type][axis] = {
+                    **stats.to_dict(),
+                    'peak_to_peak': stats.max - stats.min,
                 }
 
         # 세션 메타데이터 업데이트
-        session.data_count = len(sensor_data)
+        session.data_count = sum(counts.values())
         db.session.commit()
 
         return {
@@ -8,6 +8,10 @@ from app import db
 from app.models.sensor_data import SensorData
 from app.models.session import RecordingSession
 from app.models.sync_log import SyncLog
+from app.models.user import User
+from app.utils.cache import pull_cache
+from app.utils.changes import record_session_changes
+from app.utils.analysis_cache import invalidate_analysis_results
 from datetime import datetime, timedelta
 import os
 
@@ -54,12 +58,26 @@ def cleanup_old_sensor_data(days: int = 30):
                 SensorData.query.filter_by(session_id=session.id).delete()
                 total_records += record_count
 
+                # 저장된 분석 결과 삭제
+                invalidate_analysis_results(session.id)
+
             # 세션도 삭제할지 결정 (선택적)
             # db.session.delete(session)
             cleaned_sessions += 1
 
+        # Pull ETag 무효화
+        User.bump_data_version([session.user_id for session in old_sessions])
+
+        # 변경 피드 기록 (세션별 센서 데이터 삭제)
+        record_session_changes(old_sessions, kind='samples', op='delete')
+
         db.session.commit()
 
+        # Pull 캐시 무효화
+        for session in old_sessions:
+            pull_cache.invalidate_session(session.id)
+            pull_cache.invalidate_user(session.user_id)
+
         return {
             'message': f'Successfully cleaned up old sensor data',
             'cutoff_date': cutoff_date.isoformat(),
@@ -224,8 +242,19 @@ def cleanup_failed_sessions(hours: int = 24):
             session.notes = (session.notes or '') + ' [Auto-closed: stale session]'
             cleaned_count += 1
 
+        # Pull ETag 무효화
+        User.bump_data_version([session.user_id for session in stale_sessions])
+
+        # 변경 피드 기록 (세션 종료 처리)
+        record_session_changes(stale_sessions)
+
         db.session.commit()
 
+        # Pull 캐시 무효화
+        for session in stale_sessions:
+            pull_cache.invalidate_session(session.id)
+            pull_cache.invalidate_user(session.user_id)
+
         return {
             'message': f'Successfully cleaned up stale sessions',
             'cutoff_time': cutoff_time.isoformat(),
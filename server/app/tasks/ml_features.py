@@ -0,0 +1,189 @@
+"""
+Phase 44: ML 윈도 특징 추출 작업
+세션별 슬라이딩 윈도 특징 행렬을 .npy / Parquet 파일로 저장하고, 여러 세션을 Celery chord로 나눠 병렬 실행
+"""
+
+from celery_app import celery
+from app.models.session import RecordingSession
+from app.tasks.batch_analysis import resolve_batch_sessions, split_sessions, submit_batch
+from app.utils.ml_features import (
+    FEATURE_FORMATS,
+    FEATURE_SENSORS,
+    FEATURE_WINDOW_SIZE,
+    extract_window_features,
+    feature_output_dir,
+    validate_window,
+    write_feature_matrix,
+    write_manifest
+)
+from app.utils.arrow import arrow_available
+from app.utils.sensor_arrays import ANALYSIS_BATCH_SIZE, sensor_type_counts
+from flask import current_app
+from datetime import datetime
+
+
+@celery.task(name='app.tasks.ml_features.extract_ml_features')
+def extract_ml_features(session_id: int, sensor_types: list = None, window_size: int = FEATURE_WINDOW_SIZE,
+                        step: int = None, output_format: str = 'npy', output_dir: str = None):
+    """
+    세션 ML 윈도 특징 추출 (센서 타입별 특징 행렬 파일 + features.json)
+
+    window_size 샘플 윈도를 step 간격으로 만들어 채널 (x / y / z / 벡터 크기)마다 평균, 표준편차,
+    min, max, jerk, 영점 교차 수를 계산한다. 파일은 {output_dir}/{user_id}/{session_uuid}/에 저장한다.
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_types: 대상 센서 타입 (생략 시 세션의 FEATURE_SENSORS 전체)
+        window_size: 윈도 샘플 수 (기본값: 100, 앱 추론과 같음)
+        step: 윈도 간격 (기본값: window_size / 2)
+        output_format: npy / parquet
+        output_dir: 저장 루트 (생략 시 ML_FEATURES_FOLDER)
+
+    Returns:
+        dict: 저장 디렉토리, 센서 타입별 윈도 수 / 열 수 / 파일
+    """
+    try:
+        session = RecordingSession.query.get(session_id)
+        if not session:
+            return {'error': 'Session not found', 'session_id': session_id}
+
+        window_size, step = validate_window(window_size, step)
+        if output_format not in FEATURE_FORMATS:
+            return {'error': f'Invalid format: {output_format}', 'session_id': session_id}
+        if output_format == 'parquet' and not arrow_available():
+            return {'error': 'Parquet output requires pyarrow', 'session_id': session_id}
+
+        chunk_size = current_app.config.get('ANALYSIS_CHUNK_SIZE', ANALYSIS_BATCH_SIZE)
+        targets = [sensor_type for sensor_type in sensor_type_counts(session_id, sensor_types)
+                   if sensor_type in FEATURE_SENSORS]
+
+        if not targets:
+            return {'error': 'No IMU sensor data found', 'session_id': session_id}
+
+        directory = feature_output_dir(output_dir or current_app.config.get('ML_FEATURES_FOLDER', './ml_features'),
+                                       session)
+        features = {}
+        for sensor_type in targets:
+            result = extract_window_features(session_id, sensor_type, window_size, step, chunk_size)
+            if result is None:
+                continue
+            features[sensor_type] = {
+                'window_count': result['window_count'],
+                'columns': result['columns'],
+                'files': write_feature_matrix(directory, sensor_type, result, output_format),
+            }
+
+        if not features:
+            return {'error': 'Not enough samples for one window', 'session_id': session_id}
+
+        manifest = {
+            'session_uuid': str(session.session_id),
+            'change_seq': session.change_seq,
+            'format': output_format,
+            'window_size': window_size,
+            'step': step,
+            'sensor_types': features,
+            'extracted_at': datetime.utcnow().isoformat()
+        }
+        write_manifest(directory, manifest)
+
+        return {
+            'session_id': session_id,
+            'session_uuid': str(session.session_id),
+            'output_dir': directory,
+            'format': output_format,
+            'window_size': window_size,
+            'step': step,
+            'sensor_types': {
+                sensor_type: {'window_count': entry['window_count'], 'feature_count': len(entry['columns']),
+                              'files': entry['files']}
+                for sensor_type, entry in features.items()
+            },
+            'extracted_at': manifest['extracted_at']
+        }
+
+    except Exception as e:
+        return {'error': str(e), 'session_id': session_id}
+
+
+@celery.task(name='app.tasks.ml_features.extract_ml_features_batch')
+def extract_ml_features_batch(session_ids: list = None, user_id: int = None, max_concurrency: int = None,
+                              **options):
+    """
+    여러 세션 ML 윈도 특징 일괄 추출 (fan-out / fan-in)
+
+    analyze_sessions_batch와 같이 세션을 최대 max_concurrency개 묶음으로 나눠 묶음마다
+    extract_features_slice를 실행하고, 모두 끝나면 merge_feature_report가 요약한다.
+    진행률은 batch_progress()로 조회한다.
+
+    Args:
+        session_ids: RecordingSession ID 목록
+        user_id: 사용자 ID (session_ids 생략 시 사용자의 전체 세션)
+        max_concurrency: 동시 하위 작업 수 (생략 시 BATCH_ANALYSIS_CONCURRENCY)
+        **options: extract_ml_features 인자 (sensor_types, window_size, step, output_format, output_dir)
+
+    Returns:
+        dict: batch_id (보고서 작업 ID), slice_task_ids, slice_sizes, total_sessions
+    """
+    try:
+        session_ids = resolve_batch_sessions(session_ids, user_id)
+        slices = split_sessions(session_ids, max_concurrency)
+        return submit_batch([extract_features_slice.s(ids, **options) for ids in slices],
+                            merge_feature_report.s(total_sessions=len(session_ids)), slices)
+
+    except Exception as e:
+        return {'error': str(e), 'user_id': user_id}
+
+
+@celery.task(name='app.tasks.ml_features.extract_features_slice', bind=True)
+def extract_features_slice(self, session_ids: list, **options):
+    """
+    세션 묶음 순차 특징 추출 (세션마다 PROGRESS 상태 갱신)
+
+    Args:
+        session_ids: RecordingSession ID 목록
+        **options: extract_ml_features 인자
+
+    Returns:
+        list: 세션별 extract_ml_features 결과
+    """
+    results = []
+    for done, session_id in enumerate(session_ids, start=1):
+        results.append(extract_ml_features(session_id, **options))
+        if not self.request.called_directly and not self.request.is_eager:
+            self.update_state(state='PROGRESS', meta={'done': done, 'total': len(session_ids)})
+    return results
+
+
+@celery.task(name='app.tasks.ml_features.merge_feature_report')
+def merge_feature_report(slice_results: list, total_sessions: int = None):
+    """
+    세션별 특징 추출 결과 요약
+
+    Args:
+        slice_results: extract_features_slice 결과 목록 (묶음별 세션 결과 리스트)
+        total_sessions: 요청한 세션 수
+
+    Returns:
+        dict: 추출 / 실패 세션 수, 센서 타입별 세션 수 / 윈도 수, 세션별 저장 디렉토리
+    """
+    results = [result for results in slice_results for result in results]
+    failed = [{'session_id': result.get('session_id'), 'error': result['error']}
+              for result in results if 'error' in result]
+    extracted = [result for result in results if 'error' not in result]
+
+    sensor_types = {}
+    for result in extracted:
+        for sensor_type, entry in result['sensor_types'].items():
+            summary = sensor_types.setdefault(sensor_type, {'sessions': 0, 'window_count': 0})
+            summary['sessions'] += 1
+            summary['window_count'] += entry['window_count']
+
+    return {
+        'total_sessions': total_sessions if total_sessions is not None else len(results),
+        'extracted_sessions': len(extracted),
+        'failed_sessions': failed,
+        'sensor_types': dict(sorted(sensor_types.items())),
+        'output_dirs': {result['session_uuid']: result['output_dir'] for result in extracted},
+        'generated_at': datetime.utcnow().isoformat()
+    }
@@ -0,0 +1,206 @@
+"""
+Utilities
+라우트/작업 공용 헬퍼 모듈
+"""
+
+from app.utils.pagination import (
+    InvalidCursorError,
+    encode_cursor,
+    decode_cursor,
+    apply_keyset
+)
+from app.utils.cache import PullCache, pull_cache
+from app.utils.passwords import PasswordHasher, PasswordHasherBusy, password_hasher
+from app.utils.identity import IdentityCache, identity_cache
+from app.utils.changes import record_push_changes, record_session_changes, changes_since
+from app.utils.notify import (
+    NotificationHub,
+    notifier,
+    format_sse,
+    parse_last_event_id,
+    replay_events
+)
+from app.utils.status import session_counts, build_sync_status
+from app.utils.log_writer import SyncLogWriter, sync_log_writer, sync_record, resolve_request_id
+from app.utils.sensor_arrays import (
+    numeric_field,
+    sensor_type_counts,
+    sensor_type_bounds,
+    iter_sensor_chunks,
+    iter_sensor_columns,
+    load_sensor_arrays
+)
+from app.utils.online_stats import RunningStats
+from app.utils.aggregates import aggregate_backend, aggregate_statement, field_aggregates
+from app.utils.trajectory import (
+    haversine_km,
+    TrajectoryAccumulator,
+    analyze_trajectory,
+    save_trajectory,
+    session_trajectory
+)
+from app.utils.anomaly import (
+    ANOMALY_METHODS,
+    detect_intervals,
+    save_anomaly_intervals,
+    query_anomaly_intervals
+)
+from app.utils.analysis_cache import (
+    analysis_params_key,
+    get_cached_result,
+    store_result,
+    cached_analysis,
+    invalidate_analysis_results
+)
+from app.utils.spectral import (
+    SPECTRAL_SENSORS,
+    SpectralAccumulator,
+    validate_spectral,
+    encode_features,
+    decode_features,
+    session_spectral_features,
+    query_spectral_windows,
+    build_spectral_response
+)
+from app.utils.ml_features import (
+    FEATURE_SENSORS,
+    WindowFeatureExtractor,
+    feature_columns,
+    extract_window_features,
+    write_feature_matrix,
+    load_feature_matrix
+)
+from app.utils.resample import (
+    RESAMPLE_METHODS,
+    validate_resample,
+    time_grid,
+    resample_series,
+    align_sensor_arrays,
+    align_session
+)
+from app.utils.user_statistics import STATISTICS_BUCKETS, session_statistics, cached_statistics
+from app.utils.downsample import (
+    parse_sample_filter,
+    sample_conditions,
+    stride_select,
+    bucket_series
+)
+from app.utils.compression import (
+    negotiate_encoding,
+    encoded_etag,
+    stream_encoded,
+    iter_json,
+    negotiated_response,
+    compressed_json_response
+)
+from app.utils.arrow import (
+    ARROW_STREAM_MIMETYPE,
+    arrow_available,
+    wants_arrow,
+    iter_pull_arrow,
+    iter_aligned_arrow
+)
+from app.utils.pull import (
+    build_pull_page,
+    serialize_session,
+    parse_data_cursors,
+    pull_etag,
+    serialize_sensor_row,
+    collect_session_data
+)
+
+__all__ = [
+    'InvalidCursorError',
+    'encode_cursor',
+    'decode_cursor',
+    'apply_keyset',
+    'PullCache',
+    'pull_cache',
+    'PasswordHasher',
+    'PasswordHasherBusy',
+    'password_hasher',
+    'IdentityCache',
+    'identity_cache',
+    'record_push_changes',
+    'record_session_changes',
+    'changes_since',
+    'NotificationHub',
+    'notifier',
+    'format_sse',
+    'parse_last_event_id',
+    'replay_events',
+    'session_counts',
+    'build_sync_status',
+    'SyncLogWriter',
+    'sync_log_writer',
+    'sync_record',
+    'resolve_request_id',
+    'numeric_field',
+    'sensor_type_counts',
+    'sensor_type_bounds',
+    'iter_sensor_chunks',
+    'iter_sensor_columns',
+    'RunningStats',
+    'aggregate_backend',
+    'aggregate_statement',
+    'field_aggregates',
+    'load_sensor_arrays',
+    'haversine_km',
+    'TrajectoryAccumulator',
+    'analyze_trajectory',
+    'save_trajectory',
+    'session_trajectory',
+    'ANOMALY_METHODS',
+    'detect_intervals',
+    'save_anomaly_intervals',
+    'query_anomaly_intervals',
+    'analysis_params_key',
+    'get_cached_result',
+    'store_result',
+    'cached_analysis',
+    'invalidate_analysis_results',
+    'SPECTRAL_SENSORS',
+    'SpectralAccumulator',
+    'validate_spectral',
+    'encode_features',
+    'decode_features',
+    'session_spectral_features',
+    'query_spectral_windows',
+    'build_spectral_response',
+    'FEATURE_SENSORS',
+    'WindowFeatureExtractor',
+    'feature_columns',
+    'extract_window_features',
+    'write_feature_matrix',
+    'load_feature_matrix',
+    'RESAMPLE_METHODS',
+    'validate_resample',
+    'time_grid',
+    'resample_series',
+    'align_sensor_arrays',
+    'align_session',
+    'STATISTICS_BUCKETS',
+    'session_statistics',
+    'cached_statistics',
+    'parse_sample_filter',
+    'sample_conditions',
+    'stride_select',
+    'bucket_series',
+    'negotiate_encoding',
+    'encoded_etag',
+    'stream_encoded',
+    'iter_json',
+    'negotiated_response',
+    'compressed_json_response',
+    'ARROW_STREAM_MIMETYPE',
+    'arrow_available',
+    'wants_arrow',
+    'iter_pull_arrow',
+    'iter_aligned_arrow',
+    'build_pull_page',
+    'serialize_session',
+    'parse_data_cursors',
+    'pull_etag',
+    'serialize_sensor_row',
+    'collect_session_data',
+]
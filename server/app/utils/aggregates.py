@@ -0,0 +1,150 @@
+"""
+Sensor Field Aggregates
+세션 센서 필드 통계 (PostgreSQL은 GROUP BY 집계로 DB에서 계산, 그 외 DB는 청크 배열 + RunningStats)
+"""
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func, select
+from app import db
+from app.models.sensor_data import SensorData
+from app.utils.online_stats import RunningStats
+from app.utils.sensor_arrays import ANALYSIS_BATCH_SIZE, iter_sensor_columns, numeric_field, sensor_type_counts
+
+# 필드별 집계 열 순서 (aggregate_statement)
+AGGREGATE_COLUMNS = ('count', 'mean', 'std', 'min', 'max')
+
+
+def aggregate_backend() -> str:
+    """
+    필드 통계 계산 방식
+
+    Returns:
+        str: sql (PostgreSQL, ANALYSIS_SQL_AGGREGATES 설정 시) 또는 numpy
+    """
+    if not current_app.config.get('ANALYSIS_SQL_AGGREGATES', True):
+        return 'numpy'
+    return 'sql' if db.session.get_bind().dialect.name == 'postgresql' else 'numpy'
+
+
+def aggregate_statement(session_id: int, sensor_types, keys, dialect_name: str, fill_value: float = None):
+    """
+    센서 타입별 필드 집계 쿼리
+
+    SELECT sensor_type, count(*), min(timestamp), max(timestamp),
+           필드별 count / avg / stddev_pop / min / max ((data->>'x')::float)
+    GROUP BY sensor_type
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_types: 센서 타입 목록
+        keys: data의 숫자 필드 이름 목록
+        dialect_name: SQLAlchemy dialect 이름 (stddev_pop이 있는 DB)
+        fill_value: 숫자가 아니거나 없는 값 대체값 (None이면 통계에서 제외)
+
+    Returns:
+        Select: 행 = (sensor_type, count, first_ts, last_ts, 필드별 AGGREGATE_COLUMNS...)
+    """
+    columns = [
+        SensorData.sensor_type,
+        func.count(SensorData.id),
+        func.min(SensorData.timestamp),
+        func.max(SensorData.timestamp),
+    ]
+    for key in keys:
+        value = numeric_field(key, dialect_name)
+        if fill_value is not None:
+            value = func.coalesce(value, fill_value)
+        columns.extend([
+            func.count(value),
+            func.avg(value),
+            func.stddev_pop(value),
+            func.min(value),
+            func.max(value),
+        ])
+
+    return select(*columns).where(
+        SensorData.session_id == session_id,
+        SensorData.sensor_type.in_(list(sensor_types))
+    ).group_by(SensorData.sensor_type).order_by(SensorData.sensor_type)
+
+
+def _sql_aggregates(session_id: int, fields: dict, sensor_types, fill_value) -> dict:
+    """DB 집계 (필드 목록이 같은 센서 타입끼리 쿼리 1회)"""
+    dialect_name = db.session.get_bind().dialect.name
+    groups = {}
+    for sensor_type in sensor_types:
+        groups.setdefault(tuple(fields.get(sensor_type, ())), []).append(sensor_type)
+
+    aggregates = {}
+    for keys, types in groups.items():
+        rows = db.session.execute(aggregate_statement(session_id, types, keys, dialect_name, fill_value))
+        for row in rows:
+            stats = {}
+            for index, key in enumerate(keys):
+                start = 4 + index * len(AGGREGATE_COLUMNS)
+                stats[key] = RunningStats.from_moments(*row[start:start + len(AGGREGATE_COLUMNS)])
+            aggregates[row[0]] = {
+                'count': int(row[1]),
+                'first_ts': int(row[2]),
+                'last_ts': int(row[3]),
+                'stats': stats,
+            }
+    return aggregates
+
+
+def _numpy_aggregates(session_id: int, fields: dict, sensor_types, fill_value, chunk_size: int) -> dict:
+    """청크 배열 누적 통계 (stddev_pop이 없는 DB)"""
+    aggregates = {}
+    for sensor_type in sensor_types:
+        keys = tuple(fields.get(sensor_type, ()))
+        aggregate = {'count': 0, 'first_ts': None, 'last_ts': None,
+                     'stats': {key: RunningStats() for key in keys}}
+
+        for columns in iter_sensor_columns(session_id, sensor_type, keys, chunk_size):
+            timestamps = columns['timestamp']
+            aggregate['count'] += len(timestamps)
+            if aggregate['first_ts'] is None:
+                aggregate['first_ts'] = int(timestamps[0])
+            aggregate['last_ts'] = int(timestamps[-1])
+            for key in keys:
+                values = columns[key] if fill_value is None else np.nan_to_num(columns[key], nan=fill_value)
+                aggregate['stats'][key].update(values)
+
+        if aggregate['count']:
+            aggregates[sensor_type] = aggregate
+    return aggregates
+
+
+def field_aggregates(session_id: int, fields: dict, sensor_types=None, fill_value: float = None,
+                     chunk_size: int = ANALYSIS_BATCH_SIZE, backend: str = None) -> dict:
+    """
+    세션 센서 타입별 샘플 수, 첫 / 마지막 타임스탬프, 필드 통계
+
+    sql 방식은 원본 행을 Python으로 가져오지 않고 DB에서 집계하고,
+    numpy 방식은 iter_sensor_columns() 청크로 같은 통계를 계산한다 (결과 형식 동일).
+
+    Args:
+        session_id: RecordingSession ID
+        fields: {sensor_type: 필드 이름 목록} (없는 타입은 개수 / 타임스탬프만)
+        sensor_types: 대상 센서 타입 (None이면 세션의 전체 타입)
+        fill_value: 없는 값 대체값 (None이면 해당 필드 통계에서 제외)
+        chunk_size: numpy 방식 청크 행 수
+        backend: sql / numpy (None이면 aggregate_backend())
+
+    Returns:
+        dict: {sensor_type: {'count', 'first_ts', 'last_ts', 'stats': {필드: RunningStats}}}
+              (센서 타입 순, 데이터가 없는 타입은 제외)
+    """
+    if sensor_types is None:
+        sensor_types = list(sensor_type_counts(session_id))
+    sensor_types = sorted(set(sensor_types))
+    if not sensor_types:
+        return {}
+
+    if (backend or aggregate_backend()) == 'sql':
+        aggregates = _sql_aggregates(session_id, fields, sensor_types, fill_value)
+    else:
+        aggregates = _numpy_aggregates(session_id, fields, sensor_types, fill_value, chunk_size)
+
+    return {sensor_type: aggregates[sensor_type] for sensor_type in sensor_types if sensor_type in aggregates}
@@ -0,0 +1,134 @@
+"""
+Analysis Result Cache
+분석 작업 결과 저장 (세션 / 분석 종류 / 파라미터 / 데이터 버전 기준, Push 시 무효화)
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.analysis_result import AnalysisResult
+
+
+def analysis_params_key(params: dict) -> str:
+    """
+    파라미터 키 (키 정렬 JSON의 SHA-256)
+
+    Args:
+        params: 결과에 영향을 주는 작업 파라미터
+
+    Returns:
+        str: 64자 hex
+    """
+    canonical = json.dumps(params or {}, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def get_cached_result(session, analysis_type: str, params: dict):
+    """
+    저장된 분석 결과 조회 (세션 데이터 버전이 같을 때만)
+
+    Args:
+        session: RecordingSession
+        analysis_type: 분석 종류 (작업 이름)
+        params: 작업 파라미터
+
+    Returns:
+        dict | None: 저장된 결과 (없거나 오래되었으면 None)
+    """
+    if session.change_seq is None:
+        return None
+
+    row = AnalysisResult.query.filter_by(
+        session_id=session.id,
+        analysis_type=analysis_type,
+        params_key=analysis_params_key(params)
+    ).first()
+
+    if row is None or row.data_version != session.change_seq:
+        return None
+    return row.result
+
+
+def store_result(session, analysis_type: str, params: dict, result: dict):
+    """
+    분석 결과 저장 (같은 키의 이전 결과를 교체, 커밋은 호출자)
+
+    Push를 거치지 않은 세션(change_seq 없음)은 데이터 버전을 알 수 없으므로 저장하지 않는다.
+
+    Args:
+        session: RecordingSession
+        analysis_type: 분석 종류
+        params: 작업 파라미터
+        result: 작업 결과 (JSON 직렬화 가능)
+
+    Returns:
+        AnalysisResult | None: 저장된 행
+    """
+    if session.change_seq is None:
+        return None
+
+    key = analysis_params_key(params)
+    values = {
+        'params': params or {},
+        'data_version': session.change_seq,
+        'result': result,
+        'computed_at': datetime.utcnow(),
+    }
+
+    row = AnalysisResult.query.filter_by(session_id=session.id, analysis_type=analysis_type, params_key=key).first()
+    if row is None:
+        try:
+            # 동시에 같은 결과를 저장하면 먼저 저장된 행을 갱신
+            with db.session.begin_nested():
+                row = AnalysisResult(session_id=session.id, analysis_type=analysis_type, params_key=key, **values)
+                db.session.add(row)
+            return row
+        except IntegrityError:
+            row = AnalysisResult.query.filter_by(
+                session_id=session.id, analysis_type=analysis_type, params_key=key
+            ).first()
+
+    for name, value in values.items():
+        setattr(row, name, value)
+    return row
+
+
+def cached_analysis(session, analysis_type: str, params: dict, compute, refresh: bool = False) -> dict:
+    """
+    분석 결과 캐시 적용 (데이터 버전이 같으면 저장된 결과, 아니면 계산 후 저장)
+
+    에러 결과({'error': ...})는 저장하지 않는다. 결과에는 cached (bool)가 추가된다.
+
+    Args:
+        session: RecordingSession
+        analysis_type: 분석 종류
+        params: 결과에 영향을 주는 작업 파라미터
+        compute: 결과를 계산하는 함수 (인자 없음)
+        refresh: True면 항상 다시 계산
+
+    Returns:
+        dict: 분석 결과 (커밋은 호출자)
+    """
+    enabled = current_app.config.get('ANALYSIS_CACHE_ENABLED', True)
+    if enabled and not refresh:
+        cached = get_cached_result(session, analysis_type, params)
+        if cached is not None:
+            return {**cached, 'cached': True}
+
+    result = compute()
+    if enabled and 'error' not in result:
+        store_result(session, analysis_type, params, result)
+    return {**result, 'cached': False}
+
+
+def invalidate_analysis_results(session_id: int) -> int:
+    """
+    세션의 저장된 분석 결과 삭제 (Push / 데이터 정리 트랜잭션에서 호출, 커밋은 호출자)
+
+    Returns:
+        int: 삭제한 행 수
+    """
+    return AnalysisResult.query.filter_by(session_id=session_id).delete(synchronize_session=False)
@@ -0,0 +1,376 @@
+"""
+Windowed Anomaly Detection
+윈도 기반 이상 탐지 (이동 z-score, EWMA, MAD) - 청크 단위 배열 연산, 이상 구간 저장
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sqlalchemy import insert
+from app import db
+from app.models.anomaly import AnomalyInterval
+from app.utils.sensor_arrays import ANALYSIS_BATCH_SIZE, iter_sensor_columns
+
+ANOMALY_METHODS = ('zscore', 'ewma', 'mad')
+
+# 방법별 기본 임계값 (MAD는 modified z-score 기준 3.5)
+DEFAULT_THRESHOLDS = {'zscore': 3.0, 'ewma': 3.0, 'mad': 3.5}
+
+# 기준 윈도 (샘플 수)
+DEFAULT_WINDOW = 100
+MAX_WINDOW = 5000
+
+# 센서 타입별 탐지 신호 (필드가 여러 개면 벡터 크기)
+SIGNAL_FIELDS = {
+    'accelerometer': ('x', 'y', 'z'),
+    'gyroscope': ('x', 'y', 'z'),
+    'magnetometer': ('x', 'y', 'z'),
+    'gravity': ('x', 'y', 'z'),
+    'linear_acceleration': ('x', 'y', 'z'),
+    'gps': ('speed',),
+    'significant_motion': ('magnitude',),
+    'step_counter': ('delta',),
+    'proximity': ('distance',),
+    'light': ('lux',),
+    'pressure': ('pressure',),
+    'temperature': ('celsius',),
+    'humidity': ('humidity',),
+}
+
+# 세션 / 센서 타입 / 방법당 저장하는 최대 구간 수
+MAX_INTERVALS = 10000
+
+
+def signal_values(columns: dict, fields) -> tuple:
+    """
+    청크의 탐지 신호 (필드 1개면 값, 여러 개면 벡터 크기), 값이 없는 샘플은 제외
+
+    Args:
+        columns: {'timestamp', 필드...} 배열
+        fields: 신호 필드 목록
+
+    Returns:
+        tuple: (timestamps, values)
+    """
+    if len(fields) == 1:
+        values = columns[fields[0]]
+    else:
+        values = np.sqrt(sum(columns[key] ** 2 for key in fields))
+    valid = ~np.isnan(values)
+    return columns['timestamp'][valid], values[valid]
+
+
+# ------------------------------------------------------------
+# Detectors (청크 사이에 윈도 상태를 이어감)
+# ------------------------------------------------------------
+
+class RollingZScore:
+    """직전 window개 샘플의 평균 / 표준편차 기준 z-score (누적합으로 계산)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._tail = np.zeros(0)
+
+    def scores(self, values: np.ndarray) -> np.ndarray:
+        """
+        청크 점수 계산
+
+        Args:
+            values: 신호 배열
+
+        Returns:
+            np.ndarray: |x - mean| / std (윈도가 차기 전 / 분산이 0이면 NaN)
+        """
+        w = self.window
+        ext = np.concatenate((self._tail, values))
+        self._tail = ext[-w:]
+
+        # 윈도 ext[i - w:i]의 합 = cs[i] - cs[i - w]
+        index = np.arange(len(ext) - len(values), len(ext))
+        index = index[index >= w]
+        out = np.full(len(values), np.nan)
+        if not len(index):
+            return out
+
+        cs = np.concatenate(([0.0], np.cumsum(ext)))
+        cs2 = np.concatenate(([0.0], np.cumsum(ext ** 2)))
+        mean = (cs[index] - cs[index - w]) / w
+        var = np.maximum((cs2[index] - cs2[index - w]) / w - mean ** 2, 0.0)
+        std = np.sqrt(var)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(std > 1e-12 * np.maximum(np.abs(mean), 1.0), np.abs(ext[index] - mean) / std, np.nan)
+        out[index - (len(ext) - len(values))] = z
+        return out
+
+
+class EwmaScore:
+    """지수 가중 이동 평균 / 분산 기준 점수 (span = window, 첫 window개는 워밍업)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+        self._mean = None
+        self._square = None
+        self._seen = 0
+
+    def _ewm(self, state: float, values: np.ndarray) -> np.ndarray:
+        # 이전 상태를 앞에 붙이면 adjust=False 재귀식이 청크 경계에서 이어진다
+        series = pd.Series(np.concatenate(([state], values)))
+        return series.ewm(alpha=self.alpha, adjust=False).mean().to_numpy()
+
+    def scores(self, values: np.ndarray) -> np.ndarray:
+        """
+        청크 점수 계산
+
+        Args:
+            values: 신호 배열
+
+        Returns:
+            np.ndarray: |x - 직전 EWMA| / 직전 EW 표준편차 (워밍업 / 분산 0이면 NaN)
+        """
+        if not len(values):
+            return np.zeros(0)
+        if self._mean is None:
+            self._mean, self._square = float(values[0]), float(values[0]) ** 2
+
+        means = self._ewm(self._mean, values)
+        squares = self._ewm(self._square, values ** 2)
+        prev_mean, prev_square = means[:-1], squares[:-1]
+        std = np.sqrt(np.maximum(prev_square - prev_mean ** 2, 0.0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(std > 1e-12 * np.maximum(np.abs(prev_mean), 1.0), np.abs(values - prev_mean) / std, np.nan)
+        z[np.arange(self._seen, self._seen + len(values)) < self.window] = np.nan
+
+        self._mean, self._square = float(means[-1]), float(squares[-1])
+        self._seen += len(values)
+        return z
+
+
+class RollingMAD:
+    """직전 window개 샘플의 중앙값 / MAD 기준 modified z-score (0.6745 * |x - median| / MAD)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._tail = np.zeros(0)
+
+    def scores(self, values: np.ndarray) -> np.ndarray:
+        """
+        청크 점수 계산
+
+        Args:
+            values: 신호 배열
+
+        Returns:
+            np.ndarray: modified z-score (윈도가 차기 전 / MAD가 0이면 NaN)
+        """
+        w = self.window
+        ext = np.concatenate((self._tail, values))
+        self._tail = ext[-w:]
+
+        offset = len(ext) - len(values)
+        index = np.arange(offset, len(ext))
+        index = index[index >= w]
+        out = np.full(len(values), np.nan)
+        if not len(index):
+            return out
+
+        # 윈도 ext[i - w:i] = sliding_window_view(ext, w)[i - w] (복사 없는 뷰)
+        windows = sliding_window_view(ext, w)[index - w]
+        median = np.median(windows, axis=1)
+        mad = np.median(np.abs(windows - median[:, None]), axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(mad > 0, 0.6745 * np.abs(ext[index] - median) / mad, np.nan)
+        out[index - offset] = z
+        return out
+
+
+DETECTORS = {'zscore': RollingZScore, 'ewma': EwmaScore, 'mad': RollingMAD}
+
+
+class IntervalBuilder:
+    """임계값을 넘은 연속 샘플을 구간으로 묶음 (청크 끝에 걸친 구간은 다음 청크에서 이어감)"""
+
+    def __init__(self, threshold: float, max_intervals: int = MAX_INTERVALS):
+        self.threshold = threshold
+        self.max_intervals = max_intervals
+        self.intervals = []
+        self.anomalous_samples = 0
+        self.truncated = False
+        self._open = None
+
+    def update(self, timestamps: np.ndarray, values: np.ndarray, scores: np.ndarray):
+        """
+        청크 점수로 구간 갱신
+
+        Args:
+            timestamps: 타임스탬프 배열
+            values: 신호 배열
+            scores: 탐지기 점수 (NaN은 정상으로 취급)
+        """
+        flagged = np.nan_to_num(scores, nan=0.0) > self.threshold
+        if self._open is not None and (not len(flagged) or not flagged[0]):
+            self._close()
+        if not flagged.any():
+            return
+
+        self.anomalous_samples += int(flagged.sum())
+        edges = np.diff(np.concatenate(([0], flagged.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        for start, end in zip(starts, ends):
+            peak = start + int(np.argmax(scores[start:end]))
+            peak_score = scores[peak]
+            if start == 0 and self._open is not None:
+                interval = self._open
+                interval['end_ts'] = int(timestamps[end - 1])
+                interval['sample_count'] += int(end - start)
+                if peak_score > interval['max_score']:
+                    interval.update(max_score=float(peak_score), peak_ts=int(timestamps[peak]),
+                                    peak_value=float(values[peak]))
+            else:
+                self._open = {
+                    'start_ts': int(timestamps[start]),
+                    'end_ts': int(timestamps[end - 1]),
+                    'sample_count': int(end - start),
+                    'max_score': float(peak_score),
+                    'peak_ts': int(timestamps[peak]),
+                    'peak_value': float(values[peak]),
+                }
+            if end < len(flagged):
+                self._close()
+
+    def _close(self):
+        if len(self.intervals) < self.max_intervals:
+            self.intervals.append(self._open)
+        else:
+            self.truncated = True
+        self._open = None
+
+    def finish(self) -> list:
+        """열린 구간을 닫고 구간 목록 반환"""
+        if self._open is not None:
+            self._close()
+        return self.intervals
+
+
+# ------------------------------------------------------------
+# Engine
+# ------------------------------------------------------------
+
+def validate_detector(method: str, window: int, threshold: float = None) -> float:
+    """
+    탐지 파라미터 확인
+
+    Returns:
+        float: 임계값 (생략 시 방법별 기본값)
+
+    Raises:
+        ValueError: 파라미터가 올바르지 않은 경우
+    """
+    if method not in ANOMALY_METHODS:
+        raise ValueError(f'method must be one of: {", ".join(ANOMALY_METHODS)}')
+    if not isinstance(window, int) or isinstance(window, bool) or not 2 <= window <= MAX_WINDOW:
+        raise ValueError(f'window must be an integer between 2 and {MAX_WINDOW}')
+    if threshold is None:
+        return DEFAULT_THRESHOLDS[method]
+    if not isinstance(threshold, (int, float)) or isinstance(threshold, bool) or threshold <= 0:
+        raise ValueError('threshold must be a positive number')
+    return float(threshold)
+
+
+def detect_intervals(session_id: int, sensor_type: str, method: str = 'zscore', window: int = DEFAULT_WINDOW,
+                     threshold: float = None, fields=None, chunk_size: int = ANALYSIS_BATCH_SIZE) -> dict:
+    """
+    한 센서 시리즈의 이상 구간 탐지 (chunk_size행씩 읽어 윈도 상태를 이어가며 계산)
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_type: 센서 타입
+        method: zscore / ewma / mad
+        window: 기준 윈도 (샘플 수)
+        threshold: 점수 임계값 (생략 시 방법별 기본값)
+        fields: 신호 필드 (생략 시 SIGNAL_FIELDS)
+        chunk_size: 청크 행 수
+
+    Returns:
+        dict: {'samples', 'anomalous_samples', 'intervals', 'truncated', 'threshold'}
+
+    Raises:
+        ValueError: 파라미터가 올바르지 않거나 신호 필드를 알 수 없는 경우
+    """
+    threshold = validate_detector(method, window, threshold)
+    fields = tuple(fields or SIGNAL_FIELDS.get(sensor_type, ()))
+    if not fields:
+        raise ValueError(f'No signal fields for sensor type: {sensor_type}')
+
+    detector = DETECTORS[method](window)
+    builder = IntervalBuilder(threshold)
+    samples = 0
+
+    for columns in iter_sensor_columns(session_id, sensor_type, fields, chunk_size):
+        timestamps, values = signal_values(columns, fields)
+        if not len(values):
+            continue
+        builder.update(timestamps, values, detector.scores(values))
+        samples += len(values)
+
+    return {
+        'samples': samples,
+        'anomalous_samples': builder.anomalous_samples,
+        'intervals': builder.finish(),
+        'truncated': builder.truncated,
+        'threshold': threshold,
+    }
+
+
+def save_anomaly_intervals(session_id: int, sensor_type: str, method: str, window: int,
+                           threshold: float, intervals: list) -> int:
+    """
+    이상 구간 저장 (같은 세션 / 센서 타입 / 방법의 이전 결과를 교체, 커밋은 호출자)
+
+    Returns:
+        int: 저장한 구간 수
+    """
+    AnomalyInterval.query.filter_by(
+        session_id=session_id, sensor_type=sensor_type, method=method
+    ).delete(synchronize_session=False)
+
+    if intervals:
+        rows = [
+            {**interval, 'session_id': session_id, 'sensor_type': sensor_type, 'method': method,
+             'window': window, 'threshold': threshold}
+            for interval in intervals
+        ]
+        db.session.execute(insert(AnomalyInterval.__table__), rows)
+    return len(intervals)
+
+
+def query_anomaly_intervals(session_id: int, sensor_type: str = None, method: str = None,
+                            start_ts: int = None, end_ts: int = None) -> list:
+    """
+    저장된 이상 구간 조회 (시간 범위와 겹치는 구간, 시작 시각 순)
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_type: 센서 타입 (선택)
+        method: 탐지 방법 (선택)
+        start_ts: 범위 시작 (ms, 선택)
+        end_ts: 범위 끝 (ms, 선택)
+
+    Returns:
+        list: AnomalyInterval 목록
+    """
+    query = AnomalyInterval.query.filter(AnomalyInterval.session_id == session_id)
+    if sensor_type is not None:
+        query = query.filter(AnomalyInterval.sensor_type == sensor_type)
+    if method is not None:
+        query = query.filter(AnomalyInterval.method == method)
+    if start_ts is not None:
+        query = query.filter(AnomalyInterval.end_ts >= start_ts)
+    if end_ts is not None:
+        query = query.filter(AnomalyInterval.start_ts <= end_ts)
+    return query.order_by(AnomalyInterval.sensor_type, AnomalyInterval.start_ts).all()
@@ -0,0 +1,170 @@
+"""
+Arrow IPC Output
+Pull 응답의 Apache Arrow IPC 스트림 직렬화 (세션 스트림 + 센서 타입별 열 지향 스트림)
+"""
+
+import json
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+ARROW_STREAM_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+# 레코드 배치당 최대 행 수
+ARROW_BATCH_ROWS = 65536
+
+# 페이지 정보 (sessions 스트림의 스키마 메타데이터로 전달)
+PAGE_KEYS = ('page', 'page_size', 'total', 'has_more', 'next_cursor', 'server_timestamp', 'sync_log_id', 'request_id')
+
+
+def arrow_available() -> bool:
+    """pyarrow 설치 여부"""
+    return pa is not None
+
+
+def wants_arrow(accept_mimetypes) -> bool:
+    """
+    Accept 헤더가 JSON보다 Arrow 스트림을 선호하는지 확인
+
+    Args:
+        accept_mimetypes: request.accept_mimetypes
+
+    Returns:
+        bool: Arrow 응답 여부 (*/* 또는 Accept 없음이면 JSON)
+    """
+    return accept_mimetypes.best_match(['application/json', ARROW_STREAM_MIMETYPE]) == ARROW_STREAM_MIMETYPE
+
+
+def _session_schema():
+    return pa.schema([
+        ('session_id', pa.string()),
+        ('start_time', pa.string()),
+        ('end_time', pa.string()),
+        ('is_active', pa.bool_()),
+        ('enabled_sensors', pa.list_(pa.string())),
+        ('sample_rate', pa.int32()),
+        ('data_count', pa.int64()),
+        ('notes', pa.string()),
+        ('is_uploaded', pa.bool_()),
+        ('created_at', pa.string()),
+        ('updated_at', pa.string()),
+        ('change_seq', pa.int64()),
+        ('data_complete', pa.bool_()),
+        ('data_cursor', pa.struct([('sensor_type', pa.string()), ('timestamp', pa.int64())])),
+    ])
+
+
+def iter_pull_arrow(page: dict, float32: bool = False):
+    """
+    Pull 페이지를 Arrow IPC 스트림들로 직렬화
+
+    응답 본문은 연속된 IPC 스트림이다 (각 스트림은 스키마 + 레코드 배치 + EOS).
+    첫 스트림은 세션 메타데이터 (스키마 메타데이터 koodtx.page에 페이지 정보 JSON),
+    이후 센서 타입마다 하나의 스트림 (session_id, timestamp int64, data.<키> 축 값 열)이 이어진다.
+    스트림 종류는 스키마 메타데이터 koodtx.stream / koodtx.sensor_type으로 구분한다.
+
+    Args:
+        page: build_pull_page() 결과 + server_timestamp, sync_log_id
+        float32: 숫자 축 값을 float32로 전송 (기본 float64)
+
+    Yields:
+        bytes: IPC 스트림 하나
+    """
+    sessions = page['sessions']
+    page_info = {key: page[key] for key in PAGE_KEYS if key in page}
+
+    sessions_table = pa.Table.from_pylist(sessions, schema=_session_schema()).replace_schema_metadata({
+        'koodtx.stream': 'sessions',
+        'koodtx.page': json.dumps(page_info)
+    })
+    yield _ipc_stream(sessions_table)
+
+    # 센서 타입별 행 수집 (세션 순서, 세션 내 timestamp 순서 유지)
+    by_type = {}
+    for session in sessions:
+        for row in session.get('sensor_data') or []:
+            by_type.setdefault(row['sensor_type'], []).append((session['session_id'], row))
+
+    for sensor_type, rows in by_type.items():
+        yield _ipc_stream(_sensor_table(sensor_type, rows, float32))
+
+
+def iter_aligned_arrow(aligned: dict, float32: bool = False):
+    """
+    정렬 결과 (app.utils.resample.align_session)를 Arrow IPC 스트림 하나로 직렬화
+
+    열은 timestamp (int64) + {sensor_type}_{field} (NaN은 null), 스키마 메타데이터 koodtx.stream = aligned,
+    koodtx.aligned에 방법 / 격자 주파수 / 범위 JSON.
+
+    Yields:
+        bytes: IPC 스트림
+    """
+    float_type = pa.float32() if float32 else pa.float64()
+    columns = {'timestamp': pa.array(aligned['timestamp'], pa.int64())}
+    for name, values in aligned['columns'].items():
+        columns[name] = pa.array(values, float_type, from_pandas=True)
+
+    info = {key: aligned[key] for key in ('sensor_types', 'method', 'rate_hz', 'start_ts', 'end_ts')}
+    yield _ipc_stream(pa.table(columns).replace_schema_metadata({
+        'koodtx.stream': 'aligned',
+        'koodtx.aligned': json.dumps(info)
+    }))
+
+
+def _sensor_table(sensor_type: str, rows: list, float32: bool):
+    """
+    한 센서 타입의 행들을 열 지향 테이블로 변환
+
+    data의 각 키가 data.<키> 열이 된다 (숫자 -> float, bool -> bool, 그 외 -> string/JSON).
+    bucket 다운샘플링 행은 min.<키>, max.<키>, count 열을 추가로 가진다.
+    접두사로 구분하므로 session_id / timestamp / count 같은 키도 고정 열과 겹치지 않는다.
+    """
+    float_type = pa.float32() if float32 else pa.float64()
+
+    columns = {
+        'session_id': pa.array([session_id for session_id, _ in rows], pa.string()).dictionary_encode(),
+        'timestamp': pa.array([row['timestamp'] for _, row in rows], pa.int64()),
+    }
+
+    for source in ('data', 'min', 'max'):
+        values = [row.get(source) or {} for _, row in rows]
+        keys = []
+        for item in values:
+            for key in item:
+                if key not in keys:
+                    keys.append(key)
+        for key in keys:
+            columns[f'{source}.{key}'] = _column([item.get(key) for item in values], float_type)
+
+    if any('count' in row for _, row in rows):
+        columns['count'] = pa.array([row.get('count') for _, row in rows], pa.int64())
+
+    return pa.table(columns).replace_schema_metadata({
+        'koodtx.stream': 'sensor_data',
+        'koodtx.sensor_type': sensor_type
+    })
+
+
+def _column(values: list, float_type):
+    """값 목록의 타입에 맞는 Arrow 배열 (None은 null)"""
+    present = [v for v in values if v is not None]
+
+    if present and all(isinstance(v, bool) for v in present):
+        return pa.array(values, pa.bool_())
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return pa.array(values, float_type)
+    return pa.array([
+        None if v is None else v if isinstance(v, str) else json.dumps(v)
+        for v in values
+    ], pa.string())
+
+
+def _ipc_stream(table) -> bytes:
+    """테이블 하나를 IPC 스트림 바이트로 직렬화"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=ARROW_BATCH_ROWS):
+            writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
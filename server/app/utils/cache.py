@@ -0,0 +1,332 @@
+"""
+Pull Response Cache
+Redis 기반 Pull 페이지 / 세션 센서 데이터 캐시 (선택 사항, PULL_CACHE_ENABLED)
+"""
+
+import json
+import logging
+import time
+from functools import wraps
+import redis
+from app.utils.identity import _TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Redis 캐시가 꺼져 있을 때 워커 프로세스 내 동기화 상태 캐시 최대 사용자 수
+LOCAL_STATUS_MAX_ENTRIES = 10000
+
+
+def _fail_open(default=None):
+    """Redis 오류는 캐시 미스/무시로 처리 (요청은 실패하지 않음)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not self.enabled:
+                return default() if callable(default) else default
+            try:
+                return func(self, *args, **kwargs)
+            except redis.RedisError as e:
+                logger.warning('Pull cache error in %s: %s', func.__name__, e)
+                return default() if callable(default) else default
+        return wrapper
+    return decorator
+
+
+class PullCache:
+    """
+    Pull 응답 캐시
+
+    - 페이지: (user_id, Pull ETag) -> 직렬화된 페이지 (ETag에 data_version 포함)
+    - 세션 데이터: (session pk, updated_at, data_count) -> 직렬화된 sensor_data 목록
+    - 동기화 상태: user_id -> /status 응답 (짧은 TTL, SYNC_STATUS_CACHE_TTL). Redis 캐시가 꺼져 있으면
+      워커 프로세스 내 TTL 캐시 (Push한 워커는 즉시 무효화, 다른 워커는 TTL 안에 반영)
+    - Push 시 해당 사용자 페이지와 세션 데이터 키를 인덱스 셋으로 찾아 삭제
+    - 저장 바이트 합계가 PULL_CACHE_MAX_BYTES를 넘으면 마지막 접근 시간
+      (sorted set) 기준 LRU로 제거
+    - 적중/미스/절약 바이트/제거 횟수를 Redis 해시에 누적 (stats())
+    """
+
+    def __init__(self, app=None):
+        self.client = None
+        self.prefix = 'koodtx:pull'
+        self.ttl = 3600
+        self.status_ttl = 10
+        self.max_bytes = 0
+        self.local_status = _TTLCache(LOCAL_STATUS_MAX_ENTRIES, self.status_ttl)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, client=None):
+        """
+        Flask 앱 설정으로 초기화
+
+        Args:
+            app: Flask 애플리케이션
+            client: Redis 클라이언트 (생략 시 PULL_CACHE_REDIS_URL로 생성)
+        """
+        self.client = None
+        self.status_ttl = app.config.get('SYNC_STATUS_CACHE_TTL', self.status_ttl)
+        self.local_status = _TTLCache(LOCAL_STATUS_MAX_ENTRIES, self.status_ttl)
+        if not app.config.get('PULL_CACHE_ENABLED'):
+            return
+
+        self.client = client or redis.Redis.from_url(app.config['PULL_CACHE_REDIS_URL'])
+        self.prefix = app.config.get('PULL_CACHE_PREFIX', self.prefix)
+        self.ttl = app.config['PULL_CACHE_TTL']
+        self.max_bytes = app.config['PULL_CACHE_MAX_BYTES']
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+
+    def _key(self, *parts) -> str:
+        return ':'.join([self.prefix] + [str(p) for p in parts])
+
+    def page_key(self, user_id: int, etag: str) -> str:
+        return self._key('page', user_id, etag)
+
+    def session_key(self, session) -> str:
+        # change_seq는 데이터를 바꾸는 모든 트랜잭션(Push, 정리 작업)에서 증가하므로
+        # updated_at / data_count가 같게 남는 경합에서도 키가 달라짐
+        updated = int(session.updated_at.timestamp() * 1000000)
+        version = f'{updated}-{session.data_count or 0}-{session.change_seq or 0}'
+        return self._key('session', session.id, version)
+
+    def status_key(self, user_id: int) -> str:
+        return self._key('status', user_id)
+
+    # ------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------
+
+    @_fail_open()
+    def get_page(self, user_id: int, etag: str):
+        """
+        캐시된 Pull 페이지 조회
+
+        Returns:
+            dict | None: build_pull_page() 결과 (미스면 None)
+        """
+        key = self.page_key(user_id, etag)
+        blob = self.client.get(key)
+        self._record([(key, blob)])
+        return json.loads(blob) if blob is not None else None
+
+    @_fail_open()
+    def set_page(self, user_id: int, etag: str, page: dict):
+        """Pull 페이지 저장"""
+        key = self.page_key(user_id, etag)
+        blob = json.dumps(page, separators=(',', ':'))
+        self._store(key, blob, self._key('idx', 'user', user_id))
+
+    # ------------------------------------------------------------
+    # Session sensor data
+    # ------------------------------------------------------------
+
+    @_fail_open(default=dict)
+    def get_session_data(self, sessions: list) -> dict:
+        """
+        캐시된 세션 센서 데이터 일괄 조회 (MGET 1회)
+
+        Returns:
+            dict: {session.id: sensor_data 목록} (적중한 세션만)
+        """
+        if not sessions:
+            return {}
+
+        keys = [self.session_key(session) for session in sessions]
+        blobs = self.client.mget(keys)
+
+        self._record(list(zip(keys, blobs)))
+
+        found = {}
+        for session, blob in zip(sessions, blobs):
+            if blob is not None:
+                found[session.id] = json.loads(blob)
+        return found
+
+    @_fail_open()
+    def set_session_data(self, session, sensor_data: list):
+        """세션 센서 데이터 저장"""
+        blob = json.dumps(sensor_data, separators=(',', ':'))
+        self._store(self.session_key(session), blob, self._key('idx', 'session', session.id))
+
+    # ------------------------------------------------------------
+    # Sync status
+    # ------------------------------------------------------------
+
+    def get_status(self, user_id: int):
+        """
+        캐시된 동기화 상태 조회 (Redis 캐시가 꺼져 있으면 워커 프로세스 내 캐시)
+
+        Returns:
+            dict | None: build_sync_status() 결과 (미스면 None)
+        """
+        if not self.enabled:
+            return self.local_status.get(user_id) if self.status_ttl else None
+        return self._get_status(user_id)
+
+    @_fail_open()
+    def _get_status(self, user_id: int):
+        key = self.status_key(user_id)
+        blob = self.client.get(key)
+        self._record([(key, blob)])
+        return json.loads(blob) if blob is not None else None
+
+    def set_status(self, user_id: int, status: dict):
+        """동기화 상태 저장 (status_ttl초, Push 시 invalidate_user로 삭제)"""
+        if not self.status_ttl:
+            return
+        if not self.enabled:
+            self.local_status.set(user_id, status)
+            return
+        self._set_status(user_id, status)
+
+    @_fail_open()
+    def _set_status(self, user_id: int, status: dict):
+        blob = json.dumps(status, separators=(',', ':'))
+        self._store(self.status_key(user_id), blob, self._key('idx', 'user', user_id), ttl=self.status_ttl)
+
+    # ------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------
+
+    def invalidate_user(self, user_id: int):
+        """사용자의 캐시된 Pull 페이지 / 동기화 상태 삭제"""
+        self.local_status.pop(user_id)
+        self._invalidate_user(user_id)
+
+    @_fail_open()
+    def _invalidate_user(self, user_id: int):
+        self._invalidate_index(self._key('idx', 'user', user_id))
+
+    @_fail_open()
+    def invalidate_session(self, session_pk: int):
+        """세션의 캐시된 센서 데이터 삭제"""
+        self._invalidate_index(self._key('idx', 'session', session_pk))
+
+    def _invalidate_index(self, index_key: str):
+        members = [m.decode('utf-8') for m in self.client.smembers(index_key)]
+        if members:
+            self._forget(members)
+        self.client.delete(index_key)
+
+    # ------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------
+
+    @_fail_open(default=lambda: {'enabled': False})
+    def stats(self) -> dict:
+        """
+        캐시 지표
+
+        Returns:
+            dict: hits, misses, hit_rate, bytes_saved, bytes_stored, keys, evictions
+        """
+        raw = self.client.hgetall(self._key('stats'))
+        values = {k.decode('utf-8'): int(v) for k, v in raw.items()}
+        hits = values.get('hits', 0)
+        misses = values.get('misses', 0)
+
+        return {
+            'enabled': True,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            'bytes_saved': values.get('bytes_saved', 0),
+            'bytes_stored': int(self.client.get(self._key('bytes')) or 0),
+            'max_bytes': self.max_bytes,
+            'keys': self.client.zcard(self._key('lru')),
+            'evictions': values.get('evictions', 0),
+        }
+
+    # ------------------------------------------------------------
+    # Internals (LRU bookkeeping)
+    # ------------------------------------------------------------
+
+    def _record(self, lookups: list):
+        """적중/미스 기록, 적중한 키의 LRU 접근 시간 갱신 (파이프라인 1회)"""
+        hits = {key: blob for key, blob in lookups if blob is not None}
+        misses = len(lookups) - len(hits)
+
+        pipe = self.client.pipeline(transaction=False)
+        if hits:
+            pipe.hincrby(self._key('stats'), 'hits', len(hits))
+            pipe.hincrby(self._key('stats'), 'bytes_saved', sum(len(blob) for blob in hits.values()))
+            now = time.time()
+            pipe.zadd(self._key('lru'), {key: now for key in hits})
+        if misses:
+            pipe.hincrby(self._key('stats'), 'misses', misses)
+        pipe.execute()
+
+    def _store(self, key: str, blob: str, index_key: str, ttl: int = None):
+        """값 저장 + 크기/LRU/인덱스 기록, 상한 초과 시 제거 (ttl 생략 시 기본 TTL)"""
+        size = len(blob.encode('utf-8'))
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        self._forget([key])
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(key, blob, ex=ttl or self.ttl)
+        pipe.hset(self._key('sizes'), key, size)
+        pipe.zadd(self._key('lru'), {key: time.time()})
+        pipe.sadd(index_key, key)
+        pipe.expire(index_key, self.ttl)
+        pipe.incrby(self._key('bytes'), size)
+        total = pipe.execute()[-1]
+
+        if self.max_bytes and total > self.max_bytes:
+            self._evict()
+
+    def _evict(self, batch: int = 32):
+        """총 크기가 상한의 90% 이하가 될 때까지 가장 오래 접근하지 않은 키부터 제거"""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        while True:
+            excess = int(self.client.get(self._key('bytes')) or 0) - target
+            if excess <= 0:
+                break
+
+            oldest = [m.decode('utf-8') for m in self.client.zrange(self._key('lru'), 0, batch - 1)]
+            if not oldest:
+                # 기록이 비었는데 합계가 남아 있으면 (TTL 만료 등) 합계를 초기화
+                self.client.set(self._key('bytes'), 0)
+                break
+
+            # 필요한 만큼만 제거 (가장 오래된 키부터)
+            victims = []
+            freed = 0
+            for key, size in zip(oldest, self.client.hmget(self._key('sizes'), oldest)):
+                victims.append(key)
+                freed += int(size or 0)
+                if freed >= excess:
+                    break
+
+            self._forget(victims)
+            evicted += len(victims)
+
+        if evicted:
+            self.client.hincrby(self._key('stats'), 'evictions', evicted)
+
+    def _forget(self, keys: list):
+        """키 삭제 및 크기/LRU 기록 정리 (TTL로 이미 만료된 키 포함)"""
+        sizes = self.client.hmget(self._key('sizes'), keys)
+        freed = sum(int(s) for s in sizes if s is not None)
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(*keys)
+        pipe.hdel(self._key('sizes'), *keys)
+        pipe.zrem(self._key('lru'), *keys)
+        if freed:
+            pipe.decrby(self._key('bytes'), freed)
+        pipe.execute()
+
+
+# Extension instance (create_app에서 init_app)
+pull_cache = PullCache()
@@ -0,0 +1,119 @@
+"""
+Change Feed Helpers
+변경 시퀀스 기록 (Push, 정리 작업) 및 /api/sync/changes 피드 조회
+"""
+
+from app import db
+from app.models.change_log import ChangeCounter, SyncChange
+
+
+def counter_name(user_id: int) -> str:
+    """사용자 변경 시퀀스 카운터 이름 (/changes는 사용자별 피드)"""
+    return f'user:{user_id}'
+
+
+def record_push_changes(user_id: int, session, batches: dict) -> int:
+    """
+    Push 변경 기록: 세션 변경 1건 + 센서 타입별 샘플 배치 1건씩
+
+    배치의 행(SensorData)에는 배치 시퀀스를 change_seq로 기록한다 (새 행은 삽입 전에 호출).
+    사용자 카운터 행 잠금은 커밋까지 유지되므로 나머지 작업 (COUNT, 동기화 로그) 뒤에 호출한다.
+
+    Args:
+        user_id: 사용자 ID
+        session: RecordingSession
+        batches: {sensor_type: [SensorData, ...]} (삽입/갱신된 행)
+
+    Returns:
+        int: 마지막 시퀀스
+    """
+    first = ChangeCounter.allocate(1 + len(batches), name=counter_name(user_id))
+
+    session.change_seq = first
+    changes = [SyncChange(
+        seq=first,
+        user_id=user_id,
+        session_uuid=session.session_id,
+        kind='session',
+        op='upsert'
+    )]
+
+    for seq, (sensor_type, records) in enumerate(batches.items(), start=first + 1):
+        timestamps = [record.timestamp for record in records]
+        for record in records:
+            record.change_seq = seq
+        changes.append(SyncChange(
+            seq=seq,
+            user_id=user_id,
+            session_uuid=session.session_id,
+            kind='samples',
+            op='upsert',
+            sensor_type=sensor_type,
+            count=len(records),
+            ts_min=min(timestamps) if timestamps else None,
+            ts_max=max(timestamps) if timestamps else None
+        ))
+
+    db.session.add_all(changes)
+    return first + len(batches)
+
+
+def record_session_changes(sessions: list, kind: str = 'session', op: str = 'upsert') -> int:
+    """
+    여러 세션의 변경 기록 (정리 작업 등)
+
+    Args:
+        sessions: RecordingSession 목록
+        kind: 'session' (메타데이터 변경) 또는 'samples' (센서 데이터 변경)
+        op: 'upsert' 또는 'delete'
+
+    Returns:
+        dict: {user_id: 마지막 시퀀스} (세션이 없으면 빈 dict)
+    """
+    by_user = {}
+    for session in sessions:
+        by_user.setdefault(session.user_id, []).append(session)
+
+    last_seqs = {}
+    # 사용자 id 순으로 카운터를 잠가 동시 정리 작업 간 교착을 피함
+    for user_id in sorted(by_user):
+        user_sessions = by_user[user_id]
+        first = ChangeCounter.allocate(len(user_sessions), name=counter_name(user_id))
+        for seq, session in enumerate(user_sessions, start=first):
+            session.change_seq = seq
+            db.session.add(SyncChange(
+                seq=seq,
+                user_id=user_id,
+                session_uuid=session.session_id,
+                kind=kind,
+                op=op
+            ))
+        last_seqs[user_id] = first + len(user_sessions) - 1
+    return last_seqs
+
+
+def changes_since(user_id: int, since: int, limit: int) -> dict:
+    """
+    사용자 변경 피드 조회 (seq > since, seq 오름차순)
+
+    Args:
+        user_id: 사용자 ID
+        since: 마지막으로 처리한 시퀀스 (0이면 처음부터)
+        limit: 최대 변경 수
+
+    Returns:
+        dict: changes, next_since (다음 요청의 since), has_more
+    """
+    rows = SyncChange.query.filter(
+        SyncChange.user_id == user_id,
+        SyncChange.seq > since
+    ).order_by(SyncChange.seq.asc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        'changes': [row.to_dict() for row in rows],
+        'next_since': rows[-1].seq if rows else since,
+        'has_more': has_more
+    }
@@ -0,0 +1,222 @@
+"""
+Response Compression
+Accept-Encoding 협상 (zstd, br, gzip) 및 스트리밍 JSON 압축 응답
+"""
+
+import json
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# 압축 전 JSON 조각을 모으는 크기 (너무 작은 조각마다 압축기를 호출하지 않음)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# C 인코더로 한 번에 직렬화하는 리스트 항목 수 (센서 데이터 행 묶음)
+JSON_ENCODE_BATCH = 1000
+
+_json_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+def available_encodings() -> list:
+    """
+    서버에서 사용 가능한 인코딩 (선호 순서)
+
+    Returns:
+        list: 예) ['zstd', 'br', 'gzip']
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings.append('gzip')
+    return encodings
+
+
+def negotiate_encoding(accept_encodings) -> str:
+    """
+    Accept-Encoding 헤더로 응답 인코딩 결정
+
+    Args:
+        accept_encodings: request.accept_encodings
+
+    Returns:
+        str | None: 'zstd', 'br', 'gzip' 또는 None (압축 안 함)
+    """
+    if not current_app.config.get('COMPRESSION_ENABLED', True):
+        return None
+    return accept_encodings.best_match(available_encodings())
+
+
+def _compressor(encoding: str):
+    """인코딩별 스트리밍 압축기 (compress(bytes) -> bytes, flush() -> bytes)"""
+    config = current_app.config
+
+    if encoding == 'gzip':
+        return zlib.compressobj(config.get('COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config.get('COMPRESSION_BR_QUALITY', 5))
+        return _Adapter(compressor.process, compressor.finish)
+
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=config.get('COMPRESSION_ZSTD_LEVEL', 3)).compressobj()
+        return _Adapter(compressor.compress, compressor.flush)
+
+    raise ValueError(f'Unsupported encoding: {encoding}')
+
+
+class _Adapter:
+    """brotli / zstandard 압축기를 zlib compressobj 인터페이스로 맞춤"""
+
+    def __init__(self, compress, flush):
+        self.compress = compress
+        self.flush = flush
+
+
+def encoded_etag(etag: str, encoding: str = None) -> str:
+    """
+    인코딩별 ETag (압축 본문과 원본 본문은 바이트가 다르므로 강한 ETag를 공유하지 않음)
+
+    Args:
+        etag: 원본 (identity) 본문 ETag
+        encoding: 협상된 Content-Encoding (None이면 원본)
+
+    Returns:
+        str: 인코딩 접미사가 붙은 ETag (예: '<etag>-gzip')
+    """
+    return f'{etag}-{encoding}' if encoding else etag
+
+
+def _has_list(value) -> bool:
+    return isinstance(value, dict) and any(isinstance(item, (list, tuple)) for item in value.values())
+
+
+def _iter_json_pieces(value):
+    """
+    하위 리스트가 있는 dict (페이지, 세션)는 키 단위로 나누고, 리스트는 JSON_ENCODE_BATCH개씩
+    C 인코더 (JSONEncoder.encode)로 한 번에 직렬화
+    """
+    if _has_list(value):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            yield (',' if index else '') + _json_encoder.encode(str(key)) + ':'
+            yield from _iter_json_pieces(item)
+        yield '}'
+    elif isinstance(value, (list, tuple)):
+        yield '['
+        if value and _has_list(value[0]):
+            for index, item in enumerate(value):
+                if index:
+                    yield ','
+                yield from _iter_json_pieces(item)
+        else:
+            for start in range(0, len(value), JSON_ENCODE_BATCH):
+                batch = list(value[start:start + JSON_ENCODE_BATCH])
+                yield (',' if start else '') + _json_encoder.encode(batch)[1:-1]
+        yield ']'
+    else:
+        yield _json_encoder.encode(value)
+
+
+def iter_json(payload, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    JSON을 문자열 하나로 만들지 않고 chunk_size 단위 바이트 조각으로 생성
+
+    세션 목록처럼 하위 리스트를 가진 구조는 항목 단위로 나누고, 센서 데이터 행은 묶음마다
+    C 인코더로 직렬화한다 (JSONEncoder.iterencode는 순수 Python 구현이라 느림).
+
+    Args:
+        payload: JSON 직렬화 가능한 객체
+        chunk_size: 조각 크기 (바이트, 근사값)
+
+    Yields:
+        bytes: UTF-8 JSON 조각
+    """
+    buffer = []
+    size = 0
+    for piece in _iter_json_pieces(payload):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def stream_encoded(chunks, encoding: str):
+    """
+    바이트 조각 스트림을 압축하며 그대로 전달 (전체 본문을 버퍼링하지 않음)
+
+    압축기는 호출 시점에 (앱 컨텍스트 안에서) 설정을 읽어 만든다. WSGI 서버는 뷰가 반환되고
+    컨텍스트가 정리된 뒤 본문을 순회하므로 제너레이터 안에서 current_app을 읽으면 안 된다.
+
+    Args:
+        chunks: bytes 이터러블
+        encoding: 'zstd', 'br', 'gzip'
+
+    Returns:
+        Iterator[bytes]: 압축된 조각
+    """
+    return _compress_chunks(chunks, _compressor(encoding))
+
+
+def _compress_chunks(chunks, compressor):
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    tail = compressor.flush()
+    if tail:
+        yield tail
+
+
+def negotiated_response(chunks, mimetype: str, status: int = 200, headers: dict = None):
+    """
+    바이트 조각 스트림 응답 (Accept-Encoding이 허용하면 스트리밍 압축)
+
+    Args:
+        chunks: bytes 이터러블
+        mimetype: 응답 Content-Type
+        status: HTTP 상태 코드
+        headers: 추가 헤더 (예: ETag)
+
+    Returns:
+        Response: 스트리밍 응답 (Vary: Accept-Encoding)
+    """
+    encoding = negotiate_encoding(request.accept_encodings)
+    body = stream_encoded(chunks, encoding) if encoding else chunks
+
+    response = current_app.response_class(body, status=status, mimetype=mimetype, headers=headers)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def compressed_json_response(payload, status: int = 200, headers: dict = None):
+    """
+    Accept-Encoding이 허용하면 스트리밍 압축 JSON 응답 생성
+
+    Args:
+        payload: 응답 객체
+        status: HTTP 상태 코드
+        headers: 추가 헤더 (예: ETag)
+
+    Returns:
+        Response | None: 압축 응답 (협상된 인코딩이 없으면 None, 호출자가 일반 JSON 응답)
+    """
+    if negotiate_encoding(request.accept_encodings) is None:
+        return None
+    return negotiated_response(iter_json(payload), 'application/json', status, headers)
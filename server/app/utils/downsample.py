@@ -0,0 +1,208 @@
+"""
+Sensor Sample Filtering & Downsampling
+Pull용 센서 타입/시간 범위 필터와 다운샘플링 (SQL 간격 추출, NumPy 구간 집계)
+"""
+
+import numpy as np
+from sqlalchemy import case, func, select
+from app.models.sensor_data import SensorData
+
+DOWNSAMPLE_METHODS = ('stride', 'bucket')
+
+
+def parse_sample_filter(data: dict, max_points_limit: int) -> dict:
+    """
+    Pull 요청의 샘플 필터 파라미터 파싱
+
+    Args:
+        data: Pull 요청 본문 (sensor_types, start_ts, end_ts, since_seq, max_points, downsample)
+        max_points_limit: max_points 상한
+
+    Returns:
+        dict | None: {'sensor_types', 'start_ts', 'end_ts', 'since_seq', 'max_points', 'downsample'}
+                     (필터 파라미터가 없으면 None)
+
+    Raises:
+        ValueError: 파라미터가 올바르지 않은 경우 (메시지는 그대로 400 응답에 사용)
+    """
+    keys = ('sensor_types', 'start_ts', 'end_ts', 'since_seq', 'max_points', 'downsample')
+    if not any(data.get(key) is not None for key in keys):
+        return None
+
+    sensor_types = data.get('sensor_types')
+    if sensor_types is not None:
+        if not isinstance(sensor_types, list) or not sensor_types \
+                or not all(isinstance(t, str) for t in sensor_types):
+            raise ValueError('sensor_types must be a non-empty list of strings')
+
+    start_ts = data.get('start_ts')
+    end_ts = data.get('end_ts')
+    for name, value in (('start_ts', start_ts), ('end_ts', end_ts)):
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            raise ValueError(f'{name} must be an integer timestamp (milliseconds)')
+    if start_ts is not None and end_ts is not None and start_ts > end_ts:
+        raise ValueError('start_ts must be <= end_ts')
+
+    since_seq = data.get('since_seq')
+    if since_seq is not None and (not isinstance(since_seq, int) or isinstance(since_seq, bool) or since_seq < 0):
+        raise ValueError('since_seq must be a non-negative integer')
+
+    max_points = data.get('max_points')
+    downsample = data.get('downsample')
+    if downsample is not None and max_points is None:
+        raise ValueError('downsample requires max_points')
+    if max_points is not None:
+        if not isinstance(max_points, int) or isinstance(max_points, bool) \
+                or max_points < 1 or max_points > max_points_limit:
+            raise ValueError(f'max_points must be between 1 and {max_points_limit}')
+        if data.get('data_cursors') or data.get('max_records') is not None:
+            raise ValueError('max_points cannot be combined with data_cursors or max_records')
+    downsample = downsample or 'stride'
+    if downsample not in DOWNSAMPLE_METHODS:
+        raise ValueError(f'downsample must be one of: {", ".join(DOWNSAMPLE_METHODS)}')
+
+    return {
+        'sensor_types': sensor_types,
+        'start_ts': start_ts,
+        'end_ts': end_ts,
+        'since_seq': since_seq or None,
+        'max_points': max_points,
+        'downsample': downsample
+    }
+
+
+def sample_conditions(sample_filter: dict) -> list:
+    """
+    센서 타입 / 시간 범위 (start_ts 이상, end_ts 이하) / 변경 시퀀스 (since_seq 초과) 조건
+
+    Args:
+        sample_filter: parse_sample_filter() 결과 (None 허용)
+
+    Returns:
+        list: SQLAlchemy 조건 목록
+    """
+    if not sample_filter:
+        return []
+
+    conditions = []
+    if sample_filter['sensor_types']:
+        conditions.append(SensorData.sensor_type.in_(sample_filter['sensor_types']))
+    if sample_filter['start_ts'] is not None:
+        conditions.append(SensorData.timestamp >= sample_filter['start_ts'])
+    if sample_filter['end_ts'] is not None:
+        conditions.append(SensorData.timestamp <= sample_filter['end_ts'])
+    if sample_filter.get('since_seq'):
+        conditions.append(SensorData.change_seq > sample_filter['since_seq'])
+    return conditions
+
+
+def stride_select(session_ids: list, sample_filter: dict):
+    """
+    (세션, 센서 타입) 시리즈마다 N번째 샘플만 선택하는 쿼리 (SQL 윈도 함수)
+
+    N = ceil(시리즈 샘플 수 / max_points) 이므로 시리즈당 최대 max_points개가 반환되고
+    나머지 행은 DB에서 전송되지 않는다.
+
+    Args:
+        session_ids: RecordingSession.id 목록
+        sample_filter: parse_sample_filter() 결과 (max_points 필수)
+
+    Returns:
+        Select: (session_id, sensor_type, timestamp, data) 행, (session_id, timestamp) 순
+    """
+    max_points = sample_filter['max_points']
+    series = (SensorData.session_id, SensorData.sensor_type)
+
+    ranked = select(
+        SensorData.session_id,
+        SensorData.sensor_type,
+        SensorData.timestamp,
+        SensorData.data,
+        func.row_number().over(partition_by=series, order_by=SensorData.timestamp).label('rn'),
+        func.count().over(partition_by=series).label('cnt')
+    ).where(
+        SensorData.session_id.in_(session_ids),
+        *sample_conditions(sample_filter)
+    ).subquery()
+
+    # 정수 나눗셈 (SQLAlchemy 2의 '/'는 PostgreSQL에서 NUMERIC 나눗셈이 되어 step이 소수가 됨)
+    step = case(
+        (ranked.c.cnt > max_points, (ranked.c.cnt + max_points - 1) // max_points),
+        else_=1
+    )
+
+    return select(
+        ranked.c.session_id,
+        ranked.c.sensor_type,
+        ranked.c.timestamp,
+        ranked.c.data
+    ).where(
+        (ranked.c.rn - 1) % step == 0
+    ).order_by(ranked.c.session_id.asc(), ranked.c.timestamp.asc())
+
+
+def bucket_series(sensor_type: str, timestamps: list, data: list, max_points: int) -> list:
+    """
+    한 시리즈를 max_points개의 동일 샘플 수 구간으로 나눠 구간별 mean / min / max 계산
+
+    숫자 필드만 집계하며 (문자열 등은 제외), 필드가 없는 샘플은 해당 필드 집계에서 빠진다.
+    샘플 수가 max_points 이하이면 원본 샘플을 그대로 반환한다.
+
+    Args:
+        sensor_type: 센서 타입
+        timestamps: 타임스탬프 목록 (오름차순)
+        data: 센서 데이터 dict 목록
+        max_points: 최대 구간 수
+
+    Returns:
+        list: [{'sensor_type', 'timestamp'(구간 시작), 'data'(평균), 'min', 'max', 'count'}]
+    """
+    n = len(timestamps)
+    if n <= max_points:
+        return [
+            {'sensor_type': sensor_type, 'timestamp': ts, 'data': values}
+            for ts, values in zip(timestamps, data)
+        ]
+
+    fields = []
+    for values in data:
+        for key, value in values.items():
+            if key not in fields and isinstance(value, (int, float)) and not isinstance(value, bool):
+                fields.append(key)
+
+    matrix = np.full((n, len(fields)), np.nan)
+    for col, key in enumerate(fields):
+        matrix[:, col] = [
+            v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan
+            for v in (values.get(key) for values in data)
+        ]
+
+    # 동일 샘플 수 구간: 구간 번호 = i * max_points // n
+    bucket_ids = np.arange(n) * max_points // n
+    starts = np.flatnonzero(np.diff(bucket_ids, prepend=-1))
+    counts = np.diff(np.append(starts, n))
+
+    valid = ~np.isnan(matrix)
+    sums = np.add.reduceat(np.where(valid, matrix, 0.0), starts, axis=0)
+    valid_counts = np.add.reduceat(valid.astype(np.int64), starts, axis=0)
+    mins = np.fmin.reduceat(matrix, starts, axis=0)
+    maxs = np.fmax.reduceat(matrix, starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / valid_counts
+
+    ts = np.asarray(timestamps, dtype=np.int64)
+
+    def _row(values, i):
+        return {key: float(values[i, col]) for col, key in enumerate(fields) if valid_counts[i, col]}
+
+    return [
+        {
+            'sensor_type': sensor_type,
+            'timestamp': int(ts[start]),
+            'data': _row(means, i),
+            'min': _row(mins, i),
+            'max': _row(maxs, i),
+            'count': int(counts[i])
+        }
+        for i, start in enumerate(starts)
+    ]
@@ -0,0 +1,154 @@
+"""
+Identity Cache
+워커 프로세스 내 사용자 정보 조회 캐시 (TTL + LRU, 사용자 변경 시 무효화)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from app import db
+from app.models.user import User
+
+
+class _TTLCache:
+    """TTL + 최대 개수(LRU) 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+class IdentityCache:
+    """
+    JWT 인증 라우트용 조회 캐시 (워커 프로세스 단위)
+
+    - 사용자: user_id -> User.to_dict() (/api/auth/me)
+    - User 행 변경(ORM flush: 프로필 수정, 비밀번호 재해시, 삭제) 시 이 워커의 항목을 즉시 무효화,
+      다른 워커와 일괄 UPDATE(data_version 증가)는 IDENTITY_CACHE_TTL초 안에 반영
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.users = _TTLCache(1000, 30)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 앱 설정으로 초기화
+
+        Args:
+            app: Flask 애플리케이션
+        """
+        self.enabled = app.config.get('IDENTITY_CACHE_ENABLED', True)
+        ttl = app.config.get('IDENTITY_CACHE_TTL', 30)
+        max_entries = app.config.get('IDENTITY_CACHE_MAX_ENTRIES', 10000)
+        self.users = _TTLCache(max_entries, ttl)
+
+    # ------------------------------------------------------------
+    # Users
+    # ------------------------------------------------------------
+
+    def user_profile(self, user_id) -> dict:
+        """
+        사용자 정보 조회 (캐시 우선)
+
+        Args:
+            user_id: 사용자 ID (JWT identity)
+
+        Returns:
+            dict | None: User.to_dict() (없으면 None, 없는 사용자는 캐시하지 않음)
+        """
+        user_id = int(user_id)
+        if self.enabled:
+            profile = self.users.get(user_id)
+            if profile is not None:
+                return profile
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+
+        profile = user.to_dict()
+        if self.enabled:
+            self.users.set(user_id, profile)
+        return profile
+
+    def invalidate_user(self, user_id):
+        """사용자 항목 삭제 (이 워커)"""
+        self.users.pop(int(user_id))
+
+    # ------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        캐시 지표 (이 워커 기준)
+
+        Returns:
+            dict: {'enabled', 'users': {...}} (entries, hits, misses, hit_rate, evictions)
+        """
+        return {
+            'enabled': self.enabled,
+            'users': self.users.stats(),
+        }
+
+
+# Extension instance (create_app에서 init_app)
+identity_cache = IdentityCache()
+
+
+def _invalidate_user(mapper, connection, target):
+    """User 행이 ORM으로 변경/삭제되면 이 워커의 캐시 항목 삭제"""
+    identity_cache.invalidate_user(target.id)
+
+
+event.listen(User, 'after_update', _invalidate_user)
+event.listen(User, 'after_delete', _invalidate_user)
@@ -0,0 +1,344 @@
+"""
+Sync Log Writer
+동기화 로그 기록 (요청 트랜잭션에 INSERT 1회, 또는 메모리 / Redis 버퍼 + 백그라운드 일괄 저장)
+"""
+
+import atexit
+import collections
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from datetime import datetime
+import redis
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.models.sync_log import SyncLog
+
+logger = logging.getLogger(__name__)
+
+SYNC_LOG_MODES = ('off', 'memory', 'redis')
+
+# 클라이언트 요청 ID (UUID, ULID 등)
+REQUEST_ID_PATTERN = re.compile(r'^[0-9A-Za-z-]{8,36}$')
+
+# JSON 직렬화 시 문자열로 변환되는 시간 컬럼
+_DATETIME_KEYS = ('started_at', 'completed_at', 'created_at')
+
+
+def resolve_request_id(headers, data: dict) -> str:
+    """
+    요청 ID 결정 (X-Request-ID 헤더 > 본문 request_id > 서버 생성 UUID)
+
+    클라이언트가 만든 ID를 쓰면 응답을 기다리지 않고도 로그와 요청을 연결할 수 있다.
+
+    Args:
+        headers: request.headers
+        data: 요청 본문
+
+    Returns:
+        str: 요청 ID
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    request_id = headers.get('X-Request-ID') or (data or {}).get('request_id')
+    if request_id is None:
+        return uuid.uuid4().hex
+    if not isinstance(request_id, str) or not REQUEST_ID_PATTERN.match(request_id):
+        raise ValueError('request_id must be 8-36 characters of [0-9A-Za-z-] (UUID or ULID)')
+    return request_id
+
+
+def sync_record(user_id: int, sync_type: str, request_id: str, started_at: datetime,
+                status: str = 'success', session_id: int = None, records_count: int = 0,
+                duplicates_count: int = 0, errors_count: int = 0, error_message: str = None,
+                metadata: dict = None) -> dict:
+    """
+    sync_logs 행 dict 생성 (요청 끝에 한 번에 기록, 모든 행이 같은 키를 가짐)
+
+    Returns:
+        dict: sync_logs 컬럼 dict
+    """
+    return {
+        'user_id': user_id,
+        'sync_type': sync_type,
+        'request_id': request_id,
+        'session_id': session_id,
+        'records_count': records_count,
+        'duplicates_count': duplicates_count,
+        'errors_count': errors_count,
+        'status': status,
+        'error_message': error_message,
+        'metadata': metadata,
+        'started_at': started_at,
+        'completed_at': datetime.utcnow(),
+        'created_at': started_at,
+    }
+
+
+class SyncLogWriter:
+    """
+    동기화 로그 기록기
+
+    - off (기본): 요청 트랜잭션에 INSERT 1회 (커밋은 호출자), 로그 ID 반환
+    - memory: 워커 프로세스 메모리 큐에 적재 (최대 SYNC_LOG_MAX_BUFFER, 초과 시 오래된 것부터 버림)
+    - redis: Redis 리스트에 적재 (워커 재시작에도 유지, 여러 워커가 LPOP으로 나눠 저장)
+    - 버퍼 모드에서는 워커마다 백그라운드 스레드가 SYNC_LOG_FLUSH_INTERVAL초마다 또는
+      SYNC_LOG_BATCH_SIZE건이 쌓이면 다중 행 INSERT로 저장 (핸들러는 DB를 기다리지 않음)
+    - DB 연결 오류(OperationalError)면 버퍼로 되돌려 다음 주기에 재시도, 그 외 일괄 저장 실패는
+      한 행씩 다시 저장하여 저장할 수 없는 행만 버림 (한 행 때문에 이후 저장이 막히지 않음)
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.mode = 'off'
+        self.client = None
+        self.key = 'koodtx:sync_logs'
+        self.batch_size = 500
+        self.flush_interval = 2.0
+        self.max_buffer = 100000
+        self._buffer = collections.deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+        self._flusher_pid = None
+        self.written = 0
+        self.dropped = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, client=None):
+        """
+        Flask 앱 설정으로 초기화
+
+        Args:
+            app: Flask 애플리케이션
+            client: Redis 클라이언트 (redis 모드, 생략 시 SYNC_LOG_REDIS_URL로 생성)
+        """
+        mode = app.config.get('SYNC_LOG_BUFFER', 'off')
+        if mode not in SYNC_LOG_MODES:
+            raise ValueError(f'SYNC_LOG_BUFFER must be one of: {", ".join(SYNC_LOG_MODES)}')
+
+        self.app = app
+        self.mode = mode
+        self.client = None
+        self._flusher = None
+        self.batch_size = app.config.get('SYNC_LOG_BATCH_SIZE', self.batch_size)
+        self.flush_interval = app.config.get('SYNC_LOG_FLUSH_INTERVAL', self.flush_interval)
+        self.max_buffer = app.config.get('SYNC_LOG_MAX_BUFFER', self.max_buffer)
+        self.key = app.config.get('SYNC_LOG_REDIS_KEY', self.key)
+
+        if mode == 'redis':
+            self.client = client or redis.Redis.from_url(app.config['SYNC_LOG_REDIS_URL'])
+
+    @property
+    def buffered(self) -> bool:
+        return self.mode != 'off'
+
+    # ------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------
+
+    def write(self, record: dict):
+        """
+        동기화 로그 기록
+
+        Args:
+            record: sync_record() 결과
+
+        Returns:
+            int | None: 로그 ID (off 모드) / None (버퍼 모드)
+        """
+        if not self.buffered:
+            table = SyncLog.__table__
+            return db.session.execute(insert(table).values(record).returning(table.c.id)).scalar()
+
+        queued = 0
+        if self.mode == 'redis':
+            try:
+                # RPUSH가 적재 후 리스트 길이를 반환하므로 LLEN 왕복 없이 대기 수 확인
+                queued = self.client.rpush(self.key, json.dumps(_to_json(record), separators=(',', ':')))
+            except redis.RedisError as e:
+                # Redis 장애 시 메모리 버퍼로 대체
+                logger.warning('Sync log buffer error, keeping in memory: %s', e)
+                self._append(record)
+        else:
+            self._append(record)
+
+        self._ensure_flusher()
+        if queued + len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return None
+
+    def _append(self, record: dict):
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(record)
+
+    def pending(self) -> int:
+        """저장 대기 중인 로그 수 (이 워커 메모리 + Redis 리스트)"""
+        count = len(self._buffer)
+        if self.mode == 'redis':
+            try:
+                count += self.client.llen(self.key)
+            except redis.RedisError:
+                pass
+        return count
+
+    # ------------------------------------------------------------
+    # Flush
+    # ------------------------------------------------------------
+
+    def flush(self) -> int:
+        """
+        버퍼의 로그를 모두 저장 (앱 컨텍스트 필요)
+
+        Returns:
+            int: 저장한 로그 수
+        """
+        total = 0
+        while True:
+            batch = self._take(self.batch_size)
+            if not batch:
+                return total
+            try:
+                db.session.execute(insert(SyncLog.__table__), batch)
+                db.session.commit()
+            except OperationalError as e:
+                db.session.rollback()
+                logger.error('Sync log flush failed (%d records requeued): %s', len(batch), e)
+                self._requeue(batch)
+                return total
+            except Exception as e:
+                db.session.rollback()
+                logger.warning('Sync log batch insert failed, retrying row by row: %s', e)
+                saved, requeued = self._flush_rows(batch)
+                total += saved
+                if requeued:
+                    return total
+                continue
+            total += len(batch)
+            self.written += len(batch)
+
+    def _flush_rows(self, batch: list) -> tuple:
+        """
+        일괄 저장에 실패한 배치를 한 행씩 저장 (저장할 수 없는 행은 버림)
+
+        Returns:
+            tuple: (저장한 로그 수, DB 연결 오류로 남은 행을 되돌렸는지 여부)
+        """
+        saved = 0
+        for index, record in enumerate(batch):
+            try:
+                db.session.execute(insert(SyncLog.__table__), [record])
+                db.session.commit()
+            except OperationalError as e:
+                db.session.rollback()
+                logger.error('Sync log flush failed (%d records requeued): %s', len(batch) - index, e)
+                self._requeue(batch[index:])
+                return saved, True
+            except Exception as e:
+                db.session.rollback()
+                logger.error('Sync log record dropped (request_id=%s): %s', record.get('request_id'), e)
+                with self._lock:
+                    self.dropped += 1
+                continue
+            saved += 1
+            self.written += 1
+        return saved, False
+
+    def _take(self, count: int) -> list:
+        """버퍼에서 최대 count건 꺼내기 (메모리 먼저, 이후 Redis LPOP)"""
+        batch = []
+        with self._lock:
+            while self._buffer and len(batch) < count:
+                batch.append(self._buffer.popleft())
+
+        if self.mode == 'redis' and len(batch) < count:
+            try:
+                blobs = self.client.lpop(self.key, count - len(batch)) or []
+            except redis.RedisError as e:
+                logger.warning('Sync log buffer error: %s', e)
+                blobs = []
+            batch.extend(_from_json(json.loads(blob)) for blob in blobs)
+        return batch
+
+    def _requeue(self, batch: list):
+        """저장 실패한 로그를 버퍼 앞쪽으로 되돌림"""
+        with self._lock:
+            self._buffer.extendleft(reversed(batch))
+            while len(self._buffer) > self.max_buffer:
+                self._buffer.popleft()
+                self.dropped += 1
+
+    def stats(self) -> dict:
+        """기록 지표 (이 워커 기준 written / dropped)"""
+        return {
+            'mode': self.mode,
+            'pending': self.pending() if self.buffered else 0,
+            'written': self.written,
+            'dropped': self.dropped,
+        }
+
+    # ------------------------------------------------------------
+    # Background flusher
+    # ------------------------------------------------------------
+
+    def _ensure_flusher(self):
+        """워커 프로세스마다 저장 스레드 시작 (SYNC_LOG_FLUSH_INTERVAL=0이면 수동 flush만)"""
+        if not self.flush_interval:
+            return
+        pid = os.getpid()
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive() and self._flusher_pid == pid:
+                return
+            if self._flusher_pid != pid:
+                atexit.register(self._flush_at_exit)
+            self._flusher_pid = pid
+            self._flusher = threading.Thread(target=self._run, name='koodtx-sync-log', daemon=True)
+            self._flusher.start()
+
+    def _run(self):
+        """주기적 저장 루프"""
+        while self._flusher is threading.current_thread():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                with self.app.app_context():
+                    self.flush()
+            except Exception as e:
+                logger.error('Sync log flusher error: %s', e)
+
+    def _flush_at_exit(self):
+        """프로세스 종료 시 남은 로그 저장"""
+        if self.app is None or not self.buffered:
+            return
+        try:
+            with self.app.app_context():
+                self.flush()
+        except Exception as e:
+            logger.error('Sync log flush at exit failed: %s', e)
+
+
+def _to_json(record: dict) -> dict:
+    return {
+        key: value.isoformat() if key in _DATETIME_KEYS and value is not None else value
+        for key, value in record.items()
+    }
+
+
+def _from_json(record: dict) -> dict:
+    for key in _DATETIME_KEYS:
+        if record.get(key):
+            record[key] = datetime.fromisoformat(record[key])
+    return record
+
+
+# Extension instance (create_app에서 init_app)
+sync_log_writer = SyncLogWriter()
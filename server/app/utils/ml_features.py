@@ -0,0 +1,271 @@
+"""
+ML Window Features
+활동 인식 모델용 고정 길이 슬라이딩 윈도 특징 (통계, 벡터 크기, jerk, 영점 교차) - 복사 없는 윈도, .npy / Parquet 저장
+"""
+
+import json
+import os
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from app.utils.sensor_arrays import ANALYSIS_BATCH_SIZE, iter_sensor_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# 특징 추출 대상 센서 (3축)
+FEATURE_SENSORS = ('accelerometer', 'gyroscope', 'magnetometer', 'linear_acceleration', 'gravity')
+
+# 앱 SlidingWindowProcessor (src/ml/inference.ts)와 같은 기본값: 100 샘플, 50% 겹침
+FEATURE_WINDOW_SIZE = 100
+FEATURE_STEP = 50
+MIN_WINDOW_SIZE = 4
+MAX_WINDOW_SIZE = 4096
+
+# 채널 (3축 + 벡터 크기) x 윈도 특징 = 센서 타입당 열
+FEATURE_CHANNELS = ('x', 'y', 'z', 'magnitude')
+WINDOW_FEATURES = ('mean', 'std', 'min', 'max', 'jerk_mean', 'jerk_std', 'zero_crossings')
+
+# 저장 형식 (Parquet은 pyarrow 필요)
+FEATURE_FORMATS = ('npy', 'parquet')
+
+MANIFEST_NAME = 'features.json'
+
+
+def validate_window(window_size: int, step: int = None) -> tuple:
+    """
+    윈도 파라미터 확인
+
+    Returns:
+        tuple: (window_size, step)
+
+    Raises:
+        ValueError: 윈도 / 간격이 잘못된 경우
+    """
+    if not MIN_WINDOW_SIZE <= window_size <= MAX_WINDOW_SIZE:
+        raise ValueError(f'window_size must be between {MIN_WINDOW_SIZE} and {MAX_WINDOW_SIZE}')
+
+    step = window_size // 2 if step is None else step
+    if not 1 <= step <= window_size:
+        raise ValueError('step must be between 1 and window_size')
+    return int(window_size), int(step)
+
+
+def feature_columns(sensor_type: str) -> list:
+    """센서 타입 특징 열 이름 ({sensor_type}_{channel}_{feature}, 채널 순)"""
+    return [f'{sensor_type}_{channel}_{feature}' for channel in FEATURE_CHANNELS for feature in WINDOW_FEATURES]
+
+
+class WindowFeatureExtractor:
+    """
+    고정 길이 슬라이딩 윈도 특징 누적 계산
+
+    - 청크 앞에 직전 청크의 남은 샘플을 붙이고 (n, 채널) 배열을 sliding_window_view(...)[::step]로
+      (윈도, 채널, 샘플) 뷰로 만든다 (복사 없음). 통계는 뷰에 바로 축소 연산
+    - jerk = 인접 샘플 차이 / 시간 간격 (초), 전체 차이 배열을 한 번 계산하고 같은 방식의 윈도 뷰로 나눔
+    - 영점 교차 = 윈도 평균을 뺀 신호의 부호가 바뀐 횟수 (센서 자세 / 중력 성분에 무관)
+    """
+
+    def __init__(self, sensor_type: str, window_size: int = FEATURE_WINDOW_SIZE, step: int = FEATURE_STEP):
+        self.sensor_type = sensor_type
+        self.window_size = window_size
+        self.step = step
+        self.columns = feature_columns(sensor_type)
+
+        self.window_count = 0
+        self.parts = {'start_ts': [], 'end_ts': [], 'features': []}
+        self._ts = np.zeros(0, dtype=np.int64)
+        self._values = np.zeros((0, len(FEATURE_CHANNELS)))
+
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> 'WindowFeatureExtractor':
+        """
+        청크 추가 (타임스탬프 오름차순)
+
+        Args:
+            timestamps: (n,) ms
+            values: (n, 3) x / y / z
+
+        Returns:
+            WindowFeatureExtractor: self
+        """
+        magnitude = np.sqrt(np.einsum('ij,ij->i', values, values))
+        timestamps = np.concatenate([self._ts, timestamps])
+        values = np.concatenate([self._values, np.column_stack([values, magnitude])])
+
+        count = (len(values) - self.window_size) // self.step + 1 if len(values) >= self.window_size else 0
+        if count:
+            end = (count - 1) * self.step + self.window_size
+            self._add_windows(timestamps[:end], values[:end], count)
+
+        next_start = count * self.step
+        self._ts, self._values = timestamps[next_start:], values[next_start:]
+        return self
+
+    def _add_windows(self, timestamps: np.ndarray, values: np.ndarray, count: int):
+        windows = sliding_window_view(values, self.window_size, axis=0)[::self.step]
+        mean = windows.mean(axis=2)
+
+        # 같은 시각 샘플은 1 ms 간격으로 취급
+        dt = np.maximum(np.diff(timestamps), 1) / 1000.0
+        jerk = np.diff(values, axis=0) / dt[:, None]
+        jerk_windows = sliding_window_view(jerk, self.window_size - 1, axis=0)[::self.step]
+
+        above = windows > mean[..., None]
+        crossings = np.count_nonzero(above[..., 1:] != above[..., :-1], axis=2)
+
+        features = np.stack([
+            mean,
+            windows.std(axis=2),
+            windows.min(axis=2),
+            windows.max(axis=2),
+            np.abs(jerk_windows).mean(axis=2),
+            jerk_windows.std(axis=2),
+            crossings,
+        ], axis=2)
+
+        starts = np.arange(count) * self.step
+        self.parts['start_ts'].append(timestamps[starts])
+        self.parts['end_ts'].append(timestamps[starts + self.window_size - 1])
+        # (윈도, 채널, 특징) -> (윈도, 채널 x 특징), feature_columns() 순
+        self.parts['features'].append(features.reshape(count, -1).astype(np.float32))
+        self.window_count += count
+
+    def result(self) -> dict:
+        """
+        누적 결과
+
+        Returns:
+            dict | None: window_count, columns, start_ts / end_ts (int64), features (float32, 윈도 x 열)
+                         (윈도가 하나도 없으면 None)
+        """
+        if not self.window_count:
+            return None
+
+        return {
+            'window_count': self.window_count,
+            'columns': self.columns,
+            **{key: np.concatenate(parts) for key, parts in self.parts.items()},
+        }
+
+
+def extract_window_features(session_id: int, sensor_type: str, window_size: int = FEATURE_WINDOW_SIZE,
+                            step: int = FEATURE_STEP, chunk_size: int = ANALYSIS_BATCH_SIZE):
+    """
+    세션 센서 타입의 윈도 특징 계산 (청크 스트리밍, 축 값이 없는 샘플 제외)
+
+    Returns:
+        dict | None: WindowFeatureExtractor.result()
+    """
+    fields = ('x', 'y', 'z')
+    extractor = WindowFeatureExtractor(sensor_type, window_size, step)
+    for columns in iter_sensor_columns(session_id, sensor_type, fields, chunk_size):
+        values = np.column_stack([columns[key] for key in fields])
+        valid = ~np.isnan(values).any(axis=1)
+        extractor.update(columns['timestamp'][valid], values[valid])
+    return extractor.result()
+
+
+def feature_output_dir(base_dir: str, session) -> str:
+    """세션 특징 파일 디렉토리 ({base_dir}/{user_id}/{session_uuid})"""
+    return os.path.join(base_dir, str(session.user_id), str(session.session_id))
+
+
+def _replace_file(path: str, write):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    temp_path = f'{path}.tmp'
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def _save_npy(path: str, array: np.ndarray):
+    with open(path, 'wb') as file:
+        np.save(file, array)
+
+
+def write_feature_matrix(output_dir: str, sensor_type: str, result: dict, output_format: str = 'npy') -> list:
+    """
+    윈도 특징 행렬 저장
+
+    - npy: {sensor_type}.npy (float32, 윈도 x 열), {sensor_type}_windows.npy (int64, [start_ts, end_ts])
+    - parquet: {sensor_type}.parquet (start_ts, end_ts, 특징 열)
+
+    Args:
+        output_dir: 저장 디렉토리
+        sensor_type: 센서 타입
+        result: WindowFeatureExtractor.result()
+        output_format: npy / parquet
+
+    Returns:
+        list: 저장한 파일 이름
+
+    Raises:
+        ValueError: 알 수 없는 형식이거나 Parquet에 pyarrow가 없는 경우
+    """
+    if output_format not in FEATURE_FORMATS:
+        raise ValueError(f'Invalid format: {output_format!r} (expected one of {", ".join(FEATURE_FORMATS)})')
+    os.makedirs(output_dir, exist_ok=True)
+
+    if output_format == 'npy':
+        windows = np.column_stack([result['start_ts'], result['end_ts']])
+        names = [f'{sensor_type}.npy', f'{sensor_type}_windows.npy']
+        for name, array in zip(names, (result['features'], windows)):
+            # np.save는 경로에 .npy를 붙이므로 파일 객체로 저장
+            _replace_file(os.path.join(output_dir, name), lambda path, array=array: _save_npy(path, array))
+        return names
+
+    if pa is None:
+        raise ValueError('Parquet output requires pyarrow')
+
+    table = pa.table({
+        'start_ts': result['start_ts'],
+        'end_ts': result['end_ts'],
+        **{column: result['features'][:, index] for index, column in enumerate(result['columns'])},
+    })
+    name = f'{sensor_type}.parquet'
+    _replace_file(os.path.join(output_dir, name), lambda path: pq.write_table(table, path))
+    return [name]
+
+
+def write_manifest(output_dir: str, manifest: dict) -> str:
+    """
+    특징 파일 목록 저장 (features.json: 세션, 윈도 파라미터, 센서 타입별 열 / 윈도 수 / 파일)
+
+    Returns:
+        str: 경로
+    """
+    path = os.path.join(output_dir, MANIFEST_NAME)
+
+    def write(temp_path):
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+
+    _replace_file(path, write)
+    return path
+
+
+def load_feature_matrix(output_dir: str, sensor_type: str) -> dict:
+    """
+    저장된 윈도 특징 읽기 (write_feature_matrix 역변환, 형식은 features.json 기준)
+
+    Returns:
+        dict: columns, start_ts, end_ts, features
+    """
+    with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as file:
+        manifest = json.load(file)
+    columns = manifest['sensor_types'][sensor_type]['columns']
+
+    if manifest['format'] == 'npy':
+        windows = np.load(os.path.join(output_dir, f'{sensor_type}_windows.npy'))
+        features = np.load(os.path.join(output_dir, f'{sensor_type}.npy'))
+        return {'columns': columns, 'start_ts': windows[:, 0], 'end_ts': windows[:, 1], 'features': features}
+
+    table = pq.read_table(os.path.join(output_dir, f'{sensor_type}.parquet'))
+    return {
+        'columns': columns,
+        'start_ts': table.column('start_ts').to_numpy(),
+        'end_ts': table.column('end_ts').to_numpy(),
+        'features': np.column_stack([table.column(column).to_numpy() for column in columns]),
+    }
@@ -0,0 +1,272 @@
+"""
+Sync Notifications
+Redis pub/sub 기반 동기화 알림 (gunicorn 워커 간 fan-out) 및 SSE 스트림
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import redis
+from app.utils.changes import changes_since
+
+logger = logging.getLogger(__name__)
+
+
+def format_sse(data: dict, event: str = 'sync', event_id=None) -> str:
+    """
+    SSE 메시지 직렬화
+
+    Args:
+        data: 이벤트 데이터 (JSON)
+        event: 이벤트 이름
+        event_id: 이벤트 ID (Last-Event-ID로 돌아옴)
+
+    Returns:
+        str: "id: ...\\nevent: ...\\ndata: ...\\n\\n"
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def parse_last_event_id(value):
+    """
+    SSE 재연결 시 Last-Event-ID (마지막으로 받은 change_seq) 파싱
+
+    Args:
+        value: Last-Event-ID 헤더 또는 last_event_id 쿼리 값
+
+    Returns:
+        int | None: 시퀀스 (없거나 잘못된 값이면 None, 재생하지 않음)
+    """
+    try:
+        seq = int(value)
+    except (TypeError, ValueError):
+        return None
+    return seq if seq >= 0 else None
+
+
+def replay_events(user_id: int, last_event_id, limit: int) -> list:
+    """
+    재연결 사이에 놓친 변경을 변경 피드 (changes_since)에서 읽어 SSE 알림으로 변환
+
+    limit개를 넘으면 앞부분만 보내고, 뒤따르는 ready 이벤트의 change_seq가 마지막 재생
+    알림보다 크므로 클라이언트는 /changes로 나머지를 가져온다.
+
+    Args:
+        user_id: 사용자 ID
+        last_event_id: parse_last_event_id() 결과 (None이면 재생 없음)
+        limit: 최대 재생 알림 수
+
+    Returns:
+        list: {'type': 'change', 'change_seq': seq, 'kind', 'op', 'session_id', ...} 목록
+    """
+    if last_event_id is None:
+        return []
+    feed = changes_since(user_id, last_event_id, limit)
+    return [
+        dict({key: value for key, value in change.items() if key != 'seq'},
+             type='change', change_seq=change['seq'])
+        for change in feed['changes']
+    ]
+
+
+class NotificationHub:
+    """
+    동기화 알림 허브
+
+    - Push 후 publish(user_id, event)로 사용자 채널에 발행 (Redis PUBLISH)
+    - 워커 프로세스마다 리스너 스레드 하나가 패턴 구독(koodtx:notify:user:*)으로 모든
+      알림을 받아, 그 워커에 연결된 해당 사용자의 SSE 연결 큐로 전달
+      (연결마다 Redis 연결을 만들지 않음)
+    - 느린 연결의 큐가 가득 차면 알림을 버림 (클라이언트는 다음 알림 또는 재연결 시 Pull)
+    - Redis 오류는 로그만 남기고 요청은 실패하지 않음
+    """
+
+    def __init__(self, app=None):
+        self.client = None
+        self.prefix = 'koodtx:notify'
+        self.heartbeat = 15
+        self.stream_timeout = 300
+        self.queue_size = 100
+        self.replay_limit = 100
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listener_pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, client=None):
+        """
+        Flask 앱 설정으로 초기화
+
+        Args:
+            app: Flask 애플리케이션
+            client: Redis 클라이언트 (생략 시 NOTIFY_REDIS_URL로 생성)
+        """
+        self.client = None
+        self._listener = None
+        if not app.config.get('NOTIFY_ENABLED'):
+            return
+
+        self.client = client or redis.Redis.from_url(app.config['NOTIFY_REDIS_URL'])
+        self.prefix = app.config.get('NOTIFY_PREFIX', self.prefix)
+        self.heartbeat = app.config['NOTIFY_HEARTBEAT']
+        self.stream_timeout = app.config['NOTIFY_STREAM_TIMEOUT']
+        self.queue_size = app.config['NOTIFY_QUEUE_SIZE']
+        self.replay_limit = app.config.get('NOTIFY_REPLAY_LIMIT', self.replay_limit)
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    def channel(self, user_id) -> str:
+        return f'{self.prefix}:user:{user_id}'
+
+    # ------------------------------------------------------------
+    # Publish
+    # ------------------------------------------------------------
+
+    def publish(self, user_id, event: dict) -> bool:
+        """
+        사용자 알림 발행 (모든 워커의 해당 사용자 SSE 연결로 전달)
+
+        Args:
+            user_id: 대상 사용자 ID
+            event: 알림 데이터
+
+        Returns:
+            bool: 발행 여부
+        """
+        if not self.enabled:
+            return False
+        try:
+            self.client.publish(self.channel(user_id), json.dumps(event, separators=(',', ':')))
+            return True
+        except redis.RedisError as e:
+            logger.warning('Notification publish failed: %s', e)
+            return False
+
+    # ------------------------------------------------------------
+    # Subscribe (per-worker fan-out)
+    # ------------------------------------------------------------
+
+    def subscribe(self, user_id) -> queue.Queue:
+        """
+        이 워커에서 사용자 알림 수신 큐 등록
+
+        Returns:
+            queue.Queue: 알림 dict가 들어오는 큐
+        """
+        self._ensure_listener()
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(str(user_id), set()).add(q)
+        return q
+
+    def unsubscribe(self, user_id, q: queue.Queue):
+        """수신 큐 해제"""
+        with self._lock:
+            queues = self._subscribers.get(str(user_id))
+            if queues is not None:
+                queues.discard(q)
+                if not queues:
+                    del self._subscribers[str(user_id)]
+
+    def connection_count(self) -> int:
+        """이 워커의 SSE 연결 수"""
+        with self._lock:
+            return sum(len(queues) for queues in self._subscribers.values())
+
+    def _ensure_listener(self):
+        """워커 프로세스마다 리스너 스레드 시작 (preload_app fork 이후 지연 시작)"""
+        pid = os.getpid()
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive() and self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._listener = threading.Thread(target=self._listen, name='koodtx-notify', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        """패턴 구독 루프 (연결 오류 시 재연결)"""
+        while True:
+            if self._listener is not threading.current_thread():
+                return  # init_app으로 교체된 리스너
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.channel('*'))
+                for message in pubsub.listen():
+                    self._dispatch(message)
+            except redis.RedisError as e:
+                logger.warning('Notification listener error: %s', e)
+                time.sleep(1)
+
+    def _dispatch(self, message: dict):
+        """수신한 알림을 해당 사용자의 로컬 큐로 전달"""
+        channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode('utf-8')
+        user_id = channel.rsplit(':', 1)[-1]
+
+        with self._lock:
+            queues = list(self._subscribers.get(user_id, ()))
+        if not queues:
+            return
+
+        try:
+            event = json.loads(message['data'])
+        except (TypeError, ValueError):
+            return
+
+        for q in queues:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                pass
+
+    # ------------------------------------------------------------
+    # SSE
+    # ------------------------------------------------------------
+
+    def stream(self, q: queue.Queue, initial_events: list = ()):
+        """
+        SSE 응답 본문 생성기
+
+        DB나 앱 컨텍스트를 사용하지 않으므로 요청이 끝난 뒤에도 연결만 유지된다.
+        heartbeat초마다 주석 줄로 연결을 유지하고, stream_timeout초가 지나면 종료해
+        클라이언트가 Last-Event-ID와 함께 다시 연결하도록 한다.
+
+        Args:
+            q: subscribe()가 반환한 큐
+            initial_events: 연결 직후 보낼 알림 목록
+
+        Yields:
+            str: SSE 메시지
+        """
+        yield f'retry: {int(self.heartbeat * 1000)}\n\n'
+        for event in initial_events:
+            yield format_sse(event, event_id=event.get('change_seq'))
+
+        deadline = time.monotonic() + self.stream_timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event = q.get(timeout=min(self.heartbeat, remaining))
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            yield format_sse(event, event_id=event.get('change_seq'))
+
+
+# Extension instance (create_app에서 init_app)
+notifier = NotificationHub()
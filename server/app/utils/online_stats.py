@@ -0,0 +1,114 @@
+"""
+Online Statistics
+청크 단위로 갱신하고 서로 합칠 수 있는 누적 통계 (Welford / Chan 평균·분산, min / max, 개수)
+"""
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    누적 통계 (모집단 분산, np.std와 같은 ddof=0)
+
+    - update(values): 청크 배열의 평균 / 제곱편차합을 NumPy로 계산한 뒤 Chan 병합 공식으로 합침
+      (값마다 Python 루프를 돌지 않으며, 한 청크만 넣으면 np.mean / np.std와 같은 결과)
+    - merge(other): 다른 누적 통계 합치기 (병렬 작업 결과 결합)
+    - NaN은 건너뜀
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values) -> 'RunningStats':
+        """
+        청크 값 추가
+
+        Args:
+            values: 숫자 배열 (NaN 제외)
+
+        Returns:
+            RunningStats: self
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+
+        chunk = RunningStats()
+        chunk.count = len(values)
+        chunk.mean = float(np.mean(values))
+        chunk.m2 = float(np.sum((values - chunk.mean) ** 2))
+        chunk.min = float(np.min(values))
+        chunk.max = float(np.max(values))
+        return self.merge(chunk)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        다른 누적 통계 합치기 (Chan et al. 병렬 분산 공식)
+
+        Returns:
+            RunningStats: self
+        """
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @classmethod
+    def from_moments(cls, count: int, mean, std, min_value, max_value) -> 'RunningStats':
+        """
+        집계 결과로 생성 (SQL avg / stddev_pop / min / max, 값이 없으면 빈 통계)
+
+        Returns:
+            RunningStats: 다른 누적 통계와 merge 가능
+        """
+        stats = cls()
+        if count:
+            stats.count = int(count)
+            stats.mean = float(mean)
+            stats.m2 = float(std or 0.0) ** 2 * stats.count
+            stats.min = float(min_value)
+            stats.max = float(max_value)
+        return stats
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self, keys=('mean', 'std', 'min', 'max')) -> dict:
+        """
+        통계 dict
+
+        Args:
+            keys: 포함할 항목 (mean, std, min, max, count)
+
+        Returns:
+            dict | None: {key: float} (값이 없으면 None)
+        """
+        if not self.count:
+            return None
+
+        values = {'mean': float(self.mean), 'std': self.std, 'min': float(self.min),
+                  'max': float(self.max), 'count': self.count}
+        return {key: values[key] for key in keys}
@@ -0,0 +1,74 @@
+"""
+Keyset Pagination
+(updated_at, id) 기반 커서 페이지네이션 헬퍼
+"""
+
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+
+
+class InvalidCursorError(ValueError):
+    """잘못된 커서 토큰"""
+
+
+def encode_cursor(updated_at: datetime, row_id: int) -> str:
+    """
+    마지막 행의 (updated_at, id)를 불투명 커서 토큰으로 인코딩
+
+    Args:
+        updated_at: 마지막 행의 updated_at
+        row_id: 마지막 행의 id
+
+    Returns:
+        str: URL-safe base64 커서 토큰
+    """
+    payload = json.dumps({'u': updated_at.isoformat(), 'i': row_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple:
+    """
+    커서 토큰 디코딩
+
+    Args:
+        token: encode_cursor()로 생성한 토큰
+
+    Returns:
+        tuple: (updated_at, id)
+
+    Raises:
+        InvalidCursorError: 토큰 형식이 올바르지 않은 경우
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(payload['u']), int(payload['i'])
+    except (TypeError, ValueError, KeyError, AttributeError) as e:
+        raise InvalidCursorError(f'Invalid cursor: {token!r}') from e
+
+
+def apply_keyset(query, model, cursor: tuple = None):
+    """
+    (updated_at DESC, id DESC) 키셋 정렬 및 커서 이후 행 필터 적용
+
+    OFFSET 없이 인덱스 탐색으로 다음 페이지를 조회하므로, 다른 세션이 갱신되어도
+    나머지 세션이 페이지 사이에서 밀리거나 건너뛰어지지 않는다.
+    단, 동기화 도중 갱신된 세션은 updated_at이 커서보다 새로워져 이번 페이지 순회에서는
+    빠지고, 이후 Pull (last_sync_time 이후 변경)에서 다시 나타난다. 이미 받은 세션도
+    다시 올 수 있으므로 클라이언트는 session_id 기준으로 중복 제거 (upsert)해야 한다.
+
+    Args:
+        query: 기본 쿼리
+        model: updated_at, id 컬럼을 가진 모델
+        cursor: decode_cursor() 결과 (None이면 첫 페이지)
+
+    Returns:
+        Query: 정렬/필터가 적용된 쿼리
+    """
+    if cursor is not None:
+        updated_at, row_id = cursor
+        query = query.filter(tuple_(model.updated_at, model.id) < tuple_(updated_at, row_id))
+
+    return query.order_by(model.updated_at.desc(), model.id.desc())
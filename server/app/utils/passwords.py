@@ -0,0 +1,280 @@
+"""
+Password Hashing
+bcrypt 해시를 제한된 워커 풀에서 실행 (동시 실행 / 대기 수 제한, 워커 간 전역 슬롯, 대기 시간 지표, 비용 변경 시 재해시)
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import bcrypt
+import redis
+
+try:
+    from gevent import monkey as gevent_monkey
+except ImportError:  # pragma: no cover - optional dependency
+    gevent_monkey = None
+
+logger = logging.getLogger(__name__)
+
+# 워커 간 전역 슬롯 (sorted set: 토큰 -> 획득 시각)
+SLOT_KEY = 'koodtx:bcrypt:slots'
+
+
+class PasswordHasherBusy(Exception):
+    """해시 대기열이 가득 찼거나 대기 시간이 초과된 경우 (503으로 응답)"""
+    pass
+
+
+def _executor_class():
+    """
+    워커 풀 클래스 선택
+
+    gevent 워커에서는 threading이 그린렛으로 패치되어 bcrypt가 이벤트 루프를 막으므로
+    gevent의 네이티브 스레드 풀을 사용한다.
+    """
+    if gevent_monkey is not None and gevent_monkey.is_module_patched('threading'):
+        from gevent.threadpool import ThreadPoolExecutor
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor
+
+
+class PasswordHasher:
+    """
+    비밀번호 해시기
+
+    - bcrypt는 GIL을 놓고 실행되므로 워커 프로세스마다 PASSWORD_HASH_WORKERS개 스레드에서 실행
+    - 대기 중인 작업이 PASSWORD_HASH_MAX_WAITING개를 넘거나 PASSWORD_HASH_QUEUE_TIMEOUT초 안에
+      시작하지 못하면 PasswordHasherBusy (클라이언트는 Retry-After 후 재시도).
+      워커 프로세스 안의 제한이므로 요청을 동시에 여러 개 받는 gevent 워커에서만 걸린다
+      (sync 워커는 요청 하나씩 처리하여 대기가 생기지 않음)
+    - PASSWORD_HASH_GLOBAL_LIMIT > 0이면 Redis 슬롯으로 모든 워커의 동시 해시 수를 제한
+      (워커 종류와 무관하게 로그인 폭주가 Push 등 다른 요청의 워커를 모두 차지하지 못함,
+      Redis 오류 시에는 제한 없이 진행)
+    - 비용(BCRYPT_ROUNDS)이 저장된 해시와 다르면 needs_rehash() -> 로그인 시 재해시
+    - 대기 시간 / 실행 시간 / 거절 수 지표 (stats())
+    """
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.max_workers = 2
+        self.max_waiting = 64
+        self.queue_timeout = 5.0
+        self.global_limit = 0
+        self.slot_lease = 30
+        self.client = None
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._reset_metrics()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, client=None):
+        """
+        Flask 앱 설정으로 초기화
+
+        Args:
+            app: Flask 애플리케이션
+            client: Redis 클라이언트 (생략 시 PASSWORD_HASH_REDIS_URL로 생성, 전역 제한 사용 시)
+        """
+        self.rounds = app.config.get('BCRYPT_ROUNDS', self.rounds)
+        self.max_workers = app.config.get('PASSWORD_HASH_WORKERS', self.max_workers)
+        self.max_waiting = app.config.get('PASSWORD_HASH_MAX_WAITING', self.max_waiting)
+        self.queue_timeout = app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', self.queue_timeout)
+        self.global_limit = app.config.get('PASSWORD_HASH_GLOBAL_LIMIT', 0)
+        self.slot_lease = app.config.get('PASSWORD_HASH_SLOT_LEASE', self.slot_lease)
+        self.client = None
+        if self.global_limit > 0:
+            self.client = client or redis.Redis.from_url(app.config['PASSWORD_HASH_REDIS_URL'])
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+
+    # ------------------------------------------------------------
+    # Hashing
+    # ------------------------------------------------------------
+
+    def hash(self, password: str) -> str:
+        """
+        비밀번호 해시 (현재 비용)
+
+        Raises:
+            PasswordHasherBusy: 대기열이 가득 찬 경우
+        """
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self._run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def check(self, password: str, password_hash: str) -> bool:
+        """
+        비밀번호 확인
+
+        Raises:
+            PasswordHasherBusy: 대기열이 가득 찬 경우
+        """
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """저장된 해시의 비용이 현재 설정(BCRYPT_ROUNDS)과 다른지 확인"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+    # ------------------------------------------------------------
+    # Worker pool
+    # ------------------------------------------------------------
+
+    def _get_executor(self):
+        """워커 프로세스마다 풀 생성 (preload_app fork 이후 지연 생성)"""
+        pid = os.getpid()
+        with self._lock:
+            if self._executor is None or self._executor_pid != pid:
+                self._executor = _executor_class()(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='koodtx-bcrypt'
+                )
+                self._executor_pid = pid
+            return self._executor
+
+    def _run(self, func, *args):
+        """전역 슬롯을 잡고 풀에서 실행"""
+        token = self._acquire_slot()
+        try:
+            return self._run_local(func, *args)
+        finally:
+            self._release_slot(token)
+
+    def _run_local(self, func, *args):
+        """풀에서 실행하고 결과 대기 (대기열 제한 / 시작 대기 시간 제한)"""
+        executor = self._get_executor()
+
+        with self._lock:
+            if self.waiting >= self.max_waiting:
+                self.rejected += 1
+                raise PasswordHasherBusy('Password hashing queue is full')
+            self.waiting += 1
+
+        submitted = time.monotonic()
+
+        def task():
+            started = time.monotonic()
+            with self._lock:
+                self.waiting -= 1
+                self.running += 1
+                self.queue_time_total += started - submitted
+                self.queue_time_max = max(self.queue_time_max, started - submitted)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.run_time_total += time.monotonic() - started
+
+        future = executor.submit(task)
+        try:
+            return future.result(timeout=self.queue_timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                with self._lock:
+                    self.waiting -= 1
+                    self.rejected += 1
+                raise PasswordHasherBusy('Password hashing queue timed out')
+            # 이미 실행 중이면 끝까지 기다림
+            return future.result()
+
+    # ------------------------------------------------------------
+    # Global slots (Redis)
+    # ------------------------------------------------------------
+
+    def _acquire_slot(self):
+        """
+        워커 간 전역 슬롯 획득
+
+        획득 시각 순위가 PASSWORD_HASH_GLOBAL_LIMIT 안에 들면 성공. 워커가 죽어 반환되지 않은
+        슬롯은 PASSWORD_HASH_SLOT_LEASE초 후 회수된다.
+
+        Returns:
+            str: 슬롯 토큰 (전역 제한을 쓰지 않거나 Redis 오류 시 None)
+
+        Raises:
+            PasswordHasherBusy: 모든 슬롯이 사용 중인 경우
+        """
+        if self.client is None:
+            return None
+
+        token = uuid.uuid4().hex
+        now = time.time()
+        try:
+            pipe = self.client.pipeline()
+            pipe.zremrangebyscore(SLOT_KEY, '-inf', now - self.slot_lease)
+            pipe.zadd(SLOT_KEY, {token: now})
+            pipe.zrank(SLOT_KEY, token)
+            pipe.expire(SLOT_KEY, math.ceil(self.slot_lease))
+            rank = pipe.execute()[2]
+        except redis.RedisError as e:
+            logger.warning('Password hash slot error: %s', e)
+            return None
+
+        if rank >= self.global_limit:
+            self._release_slot(token)
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy('Password hashing slots are full')
+        return token
+
+    def _release_slot(self, token):
+        """전역 슬롯 반환"""
+        if token is None:
+            return
+        try:
+            self.client.zrem(SLOT_KEY, token)
+        except redis.RedisError as e:
+            logger.warning('Password hash slot error: %s', e)
+
+    # ------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        해시 풀 지표 (이 워커 기준)
+
+        Returns:
+            dict: rounds, workers, waiting, running, completed, rejected,
+                  avg/max queue time (ms), avg run time (ms)
+        """
+        with self._lock:
+            completed = self.completed
+            return {
+                'rounds': self.rounds,
+                'workers': self.max_workers,
+                'global_limit': self.global_limit,
+                'waiting': self.waiting,
+                'running': self.running,
+                'completed': completed,
+                'rejected': self.rejected,
+                'avg_queue_ms': round(self.queue_time_total / completed * 1000, 2) if completed else 0.0,
+                'max_queue_ms': round(self.queue_time_max * 1000, 2),
+                'avg_run_ms': round(self.run_time_total / completed * 1000, 2) if completed else 0.0,
+            }
+
+
+# Extension instance (create_app에서 init_app)
+password_hasher = PasswordHasher()
@@ -0,0 +1,379 @@
+"""
+Pull Data Helpers
+Pull 응답용 센서 데이터 조회 (세션별 데이터 커서, 응답당 레코드 예산)
+"""
+
+import hashlib
+import json
+from itertools import groupby
+from operator import attrgetter
+from sqlalchemy import and_, or_, tuple_
+from app import db
+from app.models.session import RecordingSession
+from app.models.sensor_data import SensorData
+from app.utils.cache import pull_cache
+from app.utils.downsample import sample_conditions, stride_select, bucket_series
+from app.utils.pagination import InvalidCursorError, encode_cursor, apply_keyset
+
+# yield_per 스트리밍 배치 크기
+STREAM_BATCH_SIZE = 1000
+
+# 세션 데이터 처음 위치 (빈 sensor_type은 모든 (sensor_type, timestamp)보다 앞)
+START_CURSOR = ('', 0)
+
+
+def parse_data_cursors(raw) -> dict:
+    """
+    요청의 data_cursors 파싱
+
+    Args:
+        raw: {"<session uuid>": {"sensor_type": str, "timestamp": int}, ...}
+
+    Returns:
+        dict: {session uuid(str): (sensor_type, timestamp)}
+
+    Raises:
+        InvalidCursorError: 형식이 올바르지 않은 경우
+    """
+    if not raw:
+        return {}
+    if not isinstance(raw, dict):
+        raise InvalidCursorError('data_cursors must be an object')
+
+    cursors = {}
+    for session_uuid, cursor in raw.items():
+        try:
+            cursors[str(session_uuid)] = (str(cursor['sensor_type']), int(cursor['timestamp']))
+        except (TypeError, ValueError, KeyError) as e:
+            raise InvalidCursorError(f'Invalid data cursor for session {session_uuid}') from e
+    return cursors
+
+
+def pull_etag(user_id: int, data_version: int, params: dict) -> str:
+    """
+    Pull 응답 ETag 계산
+
+    같은 사용자 데이터 버전에서 같은 요청 파라미터는 같은 응답을 만들기 때문에
+    (user_id, data_version, 정규화된 요청 본문)의 해시를 ETag로 사용한다.
+
+    Args:
+        user_id: 사용자 ID
+        data_version: User.data_version
+        params: Pull 요청 본문
+
+    Returns:
+        str: ETag 값 (따옴표 제외)
+    """
+    # 요청 ID는 응답 내용에 영향이 없으므로 제외
+    params = {key: value for key, value in params.items() if key != 'request_id'}
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha1(f'{user_id}:{data_version}:{canonical}'.encode('utf-8')).hexdigest()
+    return f'pull-{user_id}-{data_version}-{digest[:16]}'
+
+
+def build_pull_page(user_id: int, last_sync_dt=None, session_ids=None, cursor=None, use_cursor=False,
+                    page: int = 1, page_size: int = 50, include_data: bool = True,
+                    data_cursors: dict = None, max_records: int = None,
+                    sample_filter: dict = None) -> dict:
+    """
+    Pull 응답 페이지 생성 (세션 조회 + 센서 데이터 수집 + 직렬화)
+
+    요청마다 달라지는 server_timestamp, sync_log_id, request_id는 포함하지 않으므로
+    결과를 그대로 캐시할 수 있다.
+
+    Args:
+        user_id: 사용자 ID
+        last_sync_dt: 델타 동기화 기준 시간 (None이면 전체)
+        session_ids: 특정 세션 UUID 목록
+        cursor: decode_cursor() 결과 (키셋 모드)
+        use_cursor: 키셋 모드 여부
+        page: 페이지 번호 (오프셋 모드)
+        page_size: 페이지 크기
+        include_data: 센서 데이터 포함 여부
+        data_cursors: parse_data_cursors() 결과
+        max_records: 응답당 최대 센서 레코드 수
+        sample_filter: parse_sample_filter() 결과 (센서 타입/시간 범위/다운샘플링)
+
+    Returns:
+        dict: sessions, page_size, has_more, next_cursor, total_records
+              (+ 오프셋 모드에서 page, total)
+    """
+    query = RecordingSession.query.filter_by(user_id=user_id)
+
+    # Filter by last_sync_time (delta sync)
+    if last_sync_dt is not None:
+        query = query.filter(RecordingSession.updated_at > last_sync_dt)
+
+    # Filter by change sequence (sessions changed after the client's checkpoint)
+    if sample_filter and sample_filter.get('since_seq'):
+        query = query.filter(RecordingSession.change_seq > sample_filter['since_seq'])
+
+    # Filter by specific session_ids (if provided)
+    if session_ids:
+        query = query.filter(RecordingSession.session_id.in_(session_ids))
+
+    # Order by (updated_at, id) descending (most recent first)
+    query = apply_keyset(query, RecordingSession, cursor)
+
+    if use_cursor:
+        # Keyset pagination: index seek, no COUNT, limit + 1 for has_more
+        rows = query.limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        sessions = rows[:page_size]
+        total = None
+    else:
+        total = query.count()
+        offset = (page - 1) * page_size
+        sessions = query.offset(offset).limit(page_size).all()
+        has_more = (offset + page_size) < total
+
+    next_cursor = None
+    if has_more and sessions:
+        next_cursor = encode_cursor(sessions[-1].updated_at, sessions[-1].id)
+
+    # Collect sensor data (per-session data cursors, max_records budget)
+    session_data_map = {}
+    total_records = 0
+    if include_data:
+        session_data_map, total_records = collect_session_data(
+            sessions, data_cursors, max_records, sample_filter
+        )
+
+    sessions_data = []
+    for session in sessions:
+        session_dict = serialize_session(session)
+        if include_data:
+            session_dict.update(session_data_map[session.id])
+        else:
+            session_dict['sensor_data'] = []
+        sessions_data.append(session_dict)
+
+    result = {
+        'sessions': sessions_data,
+        'page_size': page_size,
+        'has_more': has_more,
+        'next_cursor': next_cursor,
+        'total_records': total_records
+    }
+    if not use_cursor:
+        result['page'] = page
+        result['total'] = total
+
+    return result
+
+
+def serialize_session(session) -> dict:
+    """Pull 응답용 세션 메타데이터 직렬화"""
+    return {
+        'session_id': str(session.session_id),
+        'start_time': session.start_time.isoformat() + 'Z',
+        'end_time': session.end_time.isoformat() + 'Z' if session.end_time else None,
+        'is_active': session.is_active,
+        'enabled_sensors': session.enabled_sensors,
+        'sample_rate': session.sample_rate,
+        'data_count': session.data_count,
+        'notes': session.notes,
+        'is_uploaded': session.is_uploaded,
+        'created_at': session.created_at.isoformat() + 'Z',
+        'updated_at': session.updated_at.isoformat() + 'Z',
+        'change_seq': session.change_seq
+    }
+
+
+def serialize_sensor_row(sd) -> dict:
+    """Pull 응답용 센서 데이터 직렬화"""
+    return {
+        'sensor_type': sd.sensor_type,
+        'timestamp': sd.timestamp,
+        'data': sd.data
+    }
+
+
+def collect_session_data(sessions: list, data_cursors: dict = None, max_records: int = None,
+                         sample_filter: dict = None):
+    """
+    페이지의 세션들에 대한 센서 데이터 수집
+
+    세션 수와 무관하게 sensor_data 조회는 한 번만 실행한다
+    (session_id IN (...) 정렬 후 yield_per로 스트리밍하며 세션별로 그룹화).
+    전체 세션 모드에서는 Pull 캐시에 있는 세션을 먼저 채우고 나머지만 조회한다.
+
+    max_records 또는 세션의 데이터 커서가 지정되면 (sensor_type, timestamp) 순으로
+    커서 이후 데이터만 idx_session_sensor_timestamp 인덱스로 조회하고, 응답 전체에서
+    max_records개를 넘지 않도록 잘라낸다. 예산은 페이지 순서가 아니라 세션 id (PK) 순으로
+    소비되므로, 페이지에서 뒤에 있는 세션이 완료되고 앞의 세션이 잘릴 수 있다. 잘린 세션은
+    data_complete=False와 함께 마지막으로 전달한 위치(data_cursor)를 반환하며, 한 행도
+    받지 못한 세션의 data_cursor는 START_CURSOR (처음부터)이다. 클라이언트는 이 값을
+    그대로 data_cursors로 다시 보내 이어서 받는다.
+
+    sample_filter의 센서 타입 / 시간 범위 조건은 모든 모드의 조회에 적용된다
+    (필터가 있으면 전체 세션 캐시는 사용하지 않음). max_points가 있으면
+    (세션, 센서 타입) 시리즈마다 stride는 SQL에서 N번째 샘플만, bucket은
+    NumPy로 구간별 mean / min / max를 계산해 최대 max_points개를 반환한다.
+
+    Args:
+        sessions: RecordingSession 목록 (페이지 순서)
+        data_cursors: parse_data_cursors() 결과
+        max_records: 응답당 최대 센서 레코드 수 (None이면 제한 없음)
+        sample_filter: parse_sample_filter() 결과
+
+    Returns:
+        tuple: ({session.id: {'sensor_data', 'data_cursor', 'data_complete'}}, total_records)
+    """
+    data_cursors = data_cursors or {}
+    cursors = {}
+    for session in sessions:
+        cursor = data_cursors.get(str(session.session_id))
+        if cursor is not None:
+            cursors[session.id] = cursor
+
+    paged = max_records is not None or bool(cursors)
+
+    results = {
+        session.id: {'sensor_data': [], 'data_cursor': None, 'data_complete': True}
+        for session in sessions
+    }
+    if not sessions:
+        return results, 0
+
+    conditions = sample_conditions(sample_filter)
+
+    if sample_filter and sample_filter['max_points'] is not None:
+        return _collect_downsampled(results, sample_filter)
+
+    if not paged and conditions:
+        query = SensorData.query.filter(
+            SensorData.session_id.in_(list(results)),
+            *conditions
+        ).order_by(SensorData.session_id.asc(), SensorData.timestamp.asc())
+
+        total_records = 0
+        for session_id, rows in groupby(query.yield_per(STREAM_BATCH_SIZE), key=attrgetter('session_id')):
+            serialized = [serialize_sensor_row(sd) for sd in rows]
+            results[session_id]['sensor_data'] = serialized
+            total_records += len(serialized)
+        return results, total_records
+
+    if not paged:
+        # Legacy: 세션별 전체 데이터를 timestamp 순으로 (세션 데이터 캐시 우선)
+        total_records = 0
+        cached = pull_cache.get_session_data(sessions)
+        for session_id, sensor_data in cached.items():
+            results[session_id]['sensor_data'] = sensor_data
+            total_records += len(sensor_data)
+
+        misses = {session.id: session for session in sessions if session.id not in cached}
+        if not misses:
+            return results, total_records
+
+        query = SensorData.query.filter(
+            SensorData.session_id.in_(list(misses))
+        ).order_by(SensorData.session_id.asc(), SensorData.timestamp.asc())
+
+        for session_id, rows in groupby(query.yield_per(STREAM_BATCH_SIZE), key=attrgetter('session_id')):
+            serialized = [serialize_sensor_row(sd) for sd in rows]
+            results[session_id]['sensor_data'] = serialized
+            total_records += len(serialized)
+
+        for session_id, session in misses.items():
+            pull_cache.set_session_data(session, results[session_id]['sensor_data'])
+        return results, total_records
+
+    session_conditions = []
+    plain_ids = [session_id for session_id in results if session_id not in cursors]
+    if plain_ids:
+        session_conditions.append(SensorData.session_id.in_(plain_ids))
+    for session_id, cursor in cursors.items():
+        session_conditions.append(and_(
+            SensorData.session_id == session_id,
+            tuple_(SensorData.sensor_type, SensorData.timestamp) > tuple_(*cursor)
+        ))
+
+    query = SensorData.query.filter(or_(*session_conditions), *conditions).order_by(
+        SensorData.session_id.asc(),
+        SensorData.sensor_type.asc(),
+        SensorData.timestamp.asc()
+    )
+    if max_records is not None:
+        query = query.limit(max_records + 1)
+
+    total_records = 0
+    overflow = None
+    for sd in query.yield_per(STREAM_BATCH_SIZE):
+        if max_records is not None and total_records >= max_records:
+            overflow = sd
+            break
+        results[sd.session_id]['sensor_data'].append(serialize_sensor_row(sd))
+        cursors[sd.session_id] = (sd.sensor_type, sd.timestamp)
+        total_records += 1
+
+    if overflow is not None:
+        # 예산 초과: 넘친 행의 세션 이후는 전송 여부를 알 수 없으므로 미완료 처리
+        # (아직 한 행도 보내지 않은 세션은 처음부터 받도록 START_CURSOR)
+        for session_id, result in results.items():
+            if session_id >= overflow.session_id:
+                result['data_complete'] = False
+                result['data_cursor'] = _cursor_dict(cursors.get(session_id, START_CURSOR))
+
+    return results, total_records
+
+
+def _collect_downsampled(results: dict, sample_filter: dict):
+    """
+    다운샘플링된 세션 데이터 수집 (collect_session_data의 max_points 모드)
+
+    Args:
+        results: {session.id: {'sensor_data', 'data_cursor', 'data_complete'}}
+        sample_filter: parse_sample_filter() 결과
+
+    Returns:
+        tuple: (results, total_records)
+    """
+    session_ids = list(results)
+    total_records = 0
+
+    if sample_filter['downsample'] == 'stride':
+        rows = db.session.execute(stride_select(session_ids, sample_filter)).yield_per(STREAM_BATCH_SIZE)
+        for session_id, session_rows in groupby(rows, key=attrgetter('session_id')):
+            serialized = [serialize_sensor_row(row) for row in session_rows]
+            results[session_id]['sensor_data'] = serialized
+            total_records += len(serialized)
+        return results, total_records
+
+    # bucket: (세션, 센서 타입) 시리즈별 NumPy 구간 집계
+    query = db.session.query(
+        SensorData.session_id,
+        SensorData.sensor_type,
+        SensorData.timestamp,
+        SensorData.data
+    ).filter(
+        SensorData.session_id.in_(session_ids),
+        *sample_conditions(sample_filter)
+    ).order_by(
+        SensorData.session_id.asc(),
+        SensorData.sensor_type.asc(),
+        SensorData.timestamp.asc()
+    )
+
+    for session_id, session_rows in groupby(query.yield_per(STREAM_BATCH_SIZE), key=attrgetter('session_id')):
+        sensor_data = []
+        for sensor_type, series in groupby(session_rows, key=attrgetter('sensor_type')):
+            series = list(series)
+            sensor_data.extend(bucket_series(
+                sensor_type,
+                [row.timestamp for row in series],
+                [row.data or {} for row in series],
+                sample_filter['max_points']
+            ))
+        sensor_data.sort(key=lambda row: row['timestamp'])
+        results[session_id]['sensor_data'] = sensor_data
+        total_records += len(sensor_data)
+
+    return results, total_records
+
+
+def _cursor_dict(cursor) -> dict:
+    """(sensor_type, timestamp) 커서를 응답 형식으로 변환"""
+    if cursor is None:
+        return None
+    return {'sensor_type': cursor[0], 'timestamp': cursor[1]}
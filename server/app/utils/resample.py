@@ -0,0 +1,288 @@
+"""
+Sensor Resampling & Time Alignment
+세션 센서 타입들을 공통 시간 격자로 정렬 (nearest / linear / zoh, searchsorted 기반 벡터 연산)
+"""
+
+import math
+import numpy as np
+from app.utils.anomaly import SIGNAL_FIELDS
+from app.utils.sensor_arrays import ANALYSIS_BATCH_SIZE, load_sensor_arrays, sensor_type_bounds
+from app.utils.trajectory import TRAJECTORY_FIELDS
+
+# nearest: 가장 가까운 샘플, linear: 앞뒤 샘플 선형 보간, zoh: 직전 샘플 유지 (zero-order hold)
+RESAMPLE_METHODS = ('nearest', 'linear', 'zoh')
+
+# 센서 타입별 정렬 필드 (GPS는 위치 + 속도)
+RESAMPLE_FIELDS = {**SIGNAL_FIELDS, 'gps': TRAJECTORY_FIELDS + ('speed',)}
+
+# 내보내기 형식 (arrow는 pyarrow 필요)
+EXPORT_FORMATS = ('json', 'csv', 'arrow')
+
+# CSV 조각당 행 수
+CSV_CHUNK_ROWS = 5000
+
+
+def validate_resample(method: str, rate_hz, max_gap_ms=None) -> tuple:
+    """
+    정렬 파라미터 확인
+
+    Returns:
+        tuple: (method, rate_hz, max_gap_ms)
+
+    Raises:
+        ValueError: 방법 / 격자 주파수 / 최대 간격이 잘못된 경우
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f'method must be one of: {", ".join(RESAMPLE_METHODS)}')
+    # inf / nan은 '> 0' 비교를 통과하므로 유한 값인지 함께 확인 (int(inf)는 OverflowError)
+    if not rate_hz or not math.isfinite(float(rate_hz)) or float(rate_hz) <= 0:
+        raise ValueError('rate_hz must be a positive finite number')
+    if max_gap_ms is not None and (not math.isfinite(float(max_gap_ms)) or float(max_gap_ms) <= 0):
+        raise ValueError('max_gap_ms must be a positive finite number')
+    return method, float(rate_hz), None if max_gap_ms is None else float(max_gap_ms)
+
+
+def time_grid(start_ts: int, end_ts: int, rate_hz: float) -> np.ndarray:
+    """
+    균일 시간 격자 (ms, start_ts부터 1000 / rate_hz 간격, end_ts 이하)
+
+    Returns:
+        np.ndarray: float64 타임스탬프 (소수 ms 유지, 출력 시 반올림)
+    """
+    interval = 1000.0 / rate_hz
+    count = int(np.floor((end_ts - start_ts) / interval)) + 1 if end_ts >= start_ts else 0
+    return start_ts + np.arange(count) * interval
+
+
+def resample_series(timestamps: np.ndarray, values: np.ndarray, grid: np.ndarray, method: str = 'linear',
+                    max_gap_ms: float = None) -> np.ndarray:
+    """
+    한 센서 시계열을 격자로 재표본화
+
+    격자 각 시각의 위치를 np.searchsorted로 한 번에 찾고 (정렬된 병합), 앞뒤 샘플 인덱스로 값을 고른다.
+    같은 시각의 중복 샘플은 마지막 값을 쓴다.
+
+    - nearest / linear: 첫 샘플 ~ 마지막 샘플 범위 밖은 NaN (외삽 없음)
+    - zoh: 첫 샘플 이전은 NaN, 이후는 직전 샘플 값 유지
+    - max_gap_ms: 사용한 샘플과의 거리 (nearest), 샘플 경과 시간 (zoh), 보간 구간 길이 (linear, 샘플 시각은 0)가
+      이보다 크면 NaN (데이터 끊김 구간)
+
+    Args:
+        timestamps: (n,) 오름차순 ms
+        values: (n,) 또는 (n, k)
+        grid: (m,) 격자 ms
+        method: nearest / linear / zoh
+        max_gap_ms: 최대 간격 (선택)
+
+    Returns:
+        np.ndarray: (m,) 또는 (m, k) float64
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out_shape = (len(grid),) + values.shape[1:]
+    if not len(timestamps):
+        return np.full(out_shape, np.nan)
+
+    keep = np.append(timestamps[1:] != timestamps[:-1], True)
+    timestamps, values = timestamps[keep].astype(np.float64), values[keep]
+    last = len(timestamps) - 1
+
+    right = np.searchsorted(timestamps, grid, side='right')
+    lower = np.clip(right - 1, 0, last)
+    upper = np.clip(right, 0, last)
+
+    if method == 'zoh':
+        index = lower
+        valid = right > 0
+        gap = grid - timestamps[index]
+        result = values[index]
+    elif method == 'nearest':
+        index = np.where(timestamps[upper] - grid < grid - timestamps[lower], upper, lower)
+        valid = (grid >= timestamps[0]) & (grid <= timestamps[-1])
+        gap = np.abs(grid - timestamps[index])
+        result = values[index]
+    else:
+        span = timestamps[upper] - timestamps[lower]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(span > 0, (grid - timestamps[lower]) / span, 0.0)
+        if values.ndim > 1:
+            weight = weight[:, None]
+        valid = (grid >= timestamps[0]) & (grid <= timestamps[-1])
+        # 격자가 샘플 시각과 같으면 구간 길이와 관계없이 그 샘플 값
+        gap = np.where(grid == timestamps[lower], 0.0, span)
+        result = values[lower] + (values[upper] - values[lower]) * weight
+
+    if max_gap_ms is not None:
+        valid &= gap <= max_gap_ms
+    result = np.array(result, dtype=np.float64)
+    result[~valid] = np.nan
+    return result
+
+
+def align_sensor_arrays(arrays: dict, grid: np.ndarray, method: str = 'linear', max_gap_ms: float = None,
+                        fields: dict = None) -> dict:
+    """
+    센서 타입별 열 배열을 같은 격자로 정렬 (타입마다 searchsorted 1회, 축 값이 없는 샘플 제외)
+
+    Args:
+        arrays: load_sensor_arrays() 결과 {sensor_type: {'timestamp', 필드...}}
+        grid: 격자 ms
+        method: nearest / linear / zoh
+        max_gap_ms: 최대 간격 (선택)
+        fields: {sensor_type: 필드 목록} (생략 시 RESAMPLE_FIELDS)
+
+    Returns:
+        dict: {'{sensor_type}_{field}': (m,) 배열} (arrays 순서, 필드 순서)
+    """
+    fields = fields or RESAMPLE_FIELDS
+    columns = {}
+    for sensor_type, series in arrays.items():
+        keys = [key for key in fields.get(sensor_type, ()) if key in series]
+        if not keys:
+            continue
+        values = np.column_stack([series[key] for key in keys])
+        valid = ~np.isnan(values).any(axis=1)
+        resampled = resample_series(series['timestamp'][valid], values[valid], grid, method, max_gap_ms)
+        for col, key in enumerate(keys):
+            columns[f'{sensor_type}_{key}'] = resampled[:, col]
+    return columns
+
+
+def align_session(session, sensor_types: list = None, rate_hz: float = None, method: str = 'linear',
+                  start_ts: int = None, end_ts: int = None, max_gap_ms: float = None,
+                  chunk_size: int = ANALYSIS_BATCH_SIZE, max_points: int = None) -> dict:
+    """
+    세션 센서 타입들을 공통 시간 격자로 정렬
+
+    격자 범위를 생략하면 모든 센서 타입에 데이터가 있는 구간 (시작 시각 최댓값 ~ 끝 시각 최솟값)을 쓴다.
+
+    Args:
+        session: RecordingSession (rate_hz 생략 시 sample_rate 사용)
+        sensor_types: 대상 센서 타입 (생략 시 세션의 RESAMPLE_FIELDS 타입 전체)
+        rate_hz: 격자 주파수 (Hz)
+        method: nearest / linear / zoh
+        start_ts: 격자 시작 (ms, 선택)
+        end_ts: 격자 끝 (ms, 선택)
+        max_gap_ms: 최대 간격 (선택)
+        chunk_size: 청크 행 수
+        max_points: 격자 점 수 상한 (선택)
+
+    Returns:
+        dict: {'sensor_types', 'method', 'rate_hz', 'start_ts', 'end_ts', 'timestamp' (int64 배열),
+               'columns' ({열 이름: float64 배열}), 'coverage' ({sensor_type: [첫 샘플, 마지막 샘플]})}
+
+    Raises:
+        ValueError: 파라미터가 잘못되었거나, 데이터 / 겹치는 구간이 없거나, 격자 점이 상한을 넘는 경우
+    """
+    method, rate_hz, max_gap_ms = validate_resample(method, rate_hz or session.sample_rate, max_gap_ms)
+
+    # 타입별 수 / 범위만 먼저 집계해 격자 크기를 확인한 뒤 배열을 읽는다
+    bounds = {sensor_type: bound for sensor_type, bound in sensor_type_bounds(session.id, sensor_types).items()
+              if sensor_type in RESAMPLE_FIELDS}
+    if sensor_types:
+        bounds = {sensor_type: bounds[sensor_type] for sensor_type in sensor_types if sensor_type in bounds}
+    if not bounds:
+        raise ValueError('No sensor data found')
+    coverage = {sensor_type: [bound['first'], bound['last']] for sensor_type, bound in bounds.items()}
+
+    start_ts = max(first for first, _ in coverage.values()) if start_ts is None else int(start_ts)
+    end_ts = min(last for _, last in coverage.values()) if end_ts is None else int(end_ts)
+    if start_ts > end_ts:
+        raise ValueError('Sensor time ranges do not overlap')
+
+    points = int(np.floor((end_ts - start_ts) * rate_hz / 1000.0)) + 1
+    if max_points is not None and points > max_points:
+        raise ValueError(f'Too many grid points ({points}, max {max_points})')
+
+    counts = {sensor_type: bound['count'] for sensor_type, bound in bounds.items()}
+    arrays = load_sensor_arrays(session.id, RESAMPLE_FIELDS, list(counts), chunk_size, counts)
+
+    grid = time_grid(start_ts, end_ts, rate_hz)
+    return {
+        'sensor_types': list(arrays),
+        'method': method,
+        'rate_hz': rate_hz,
+        'start_ts': start_ts,
+        'end_ts': end_ts,
+        'timestamp': np.rint(grid).astype(np.int64),
+        'columns': align_sensor_arrays(arrays, grid, method, max_gap_ms),
+        'coverage': coverage,
+    }
+
+
+def parse_align_args(args) -> dict:
+    """
+    정렬 내보내기 쿼리 파라미터 파싱
+
+    Args:
+        args: request.args (sensor_types 쉼표 구분, method, rate_hz, start_ts, end_ts, max_gap_ms)
+
+    Returns:
+        dict: align_session() 인자
+
+    Raises:
+        ValueError: 숫자가 아니거나 파라미터가 잘못된 경우 (메시지는 그대로 400 응답에 사용)
+    """
+    sensor_types = [name for name in args.get('sensor_types', '').split(',') if name] or None
+    try:
+        rate_hz = float(args['rate_hz']) if 'rate_hz' in args else None
+        start_ts = int(args['start_ts']) if 'start_ts' in args else None
+        end_ts = int(args['end_ts']) if 'end_ts' in args else None
+        max_gap_ms = float(args['max_gap_ms']) if 'max_gap_ms' in args else None
+    except ValueError:
+        raise ValueError('rate_hz, start_ts, end_ts and max_gap_ms must be numbers')
+
+    method = args.get('method', 'linear')
+    validate_resample(method, 1.0 if rate_hz is None else rate_hz, max_gap_ms)
+    if start_ts is not None and end_ts is not None and start_ts > end_ts:
+        raise ValueError('start_ts must be <= end_ts')
+
+    return {
+        'sensor_types': sensor_types,
+        'rate_hz': rate_hz,
+        'method': method,
+        'start_ts': start_ts,
+        'end_ts': end_ts,
+        'max_gap_ms': max_gap_ms,
+    }
+
+
+def aligned_to_dict(session, aligned: dict) -> dict:
+    """
+    정렬 결과 JSON 응답 (열 지향, NaN은 null)
+
+    Returns:
+        dict: {'session_id', 'sensor_types', 'method', 'rate_hz', 'start_ts', 'end_ts', 'count',
+               'coverage', 'timestamps': [...], 'columns': {열 이름: [...]}}
+    """
+    return {
+        'session_id': str(session.session_id),
+        **{key: aligned[key] for key in ('sensor_types', 'method', 'rate_hz', 'start_ts', 'end_ts', 'coverage')},
+        'count': len(aligned['timestamp']),
+        'timestamps': aligned['timestamp'].tolist(),
+        'columns': {
+            name: [None if math.isnan(value) else value for value in values.tolist()]
+            for name, values in aligned['columns'].items()
+        },
+    }
+
+
+def iter_aligned_csv(aligned: dict, chunk_rows: int = CSV_CHUNK_ROWS):
+    """
+    정렬 결과 CSV (timestamp + 열, 값이 없으면 빈 칸) 바이트 조각 생성
+
+    Yields:
+        bytes: 헤더, 이후 chunk_rows 행씩
+    """
+    names = list(aligned['columns'])
+    yield (','.join(['timestamp'] + names) + '\n').encode()
+
+    timestamps = aligned['timestamp']
+    values = np.column_stack([aligned['columns'][name] for name in names]) if names \
+        else np.zeros((len(timestamps), 0))
+    for start in range(0, len(timestamps), chunk_rows):
+        block = values[start:start + chunk_rows]
+        text = np.char.mod('%.10g', block)
+        text[np.isnan(block)] = ''
+        lines = [','.join([str(ts)] + row) for ts, row in
+                 zip(timestamps[start:start + chunk_rows].tolist(), text.tolist())]
+        yield ('\n'.join(lines) + '\n').encode()
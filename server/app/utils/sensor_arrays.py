@@ -0,0 +1,190 @@
+"""
+Sensor Array Loader
+분석 작업용 센서 데이터 로더 (필요한 JSON 숫자 필드만 SQL에서 추출해 센서 타입별 NumPy 배열로 적재)
+"""
+
+import re
+import numpy as np
+from sqlalchemy import Float, case, func, select
+from app import db
+from app.models.sensor_data import SensorData
+
+# 서버 측 커서에서 한 번에 가져오는 행 수
+ANALYSIS_BATCH_SIZE = 10000
+
+# JSON 필드 이름 (SQL 경로 문자열에 그대로 들어가므로 제한)
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def numeric_field(key: str, dialect_name: str):
+    """
+    data JSON의 숫자 필드 추출 식 (숫자가 아니거나 없으면 NULL)
+
+    - PostgreSQL: data->>'key' (jsonb_typeof = 'number'인 경우만 float로 변환)
+    - SQLite: json_extract(data, '$."key"') (json_type이 integer / real인 경우만)
+
+    Args:
+        key: 필드 이름
+        dialect_name: SQLAlchemy dialect 이름
+
+    Returns:
+        ColumnElement: float 또는 NULL
+    """
+    if not FIELD_NAME_PATTERN.match(key):
+        raise ValueError(f'Invalid sensor field name: {key!r}')
+
+    if dialect_name == 'postgresql':
+        return case(
+            (func.jsonb_typeof(SensorData.data[key]) == 'number', SensorData.data[key].astext.cast(Float)),
+            else_=None
+        )
+
+    path = f'$."{key}"'
+    return case(
+        (func.json_type(SensorData.data, path).in_(('integer', 'real')),
+         func.json_extract(SensorData.data, path)),
+        else_=None
+    )
+
+
+def sensor_type_counts(session_id: int, sensor_types=None) -> dict:
+    """
+    세션의 센서 타입별 샘플 수 (GROUP BY 1회, 배열 사전 할당용)
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_types: 센서 타입 목록 (None이면 전체)
+
+    Returns:
+        dict: {sensor_type: count} (센서 타입 순)
+    """
+    query = db.session.query(
+        SensorData.sensor_type,
+        func.count(SensorData.id)
+    ).filter(
+        SensorData.session_id == session_id
+    )
+    if sensor_types is not None:
+        query = query.filter(SensorData.sensor_type.in_(list(sensor_types)))
+
+    rows = query.group_by(SensorData.sensor_type).order_by(SensorData.sensor_type).all()
+    return {sensor_type: int(count) for sensor_type, count in rows}
+
+
+def sensor_type_bounds(session_id: int, sensor_types=None) -> dict:
+    """
+    세션의 센서 타입별 샘플 수와 첫 / 마지막 타임스탬프 (GROUP BY 1회, 배열을 읽기 전 범위 계산용)
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_types: 센서 타입 목록 (None이면 전체)
+
+    Returns:
+        dict: {sensor_type: {'count', 'first', 'last'}} (센서 타입 순)
+    """
+    query = db.session.query(
+        SensorData.sensor_type,
+        func.count(SensorData.id),
+        func.min(SensorData.timestamp),
+        func.max(SensorData.timestamp)
+    ).filter(
+        SensorData.session_id == session_id
+    )
+    if sensor_types is not None:
+        query = query.filter(SensorData.sensor_type.in_(list(sensor_types)))
+
+    rows = query.group_by(SensorData.sensor_type).order_by(SensorData.sensor_type).all()
+    return {sensor_type: {'count': int(count), 'first': int(first), 'last': int(last)}
+            for sensor_type, count, first, last in rows}
+
+
+def iter_sensor_chunks(session_id: int, sensor_type: str, fields=(), chunk_size: int = ANALYSIS_BATCH_SIZE):
+    """
+    한 시리즈의 (timestamp, 필드...) 행을 float64 2차원 배열 청크로 읽기
+
+    (session_id, sensor_type, timestamp) 인덱스 순서로 서버 측 커서(stream_results)에서
+    chunk_size행씩 가져오므로 ORM 객체나 JSON dict를 만들지 않고, 메모리는 청크 크기로 제한된다.
+
+    Args:
+        session_id: RecordingSession ID
+        sensor_type: 센서 타입
+        fields: data의 숫자 필드 이름 목록 (없거나 숫자가 아니면 NaN)
+        chunk_size: 청크 행 수
+
+    Yields:
+        np.ndarray: (행 수, 1 + len(fields)) 배열, 0번 열은 timestamp
+    """
+    dialect_name = db.session.get_bind().dialect.name
+    statement = select(
+        SensorData.timestamp,
+        *(numeric_field(key, dialect_name).label(key) for key in fields)
+    ).where(
+        SensorData.session_id == session_id,
+        SensorData.sensor_type == sensor_type
+    ).order_by(SensorData.timestamp.asc())
+
+    connection = db.session.connection().execution_options(stream_results=True, max_row_buffer=chunk_size)
+    result = connection.execute(statement)
+    try:
+        for rows in result.partitions(chunk_size):
+            yield np.array(rows, dtype=np.float64).reshape(len(rows), 1 + len(fields))
+    finally:
+        result.close()
+
+
+def iter_sensor_columns(session_id: int, sensor_type: str, fields=(), chunk_size: int = ANALYSIS_BATCH_SIZE):
+    """
+    iter_sensor_chunks()를 열 dict로 나눠 반환 (스트리밍 분석용)
+
+    Yields:
+        dict: {'timestamp': int64 배열, 필드: float64 배열} (청크 하나)
+    """
+    for chunk in iter_sensor_chunks(session_id, sensor_type, fields, chunk_size):
+        columns = {'timestamp': chunk[:, 0].astype(np.int64)}
+        for col, key in enumerate(fields, start=1):
+            columns[key] = chunk[:, col]
+        yield columns
+
+
+def load_sensor_arrays(session_id: int, fields: dict, sensor_types=None,
+                       chunk_size: int = ANALYSIS_BATCH_SIZE, counts: dict = None) -> dict:
+    """
+    세션 센서 데이터를 센서 타입별 열 배열로 적재
+
+    타입별 샘플 수로 배열을 미리 할당한 뒤 iter_sensor_chunks() 청크를 채운다
+    (집계 이후 추가된 행이 있으면 배열을 늘린다).
+
+    Args:
+        session_id: RecordingSession ID
+        fields: {sensor_type: 필드 이름 목록} (없는 타입은 timestamp만)
+        sensor_types: 적재할 센서 타입 목록 (None이면 세션의 전체 타입)
+        chunk_size: 청크 행 수
+        counts: sensor_type_counts() 결과 (이미 조회한 경우)
+
+    Returns:
+        dict: {sensor_type: {'timestamp': int64 배열, 필드: float64 배열 (없으면 NaN)}}
+              (타임스탬프 오름차순, 데이터가 없으면 빈 dict)
+    """
+    arrays = {}
+    if counts is None:
+        counts = sensor_type_counts(session_id, sensor_types)
+
+    for sensor_type, count in counts.items():
+        keys = tuple(fields.get(sensor_type, ()))
+        block = np.empty((count, 1 + len(keys)), dtype=np.float64)
+        filled = 0
+
+        for chunk in iter_sensor_chunks(session_id, sensor_type, keys, chunk_size):
+            end = filled + len(chunk)
+            if end > len(block):
+                block = np.concatenate([block[:filled], np.empty((end - filled, block.shape[1]))])
+            block[filled:end] = chunk
+            filled = end
+
+        block = block[:filled]
+        columns = {'timestamp': block[:, 0].astype(np.int64)}
+        for col, key in enumerate(keys, start=1):
+            columns[key] = np.ascontiguousarray(block[:, col])
+        arrays[sensor_type] = columns
+
+    return arrays
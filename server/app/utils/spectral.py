@@ -0,0 +1,282 @@
+"""
+Spectral Features
+윈도별 주파수 특징 (Hann 윈도 FFT, 우세 주파수, 대역 에너지, Welch PSD) - 청크 단위 배열 연산, 압축 저장
+"""
+
+import io
+import numpy as np
+from datetime import datetime
+from numpy.lib.stride_tricks import sliding_window_view
+from app import db
+from app.models.spectral import SpectralFeatures
+from app.utils.anomaly import SIGNAL_FIELDS, signal_values
+from app.utils.sensor_arrays import ANALYSIS_BATCH_SIZE, iter_sensor_columns, sensor_type_counts
+
+# 주파수 분석 대상 센서 (3축 벡터 크기)
+SPECTRAL_SENSORS = ('accelerometer', 'gyroscope', 'magnetometer', 'linear_acceleration')
+
+# 윈도 (샘플 수), 기본 50% 겹침
+DEFAULT_WINDOW_SIZE = 256
+MIN_WINDOW_SIZE = 16
+MAX_WINDOW_SIZE = 8192
+
+# 대역 에너지 구간 (Hz): 자세 / 보행 / 달리기·떨림 / 진동
+DEFAULT_BANDS = ((0.0, 0.5), (0.5, 3.0), (3.0, 8.0), (8.0, 20.0))
+
+# 윈도별 특징 배열 (encode_features)
+FEATURE_ARRAYS = ('start_ts', 'end_ts', 'dominant_frequency', 'dominant_power', 'total_energy',
+                  'spectral_centroid', 'band_energy')
+
+
+def validate_spectral(sample_rate, window_size: int, hop: int = None, bands=None) -> tuple:
+    """
+    주파수 분석 파라미터 확인
+
+    Returns:
+        tuple: (sample_rate, window_size, hop, bands)
+
+    Raises:
+        ValueError: 샘플링 주파수 / 윈도 / 간격 / 대역이 잘못된 경우
+    """
+    if not sample_rate or sample_rate <= 0:
+        raise ValueError('Session sample_rate must be positive')
+    if not MIN_WINDOW_SIZE <= window_size <= MAX_WINDOW_SIZE:
+        raise ValueError(f'window_size must be between {MIN_WINDOW_SIZE} and {MAX_WINDOW_SIZE}')
+
+    hop = window_size // 2 if hop is None else hop
+    if not 1 <= hop <= window_size:
+        raise ValueError('hop must be between 1 and window_size')
+
+    bands = [[float(low), float(high)] for low, high in (bands or DEFAULT_BANDS)]
+    if any(low < 0 or high <= low for low, high in bands):
+        raise ValueError('bands must be [low_hz, high_hz] with 0 <= low < high')
+    return float(sample_rate), int(window_size), int(hop), bands
+
+
+class SpectralAccumulator:
+    """
+    윈도 주파수 특징 누적 계산
+
+    - 청크 앞에 직전 청크의 남은 샘플을 붙여 hop 간격 윈도를 sliding_window_view로 만들고
+      (복사 없음), 윈도 전체를 한 번의 rfft로 변환
+    - 윈도마다 평균 제거 후 Hann 윈도 적용, PSD는 밀도 단위 (scipy.signal.welch와 같은 스케일)
+    - Welch PSD = 전체 윈도 PSD 평균
+    """
+
+    def __init__(self, sample_rate: float, window_size: int, hop: int, bands):
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+        self.hop = hop
+        self.bands = bands
+
+        self.taper = np.hanning(window_size + 1)[:-1]  # periodic Hann
+        self.frequencies = np.fft.rfftfreq(window_size, d=1.0 / sample_rate)
+        self.scale = 1.0 / (sample_rate * np.sum(self.taper ** 2))
+        self.band_masks = np.array([(self.frequencies >= low) & (self.frequencies < high) for low, high in bands])
+
+        self.psd_sum = np.zeros(len(self.frequencies))
+        self.window_count = 0
+        self.parts = {key: [] for key in FEATURE_ARRAYS}
+        self._ts = np.zeros(0, dtype=np.int64)
+        self._values = np.zeros(0)
+
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> 'SpectralAccumulator':
+        """
+        청크 추가 (타임스탬프 오름차순)
+
+        Returns:
+            SpectralAccumulator: self
+        """
+        timestamps = np.concatenate([self._ts, timestamps])
+        values = np.concatenate([self._values, values])
+
+        count = (len(values) - self.window_size) // self.hop + 1 if len(values) >= self.window_size else 0
+        if count:
+            frames = sliding_window_view(values, self.window_size)[::self.hop][:count]
+            starts = np.arange(count) * self.hop
+            self._add_windows(frames, timestamps[starts], timestamps[starts + self.window_size - 1])
+
+        next_start = count * self.hop
+        self._ts, self._values = timestamps[next_start:], values[next_start:]
+        return self
+
+    def _add_windows(self, frames: np.ndarray, start_ts: np.ndarray, end_ts: np.ndarray):
+        detrended = (frames - frames.mean(axis=1, keepdims=True)) * self.taper
+        psd = np.abs(np.fft.rfft(detrended, axis=1)) ** 2 * self.scale
+        # 단측 스펙트럼: DC / Nyquist 외에는 2배
+        psd[:, 1:] *= 2
+        if self.window_size % 2 == 0:
+            psd[:, -1] /= 2
+
+        df = self.frequencies[1] - self.frequencies[0]
+        peak = np.argmax(psd[:, 1:], axis=1) + 1
+        total = psd.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            centroid = np.where(total > 0, (psd * self.frequencies).sum(axis=1) / total, 0.0)
+
+        self.parts['start_ts'].append(start_ts)
+        self.parts['end_ts'].append(end_ts)
+        self.parts['dominant_frequency'].append(self.frequencies[peak].astype(np.float32))
+        self.parts['dominant_power'].append(psd[np.arange(len(psd)), peak].astype(np.float32))
+        self.parts['total_energy'].append((total * df).astype(np.float32))
+        self.parts['spectral_centroid'].append(centroid.astype(np.float32))
+        self.parts['band_energy'].append((psd @ self.band_masks.T * df).astype(np.float32))
+
+        self.psd_sum += psd.sum(axis=0)
+        self.window_count += len(psd)
+
+    def result(self) -> dict:
+        """
+        누적 결과
+
+        Returns:
+            dict | None: window_count, features (FEATURE_ARRAYS 배열), welch_psd, dominant_frequency
+                         (윈도가 하나도 없으면 None)
+        """
+        if not self.window_count:
+            return None
+
+        welch = self.psd_sum / self.window_count
+        return {
+            'window_count': self.window_count,
+            'features': {key: np.concatenate(parts) for key, parts in self.parts.items()},
+            'welch_psd': {
+                'frequencies': [round(float(f), 6) for f in self.frequencies],
+                'psd': [float(p) for p in welch],
+            },
+            'dominant_frequency': float(self.frequencies[np.argmax(welch[1:]) + 1]),
+        }
+
+
+def encode_features(features: dict) -> bytes:
+    """윈도별 특징 배열을 압축 바이너리로 (np.savez_compressed)"""
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **features)
+    return buffer.getvalue()
+
+
+def decode_features(blob: bytes) -> dict:
+    """encode_features() 역변환"""
+    with np.load(io.BytesIO(blob)) as arrays:
+        return {key: arrays[key] for key in arrays.files}
+
+
+def extract_spectral(session_id: int, sensor_type: str, sample_rate: float, window_size: int, hop: int,
+                     bands, chunk_size: int = ANALYSIS_BATCH_SIZE):
+    """
+    세션 센서 타입의 윈도 주파수 특징 계산 (청크 스트리밍, 값이 없는 샘플 제외)
+
+    Returns:
+        dict | None: SpectralAccumulator.result()
+    """
+    fields = SIGNAL_FIELDS[sensor_type]
+    accumulator = SpectralAccumulator(sample_rate, window_size, hop, bands)
+    for columns in iter_sensor_columns(session_id, sensor_type, fields, chunk_size):
+        accumulator.update(*signal_values(columns, fields))
+    return accumulator.result()
+
+
+def session_spectral_features(session, sensor_type: str, window_size: int = DEFAULT_WINDOW_SIZE, hop: int = None,
+                              bands=None, chunk_size: int = ANALYSIS_BATCH_SIZE, refresh: bool = False):
+    """
+    세션 주파수 특징 조회 (저장된 결과가 현재 데이터 버전 / 파라미터와 같으면 재사용, 아니면 계산 후 저장)
+
+    Args:
+        session: RecordingSession (sample_rate 사용)
+        sensor_type: SPECTRAL_SENSORS 중 하나
+        window_size: 윈도 샘플 수
+        hop: 윈도 간격 (생략 시 window_size / 2)
+        bands: 대역 에너지 구간 [[low_hz, high_hz], ...] (생략 시 DEFAULT_BANDS)
+        chunk_size: 청크 행 수
+        refresh: True면 항상 다시 계산
+
+    Returns:
+        SpectralFeatures | None: 저장된 행 (윈도를 만들 만큼 샘플이 없으면 None, 커밋은 호출자)
+    """
+    sample_rate, window_size, hop, bands = validate_spectral(session.sample_rate, window_size, hop, bands)
+    sample_count = sensor_type_counts(session.id, [sensor_type]).get(sensor_type, 0)
+
+    row = SpectralFeatures.query.filter_by(session_id=session.id, sensor_type=sensor_type).first()
+    if not refresh and row is not None and row.change_seq == session.change_seq \
+            and row.sample_count == sample_count and row.sample_rate == sample_rate \
+            and (row.window_size, row.hop, row.bands) == (window_size, hop, bands):
+        return row
+
+    result = extract_spectral(session.id, sensor_type, sample_rate, window_size, hop, bands, chunk_size)
+    if result is None:
+        if row is not None:
+            db.session.delete(row)
+        return None
+
+    if row is None:
+        row = SpectralFeatures(session_id=session.id, sensor_type=sensor_type)
+        db.session.add(row)
+
+    row.change_seq = session.change_seq
+    row.sample_count = sample_count
+    row.sample_rate = sample_rate
+    row.window_size = window_size
+    row.hop = hop
+    row.bands = bands
+    row.window_count = result['window_count']
+    row.features = encode_features(result['features'])
+    row.welch_psd = result['welch_psd']
+    row.dominant_frequency = result['dominant_frequency']
+    row.computed_at = datetime.utcnow()
+    return row
+
+
+def query_spectral_windows(row: SpectralFeatures, start_ts: int = None, end_ts: int = None) -> list:
+    """
+    저장된 윈도별 특징 조회 (시간 범위와 겹치는 윈도)
+
+    Args:
+        row: SpectralFeatures
+        start_ts: 범위 시작 (ms, 선택)
+        end_ts: 범위 끝 (ms, 선택)
+
+    Returns:
+        list: [{'start_ts', 'end_ts', 'dominant_frequency', 'dominant_power', 'total_energy',
+                'spectral_centroid', 'band_energy': [...]}] (시작 시각 순)
+    """
+    features = decode_features(row.features)
+    selected = np.ones(len(features['start_ts']), dtype=bool)
+    if start_ts is not None:
+        selected &= features['end_ts'] >= start_ts
+    if end_ts is not None:
+        selected &= features['start_ts'] <= end_ts
+
+    columns = {key: values[selected].tolist() for key, values in features.items()}
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def build_spectral_response(session, sensor_type: str = None, start_ts: int = None, end_ts: int = None,
+                            include_windows: bool = False) -> dict:
+    """
+    저장된 주파수 특징 응답 (GET /api/sync/sessions/<uuid>/spectral)
+
+    Args:
+        session: RecordingSession
+        sensor_type: 센서 타입 (생략 시 저장된 전체)
+        start_ts: 윈도 범위 시작 (ms, include_windows일 때)
+        end_ts: 윈도 범위 끝 (ms, include_windows일 때)
+        include_windows: 윈도별 특징 포함 여부
+
+    Returns:
+        dict | None: {'session_id', 'features': [...]} (저장된 결과가 없으면 None),
+                     stale = 계산 이후 세션 데이터가 바뀜
+    """
+    query = SpectralFeatures.query.filter_by(session_id=session.id)
+    if sensor_type is not None:
+        query = query.filter_by(sensor_type=sensor_type)
+    rows = query.order_by(SpectralFeatures.sensor_type).all()
+    if not rows:
+        return None
+
+    features = []
+    for row in rows:
+        item = {**row.to_dict(), 'session_id': str(session.session_id), 'stale': row.change_seq != session.change_seq}
+        if include_windows:
+            item['windows'] = query_spectral_windows(row, start_ts, end_ts)
+        features.append(item)
+    return {'session_id': str(session.session_id), 'features': features}
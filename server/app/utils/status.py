@@ -0,0 +1,70 @@
+"""
+Sync Status Helpers
+동기화 상태 조회 (세션 수 조건부 집계 1회 + 최근 동기화 로그, 짧은 TTL 캐시)
+"""
+
+from sqlalchemy import case, func
+from app import db
+from app.models.session import RecordingSession
+from app.models.sync_log import SyncLog
+from app.utils.cache import pull_cache
+
+# 최근 동기화 로그 수
+RECENT_SYNCS_LIMIT = 10
+
+
+def session_counts(user_id: int) -> dict:
+    """
+    사용자 세션 수를 조건부 집계 쿼리 1회로 계산
+
+    (user_id 인덱스 범위 1회 스캔으로 전체 / 활성 / 업로드 수를 함께 센다)
+
+    Args:
+        user_id: 사용자 ID
+
+    Returns:
+        dict: {'total_sessions', 'active_sessions', 'uploaded_sessions'}
+    """
+    total, active, uploaded = db.session.query(
+        func.count(RecordingSession.id),
+        func.coalesce(func.sum(case((RecordingSession.is_active.is_(True), 1), else_=0)), 0),
+        func.coalesce(func.sum(case((RecordingSession.is_uploaded.is_(True), 1), else_=0)), 0)
+    ).filter(
+        RecordingSession.user_id == user_id
+    ).one()
+
+    return {
+        'total_sessions': int(total),
+        'active_sessions': int(active),
+        'uploaded_sessions': int(uploaded)
+    }
+
+
+def build_sync_status(user_id: int) -> dict:
+    """
+    동기화 상태 조회 (캐시 우선)
+
+    캐시는 Push / 정리 작업 시 사용자 단위로 무효화되고, 그 외 (Pull 로그 등)는
+    SYNC_STATUS_CACHE_TTL초 안에 반영된다.
+
+    Args:
+        user_id: 사용자 ID
+
+    Returns:
+        dict: 세션 수 + recent_syncs
+    """
+    cached = pull_cache.get_status(user_id)
+    if cached is not None:
+        return cached
+
+    recent_syncs = SyncLog.query.filter_by(
+        user_id=user_id
+    ).order_by(
+        SyncLog.created_at.desc()
+    ).limit(RECENT_SYNCS_LIMIT).all()
+
+    status = session_counts(user_id)
+    status['recent_syncs'] = [log.to_dict() for log in recent_syncs]
+
+    pull_cache.set_status(user_id, status)
+    return status
@@ -0,0 +1,309 @@
+"""
+GPS Trajectory Analytics
+GPS 궤적 분석 (Haversine 거리, 속도, 고도 상승, 정지 구간, 경계 상자를 배열 단위로 계산, 세션별 저장)
+"""
+
+from datetime import datetime
+import numpy as np
+from app import db
+from app.models.session import RecordingSession
+from app.models.trajectory import SessionTrajectory
+from app.utils.sensor_arrays import load_sensor_arrays, sensor_type_counts
+
+EARTH_RADIUS_KM = 6371.0
+
+# 정지 구간 판정: 구간 속도가 STOP_SPEED_MPS 미만인 상태가 STOP_MIN_DURATION_MS 이상 지속
+STOP_SPEED_MPS = 0.5
+STOP_MIN_DURATION_MS = 60000
+
+TRAJECTORY_FIELDS = ('latitude', 'longitude', 'altitude')
+
+
+def haversine_km(latitudes, longitudes) -> np.ndarray:
+    """
+    연속한 GPS 좌표 사이의 구간 거리 (Haversine formula)
+
+    Args:
+        latitudes: 위도 배열 (도)
+        longitudes: 경도 배열 (도)
+
+    Returns:
+        np.ndarray: 구간 거리 (km, 길이 n - 1)
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    if len(lat) < 2:
+        return np.zeros(0)
+
+    dlat = np.diff(lat)
+    dlon = np.diff(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+class TrajectoryAccumulator:
+    """
+    GPS 궤적 누적 계산 (청크 단위 update, 청크 경계를 넘는 구간 / 정지 구간 이어붙임)
+
+    - 이전 청크의 마지막 유효 좌표를 다음 청크 앞에 붙여 경계 구간 거리 / 속도를 계산
+    - 느린 구간 run이 청크 끝까지 이어지면 열린 상태로 두고 다음 청크에서 계속
+    - 메모리는 청크 크기 + 정지 구간 목록으로 제한
+    """
+
+    def __init__(self, stop_speed: float = STOP_SPEED_MPS, min_stop_ms: int = STOP_MIN_DURATION_MS):
+        self.stop_speed = stop_speed
+        self.min_stop_ms = min_stop_ms
+        self.sample_count = 0
+        self.first_ts = None
+        self.distance_km = 0.0
+        self.max_speed_mps = None
+        self.elevation_gain_m = 0.0
+        self.elevation_loss_m = 0.0
+        self.altitude_count = 0
+        self.stops = []
+        self.bbox = None
+        self._last = None  # (timestamp, latitude, longitude)
+        self._last_altitude = None
+        self._open_stop = None  # [start_ts, end_ts, lat_sum, lon_sum, point_count]
+
+    def update(self, timestamps, latitudes, longitudes, altitudes=None) -> 'TrajectoryAccumulator':
+        """
+        청크 추가 (타임스탬프 오름차순, 위도 / 경도가 없는 샘플은 제외)
+
+        Returns:
+            TrajectoryAccumulator: self
+        """
+        ts = np.asarray(timestamps, dtype=np.int64)
+        lat = np.asarray(latitudes, dtype=np.float64)
+        lon = np.asarray(longitudes, dtype=np.float64)
+        valid = ~np.isnan(lat) & ~np.isnan(lon)
+        ts, lat, lon = ts[valid], lat[valid], lon[valid]
+        if not len(ts):
+            return self
+
+        if self.first_ts is None:
+            self.first_ts = int(ts[0])
+        self.sample_count += len(ts)
+        self._update_bbox(lat, lon)
+        if altitudes is not None:
+            self._update_elevation(np.asarray(altitudes, dtype=np.float64)[valid])
+
+        # 이전 청크 마지막 좌표를 앞에 붙임 (점 0은 이미 집계됨)
+        carried = self._last is not None
+        if carried:
+            ts = np.concatenate(([self._last[0]], ts))
+            lat = np.concatenate(([self._last[1]], lat))
+            lon = np.concatenate(([self._last[2]], lon))
+        self._last = (int(ts[-1]), float(lat[-1]), float(lon[-1]))
+
+        segments_km = haversine_km(lat, lon)
+        if not len(segments_km):
+            return self
+
+        dt_s = np.diff(ts) / 1000.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speeds = np.where(dt_s > 0, segments_km * 1000.0 / dt_s, np.nan)
+
+        self.distance_km += float(segments_km.sum())
+        if np.isfinite(speeds).any():
+            chunk_max = float(np.nanmax(speeds))
+            self.max_speed_mps = chunk_max if self.max_speed_mps is None else max(self.max_speed_mps, chunk_max)
+
+        self._update_stops(ts, lat, lon, speeds, carried)
+        return self
+
+    def _update_bbox(self, lat, lon):
+        chunk = (float(lat.min()), float(lon.min()), float(lat.max()), float(lon.max()))
+        if self.bbox is None:
+            self.bbox = chunk
+        else:
+            self.bbox = (min(self.bbox[0], chunk[0]), min(self.bbox[1], chunk[1]),
+                         max(self.bbox[2], chunk[2]), max(self.bbox[3], chunk[3]))
+
+    def _update_elevation(self, altitudes):
+        """누적 고도 상승 / 하강 (고도가 없는 샘플은 건너뜀)"""
+        values = altitudes[~np.isnan(altitudes)]
+        if not len(values):
+            return
+        self.altitude_count += len(values)
+        if self._last_altitude is not None:
+            values = np.concatenate(([self._last_altitude], values))
+        self._last_altitude = float(values[-1])
+
+        steps = np.diff(values)
+        self.elevation_gain_m += float(steps[steps > 0].sum())
+        self.elevation_loss_m += float(-steps[steps < 0].sum())
+
+    def _update_stops(self, ts, lat, lon, speeds, carried: bool):
+        """느린 구간 run 탐지 (구간 i는 점 i ~ i + 1), 청크 끝에 걸친 run은 열어 둠"""
+        slow = np.nan_to_num(speeds, nan=np.inf) < self.stop_speed
+        if self._open_stop is not None and not slow[0]:
+            self._close_stop()
+
+        if not slow.any():
+            return
+
+        edges = np.diff(np.concatenate(([0], slow.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        # 점 구간 평균 위치용 누적합
+        lat_sum = np.concatenate(([0.0], np.cumsum(lat)))
+        lon_sum = np.concatenate(([0.0], np.cumsum(lon)))
+
+        for start, end in zip(starts, ends):
+            if start == 0 and carried and self._open_stop is not None:
+                # 이전 청크에서 이어지는 run (점 0은 이미 포함)
+                run = self._open_stop
+                run[1] = int(ts[end])
+                run[2] += float(lat_sum[end + 1] - lat_sum[1])
+                run[3] += float(lon_sum[end + 1] - lon_sum[1])
+                run[4] += int(end)
+            else:
+                self._open_stop = [int(ts[start]), int(ts[end]),
+                                   float(lat_sum[end + 1] - lat_sum[start]),
+                                   float(lon_sum[end + 1] - lon_sum[start]),
+                                   int(end - start + 1)]
+            if end < len(slow):
+                self._close_stop()
+
+    def _close_stop(self):
+        start_ts, end_ts, lat_sum, lon_sum, count = self._open_stop
+        self._open_stop = None
+        if end_ts - start_ts >= self.min_stop_ms:
+            self.stops.append({
+                'start_ts': start_ts,
+                'end_ts': end_ts,
+                'duration_ms': end_ts - start_ts,
+                'latitude': lat_sum / count,
+                'longitude': lon_sum / count,
+            })
+
+    def result(self) -> dict:
+        """
+        궤적 요약 (열린 정지 구간을 닫음)
+
+        Returns:
+            dict: analyze_trajectory() 결과 (샘플이 없으면 None)
+        """
+        if not self.sample_count:
+            return None
+        if self._open_stop is not None:
+            self._close_stop()
+
+        duration_ms = self._last[0] - self.first_ts
+        moving_time_ms = duration_ms - sum(stop['duration_ms'] for stop in self.stops)
+        has_elevation = self.altitude_count >= 2
+
+        return {
+            'sample_count': self.sample_count,
+            'distance_km': round(self.distance_km, 3),
+            'duration_ms': int(duration_ms),
+            'moving_time_ms': int(moving_time_ms),
+            'avg_speed_mps': round(self.distance_km * 1000.0 / (duration_ms / 1000.0), 3) if duration_ms else None,
+            'max_speed_mps': None if self.max_speed_mps is None else round(self.max_speed_mps, 3),
+            'elevation_gain_m': round(self.elevation_gain_m, 2) if has_elevation else None,
+            'elevation_loss_m': round(self.elevation_loss_m, 2) if has_elevation else None,
+            'stop_count': len(self.stops),
+            'stops': list(self.stops),
+            'bbox': {
+                'min_latitude': self.bbox[0],
+                'min_longitude': self.bbox[1],
+                'max_latitude': self.bbox[2],
+                'max_longitude': self.bbox[3],
+            },
+        }
+
+
+def analyze_trajectory(timestamps, latitudes, longitudes, altitudes=None,
+                       stop_speed: float = STOP_SPEED_MPS, min_stop_ms: int = STOP_MIN_DURATION_MS) -> dict:
+    """
+    GPS 궤적 요약 (배열 전체를 한 청크로 계산)
+
+    위도 / 경도가 없는 샘플은 제외한다.
+
+    Args:
+        timestamps: 타임스탬프 배열 (ms, 오름차순)
+        latitudes: 위도 배열
+        longitudes: 경도 배열
+        altitudes: 고도 배열 (선택)
+        stop_speed: 정지 판정 속도 (m/s)
+        min_stop_ms: 최소 정지 시간 (ms)
+
+    Returns:
+        dict: sample_count, distance_km, duration_ms, moving_time_ms, avg_speed_mps, max_speed_mps,
+              elevation_gain_m, elevation_loss_m, stop_count, stops, bbox (샘플이 없으면 None)
+    """
+    accumulator = TrajectoryAccumulator(stop_speed, min_stop_ms)
+    return accumulator.update(timestamps, latitudes, longitudes, altitudes).result()
+
+
+def save_trajectory(session: RecordingSession, summary: dict, sample_count: int) -> SessionTrajectory:
+    """
+    세션 궤적 결과 저장 (세션당 1행 갱신, 커밋은 호출자)
+
+    Args:
+        session: RecordingSession
+        summary: analyze_trajectory() 결과
+        sample_count: 계산에 사용한 GPS 행 수 (데이터 버전 확인용)
+
+    Returns:
+        SessionTrajectory: 저장된 행
+    """
+    trajectory = SessionTrajectory.query.filter_by(session_id=session.id).first()
+    if trajectory is None:
+        trajectory = SessionTrajectory(session_id=session.id)
+        db.session.add(trajectory)
+
+    bbox = summary['bbox']
+    trajectory.change_seq = session.change_seq
+    trajectory.sample_count = sample_count
+    trajectory.distance_km = summary['distance_km']
+    trajectory.duration_ms = summary['duration_ms']
+    trajectory.moving_time_ms = summary['moving_time_ms']
+    trajectory.avg_speed_mps = summary['avg_speed_mps']
+    trajectory.max_speed_mps = summary['max_speed_mps']
+    trajectory.elevation_gain_m = summary['elevation_gain_m']
+    trajectory.elevation_loss_m = summary['elevation_loss_m']
+    trajectory.stop_count = summary['stop_count']
+    trajectory.stops = summary['stops']
+    trajectory.min_latitude = bbox['min_latitude']
+    trajectory.min_longitude = bbox['min_longitude']
+    trajectory.max_latitude = bbox['max_latitude']
+    trajectory.max_longitude = bbox['max_longitude']
+    trajectory.computed_at = datetime.utcnow()
+    return trajectory
+
+
+def session_trajectory(session: RecordingSession, refresh: bool = False):
+    """
+    세션 궤적 조회 (저장된 결과가 현재 데이터 버전과 같으면 재사용, 아니면 계산 후 저장)
+
+    데이터 버전은 세션 change_seq(Push / 정리 시 증가)와 GPS 행 수로 확인한다.
+
+    Args:
+        session: RecordingSession
+        refresh: True면 항상 다시 계산
+
+    Returns:
+        SessionTrajectory | None: 궤적 (GPS 데이터가 없으면 None, 커밋은 호출자)
+    """
+    sample_count = sensor_type_counts(session.id, ['gps']).get('gps', 0)
+
+    trajectory = SessionTrajectory.query.filter_by(session_id=session.id).first()
+    if not refresh and trajectory is not None and trajectory.change_seq == session.change_seq \
+            and trajectory.sample_count == sample_count:
+        return trajectory
+
+    columns = load_sensor_arrays(session.id, {'gps': TRAJECTORY_FIELDS}, sensor_types=['gps']).get('gps')
+    summary = None
+    if columns is not None:
+        summary = analyze_trajectory(columns['timestamp'], columns['latitude'],
+                                     columns['longitude'], columns['altitude'])
+
+    if summary is None:
+        if trajectory is not None:
+            db.session.delete(trajectory)
+        return None
+
+    return save_trajectory(session, summary, len(columns['timestamp']))
@@ -0,0 +1,167 @@
+"""
+User Statistics
+사용자 세션 통계 (세션 행을 가져오지 않고 SQL 집계, 일 / 주 단위 구간) 및 데이터 버전별 스냅샷
+"""
+
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func, select, true
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.session import RecordingSession
+from app.models.statistics_snapshot import StatisticsSnapshot
+from app.models.user import User
+from app.utils.analysis_cache import analysis_params_key
+
+# 통계 구간 단위
+STATISTICS_BUCKETS = ('day', 'week')
+
+
+def _bucket_expr(bucket: str, dialect_name: str):
+    """세션 시작 시각의 구간 시작 식 (week는 월요일)"""
+    if dialect_name == 'postgresql':
+        return func.date_trunc(bucket, RecordingSession.start_time)
+    if bucket == 'day':
+        return func.date(RecordingSession.start_time)
+    # 다음 (또는 같은) 일요일에서 6일 전 = 그 주 월요일
+    return func.date(RecordingSession.start_time, 'weekday 0', '-6 days')
+
+
+def _duration_ms_expr(dialect_name: str):
+    """세션 길이 (ms, 종료되지 않은 세션은 NULL)"""
+    if dialect_name == 'postgresql':
+        return func.extract('epoch', RecordingSession.end_time - RecordingSession.start_time) * 1000
+    return (func.julianday(RecordingSession.end_time) - func.julianday(RecordingSession.start_time)) * 86400000
+
+
+def _sensor_elements(dialect_name: str):
+    """enabled_sensors 배열 원소 테이블 함수 (jsonb_array_elements_text / json_each)"""
+    if dialect_name == 'postgresql':
+        return func.jsonb_array_elements_text(RecordingSession.enabled_sensors).table_valued('value')
+    return func.json_each(RecordingSession.enabled_sensors).table_valued('value')
+
+
+def _bucket_key(value):
+    """구간 값을 ISO 날짜 문자열로 (PostgreSQL datetime, SQLite 문자열)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return str(value)[:10]
+
+
+def session_statistics(user_id: int, start: datetime = None, end: datetime = None, bucket: str = None) -> dict:
+    """
+    사용자 세션 통계 집계
+
+    세션 수 / data_count 합 / 세션 길이 합 쿼리 1회와, enabled_sensors 원소를
+    jsonb_array_elements_text로 펼쳐 센서 타입별 세션 수를 세는 쿼리 1회로 계산한다.
+
+    Args:
+        user_id: 사용자 ID
+        start: 세션 시작 시각 하한
+        end: 세션 시작 시각 상한
+        bucket: day / week (None이면 전체만)
+
+    Returns:
+        dict: {구간 시작 (bucket이 없으면 None): {'sessions', 'data_records', 'duration_ms', 'sensor_types_usage'}}
+              (구간 순)
+    """
+    if bucket is not None and bucket not in STATISTICS_BUCKETS:
+        raise ValueError(f'Invalid bucket: {bucket!r} (expected one of {", ".join(STATISTICS_BUCKETS)})')
+
+    dialect_name = db.session.get_bind().dialect.name
+    # 구간이 없으면 전체 1행 (GROUP BY 없음)
+    grouping = [_bucket_expr(bucket, dialect_name).label('bucket')] if bucket else []
+
+    conditions = [RecordingSession.user_id == user_id]
+    if start is not None:
+        conditions.append(RecordingSession.start_time >= start)
+    if end is not None:
+        conditions.append(RecordingSession.start_time <= end)
+
+    totals = db.session.execute(
+        select(
+            *grouping,
+            func.count(RecordingSession.id),
+            func.coalesce(func.sum(RecordingSession.data_count), 0),
+            func.coalesce(func.sum(_duration_ms_expr(dialect_name)), 0),
+        ).where(*conditions).group_by(*grouping).order_by(*grouping)
+    ).all()
+
+    buckets = {}
+    for row in totals:
+        value, (sessions, data_records, duration_ms) = (row[0] if grouping else None), row[-3:]
+        buckets[_bucket_key(value)] = {
+            'sessions': int(sessions),
+            'data_records': int(data_records),
+            'duration_ms': int(round(float(duration_ms))),
+            'sensor_types_usage': {},
+        }
+
+    sensors = _sensor_elements(dialect_name)
+    usage = db.session.execute(
+        select(*grouping, sensors.c.value, func.count())
+        .select_from(RecordingSession).join(sensors, true())
+        .where(*conditions)
+        .group_by(*grouping, sensors.c.value)
+        .order_by(*grouping, sensors.c.value)
+    ).all()
+
+    for row in usage:
+        value, (sensor_type, count) = (row[0] if grouping else None), row[-2:]
+        entry = buckets.get(_bucket_key(value))
+        if entry is not None:
+            entry['sensor_types_usage'][sensor_type] = int(count)
+
+    # 세션이 없으면 전체 0 (bucket이 없을 때도 COUNT 행은 1개)
+    return {key: entry for key, entry in buckets.items() if entry['sessions']}
+
+
+def _user_data_version(user_id: int):
+    return db.session.query(User.data_version).filter(User.id == user_id).scalar()
+
+
+def cached_statistics(user_id: int, params: dict, compute, refresh: bool = False) -> dict:
+    """
+    사용자 통계 스냅샷 적용 (사용자 데이터 버전이 같으면 저장된 결과, 아니면 계산 후 저장)
+
+    User.data_version은 Push / 데이터 정리마다 증가하므로 따로 무효화하지 않는다.
+    에러 결과는 저장하지 않는다. 결과에는 cached (bool)가 추가된다.
+
+    Args:
+        user_id: 사용자 ID
+        params: 결과에 영향을 주는 파라미터 (start_date, end_date, bucket)
+        compute: 결과를 계산하는 함수 (인자 없음)
+        refresh: True면 항상 다시 계산
+
+    Returns:
+        dict: 통계 결과 (커밋은 호출자)
+    """
+    enabled = current_app.config.get('STATISTICS_SNAPSHOT_ENABLED', True)
+    version = _user_data_version(user_id) if enabled else None
+    if version is None:
+        return {**compute(), 'cached': False}
+
+    key = analysis_params_key(params)
+    row = StatisticsSnapshot.query.filter_by(user_id=user_id, params_key=key).first()
+    if row is not None and row.data_version == version and not refresh:
+        return {**row.result, 'cached': True}
+
+    result = compute()
+    if 'error' in result:
+        return {**result, 'cached': False}
+
+    values = {'params': params, 'data_version': version, 'result': result, 'computed_at': datetime.utcnow()}
+    if row is None:
+        try:
+            # 동시에 같은 스냅샷을 저장하면 먼저 저장된 행을 갱신
+            with db.session.begin_nested():
+                db.session.add(StatisticsSnapshot(user_id=user_id, params_key=key, **values))
+            return {**result, 'cached': False}
+        except IntegrityError:
+            row = StatisticsSnapshot.query.filter_by(user_id=user_id, params_key=key).first()
+
+    for name, value in values.items():
+        setattr(row, name, value)
+    return {**result, 'cached': False}
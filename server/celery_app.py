@@ -11,7 +11,7 @@ celery = Celery(
     'koodtx',
     broker=Config.CELERY_BROKER_URL,
     backend=Config.CELERY_RESULT_BACKEND,
-    include=['app.tasks.data_processing', 'app.tasks.file_cleanup']
+    include=['app.tasks.data_processing', 'app.tasks.batch_analysis', 'app.tasks.ml_features', 'app.tasks.file_cleanup']
 )
 
 # Celery 설정
@@ -12,8 +12,10 @@ backlog = 2048
 
 # Worker Processes
 workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = 'sync'  # or 'gevent', 'eventlet'
-worker_connections = 1000
+# sync: 기본 API 워커. SSE (/api/sync/events)는 GUNICORN_WORKER_CLASS=gevent로 띄운 별도 프로세스가
+# 유휴 연결을 그린렛으로 유지 (supervisor.conf의 koodtx-events, 프록시에서 해당 경로만 전달)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')  # or 'gevent'
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))  # gevent 워커당 동시 연결
 max_requests = 1000  # Worker 재시작 주기
 max_requests_jitter = 50
 timeout = 30
@@ -41,7 +43,8 @@ keyfile = os.getenv('SSL_KEYFILE', None)
 certfile = os.getenv('SSL_CERTFILE', None)
 
 # Preload
-preload_app = True  # 메모리 절약
+# gevent 워커는 fork 후 monkey patch하므로 마스터에서 앱 (redis, threading, psycopg2)을 미리 import하지 않음
+preload_app = worker_class != 'gevent'  # 메모리 절약
 
 # Server Hooks
 def on_starting(server):
@@ -76,6 +79,10 @@ def pre_fork(server, worker):
 
 def post_fork(server, worker):
     """Worker fork 후"""
+    if worker_class == 'gevent':
+        # psycopg2를 gevent 협력 모드로 (DB 대기 중 다른 그린렛 실행)
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
     print(f"Worker spawned (pid: {worker.pid})")
 
 
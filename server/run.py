@@ -16,13 +16,14 @@ app = create_app(config[env])
 @app.shell_context_processor
 def make_shell_context():
     """Flask shell context"""
-    from app.models import User, RecordingSession, SensorData, SyncLog
+    from app.models import User, RecordingSession, SensorData, SyncLog, SyncChange
     return {
         'db': db,
         'User': User,
         'RecordingSession': RecordingSession,
         'SensorData': SensorData,
-        'SyncLog': SyncLog
+        'SyncLog': SyncLog,
+        'SyncChange': SyncChange
     }
 
 
@@ -401,6 +401,56 @@ def create_session_func(session):
     return _create_session
 
 
+@pytest.fixture
+def count_queries(db):
+    """
+    실행된 SQL 문 수집 헬퍼 픽스처 (N+1 쿼리 회귀 방지용)
+
+    Usage:
+        with count_queries() as statements:
+            ...
+        assert len([s for s in statements if 'FROM sensor_data' in s]) == 1
+    """
+    from contextlib import contextmanager
+    from sqlalchemy import event
+
+    @contextmanager
+    def _count_queries():
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', _before_cursor_execute)
+
+    return _count_queries
+
+
+@pytest.fixture
+def redis_client():
+    """
+    Redis 클라이언트 픽스처 (TEST_REDIS_URL, 연결 불가 시 skip)
+    """
+    import os
+    import redis
+
+    client = redis.Redis.from_url(os.getenv('TEST_REDIS_URL', 'redis://localhost:6379/15'))
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip('Redis not available')
+
+    client.flushdb()
+
+    yield client
+
+    client.flushdb()
+
+
 # ============================================================
 # Cleanup
 # ============================================================
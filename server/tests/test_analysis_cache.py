@@ -0,0 +1,93 @@
+"""
+Test Analysis Result Cache
+세션 데이터 버전별 분석 결과 저장 / Push 시 무효화 테스트
+"""
+
+import json
+import pytest
+from app.models.analysis_result import AnalysisResult
+from app.models.session import RecordingSession
+from app.tasks.data_processing import analyze_sensor_data, detect_anomalies
+from app.utils.analysis_cache import analysis_params_key
+
+
+@pytest.mark.unit
+def test_params_key_ignores_order():
+    """파라미터 키는 키 순서와 무관"""
+    assert analysis_params_key({'a': 1, 'b': 2}) == analysis_params_key({'b': 2, 'a': 1})
+    assert analysis_params_key({'a': 1}) != analysis_params_key({'a': 2})
+    assert analysis_params_key(None) == analysis_params_key({})
+
+
+@pytest.mark.celery
+@pytest.mark.integration
+class TestAnalysisCache:
+    """분석 결과 캐시 테스트"""
+
+    @pytest.fixture
+    def versioned_session(self, session, recording_session, sensor_data_batch):
+        recording_session.change_seq = 1
+        session.commit()
+        return recording_session
+
+    def test_second_call_cached(self, versioned_session):
+        """데이터 버전이 같으면 저장된 결과 반환"""
+        first = analyze_sensor_data(versioned_session.id)
+        second = analyze_sensor_data(versioned_session.id)
+
+        assert first['cached'] is False
+        assert second['cached'] is True
+        assert second['analysis'] == first['analysis']
+        assert AnalysisResult.query.filter_by(session_id=versioned_session.id).count() == 1
+
+    def test_params_and_refresh(self, versioned_session):
+        """파라미터가 다르면 따로 저장, refresh면 다시 계산"""
+        assert detect_anomalies(versioned_session.id, sensitivity=3.0)['cached'] is False
+        assert detect_anomalies(versioned_session.id, sensitivity=2.0)['cached'] is False
+        assert detect_anomalies(versioned_session.id, sensitivity=3.0)['cached'] is True
+        assert detect_anomalies(versioned_session.id, sensitivity=3.0, refresh=True)['cached'] is False
+
+    def test_version_change_misses(self, session, versioned_session):
+        """세션 데이터 버전이 바뀌면 다시 계산"""
+        analyze_sensor_data(versioned_session.id)
+        versioned_session.change_seq = 2
+        session.commit()
+
+        result = analyze_sensor_data(versioned_session.id)
+
+        assert result['cached'] is False
+        assert AnalysisResult.query.filter_by(session_id=versioned_session.id).one().data_version == 2
+
+    def test_unversioned_session_not_stored(self, recording_session, sensor_data_batch):
+        """Push 이력이 없는 세션(change_seq 없음)은 저장하지 않음"""
+        analyze_sensor_data(recording_session.id)
+
+        assert analyze_sensor_data(recording_session.id)['cached'] is False
+        assert AnalysisResult.query.count() == 0
+
+    def test_disabled(self, app, versioned_session):
+        """ANALYSIS_CACHE_ENABLED=False면 저장하지 않음"""
+        app.config['ANALYSIS_CACHE_ENABLED'] = False
+        try:
+            analyze_sensor_data(versioned_session.id)
+            result = analyze_sensor_data(versioned_session.id)
+        finally:
+            app.config['ANALYSIS_CACHE_ENABLED'] = True
+
+        assert result['cached'] is False
+        assert AnalysisResult.query.count() == 0
+
+    def test_push_invalidates(self, client, auth_headers, recording_session, sample_push_data):
+        """Push하면 세션의 저장된 결과 삭제"""
+        assert client.post('/api/sync/push', headers=auth_headers,
+                           data=json.dumps(sample_push_data)).status_code == 200
+        session_id = RecordingSession.query.filter_by(session_id=recording_session.session_id).one().id
+        assert analyze_sensor_data(session_id)['cached'] is False
+        assert AnalysisResult.query.filter_by(session_id=session_id).count() == 1
+
+        sample_push_data['sensor_data'][0]['timestamp'] += 1
+        assert client.post('/api/sync/push', headers=auth_headers,
+                           data=json.dumps(sample_push_data)).status_code == 200
+
+        assert AnalysisResult.query.filter_by(session_id=session_id).count() == 0
+        assert analyze_sensor_data(session_id)['cached'] is False
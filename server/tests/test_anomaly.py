@@ -0,0 +1,119 @@
+"""
+Test Windowed Anomaly Detection
+윈도 기반 이상 구간 탐지 (이동 z-score, EWMA, MAD) 테스트
+"""
+
+import pytest
+import numpy as np
+from app.models.anomaly import AnomalyInterval
+from app.models.sensor_data import SensorData
+from app.tasks.data_processing import detect_anomaly_intervals
+from app.utils.anomaly import DETECTORS, IntervalBuilder, query_anomaly_intervals
+
+BASE_TS = 1_700_000_000_000
+
+
+def _signal(n=1000, spike=(600, 610)):
+    """정규 잡음 + spike 구간 (+8)"""
+    values = np.random.default_rng(42).normal(10.0, 0.5, n)
+    values[spike[0]:spike[1]] += 8.0
+    timestamps = BASE_TS + np.arange(n, dtype=np.int64) * 10
+    return timestamps, values
+
+
+@pytest.mark.unit
+class TestDetectors:
+    """탐지기 테스트"""
+
+    @pytest.mark.parametrize('method', ['zscore', 'ewma', 'mad'])
+    def test_spike_detected(self, method):
+        """spike 시작 구간 탐지 (정상 구간에서는 탐지 없음)"""
+        timestamps, values = _signal()
+        builder = IntervalBuilder(threshold=5.0)
+
+        builder.update(timestamps, values, DETECTORS[method](50).scores(values))
+        intervals = builder.finish()
+
+        assert intervals[0]['start_ts'] == timestamps[600]
+        assert intervals[0]['peak_value'] > 15.0
+        assert all(timestamps[600] <= i['start_ts'] <= timestamps[660] for i in intervals)
+
+    @pytest.mark.parametrize('method', ['zscore', 'ewma', 'mad'])
+    def test_chunked_scores_match(self, method):
+        """청크로 나눠 계산해도 같은 점수 (윈도 상태 유지)"""
+        _, values = _signal()
+        whole = DETECTORS[method](50).scores(values)
+
+        detector = DETECTORS[method](50)
+        chunked = np.concatenate([detector.scores(chunk) for chunk in np.array_split(values, 13)])
+
+        assert np.allclose(whole, chunked, equal_nan=True)
+        assert np.isnan(whole[:50]).all()
+
+    def test_interval_spans_chunks(self):
+        """청크 경계에 걸친 구간은 하나로 합쳐짐"""
+        builder = IntervalBuilder(threshold=1.0)
+        builder.update(np.array([1, 2, 3]), np.array([0.0, 5.0, 6.0]), np.array([0.0, 2.0, 3.0]))
+        builder.update(np.array([4, 5]), np.array([7.0, 0.0]), np.array([4.0, np.nan]))
+
+        intervals = builder.finish()
+
+        assert intervals == [{'start_ts': 2, 'end_ts': 4, 'sample_count': 3, 'max_score': 4.0,
+                              'peak_ts': 4, 'peak_value': 7.0}]
+        assert builder.anomalous_samples == 3
+
+
+@pytest.mark.celery
+@pytest.mark.integration
+class TestAnomalyIntervalTask:
+    """이상 구간 탐지 작업 테스트"""
+
+    @pytest.fixture
+    def spiky_session(self, session, recording_session):
+        timestamps, values = _signal()
+        session.bulk_save_objects([
+            SensorData(session_id=recording_session.id, sensor_type='accelerometer', timestamp=int(ts),
+                       data={'x': 0.0, 'y': 0.0, 'z': float(value)})
+            for ts, value in zip(timestamps, values)
+        ] + [
+            SensorData(session_id=recording_session.id, sensor_type='light', timestamp=int(ts),
+                       data={'lux': 100.0 + i % 3})
+            for i, ts in enumerate(timestamps[:200])
+        ])
+        session.commit()
+        return recording_session
+
+    def test_intervals_stored(self, app, spiky_session):
+        """구간을 테이블에 저장, 다시 실행하면 교체"""
+        app.config['ANALYSIS_CHUNK_SIZE'] = 128
+        try:
+            result = detect_anomaly_intervals(spiky_session.id, method='mad', window=50, threshold=5.0)
+            again = detect_anomaly_intervals(spiky_session.id, method='mad', window=50, threshold=5.0)
+        finally:
+            app.config['ANALYSIS_CHUNK_SIZE'] = 10000
+
+        accel = result['anomalies']['accelerometer']
+        assert accel['samples'] == 1000
+        assert 'light' in result['anomalies']
+        assert again['total_intervals'] == result['total_intervals']
+
+        stored = AnomalyInterval.query.filter_by(session_id=spiky_session.id, sensor_type='accelerometer').all()
+        assert len(stored) == accel['interval_count']
+        assert any(row.start_ts == BASE_TS + 6000 and row.sample_count >= 10 for row in stored)
+
+    def test_query_by_time_range(self, spiky_session):
+        """시간 범위와 겹치는 구간 조회"""
+        detect_anomaly_intervals(spiky_session.id, method='zscore', window=50, threshold=5.0,
+                                 sensor_types=['accelerometer'])
+
+        rows = query_anomaly_intervals(spiky_session.id, sensor_type='accelerometer', method='zscore',
+                                       start_ts=BASE_TS + 5990, end_ts=BASE_TS + 6000)
+
+        assert len(rows) == 1
+        assert rows[0].to_dict()['start_ts'] == BASE_TS + 6000
+        assert query_anomaly_intervals(spiky_session.id, method='ewma') == []
+
+    def test_invalid_parameters(self, spiky_session):
+        """잘못된 방법 / 윈도는 에러"""
+        assert 'error' in detect_anomaly_intervals(spiky_session.id, method='iforest')
+        assert 'error' in detect_anomaly_intervals(spiky_session.id, window=1)
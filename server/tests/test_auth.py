@@ -5,7 +5,11 @@ Test Auth API
 
 import pytest
 import json
+import threading
+import time
+import redis
 from app.models.user import User
+from app.utils.passwords import SLOT_KEY, PasswordHasherBusy, password_hasher
 
 
 @pytest.mark.api
@@ -197,6 +201,148 @@ class TestAuthLogin:
         assert 'error' in result
 
 
+@pytest.fixture
+def hasher_config(app):
+    """password_hasher 설정 변경 후 복원"""
+    def _configure(client=None, **overrides):
+        app.config.update(overrides)
+        password_hasher.init_app(app, client=client)
+        return password_hasher
+
+    original = {key: app.config[key] for key in (
+        'BCRYPT_ROUNDS', 'PASSWORD_HASH_WORKERS', 'PASSWORD_HASH_MAX_WAITING', 'PASSWORD_HASH_QUEUE_TIMEOUT',
+        'PASSWORD_HASH_GLOBAL_LIMIT')}
+    yield _configure
+
+    app.config.update(original)
+    password_hasher.init_app(app)
+
+
+@pytest.mark.unit
+class TestPasswordHasher:
+    """bcrypt 워커 풀 테스트"""
+
+    def test_hash_uses_configured_rounds(self, hasher_config):
+        """설정한 비용으로 해시, 비용이 다르면 재해시 필요"""
+        hasher = hasher_config(BCRYPT_ROUNDS=5)
+        password_hash = hasher.hash('secret')
+
+        assert password_hash.startswith('$2b$05$')
+        assert hasher.check('secret', password_hash) is True
+        assert hasher.needs_rehash(password_hash) is False
+        assert hasher_config(BCRYPT_ROUNDS=4).needs_rehash(password_hash) is True
+
+    def test_full_queue_rejected(self, hasher_config):
+        """대기열이 가득 차면 PasswordHasherBusy"""
+        hasher = hasher_config(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_WAITING=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return True
+
+        worker = threading.Thread(target=hasher._run, args=(blocking,))
+        worker.start()
+        started.wait(5)
+        queued = threading.Thread(target=hasher._run, args=(lambda: True,))
+        queued.start()
+        while hasher.stats()['waiting'] < 1:
+            time.sleep(0.01)
+
+        with pytest.raises(PasswordHasherBusy):
+            hasher._run(lambda: True)
+
+        release.set()
+        worker.join()
+        queued.join()
+        stats = hasher.stats()
+        assert stats['rejected'] == 1
+        assert stats['completed'] == 2
+        assert stats['waiting'] == 0
+
+    def test_queue_timeout(self, hasher_config):
+        """시작 대기 시간 초과 시 PasswordHasherBusy"""
+        hasher = hasher_config(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_TIMEOUT=0.05)
+        release = threading.Event()
+
+        worker = threading.Thread(target=hasher._run, args=(lambda: release.wait(5),))
+        worker.start()
+        while hasher.stats()['running'] < 1:
+            time.sleep(0.01)
+
+        with pytest.raises(PasswordHasherBusy):
+            hasher._run(lambda: True)
+
+        release.set()
+        worker.join()
+        assert hasher.stats()['waiting'] == 0
+
+    def test_global_slots_shared_by_workers(self, hasher_config, redis_client):
+        """다른 워커가 전역 슬롯을 모두 쓰면 PasswordHasherBusy, 만료된 슬롯은 회수"""
+        hasher = hasher_config(client=redis_client, PASSWORD_HASH_GLOBAL_LIMIT=1)
+        redis_client.zadd(SLOT_KEY, {'other-worker': time.time()})
+
+        with pytest.raises(PasswordHasherBusy):
+            hasher.hash('secret')
+        assert hasher.stats()['rejected'] == 1
+        assert redis_client.zcard(SLOT_KEY) == 1
+
+        redis_client.zadd(SLOT_KEY, {'other-worker': time.time() - hasher.slot_lease - 1})
+        assert hasher.check('secret', hasher.hash('secret')) is True
+        assert redis_client.zcard(SLOT_KEY) == 0
+
+    def test_global_slots_fail_open(self, hasher_config):
+        """Redis 오류 시 전역 제한 없이 해시"""
+        hasher = hasher_config(
+            client=redis.Redis(port=1, socket_connect_timeout=0.1), PASSWORD_HASH_GLOBAL_LIMIT=1)
+
+        assert hasher.check('secret', hasher.hash('secret')) is True
+        assert hasher.stats()['rejected'] == 0
+
+
+@pytest.mark.api
+@pytest.mark.auth
+class TestAuthPasswordHashing:
+    """로그인 시 재해시 / 해시 풀 포화 테스트"""
+
+    def test_login_rehashes_on_cost_change(self, client, user, hasher_config):
+        """BCRYPT_ROUNDS 변경 후 로그인하면 새 비용으로 재해시"""
+        old_hash = user.password_hash
+        hasher_config(BCRYPT_ROUNDS=5)
+
+        response = client.post('/api/auth/login', data=json.dumps({
+            'username': 'testuser', 'password': 'password123'
+        }), content_type='application/json')
+
+        assert response.status_code == 200
+        refreshed = User.query.get(user.id)
+        assert refreshed.password_hash != old_hash
+        assert refreshed.password_hash.startswith('$2b$05$')
+        assert refreshed.check_password('password123') is True
+
+    def test_login_busy_returns_503(self, client, user, hasher_config):
+        """해시 대기열이 가득 차면 503 + Retry-After"""
+        hasher_config(PASSWORD_HASH_MAX_WAITING=0)
+
+        response = client.post('/api/auth/login', data=json.dumps({
+            'username': 'testuser', 'password': 'password123'
+        }), content_type='application/json')
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+
+    def test_hasher_stats(self, client, user, auth_headers):
+        """해시 풀 지표 조회"""
+        response = client.get('/api/auth/hasher/stats', headers=auth_headers)
+
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result['rounds'] == 4
+        assert {'waiting', 'running', 'completed', 'rejected', 'avg_queue_ms', 'max_queue_ms'} <= set(result)
+
+
 @pytest.mark.api
 @pytest.mark.auth
 class TestAuthRefresh:
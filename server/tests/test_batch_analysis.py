@@ -0,0 +1,83 @@
+"""
+Test Batch Analysis
+여러 세션 일괄 분석 (chord fan-out / 코호트 보고서) 테스트
+"""
+
+import uuid
+import pytest
+import numpy as np
+from datetime import datetime
+from celery_app import celery
+from app.models.session import RecordingSession
+from app.models.sensor_data import SensorData
+from app.tasks.batch_analysis import analyze_sessions_batch, analyze_session_slice, merge_cohort_report
+from app.utils.sensor_arrays import load_sensor_arrays
+
+
+@pytest.fixture
+def cohort(session, user):
+    """가속도 데이터가 있는 세션 3개 (세션마다 다른 분포)"""
+    rng = np.random.default_rng(7)
+    sessions = []
+    for index in range(3):
+        rec_session = RecordingSession(user_id=user.id, session_id=str(uuid.uuid4()),
+                                       start_time=datetime.utcnow(), is_active=False)
+        session.add(rec_session)
+        session.flush()
+        values = rng.normal(index * 2.0, 1.0 + index, 50 + index * 10)
+        session.bulk_save_objects([
+            SensorData(session_id=rec_session.id, sensor_type='accelerometer', timestamp=1000 + i * 10,
+                       data={'x': float(value), 'y': 0.0, 'z': 9.8})
+            for i, value in enumerate(values)
+        ])
+        sessions.append(rec_session)
+    session.commit()
+    return sessions
+
+
+@pytest.mark.celery
+@pytest.mark.integration
+class TestBatchAnalysis:
+    """일괄 분석 작업 테스트"""
+
+    def test_cohort_report_pools_statistics(self, cohort):
+        """세션별 통계 병합 결과가 전체 샘플 통계와 같음"""
+        ids = [rec_session.id for rec_session in cohort]
+        report = merge_cohort_report([analyze_session_slice(ids[:2]), analyze_session_slice(ids[2:] + [999999])],
+                                     total_sessions=4)
+
+        values = np.concatenate([
+            load_sensor_arrays(session_id, {'accelerometer': ('x',)})['accelerometer']['x'] for session_id in ids
+        ])
+        accel = report['sensor_types']['accelerometer']
+
+        assert report['analyzed_sessions'] == 3
+        assert report['failed_sessions'] == [{'session_id': 999999, 'error': 'Session not found'}]
+        assert report['total_records'] == len(values) == 180
+        assert accel['sessions'] == 3
+        assert accel['statistics']['x']['mean'] == pytest.approx(np.mean(values))
+        assert accel['statistics']['x']['std'] == pytest.approx(np.std(values))
+        assert accel['statistics']['x']['max'] == pytest.approx(np.max(values))
+
+    def test_fan_out_respects_concurrency(self, app, user, cohort):
+        """하위 작업 수는 동시 실행 상한 이하, 세션은 묶음에 고르게 분배"""
+        celery.conf.task_always_eager = True
+        try:
+            batch = analyze_sessions_batch(user_id=user.id, max_concurrency=2)
+        finally:
+            celery.conf.task_always_eager = False
+
+        assert batch['total_sessions'] == 3
+        assert len(batch['slice_task_ids']) == 2
+        assert batch['slice_sizes'] == [2, 1]
+
+    def test_invalid_requests(self, app, user):
+        """세션이 없거나 상한을 넘으면 에러"""
+        assert 'error' in analyze_sessions_batch()
+        assert analyze_sessions_batch(user_id=user.id)['error'] == 'No sessions found'
+
+        app.config['BATCH_ANALYSIS_MAX_SESSIONS'] = 2
+        try:
+            assert 'Too many sessions' in analyze_sessions_batch(session_ids=[1, 2, 3])['error']
+        finally:
+            app.config['BATCH_ANALYSIS_MAX_SESSIONS'] = 1000
@@ -0,0 +1,190 @@
+"""
+Test Pull Cache
+Redis Pull 응답 캐시 테스트 (Redis 필요)
+"""
+
+import pytest
+import json
+from app.utils.cache import PullCache, pull_cache
+
+
+@pytest.fixture
+def cache(app, redis_client):
+    """테스트용 PullCache 인스턴스"""
+    instance = PullCache()
+    app.config.update(PULL_CACHE_ENABLED=True, PULL_CACHE_TTL=60, PULL_CACHE_MAX_BYTES=1024 * 1024)
+    instance.init_app(app, client=redis_client)
+
+    yield instance
+
+    app.config['PULL_CACHE_ENABLED'] = False
+
+
+@pytest.fixture
+def enabled_pull_cache(app, redis_client):
+    """앱 전역 pull_cache 활성화 (Pull API 통합 테스트용)"""
+    app.config.update(PULL_CACHE_ENABLED=True, PULL_CACHE_TTL=60, PULL_CACHE_MAX_BYTES=1024 * 1024,
+                      SYNC_STATUS_CACHE_TTL=10)
+    pull_cache.init_app(app, client=redis_client)
+
+    yield pull_cache
+
+    app.config.update(PULL_CACHE_ENABLED=False, SYNC_STATUS_CACHE_TTL=0)
+    pull_cache.init_app(app)
+
+
+@pytest.fixture
+def local_status_cache(app):
+    """Redis 없이 워커 프로세스 내 동기화 상태 캐시만 활성화"""
+    app.config['SYNC_STATUS_CACHE_TTL'] = 10
+    pull_cache.init_app(app)
+
+    yield pull_cache
+
+    app.config['SYNC_STATUS_CACHE_TTL'] = 0
+    pull_cache.init_app(app)
+
+
+@pytest.mark.unit
+def test_disabled_cache_is_noop(app):
+    """비활성화 상태에서는 항상 미스"""
+    instance = PullCache(app)
+
+    assert instance.enabled is False
+    assert instance.get_page(1, 'etag') is None
+    assert instance.get_session_data([]) == {}
+    assert instance.stats() == {'enabled': False}
+
+
+@pytest.mark.unit
+def test_session_key_includes_change_seq(recording_session):
+    """updated_at / data_count가 같아도 change_seq가 바뀌면 다른 키"""
+    instance = PullCache()
+    recording_session.change_seq = 3
+    before = instance.session_key(recording_session)
+
+    recording_session.change_seq = 4
+    assert instance.session_key(recording_session) != before
+
+
+@pytest.mark.integration
+def test_status_local_fallback(client, user, auth_headers, sample_push_data, local_status_cache, count_queries):
+    """Redis 캐시가 꺼져 있어도 상태 응답은 프로세스 내 TTL 캐시, Push 시 무효화"""
+    assert local_status_cache.enabled is False
+    first = client.get('/api/sync/status', headers=auth_headers).get_json()
+
+    with count_queries() as statements:
+        second = client.get('/api/sync/status', headers=auth_headers).get_json()
+
+    assert second == first
+    assert not any('FROM recording_sessions' in s for s in statements)
+
+    assert client.post('/api/sync/push', headers=auth_headers,
+                       data=json.dumps(sample_push_data)).status_code == 200
+    after = client.get('/api/sync/status', headers=auth_headers).get_json()
+    assert after['recent_syncs'][0]['sync_type'] == 'push'
+
+
+@pytest.mark.integration
+class TestPullCache:
+    """PullCache 동작 테스트"""
+
+    def test_page_roundtrip_and_stats(self, cache):
+        """페이지 저장/조회 및 적중 지표"""
+        page = {'sessions': [], 'has_more': False, 'total_records': 0}
+
+        assert cache.get_page(1, 'etag-a') is None
+        cache.set_page(1, 'etag-a', page)
+        assert cache.get_page(1, 'etag-a') == page
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+        assert stats['bytes_saved'] == len(json.dumps(page, separators=(',', ':')))
+        assert stats['keys'] == 1
+
+    def test_invalidate_user(self, cache):
+        """사용자 페이지 무효화"""
+        cache.set_page(1, 'etag-a', {'sessions': []})
+        cache.set_page(2, 'etag-b', {'sessions': []})
+
+        cache.invalidate_user(1)
+
+        assert cache.get_page(1, 'etag-a') is None
+        assert cache.get_page(2, 'etag-b') is not None
+        assert cache.stats()['bytes_stored'] == len('{"sessions":[]}')
+
+    def test_lru_eviction(self, app, cache):
+        """저장 상한 초과 시 가장 오래 접근하지 않은 키부터 제거"""
+        cache.max_bytes = 300
+        blob = {'sessions': ['x' * 80]}
+
+        cache.set_page(1, 'old', blob)
+        cache.set_page(1, 'recent', blob)
+        cache.get_page(1, 'old')  # old 접근 -> recent가 LRU 대상
+        cache.set_page(1, 'new', blob)
+        cache.set_page(1, 'newest', blob)
+
+        assert cache.get_page(1, 'recent') is None
+        assert cache.get_page(1, 'newest') is not None
+
+        stats = cache.stats()
+        assert stats['evictions'] >= 1
+        assert stats['bytes_stored'] <= 300
+
+
+@pytest.mark.api
+@pytest.mark.sync
+@pytest.mark.integration
+class TestPullWithCache:
+    """캐시 활성화 상태의 Pull API 테스트"""
+
+    def test_repeated_pull_served_from_cache(self, client, user, auth_headers, recording_session,
+                                             sensor_data_batch, enabled_pull_cache, count_queries):
+        """같은 요청 반복 시 센서 데이터 조회 없이 캐시 응답"""
+        body = json.dumps({'page': 1, 'page_size': 50, 'include_data': True})
+
+        first = client.post('/api/sync/pull', headers=auth_headers, data=body)
+        assert first.status_code == 200
+
+        with count_queries() as statements:
+            second = client.post('/api/sync/pull', headers=auth_headers, data=body)
+
+        assert second.status_code == 200
+        assert second.get_json()['sessions'] == first.get_json()['sessions']
+        assert not any('FROM sensor_data' in s for s in statements)
+        assert enabled_pull_cache.stats()['hits'] >= 1
+
+    def test_push_invalidates_cached_pull(self, client, user, auth_headers, recording_session,
+                                          sample_push_data, enabled_pull_cache):
+        """Push 후 Pull은 새 데이터를 반환"""
+        body = json.dumps({'session_ids': [str(recording_session.session_id)], 'include_data': True})
+
+        before = client.post('/api/sync/pull', headers=auth_headers, data=body).get_json()
+        assert len(before['sessions'][0]['sensor_data']) == 0
+
+        assert client.post('/api/sync/push', headers=auth_headers,
+                           data=json.dumps(sample_push_data)).status_code == 200
+
+        after = client.post('/api/sync/pull', headers=auth_headers, data=body).get_json()
+        assert len(after['sessions'][0]['sensor_data']) == 2
+
+    def test_status_cached_until_push(self, client, user, auth_headers, recording_session,
+                                      sample_push_data, enabled_pull_cache, count_queries):
+        """상태 응답은 캐시되고 Push 시 무효화"""
+        first = client.get('/api/sync/status', headers=auth_headers).get_json()
+        assert first['recent_syncs'] == []
+
+        with count_queries() as statements:
+            second = client.get('/api/sync/status', headers=auth_headers).get_json()
+
+        assert second == first
+        assert not any('FROM recording_sessions' in s for s in statements)
+
+        assert client.post('/api/sync/push', headers=auth_headers,
+                           data=json.dumps(sample_push_data)).status_code == 200
+
+        after = client.get('/api/sync/status', headers=auth_headers).get_json()
+        assert after['total_sessions'] == 1
+        assert after['recent_syncs'][0]['sync_type'] == 'push'
@@ -0,0 +1,94 @@
+"""
+Test Identity Cache
+워커 프로세스 내 사용자 정보 조회 캐시 테스트
+"""
+
+import pytest
+import time
+from app.utils.identity import IdentityCache, identity_cache
+
+
+@pytest.fixture
+def enabled_identity_cache(app):
+    """앱 전역 identity_cache 활성화 (테스트마다 비운 상태로 시작)"""
+    app.config.update(IDENTITY_CACHE_ENABLED=True, IDENTITY_CACHE_TTL=30, IDENTITY_CACHE_MAX_ENTRIES=100)
+    identity_cache.init_app(app)
+
+    yield identity_cache
+
+    app.config['IDENTITY_CACHE_ENABLED'] = False
+    identity_cache.init_app(app)
+
+
+@pytest.mark.unit
+class TestIdentityCacheUnit:
+    """TTL / LRU 동작 테스트"""
+
+    def test_ttl_expiry(self, app):
+        """TTL이 지나면 미스"""
+        cache = IdentityCache()
+        app.config.update(IDENTITY_CACHE_ENABLED=True, IDENTITY_CACHE_TTL=0.05)
+        cache.init_app(app)
+
+        cache.users.set(1, {'id': 1})
+        assert cache.users.get(1) == {'id': 1}
+        time.sleep(0.06)
+        assert cache.users.get(1) is None
+        assert cache.stats()['users']['hits'] == 1
+        assert cache.stats()['users']['misses'] == 1
+
+        app.config.update(IDENTITY_CACHE_ENABLED=False, IDENTITY_CACHE_TTL=30)
+
+    def test_lru_eviction(self, app):
+        """최대 개수 초과 시 가장 오래 사용하지 않은 항목 제거"""
+        cache = IdentityCache()
+        app.config.update(IDENTITY_CACHE_ENABLED=True, IDENTITY_CACHE_MAX_ENTRIES=2)
+        cache.init_app(app)
+
+        cache.users.set(1, {'id': 1})
+        cache.users.set(2, {'id': 2})
+        cache.users.get(1)
+        cache.users.set(3, {'id': 3})
+
+        assert cache.users.get(2) is None
+        assert cache.users.get(1) == {'id': 1}
+        assert cache.stats()['users']['evictions'] == 1
+
+        app.config.update(IDENTITY_CACHE_ENABLED=False, IDENTITY_CACHE_MAX_ENTRIES=10000)
+
+
+@pytest.mark.integration
+class TestIdentityCache:
+    """라우트 연동 테스트"""
+
+    def test_me_served_from_cache(self, client, user, auth_headers, enabled_identity_cache, count_queries):
+        """두 번째 /me는 DB 조회 없음"""
+        first = client.get('/api/auth/me', headers=auth_headers)
+
+        with count_queries() as statements:
+            second = client.get('/api/auth/me', headers=auth_headers)
+
+        assert second.status_code == 200
+        assert second.get_json() == first.get_json()
+        assert not any('FROM users' in s for s in statements)
+        assert enabled_identity_cache.stats()['users']['hits'] == 1
+
+    def test_user_update_invalidates(self, client, user, session, auth_headers, enabled_identity_cache):
+        """User 변경(flush) 시 캐시 항목 삭제"""
+        client.get('/api/auth/me', headers=auth_headers)
+
+        user.email = 'changed@example.com'
+        session.commit()
+
+        result = client.get('/api/auth/me', headers=auth_headers).get_json()
+        assert result['email'] == 'changed@example.com'
+
+    def test_identity_stats(self, client, user, auth_headers, enabled_identity_cache):
+        """캐시 지표 조회"""
+        response = client.get('/api/auth/identity/stats', headers=auth_headers)
+
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result['enabled'] is True
+        assert set(result['users']) == {'entries', 'hits', 'misses', 'hit_rate', 'evictions'}
+        assert 'sessions' not in result
@@ -0,0 +1,161 @@
+"""
+Test Sync Log Writer
+동기화 로그 기록 (요청 ID, 메모리 / Redis 버퍼 일괄 저장) 테스트
+"""
+
+import pytest
+import json
+import uuid
+from datetime import datetime
+from app.models.sync_log import SyncLog
+from app.utils.log_writer import sync_log_writer, sync_record, resolve_request_id
+
+
+def _buffered_writer(app, mode, client=None):
+    app.config.update(SYNC_LOG_BUFFER=mode, SYNC_LOG_FLUSH_INTERVAL=0, SYNC_LOG_BATCH_SIZE=2)
+    sync_log_writer.init_app(app, client=client)
+    return sync_log_writer
+
+
+@pytest.fixture
+def restore_writer(app):
+    """테스트 후 기본 모드(off)로 복원"""
+    yield
+
+    app.config.update(SYNC_LOG_BUFFER='off', SYNC_LOG_FLUSH_INTERVAL=2.0, SYNC_LOG_BATCH_SIZE=500)
+    sync_log_writer.init_app(app)
+
+
+@pytest.mark.unit
+class TestRequestId:
+    """요청 ID 결정 테스트"""
+
+    def test_header_takes_precedence(self):
+        """X-Request-ID 헤더 > 본문 request_id"""
+        assert resolve_request_id({'X-Request-ID': '01HF8Z3K4M5N6P7Q8R9S0T1V2W'},
+                                  {'request_id': 'abcdefgh'}) == '01HF8Z3K4M5N6P7Q8R9S0T1V2W'
+        assert resolve_request_id({}, {'request_id': 'abcdefgh'}) == 'abcdefgh'
+
+    def test_generated_when_missing(self):
+        """없으면 서버에서 UUID 생성"""
+        request_id = resolve_request_id({}, {})
+
+        assert uuid.UUID(request_id)
+
+    def test_invalid_request_id(self):
+        """형식이 다르면 ValueError"""
+        with pytest.raises(ValueError):
+            resolve_request_id({}, {'request_id': 'bad id!'})
+        with pytest.raises(ValueError):
+            resolve_request_id({}, {'request_id': 12345678})
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncLogRecording:
+    """Push / Pull 동기화 로그 기록 테스트"""
+
+    def test_push_logs_client_request_id(self, client, user, auth_headers, sample_push_data):
+        """요청 트랜잭션에 로그 1건 기록, 클라이언트 요청 ID 사용"""
+        request_id = str(uuid.uuid4())
+        response = client.post('/api/sync/push', headers={**auth_headers, 'X-Request-ID': request_id},
+                               data=json.dumps(sample_push_data))
+
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result['request_id'] == request_id
+
+        log = SyncLog.query.filter_by(request_id=request_id).one()
+        assert log.id == result['sync_log_id']
+        assert log.sync_type == 'push'
+        assert log.status == 'success'
+        assert log.records_count == 2
+        assert log.created_at == log.started_at
+
+    def test_invalid_request_id_rejected(self, client, user, auth_headers):
+        """잘못된 요청 ID는 400"""
+        response = client.post('/api/sync/pull', headers={**auth_headers, 'X-Request-ID': 'bad id!'},
+                               data=json.dumps({}))
+
+        assert response.status_code == 400
+
+    def test_pull_request_id_keeps_etag(self, client, user, auth_headers):
+        """요청 ID가 달라도 같은 ETag (304 가능)"""
+        first = client.post('/api/sync/pull', headers=auth_headers,
+                            data=json.dumps({'request_id': 'pull-0001'}))
+        second = client.post('/api/sync/pull', headers=auth_headers,
+                             data=json.dumps({'request_id': 'pull-0002'}))
+
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert second.get_json()['request_id'] == 'pull-0002'
+
+
+@pytest.mark.integration
+class TestBufferedSyncLog:
+    """버퍼 모드 테스트"""
+
+    def test_memory_buffer_flush(self, app, client, user, auth_headers, sample_push_data, restore_writer):
+        """메모리 버퍼: 요청 중에는 기록하지 않고 flush 시 일괄 저장"""
+        writer = _buffered_writer(app, 'memory')
+
+        response = client.post('/api/sync/push', headers={**auth_headers, 'X-Request-ID': 'push-0001'},
+                               data=json.dumps(sample_push_data))
+        client.post('/api/sync/pull', headers={**auth_headers, 'X-Request-ID': 'pull-0001'},
+                    data=json.dumps({}))
+
+        assert response.get_json()['sync_log_id'] is None
+        assert SyncLog.query.filter_by(user_id=user.id).count() == 0
+        assert writer.pending() == 2
+
+        assert writer.flush() == 2
+        logs = SyncLog.query.filter_by(user_id=user.id).order_by(SyncLog.created_at).all()
+        assert [(log.request_id, log.sync_type) for log in logs] == [('push-0001', 'push'), ('pull-0001', 'pull')]
+        assert writer.pending() == 0
+        assert writer.stats()['written'] >= 2
+
+    def test_memory_buffer_drops_oldest(self, app, restore_writer):
+        """상한 초과 시 오래된 로그부터 버림"""
+        app.config['SYNC_LOG_MAX_BUFFER'] = 2
+        writer = _buffered_writer(app, 'memory')
+        dropped = writer.dropped
+
+        for i in range(3):
+            writer.write({'user_id': 1, 'sync_type': 'push', 'request_id': f'req-000{i}'})
+
+        assert writer.pending() == 2
+        assert writer.dropped == dropped + 1
+        writer._take(2)
+        app.config['SYNC_LOG_MAX_BUFFER'] = 100000
+
+    def test_bad_record_dropped_not_requeued(self, app, user, restore_writer):
+        """일괄 저장 실패 시 한 행씩 저장, 저장할 수 없는 행만 버리고 나머지는 저장"""
+        writer = _buffered_writer(app, 'memory')
+        dropped = writer.dropped
+
+        writer.write(sync_record(user.id, 'push', 'good-0001', datetime.utcnow()))
+        writer.write(sync_record(user.id, None, 'bad-0001', datetime.utcnow()))
+        writer.write(sync_record(user.id, 'pull', 'good-0002', datetime.utcnow()))
+
+        assert writer.flush() == 2
+        assert writer.pending() == 0
+        assert writer.dropped == dropped + 1
+        request_ids = {log.request_id for log in SyncLog.query.filter_by(user_id=user.id)}
+        assert request_ids == {'good-0001', 'good-0002'}
+
+    def test_redis_buffer_flush(self, app, client, user, auth_headers, sample_push_data,
+                                redis_client, restore_writer):
+        """Redis 버퍼: 워커 간 공유 리스트에 적재 후 일괄 저장"""
+        writer = _buffered_writer(app, 'redis', client=redis_client)
+        redis_client.delete(writer.key)
+
+        client.post('/api/sync/push', headers={**auth_headers, 'X-Request-ID': 'push-0002'},
+                    data=json.dumps(sample_push_data))
+
+        assert redis_client.llen(writer.key) == 1
+        assert SyncLog.query.filter_by(user_id=user.id).count() == 0
+
+        assert writer.flush() == 1
+        log = SyncLog.query.filter_by(request_id='push-0002').one()
+        assert log.status == 'success'
+        assert log.started_at is not None
+        assert redis_client.llen(writer.key) == 0
@@ -0,0 +1,151 @@
+"""
+Test ML Window Features
+슬라이딩 윈도 특징 (통계, 벡터 크기, jerk, 영점 교차) 및 .npy / Parquet 저장 테스트
+"""
+
+import json
+import os
+import pytest
+import numpy as np
+from celery_app import celery
+from app.models.sensor_data import SensorData
+from app.tasks.ml_features import extract_ml_features, extract_ml_features_batch, merge_feature_report
+from app.utils.ml_features import WINDOW_FEATURES, WindowFeatureExtractor, feature_columns, load_feature_matrix
+
+BASE_TS = 1_700_000_000_000
+
+
+def _motion(n=1000, frequency=2.0):
+    """100 Hz 3축 신호 (x: 사인, y: 선형 증가, z: 중력 + 잡음)"""
+    t = np.arange(n) / 100.0
+    rng = np.random.default_rng(5)
+    values = np.column_stack([np.sin(2 * np.pi * frequency * t), t * 3.0, 9.8 + rng.normal(0, 0.1, n)])
+    timestamps = BASE_TS + np.arange(n, dtype=np.int64) * 10
+    return timestamps, values
+
+
+def _feature(result, channel, feature):
+    return result['features'][:, result['columns'].index(f'accelerometer_{channel}_{feature}')]
+
+
+@pytest.mark.unit
+class TestWindowFeatureExtractor:
+    """윈도 특징 계산 테스트"""
+
+    def test_matches_per_window_computation(self):
+        """윈도별로 잘라 계산한 값과 같음"""
+        timestamps, values = _motion()
+        result = WindowFeatureExtractor('accelerometer', 100, 50).update(timestamps, values).result()
+
+        assert result['window_count'] == (1000 - 100) // 50 + 1
+        assert result['features'].shape == (result['window_count'], len(feature_columns('accelerometer')))
+        assert result['start_ts'][1] - result['start_ts'][0] == 50 * 10
+        assert result['end_ts'][0] == timestamps[99]
+
+        window = values[150:250]
+        magnitude = np.linalg.norm(window, axis=1)
+        assert _feature(result, 'z', 'mean')[3] == pytest.approx(window[:, 2].mean(), rel=1e-5)
+        assert _feature(result, 'x', 'std')[3] == pytest.approx(window[:, 0].std(), rel=1e-4)
+        assert _feature(result, 'magnitude', 'max')[3] == pytest.approx(magnitude.max(), rel=1e-5)
+
+    def test_jerk_and_zero_crossings(self):
+        """선형 증가 축의 jerk = 기울기, 2 Hz 사인은 1초 윈도에 영점 교차 4회"""
+        timestamps, values = _motion()
+        result = WindowFeatureExtractor('accelerometer', 100, 50).update(timestamps, values).result()
+
+        assert np.allclose(_feature(result, 'y', 'jerk_mean'), 3.0, rtol=1e-4)
+        assert np.allclose(_feature(result, 'y', 'jerk_std'), 0.0, atol=1e-3)
+        assert np.all(np.abs(_feature(result, 'x', 'zero_crossings') - 4) <= 1)
+
+    def test_chunked_matches_whole(self):
+        """청크로 나눠도 같은 윈도 / 같은 특징 (남은 샘플을 다음 청크로 이어감)"""
+        timestamps, values = _motion()
+        whole = WindowFeatureExtractor('accelerometer', 100, 30).update(timestamps, values).result()
+
+        extractor = WindowFeatureExtractor('accelerometer', 100, 30)
+        for ts_chunk, value_chunk in zip(np.array_split(timestamps, 13), np.array_split(values, 13)):
+            extractor.update(ts_chunk, value_chunk)
+        chunked = extractor.result()
+
+        assert chunked['window_count'] == whole['window_count']
+        assert np.array_equal(chunked['start_ts'], whole['start_ts'])
+        assert np.allclose(chunked['features'], whole['features'])
+
+    def test_too_few_samples(self):
+        """윈도보다 샘플이 적으면 결과 없음"""
+        timestamps, values = _motion(n=50)
+        assert WindowFeatureExtractor('accelerometer', 100, 50).update(timestamps, values).result() is None
+
+
+@pytest.mark.celery
+@pytest.mark.integration
+class TestMlFeatureTask:
+    """특징 추출 작업 / 파일 저장 테스트"""
+
+    @pytest.fixture
+    def moving_session(self, session, recording_session):
+        timestamps, values = _motion(n=500)
+        session.bulk_save_objects([
+            SensorData(session_id=recording_session.id, sensor_type='accelerometer', timestamp=int(ts),
+                       data={'x': float(x), 'y': float(y), 'z': float(z)})
+            for ts, (x, y, z) in zip(timestamps, values)
+        ])
+        session.commit()
+        return recording_session
+
+    def test_npy_output(self, app, tmp_path, moving_session):
+        """특징 행렬 / 윈도 시각 .npy와 features.json 저장"""
+        app.config['ANALYSIS_CHUNK_SIZE'] = 120
+        try:
+            result = extract_ml_features(moving_session.id, output_dir=str(tmp_path))
+        finally:
+            app.config['ANALYSIS_CHUNK_SIZE'] = 10000
+
+        accel = result['sensor_types']['accelerometer']
+        assert accel['window_count'] == (500 - 100) // 50 + 1
+        assert accel['feature_count'] == 4 * len(WINDOW_FEATURES)
+        assert sorted(os.listdir(result['output_dir'])) == ['accelerometer.npy', 'accelerometer_windows.npy',
+                                                            'features.json']
+
+        with open(os.path.join(result['output_dir'], 'features.json')) as file:
+            assert json.load(file)['window_size'] == 100
+
+        loaded = load_feature_matrix(result['output_dir'], 'accelerometer')
+        timestamps, values = _motion(n=500)
+        expected = WindowFeatureExtractor('accelerometer', 100, 50).update(timestamps, values).result()
+        assert loaded['features'].dtype == np.float32
+        assert np.allclose(loaded['features'], expected['features'])
+        assert np.array_equal(loaded['start_ts'], expected['start_ts'])
+
+    def test_parquet_output(self, tmp_path, moving_session):
+        """Parquet 저장 (특징 열 + 윈도 시각)"""
+        pytest.importorskip('pyarrow')
+        result = extract_ml_features(moving_session.id, window_size=200, step=100, output_format='parquet',
+                                     output_dir=str(tmp_path))
+
+        assert result['sensor_types']['accelerometer']['files'] == ['accelerometer.parquet']
+        loaded = load_feature_matrix(result['output_dir'], 'accelerometer')
+        assert loaded['features'].shape == (4, len(feature_columns('accelerometer')))
+        assert loaded['start_ts'].tolist() == [BASE_TS + i * 1000 for i in range(4)]
+
+    def test_invalid_parameters(self, tmp_path, moving_session):
+        """잘못된 윈도 / 형식 / 샘플 부족은 에러"""
+        assert 'error' in extract_ml_features(moving_session.id, window_size=2, output_dir=str(tmp_path))
+        assert 'error' in extract_ml_features(moving_session.id, output_format='csv', output_dir=str(tmp_path))
+        assert 'error' in extract_ml_features(moving_session.id, window_size=1000, output_dir=str(tmp_path))
+        assert not os.listdir(tmp_path)
+
+    def test_batch_fan_out(self, tmp_path, user, moving_session):
+        """세션 일괄 추출 (동시 실행 상한) 및 결과 요약"""
+        celery.conf.task_always_eager = True
+        try:
+            batch = extract_ml_features_batch(user_id=user.id, max_concurrency=4, output_dir=str(tmp_path))
+        finally:
+            celery.conf.task_always_eager = False
+
+        assert batch['slice_sizes'] == [1]
+        report = merge_feature_report([[extract_ml_features(moving_session.id, output_dir=str(tmp_path))],
+                                       [extract_ml_features(999999)]], total_sessions=2)
+        assert report['extracted_sessions'] == 1
+        assert report['failed_sessions'] == [{'session_id': 999999, 'error': 'Session not found'}]
+        assert report['sensor_types']['accelerometer'] == {'sessions': 1, 'window_count': 9}
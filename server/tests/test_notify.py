@@ -0,0 +1,200 @@
+"""
+Test Sync Notifications
+동기화 알림 (Redis pub/sub, SSE) 테스트 (Redis 필요)
+"""
+
+import pytest
+import json
+import time
+import uuid
+from datetime import datetime
+from app.utils.notify import NotificationHub, notifier, format_sse, parse_last_event_id
+
+
+def _wait_for_listener(redis_client, timeout=2.0):
+    """리스너 스레드의 패턴 구독 완료 대기"""
+    deadline = time.monotonic() + timeout
+    while redis_client.pubsub_numpat() < 1:
+        assert time.monotonic() < deadline, 'listener did not subscribe'
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def enabled_notifier(app, redis_client):
+    """앱 전역 notifier 활성화 (SSE 통합 테스트용)"""
+    app.config.update(NOTIFY_ENABLED=True, NOTIFY_HEARTBEAT=1, NOTIFY_STREAM_TIMEOUT=5)
+    notifier.init_app(app, client=redis_client)
+
+    yield notifier
+
+    app.config['NOTIFY_ENABLED'] = False
+    notifier.init_app(app)
+
+
+@pytest.mark.unit
+def test_format_sse():
+    """SSE 메시지 형식"""
+    assert format_sse({'type': 'push'}, event_id=7) == 'id: 7\nevent: sync\ndata: {"type":"push"}\n\n'
+    assert format_sse({'a': 1}, event='ready') == 'event: ready\ndata: {"a":1}\n\n'
+
+
+@pytest.mark.unit
+def test_parse_last_event_id():
+    """Last-Event-ID는 0 이상 정수만 (그 외는 재생 없음)"""
+    assert parse_last_event_id('42') == 42
+    assert parse_last_event_id('0') == 0
+    assert parse_last_event_id(None) is None
+    assert parse_last_event_id('abc') is None
+    assert parse_last_event_id('-1') is None
+
+
+@pytest.mark.unit
+def test_disabled_hub_is_noop(app):
+    """비활성화 상태에서는 발행하지 않음"""
+    hub = NotificationHub(app)
+
+    assert hub.enabled is False
+    assert hub.publish(1, {'type': 'push'}) is False
+
+
+@pytest.mark.unit
+def test_events_disabled(client, auth_headers):
+    """알림 비활성화 시 503"""
+    response = client.get('/api/sync/events', headers=auth_headers)
+
+    assert response.status_code == 503
+
+
+@pytest.mark.integration
+class TestNotificationHub:
+    """NotificationHub 동작 테스트"""
+
+    def test_publish_reaches_subscriber(self, app, redis_client):
+        """발행한 알림이 같은 사용자의 구독 큐로만 전달"""
+        hub = NotificationHub()
+        app.config.update(NOTIFY_ENABLED=True)
+        hub.init_app(app, client=redis_client)
+
+        mine = hub.subscribe(1)
+        other = hub.subscribe(2)
+        _wait_for_listener(redis_client)
+
+        assert hub.connection_count() == 2
+        assert hub.publish(1, {'type': 'push', 'change_seq': 3}) is True
+        assert mine.get(timeout=2) == {'type': 'push', 'change_seq': 3}
+        assert other.empty()
+
+        hub.unsubscribe(1, mine)
+        hub.unsubscribe(2, other)
+        assert hub.connection_count() == 0
+        app.config['NOTIFY_ENABLED'] = False
+
+    def test_stream_ends_after_timeout(self, app, redis_client):
+        """heartbeat마다 keepalive, stream_timeout 후 종료"""
+        hub = NotificationHub()
+        app.config.update(NOTIFY_ENABLED=True, NOTIFY_HEARTBEAT=0.05, NOTIFY_STREAM_TIMEOUT=0.2)
+        hub.init_app(app, client=redis_client)
+
+        q = hub.subscribe(1)
+        chunks = list(hub.stream(q, [{'type': 'ready', 'change_seq': 0}]))
+
+        assert chunks[0] == 'retry: 50\n\n'
+        assert chunks[1].startswith('id: 0\nevent: sync\n')
+        assert ': keepalive\n\n' in chunks[2:]
+        hub.unsubscribe(1, q)
+        app.config['NOTIFY_ENABLED'] = False
+
+
+@pytest.mark.integration
+class TestSyncEvents:
+    """SSE 엔드포인트 테스트"""
+
+    def _events(self, chunks):
+        """SSE 청크에서 이벤트 데이터 추출 (keepalive 건너뜀)"""
+        for chunk in chunks:
+            text = chunk.decode('utf-8')
+            for line in text.splitlines():
+                if line.startswith('data: '):
+                    yield json.loads(line[len('data: '):])
+
+    def test_push_notifies_stream(self, client, auth_headers, enabled_notifier, redis_client):
+        """연결 시 ready, 이후 Push마다 알림"""
+        response = client.get('/api/sync/events', headers=auth_headers, buffered=False)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+        events = self._events(response.response)
+        assert next(events) == {'type': 'ready', 'change_seq': 0}
+        _wait_for_listener(redis_client)
+
+        session_id = str(uuid.uuid4())
+        pushed = client.post('/api/sync/push', headers=auth_headers, data=json.dumps({
+            'session': {
+                'session_id': session_id,
+                'start_time': datetime.utcnow().isoformat() + 'Z',
+                'enabled_sensors': ['accelerometer'],
+                'sample_rate': 100
+            },
+            'sensor_data': [{'sensor_type': 'accelerometer', 'timestamp': 100, 'data': {'x': 1.0}}]
+        })).get_json()
+
+        assert next(events) == {
+            'type': 'push', 'session_id': session_id,
+            'change_seq': pushed['change_seq'], 'records': 1
+        }
+
+        response.close()
+        assert enabled_notifier.connection_count() == 0
+
+    def test_other_user_not_notified(self, client, auth_headers, another_auth_headers,
+                                     enabled_notifier, redis_client):
+        """다른 사용자의 Push는 전달되지 않음"""
+        enabled_notifier.stream_timeout = 1
+        response = client.get('/api/sync/events', headers=another_auth_headers, buffered=False)
+        events = self._events(response.response)
+        assert next(events)['type'] == 'ready'
+        _wait_for_listener(redis_client)
+
+        client.post('/api/sync/push', headers=auth_headers, data=json.dumps({
+            'session': {
+                'session_id': str(uuid.uuid4()),
+                'start_time': datetime.utcnow().isoformat() + 'Z',
+                'enabled_sensors': ['accelerometer'],
+                'sample_rate': 100
+            },
+            'sensor_data': []
+        }))
+
+        # 알림 없이 keepalive만 오다가 stream_timeout에 종료
+        assert list(events) == []
+        response.close()
+
+    def test_last_event_id_replay(self, client, auth_headers, enabled_notifier):
+        """재연결 시 Last-Event-ID 이후 변경을 change 이벤트로 재생한 뒤 ready"""
+        session_id = str(uuid.uuid4())
+        pushed = client.post('/api/sync/push', headers=auth_headers, data=json.dumps({
+            'session': {
+                'session_id': session_id,
+                'start_time': datetime.utcnow().isoformat() + 'Z',
+                'enabled_sensors': ['accelerometer'],
+                'sample_rate': 100
+            },
+            'sensor_data': [{'sensor_type': 'accelerometer', 'timestamp': 100, 'data': {'x': 1.0}}]
+        })).get_json()
+        feed = client.get('/api/sync/changes', headers=auth_headers).get_json()['changes']
+
+        response = client.get('/api/sync/events', headers={**auth_headers, 'Last-Event-ID': '0'}, buffered=False)
+        events = self._events(response.response)
+        replayed = [next(events) for _ in feed]
+        assert [event['change_seq'] for event in replayed] == [change['seq'] for change in feed]
+        assert all(event['type'] == 'change' and event['session_id'] == session_id for event in replayed)
+        assert next(events) == {'type': 'ready', 'change_seq': pushed['change_seq']}
+        response.close()
+
+        # 마지막 시퀀스로 재연결하면 재생 없이 ready
+        response = client.get('/api/sync/events', headers=auth_headers, buffered=False,
+                              query_string={'last_event_id': pushed['change_seq']})
+        assert next(self._events(response.response))['type'] == 'ready'
+        response.close()
@@ -0,0 +1,155 @@
+"""
+Test Sensor Resampling
+공통 시간 격자 정렬 (nearest / linear / zoh) 및 정렬 내보내기 API 테스트
+"""
+
+import io
+import pytest
+import numpy as np
+from app.models.sensor_data import SensorData
+from app.utils.resample import align_session, resample_series, time_grid
+
+BASE_TS = 1_700_000_000_000
+
+
+@pytest.mark.unit
+class TestResampleSeries:
+    """시계열 재표본화 테스트"""
+
+    def test_methods(self):
+        """nearest / linear / zoh, 범위 밖은 NaN (zoh는 마지막 값 유지)"""
+        timestamps = np.array([0, 10, 40])
+        values = np.array([0.0, 1.0, 4.0])
+        grid = np.array([-5.0, 0.0, 16.0, 30.0, 40.0, 50.0])
+
+        nearest = resample_series(timestamps, values, grid, 'nearest')
+        linear = resample_series(timestamps, values, grid, 'linear')
+        zoh = resample_series(timestamps, values, grid, 'zoh')
+
+        assert np.allclose(nearest, [np.nan, 0.0, 1.0, 4.0, 4.0, np.nan], equal_nan=True)
+        assert np.allclose(linear, [np.nan, 0.0, 1.6, 3.0, 4.0, np.nan], equal_nan=True)
+        assert np.allclose(zoh, [np.nan, 0.0, 1.0, 1.0, 4.0, 4.0], equal_nan=True)
+
+    def test_max_gap_and_duplicates(self):
+        """데이터 끊김 구간은 NaN, 같은 시각 중복 샘플은 마지막 값"""
+        timestamps = np.array([0, 10, 10, 100])
+        values = np.array([[0.0, 0.0], [1.0, 10.0], [2.0, 20.0], [3.0, 30.0]])
+        grid = np.array([5.0, 10.0, 50.0])
+
+        linear = resample_series(timestamps, values, grid, 'linear', max_gap_ms=20)
+        zoh = resample_series(timestamps, values, grid, 'zoh', max_gap_ms=20)
+
+        assert linear.shape == (3, 2)
+        assert np.allclose(linear[:2], [[1.0, 10.0], [2.0, 20.0]])
+        assert np.isnan(linear[2]).all()
+        assert np.allclose(zoh[:2, 1], [0.0, 20.0])
+        assert np.isnan(zoh[2]).all()
+
+    def test_jittery_linear_signal(self):
+        """불규칙 간격 샘플의 선형 신호는 격자에서 정확히 복원"""
+        rng = np.random.default_rng(11)
+        timestamps = np.cumsum(rng.integers(5, 15, 500))
+        grid = time_grid(int(timestamps[0]), int(timestamps[-1]), 100.0)
+
+        resampled = resample_series(timestamps, timestamps * 0.5 + 3.0, grid, 'linear')
+        assert np.allclose(resampled, grid * 0.5 + 3.0)
+        assert np.allclose(np.diff(grid), 10.0)
+
+
+@pytest.mark.integration
+class TestAlignSession:
+    """세션 정렬 / 내보내기 API 테스트"""
+
+    @pytest.fixture
+    def multi_sensor_session(self, session, recording_session):
+        """가속도 100 Hz (x = 시간 선형), 자이로 약 30 Hz 지터 (z = 상수), 범위가 다름"""
+        accel_ts = BASE_TS + np.arange(300) * 10
+        gyro_ts = BASE_TS + 500 + np.cumsum(np.random.default_rng(2).integers(25, 40, 60))
+        rows = [
+            SensorData(session_id=recording_session.id, sensor_type='accelerometer', timestamp=int(ts),
+                       data={'x': float(ts - BASE_TS) / 1000.0, 'y': 0.0, 'z': 9.8})
+            for ts in accel_ts
+        ] + [
+            SensorData(session_id=recording_session.id, sensor_type='gyroscope', timestamp=int(ts),
+                       data={'x': 0.0, 'y': 0.0, 'z': 1.5})
+            for ts in gyro_ts
+        ]
+        session.bulk_save_objects(rows)
+        session.commit()
+        return recording_session, gyro_ts
+
+    def test_overlap_grid(self, multi_sensor_session):
+        """기본 격자는 모든 센서가 겹치는 구간, 열은 {sensor_type}_{field}"""
+        rec_session, gyro_ts = multi_sensor_session
+        aligned = align_session(rec_session, rate_hz=50, method='linear')
+
+        assert aligned['start_ts'] == gyro_ts[0]
+        assert aligned['end_ts'] == min(gyro_ts[-1], BASE_TS + 2990)
+        assert np.all(np.diff(aligned['timestamp']) == 20)
+        assert list(aligned['columns'])[:3] == ['accelerometer_x', 'accelerometer_y', 'accelerometer_z']
+        assert np.allclose(aligned['columns']['accelerometer_x'], (aligned['timestamp'] - BASE_TS) / 1000.0)
+        assert np.allclose(aligned['columns']['gyroscope_z'], 1.5)
+
+    def test_invalid_parameters(self, multi_sensor_session):
+        """잘못된 방법 / 범위 / 상한 초과는 ValueError"""
+        rec_session, _ = multi_sensor_session
+        with pytest.raises(ValueError):
+            align_session(rec_session, method='cubic')
+        with pytest.raises(ValueError):
+            align_session(rec_session, sensor_types=['light'])
+        with pytest.raises(ValueError):
+            align_session(rec_session, max_points=10)
+        for bad in (float('inf'), float('nan')):
+            with pytest.raises(ValueError, match='finite'):
+                align_session(rec_session, rate_hz=bad)
+            with pytest.raises(ValueError, match='finite'):
+                align_session(rec_session, max_gap_ms=bad)
+
+    def test_max_points_checked_before_loading(self, multi_sensor_session, count_queries):
+        """격자 점 상한은 타입별 범위 집계 1회로 확인 (센서 배열을 읽지 않음)"""
+        rec_session, _ = multi_sensor_session
+        with count_queries() as statements:
+            with pytest.raises(ValueError, match='Too many grid points'):
+                align_session(rec_session, rate_hz=100, max_points=10)
+
+        assert len([s for s in statements if 'FROM sensor_data' in s]) == 1
+
+    def test_export_api(self, client, auth_headers, multi_sensor_session):
+        """JSON / CSV / Arrow 내보내기, 잘못된 파라미터는 400"""
+        rec_session, _ = multi_sensor_session
+        url = f'/api/sync/sessions/{rec_session.session_id}/aligned'
+        query = {'sensor_types': 'accelerometer,gyroscope', 'method': 'zoh', 'rate_hz': 20,
+                 'start_ts': BASE_TS, 'end_ts': BASE_TS + 1000}
+
+        response = client.get(url, headers=auth_headers, query_string=query)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['count'] == len(body['timestamps']) == 21
+        # 자이로 첫 샘플 이전은 null
+        assert body['columns']['gyroscope_z'][0] is None
+        assert body['columns']['accelerometer_z'][0] == pytest.approx(9.8)
+
+        response = client.get(url, headers=auth_headers, query_string={**query, 'format': 'csv'})
+        assert response.status_code == 200
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0].startswith('timestamp,accelerometer_x')
+        assert len(lines) == 22
+        assert lines[1].endswith(',')
+
+        assert client.get(url, headers=auth_headers, query_string={'method': 'cubic'}).status_code == 400
+        assert client.get(url, headers=auth_headers, query_string={'rate_hz': 'fast'}).status_code == 400
+        assert client.get(url, headers=auth_headers, query_string={'rate_hz': 'inf'}).status_code == 400
+        assert client.get(url, headers=auth_headers, query_string={'max_gap_ms': 'nan'}).status_code == 400
+        assert client.get(url, headers=auth_headers, query_string={'format': 'xml'}).status_code == 400
+
+    def test_export_arrow(self, client, auth_headers, multi_sensor_session):
+        """Arrow IPC 스트림 (NaN은 null)"""
+        pa = pytest.importorskip('pyarrow')
+        rec_session, gyro_ts = multi_sensor_session
+        url = f'/api/sync/sessions/{rec_session.session_id}/aligned'
+
+        response = client.get(url, headers=auth_headers, query_string={'format': 'arrow', 'method': 'nearest'})
+        assert response.status_code == 200
+        table = pa.ipc.open_stream(io.BytesIO(response.get_data())).read_all()
+        assert table.column('timestamp')[0].as_py() == gyro_ts[0]
+        assert table.column('gyroscope_z').null_count == 0
@@ -0,0 +1,137 @@
+"""
+Test Spectral Features
+윈도 FFT 주파수 특징 (우세 주파수, 대역 에너지, Welch PSD) 테스트
+"""
+
+import json
+import pytest
+import numpy as np
+from celery_app import celery
+from app.models.sensor_data import SensorData
+from app.models.spectral import SpectralFeatures
+from app.tasks.data_processing import extract_spectral_features
+from app.utils.spectral import DEFAULT_BANDS, SpectralAccumulator, decode_features, encode_features
+
+BASE_TS = 1_700_000_000_000
+SAMPLE_RATE = 100.0
+
+
+def _sine(n=2000, frequency=5.0, amplitude=2.0):
+    """sample_rate 100 Hz 사인파 + 약한 잡음"""
+    t = np.arange(n) / SAMPLE_RATE
+    values = amplitude * np.sin(2 * np.pi * frequency * t) + np.random.default_rng(3).normal(0, 0.05, n)
+    timestamps = BASE_TS + np.arange(n, dtype=np.int64) * 10
+    return timestamps, values
+
+
+@pytest.mark.unit
+class TestSpectralAccumulator:
+    """윈도 FFT 계산 테스트"""
+
+    def test_dominant_frequency_and_energy(self):
+        """우세 주파수, 대역 에너지, PSD 적분 = 분산 (Parseval)"""
+        timestamps, values = _sine()
+        result = SpectralAccumulator(SAMPLE_RATE, 256, 128, DEFAULT_BANDS).update(timestamps, values).result()
+        features = result['features']
+
+        assert result['window_count'] == (2000 - 256) // 128 + 1
+        assert np.all(np.abs(features['dominant_frequency'] - 5.0) < SAMPLE_RATE / 256)
+        assert result['dominant_frequency'] == pytest.approx(5.0, abs=SAMPLE_RATE / 256)
+        assert np.mean(features['total_energy']) == pytest.approx(2.0 ** 2 / 2, rel=0.1)
+        # 5 Hz는 3-8 Hz 대역
+        assert np.all(np.argmax(features['band_energy'], axis=1) == 2)
+        assert features['start_ts'][1] - features['start_ts'][0] == 128 * 10
+
+    def test_chunked_matches_whole(self):
+        """청크로 나눠도 같은 윈도 / 같은 특징 (남은 샘플을 다음 청크로 이어감)"""
+        timestamps, values = _sine()
+        whole = SpectralAccumulator(SAMPLE_RATE, 256, 100, DEFAULT_BANDS).update(timestamps, values).result()
+
+        accumulator = SpectralAccumulator(SAMPLE_RATE, 256, 100, DEFAULT_BANDS)
+        for ts_chunk, value_chunk in zip(np.array_split(timestamps, 17), np.array_split(values, 17)):
+            accumulator.update(ts_chunk, value_chunk)
+        chunked = accumulator.result()
+
+        assert chunked['window_count'] == whole['window_count']
+        for key, array in whole['features'].items():
+            assert np.allclose(chunked['features'][key], array), key
+        assert np.allclose(chunked['welch_psd']['psd'], whole['welch_psd']['psd'])
+
+    def test_too_few_samples(self):
+        """윈도보다 샘플이 적으면 결과 없음"""
+        timestamps, values = _sine(n=100)
+        assert SpectralAccumulator(SAMPLE_RATE, 256, 128, DEFAULT_BANDS).update(timestamps, values).result() is None
+
+    def test_encode_roundtrip(self):
+        """압축 바이너리 왕복"""
+        features = {'start_ts': np.arange(5, dtype=np.int64), 'band_energy': np.ones((5, 4), dtype=np.float32)}
+        decoded = decode_features(encode_features(features))
+
+        assert decoded['start_ts'].dtype == np.int64
+        assert np.array_equal(decoded['band_energy'], features['band_energy'])
+
+
+@pytest.mark.celery
+@pytest.mark.integration
+class TestSpectralTask:
+    """주파수 특징 작업 / API 테스트"""
+
+    @pytest.fixture
+    def vibrating_session(self, session, recording_session):
+        timestamps, values = _sine()
+        session.bulk_save_objects([
+            SensorData(session_id=recording_session.id, sensor_type='accelerometer', timestamp=int(ts),
+                       data={'x': 0.0, 'y': 0.0, 'z': 9.8 + float(value)})
+            for ts, value in zip(timestamps, values)
+        ])
+        session.commit()
+        return recording_session
+
+    def test_features_stored_and_reused(self, app, vibrating_session):
+        """결과를 저장하고, 데이터 / 파라미터가 같으면 재사용"""
+        app.config['ANALYSIS_CHUNK_SIZE'] = 300
+        try:
+            result = extract_spectral_features(vibrating_session.id)
+        finally:
+            app.config['ANALYSIS_CHUNK_SIZE'] = 10000
+
+        accel = result['features']['accelerometer']
+        assert accel['sample_rate'] == SAMPLE_RATE
+        assert accel['dominant_frequency'] == pytest.approx(5.0, abs=0.5)
+
+        row = SpectralFeatures.query.filter_by(session_id=vibrating_session.id).one()
+        computed_at = row.computed_at
+        extract_spectral_features(vibrating_session.id)
+        assert SpectralFeatures.query.filter_by(session_id=vibrating_session.id).one().computed_at == computed_at
+
+        other = extract_spectral_features(vibrating_session.id, window_size=128)
+        assert other['features']['accelerometer']['window_count'] > accel['window_count']
+
+    def test_api(self, client, auth_headers, vibrating_session):
+        """조회 API (윈도 범위) / 추출 요청 API"""
+        url = f'/api/sync/sessions/{vibrating_session.session_id}/spectral'
+        assert client.get(url, headers=auth_headers).status_code == 404
+
+        celery.conf.task_always_eager = True
+        try:
+            response = client.post(url, headers=auth_headers, data=json.dumps({'window_size': 200, 'hop': 100}))
+        finally:
+            celery.conf.task_always_eager = False
+        assert response.status_code == 202
+        assert response.get_json()['task_id']
+
+        response = client.get(url, headers=auth_headers,
+                              query_string={'windows': 'true', 'start_ts': BASE_TS, 'end_ts': BASE_TS + 2000})
+        assert response.status_code == 200
+        features = response.get_json()['features'][0]
+        assert (features['window_size'], features['hop'], features['stale']) == (200, 100, False)
+        assert [w['start_ts'] for w in features['windows']] == [BASE_TS, BASE_TS + 1000, BASE_TS + 2000]
+        assert len(features['windows'][0]['band_energy']) == len(DEFAULT_BANDS)
+
+    def test_invalid_parameters(self, client, auth_headers, vibrating_session):
+        """잘못된 윈도 / 대역은 400"""
+        url = f'/api/sync/sessions/{vibrating_session.session_id}/spectral'
+
+        assert client.post(url, headers=auth_headers, data=json.dumps({'window_size': 4})).status_code == 400
+        assert client.post(url, headers=auth_headers, data=json.dumps({'bands': [[3, 1]]})).status_code == 400
+        assert 'error' in extract_spectral_features(vibrating_session.id, hop=0)
@@ -5,6 +5,9 @@ Test Sync API
 
 import pytest
 import json
+import gzip
+import threading
+from werkzeug.test import EnvironBuilder
 from datetime import datetime, timedelta
 from app.models.session import RecordingSession
 from app.models.sensor_data import SensorData
@@ -431,6 +434,784 @@ class TestSyncPull:
         assert response.status_code == 400
 
 
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncPullCursor:
+    """키셋(커서) 페이지네이션 Pull 테스트"""
+
+    def test_cursor_pagination_walks_all_sessions(self, client, user, auth_headers, create_session_func):
+        """커서로 전체 세션을 중복/누락 없이 순회"""
+        created = {str(create_session_func(user.id, notes=f'Session {i}').session_id) for i in range(5)}
+
+        seen = []
+        cursor = None
+        for _ in range(10):
+            response = client.post(
+                '/api/sync/pull',
+                headers=auth_headers,
+                data=json.dumps({'cursor': cursor, 'page_size': 2, 'include_data': False})
+            )
+
+            assert response.status_code == 200
+            result = response.get_json()
+            assert 'total' not in result
+            assert len(result['sessions']) <= 2
+
+            seen.extend(s['session_id'] for s in result['sessions'])
+            cursor = result['next_cursor']
+
+            if not result['has_more']:
+                assert cursor is None
+                break
+
+        assert len(seen) == len(set(seen))
+        assert set(seen) == created
+
+    def test_cursor_first_page_has_more(self, client, user, auth_headers, create_session_func):
+        """limit + 1 조회로 has_more 계산"""
+        for i in range(3):
+            create_session_func(user.id)
+
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps({'cursor': None, 'page_size': 3, 'include_data': False})
+        )
+
+        result = response.get_json()
+        assert len(result['sessions']) == 3
+        assert result['has_more'] is False
+        assert result['next_cursor'] is None
+
+    def test_invalid_cursor(self, client, auth_headers):
+        """잘못된 커서 토큰 테스트"""
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps({'cursor': 'not-a-cursor', 'page_size': 10})
+        )
+
+        assert response.status_code == 400
+
+    def test_cursor_roundtrip(self):
+        """커서 인코딩/디코딩 테스트"""
+        from app.utils.pagination import encode_cursor, decode_cursor
+
+        updated_at = datetime(2025, 11, 13, 12, 30, 45, 123456)
+        token = encode_cursor(updated_at, 42)
+
+        assert decode_cursor(token) == (updated_at, 42)
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncPullDataCursor:
+    """세션별 센서 데이터 커서 / max_records 예산 테스트"""
+
+    def test_max_records_limits_response(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """max_records 예산 초과 시 data_cursor 반환"""
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps({'session_ids': [str(recording_session.session_id)], 'max_records': 30})
+        )
+
+        assert response.status_code == 200
+        pulled = response.get_json()['sessions'][0]
+        assert len(pulled['sensor_data']) == 30
+        assert pulled['data_complete'] is False
+        assert pulled['data_cursor']['sensor_type'] == 'accelerometer'
+        assert pulled['data_cursor']['timestamp'] == pulled['sensor_data'][-1]['timestamp']
+
+    def test_data_cursor_resumes_session(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """data_cursors로 긴 세션을 나눠서 전부 수신"""
+        session_uuid = str(recording_session.session_id)
+        timestamps = []
+        data_cursors = {}
+
+        for _ in range(10):
+            response = client.post(
+                '/api/sync/pull',
+                headers=auth_headers,
+                data=json.dumps({
+                    'session_ids': [session_uuid],
+                    'max_records': 40,
+                    'data_cursors': data_cursors
+                })
+            )
+
+            assert response.status_code == 200
+            pulled = response.get_json()['sessions'][0]
+            timestamps.extend(d['timestamp'] for d in pulled['sensor_data'])
+
+            if pulled['data_complete']:
+                assert pulled['data_cursor'] is None
+                break
+            data_cursors = {session_uuid: pulled['data_cursor']}
+
+        assert len(timestamps) == 100
+        assert timestamps == sorted(set(timestamps))
+
+    def test_overflow_sessions_resume_from_start(self, client, session, user, auth_headers, create_session_func):
+        """예산 초과로 한 행도 받지 못한 세션도 data_cursor를 그대로 다시 보내 전부 수신"""
+        for i in range(4):
+            rec_session = create_session_func(user.id, notes=f'Session {i}')
+            session.add_all([
+                SensorData(session_id=rec_session.id, sensor_type='accelerometer', timestamp=1000 + j,
+                           data={'x': float(j)})
+                for j in range(3)
+            ])
+        session.commit()
+
+        received = 0
+        data_cursors = {}
+        session_ids = None
+        for _ in range(5):
+            body = {'page_size': 50, 'max_records': 4, 'data_cursors': data_cursors}
+            if session_ids:
+                body['session_ids'] = session_ids
+            response = client.post('/api/sync/pull', headers=auth_headers, data=json.dumps(body))
+
+            assert response.status_code == 200
+            sessions = response.get_json()['sessions']
+            received += sum(len(s['sensor_data']) for s in sessions)
+
+            incomplete = [s for s in sessions if not s['data_complete']]
+            if not incomplete:
+                break
+            assert all(s['data_cursor'] is not None for s in incomplete)
+            session_ids = [s['session_id'] for s in incomplete]
+            data_cursors = {s['session_id']: s['data_cursor'] for s in incomplete}
+
+        assert received == 12
+
+    def test_without_budget_returns_full_session(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """예산 없이 요청하면 기존처럼 전체 데이터 반환"""
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps({'session_ids': [str(recording_session.session_id)]})
+        )
+
+        pulled = response.get_json()['sessions'][0]
+        assert len(pulled['sensor_data']) == 100
+        assert pulled['data_complete'] is True
+
+    def test_invalid_max_records(self, client, auth_headers):
+        """잘못된 max_records 테스트"""
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps({'max_records': 0})
+        )
+
+        assert response.status_code == 400
+
+    def test_invalid_data_cursors(self, client, auth_headers):
+        """잘못된 data_cursors 테스트"""
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps({'data_cursors': {'uuid1': {'timestamp': 'abc'}}})
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncPullQueryCount:
+    """Pull 센서 데이터 조회 N+1 방지 테스트"""
+
+    def _create_sessions_with_data(self, session, user, create_session_func, count=5, per_session=3):
+        base_timestamp = int(datetime.utcnow().timestamp() * 1000)
+        sessions = []
+        for i in range(count):
+            rec_session = create_session_func(user.id, notes=f'Session {i}')
+            for j in range(per_session):
+                session.add(SensorData(
+                    session_id=rec_session.id,
+                    sensor_type='accelerometer',
+                    timestamp=base_timestamp + j * 10,
+                    data={'x': float(i), 'y': float(j), 'z': 9.8}
+                ))
+            sessions.append(rec_session)
+        session.commit()
+        return sessions
+
+    @staticmethod
+    def _sensor_data_selects(statements):
+        return [s for s in statements if s.lstrip().upper().startswith('SELECT') and 'FROM sensor_data' in s]
+
+    def test_pull_with_data_single_sensor_query(self, client, session, user, auth_headers,
+                                                create_session_func, count_queries):
+        """페이지의 세션 수와 무관하게 sensor_data 조회 1회"""
+        self._create_sessions_with_data(session, user, create_session_func)
+
+        with count_queries() as statements:
+            response = client.post(
+                '/api/sync/pull',
+                headers=auth_headers,
+                data=json.dumps({'page': 1, 'page_size': 50, 'include_data': True})
+            )
+
+        assert response.status_code == 200
+        result = response.get_json()
+        assert len(result['sessions']) == 5
+        assert all(len(s['sensor_data']) == 3 for s in result['sessions'])
+        assert len(self._sensor_data_selects(statements)) == 1
+
+    def test_pull_with_budget_single_sensor_query(self, client, session, user, auth_headers,
+                                                  create_session_func, count_queries):
+        """max_records 모드에서도 sensor_data 조회 1회"""
+        self._create_sessions_with_data(session, user, create_session_func)
+
+        with count_queries() as statements:
+            response = client.post(
+                '/api/sync/pull',
+                headers=auth_headers,
+                data=json.dumps({'page_size': 50, 'max_records': 7})
+            )
+
+        assert response.status_code == 200
+        result = response.get_json()
+        assert sum(len(s['sensor_data']) for s in result['sessions']) == 7
+        assert sum(1 for s in result['sessions'] if not s['data_complete']) >= 1
+        assert len(self._sensor_data_selects(statements)) == 1
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncPullConditional:
+    """ETag / If-None-Match 조건부 Pull 테스트"""
+
+    def test_pull_returns_etag(self, client, user, auth_headers, completed_session):
+        """Pull 응답에 ETag 포함"""
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps({'include_data': False})
+        )
+
+        assert response.status_code == 200
+        assert response.headers.get('ETag')
+
+    def test_pull_not_modified(self, client, user, auth_headers, completed_session, count_queries):
+        """변경 없으면 304, 센서 데이터 조회/동기화 로그 없음"""
+        body = json.dumps({'include_data': True})
+        first = client.post('/api/sync/pull', headers=auth_headers, data=body)
+        etag = first.headers['ETag']
+        logs_before = SyncLog.query.filter_by(user_id=user.id).count()
+
+        with count_queries() as statements:
+            second = client.post(
+                '/api/sync/pull',
+                headers={**auth_headers, 'If-None-Match': etag},
+                data=body
+            )
+
+        assert second.status_code == 304
+        assert second.headers['ETag'] == etag
+        assert second.data == b''
+        assert not any('sensor_data' in s or 'sync_logs' in s for s in statements)
+        assert SyncLog.query.filter_by(user_id=user.id).count() == logs_before
+
+    def test_push_invalidates_etag(self, client, user, auth_headers, sample_push_data):
+        """Push 후에는 같은 ETag로 304가 아닌 200 반환"""
+        body = json.dumps({'include_data': False})
+        etag = client.post('/api/sync/pull', headers=auth_headers, data=body).headers['ETag']
+
+        push_response = client.post('/api/sync/push', headers=auth_headers, data=json.dumps(sample_push_data))
+        assert push_response.status_code == 200
+
+        response = client.post(
+            '/api/sync/pull',
+            headers={**auth_headers, 'If-None-Match': etag},
+            data=body
+        )
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def test_etag_depends_on_request(self, client, user, auth_headers, completed_session):
+        """요청 파라미터가 다르면 ETag도 다름"""
+        first = client.post('/api/sync/pull', headers=auth_headers, data=json.dumps({'page_size': 10}))
+        second = client.post('/api/sync/pull', headers=auth_headers, data=json.dumps({'page_size': 20}))
+
+        assert first.headers['ETag'] != second.headers['ETag']
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncPullSampleFilter:
+    """센서 타입 / 시간 범위 필터와 다운샘플링 Pull 테스트"""
+
+    def _pull(self, client, auth_headers, **params):
+        response = client.post(
+            '/api/sync/pull',
+            headers=auth_headers,
+            data=json.dumps(dict({'include_data': True}, **params))
+        )
+        return response
+
+    def _sensor_data(self, response):
+        assert response.status_code == 200
+        return response.get_json()['sessions'][0]['sensor_data']
+
+    def _add_gyroscope(self, session, recording_session, count=10):
+        base = SensorData.query.filter_by(session_id=recording_session.id).first().timestamp
+        session.bulk_save_objects([
+            SensorData(
+                session_id=recording_session.id,
+                sensor_type='gyroscope',
+                timestamp=base + i * 10,
+                data={'x': float(i), 'y': 0.0, 'z': 0.0}
+            )
+            for i in range(count)
+        ])
+        session.commit()
+
+    def test_sensor_types_filter(self, client, session, user, auth_headers, recording_session, sensor_data_batch):
+        """sensor_types로 지정한 센서만 반환"""
+        self._add_gyroscope(session, recording_session)
+
+        rows = self._sensor_data(self._pull(client, auth_headers, sensor_types=['gyroscope']))
+
+        assert len(rows) == 10
+        assert {row['sensor_type'] for row in rows} == {'gyroscope'}
+
+    def test_timestamp_range(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """start_ts / end_ts 범위 (양끝 포함)"""
+        timestamps = sorted(sd.timestamp for sd in sensor_data_batch)
+
+        rows = self._sensor_data(self._pull(
+            client, auth_headers, start_ts=timestamps[10], end_ts=timestamps[19]
+        ))
+
+        assert [row['timestamp'] for row in rows] == timestamps[10:20]
+
+    def test_stride_downsample(self, client, session, user, auth_headers, recording_session, sensor_data_batch):
+        """stride: 센서 타입마다 최대 max_points개, 첫 샘플 포함"""
+        self._add_gyroscope(session, recording_session)
+        timestamps = sorted(sd.timestamp for sd in sensor_data_batch)
+
+        rows = self._sensor_data(self._pull(client, auth_headers, max_points=30))
+
+        accel = [row['timestamp'] for row in rows if row['sensor_type'] == 'accelerometer']
+        gyro = [row for row in rows if row['sensor_type'] == 'gyroscope']
+        assert accel == timestamps[::4]  # ceil(100 / 30) = 4
+        assert len(gyro) == 10  # max_points 이하 시리즈는 그대로
+
+    def test_stride_step_integer_division(self):
+        """stride step은 PostgreSQL에서도 정수 나눗셈 (NUMERIC 나눗셈이면 첫 샘플만 남음)"""
+        from sqlalchemy.dialects import postgresql
+        from app.utils.downsample import parse_sample_filter, stride_select
+
+        statement = stride_select([1], parse_sample_filter({'max_points': 10}, 1000))
+        compiled = str(statement.compile(dialect=postgresql.dialect()))
+        assert 'NUMERIC' not in compiled
+        assert ') / %(' in compiled
+
+    def test_bucket_downsample(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """bucket: 구간별 mean / min / max / count"""
+        rows = self._sensor_data(self._pull(client, auth_headers, max_points=10, downsample='bucket'))
+
+        assert len(rows) == 10
+        assert sum(row['count'] for row in rows) == 100
+
+        samples = sorted(sensor_data_batch, key=lambda sd: sd.timestamp)[:10]
+        first = rows[0]
+        assert first['timestamp'] == samples[0].timestamp
+        assert first['data']['x'] == pytest.approx(sum(sd.data['x'] for sd in samples) / 10)
+        assert first['min']['z'] == pytest.approx(min(sd.data['z'] for sd in samples))
+        assert first['max']['z'] == pytest.approx(max(sd.data['z'] for sd in samples))
+
+    @pytest.mark.parametrize('params', [
+        {'sensor_types': 'accelerometer'},
+        {'start_ts': 'yesterday'},
+        {'start_ts': 10, 'end_ts': 5},
+        {'max_points': 0},
+        {'downsample': 'bucket'},
+        {'max_points': 10, 'downsample': 'median'},
+        {'max_points': 10, 'max_records': 100},
+    ])
+    def test_invalid_sample_filter(self, client, auth_headers, params):
+        """잘못된 필터 파라미터"""
+        response = self._pull(client, auth_headers, **params)
+
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+    def test_bucket_series_mixed_fields(self):
+        """숫자가 아닌 필드는 제외, 빠진 필드는 해당 구간 집계에서 제외"""
+        from app.utils.downsample import bucket_series
+
+        data = [{'x': float(i), 'label': 'a'} for i in range(6)]
+        data[1] = {'label': 'b'}
+
+        rows = bucket_series('gps', list(range(6)), data, max_points=2)
+
+        assert [row['count'] for row in rows] == [3, 3]
+        assert rows[0]['data'] == {'x': 1.0}  # (0 + 2) / 2
+        assert rows[1]['min'] == {'x': 3.0}
+        assert rows[1]['max'] == {'x': 5.0}
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncChanges:
+    """변경 시퀀스 / 변경 피드 테스트"""
+
+    def _push(self, client, auth_headers, session_id, sensor_data):
+        response = client.post('/api/sync/push', headers=auth_headers, data=json.dumps({
+            'session': {
+                'session_id': session_id,
+                'start_time': datetime.utcnow().isoformat() + 'Z',
+                'enabled_sensors': ['accelerometer', 'gyroscope'],
+                'sample_rate': 100
+            },
+            'sensor_data': sensor_data
+        }))
+        assert response.status_code == 200
+        return response.get_json()
+
+    def _samples(self, sensor_type, timestamps):
+        return [{'sensor_type': sensor_type, 'timestamp': ts, 'data': {'x': 1.0}} for ts in timestamps]
+
+    def test_push_records_changes(self, client, user, auth_headers):
+        """Push마다 세션 변경 + 센서 타입별 샘플 배치 변경 기록"""
+        session_id = str(uuid.uuid4())
+        result = self._push(client, auth_headers, session_id,
+                            self._samples('accelerometer', [100, 200]) + self._samples('gyroscope', [150]))
+
+        response = client.get('/api/sync/changes', headers=auth_headers)
+
+        assert response.status_code == 200
+        feed = response.get_json()
+        changes = feed['changes']
+        assert [c['kind'] for c in changes] == ['session', 'samples', 'samples']
+        assert [c['seq'] for c in changes] == sorted(c['seq'] for c in changes)
+        assert all(c['session_id'] == session_id for c in changes)
+        assert changes[1] == {
+            'seq': changes[1]['seq'], 'kind': 'samples', 'op': 'upsert', 'session_id': session_id,
+            'sensor_type': 'accelerometer', 'count': 2, 'ts_min': 100, 'ts_max': 200
+        }
+        assert feed['next_since'] == changes[-1]['seq'] == result['change_seq']
+        assert feed['has_more'] is False
+
+    def test_changes_since_checkpoint(self, client, user, auth_headers):
+        """since 이후 변경만 반환"""
+        session_id = str(uuid.uuid4())
+        first = self._push(client, auth_headers, session_id, self._samples('accelerometer', [100]))
+        self._push(client, auth_headers, session_id, self._samples('accelerometer', [200, 300]))
+
+        feed = client.get(f"/api/sync/changes?since={first['change_seq']}", headers=auth_headers).get_json()
+
+        assert [c['kind'] for c in feed['changes']] == ['session', 'samples']
+        assert feed['changes'][1]['ts_min'] == 200
+
+        empty = client.get(f"/api/sync/changes?since={feed['next_since']}", headers=auth_headers).get_json()
+        assert empty == {'changes': [], 'next_since': feed['next_since'], 'has_more': False}
+
+    def test_changes_limit(self, client, user, auth_headers):
+        """limit 초과 시 has_more"""
+        self._push(client, auth_headers, str(uuid.uuid4()), self._samples('accelerometer', [100]))
+
+        feed = client.get('/api/sync/changes?limit=1', headers=auth_headers).get_json()
+
+        assert len(feed['changes']) == 1
+        assert feed['has_more'] is True
+
+    def test_changes_scoped_to_user(self, client, user, auth_headers, another_auth_headers):
+        """다른 사용자의 변경은 보이지 않음"""
+        self._push(client, another_auth_headers, str(uuid.uuid4()), self._samples('accelerometer', [100]))
+
+        feed = client.get('/api/sync/changes', headers=auth_headers).get_json()
+
+        assert feed['changes'] == []
+
+    def test_sequences_per_user(self, client, user, auth_headers, another_auth_headers):
+        """시퀀스는 사용자별 카운터 (다른 사용자의 Push와 번호를 공유하지 않음)"""
+        mine = self._push(client, auth_headers, str(uuid.uuid4()), self._samples('accelerometer', [100]))
+        theirs = self._push(client, another_auth_headers, str(uuid.uuid4()), self._samples('accelerometer', [100]))
+        again = self._push(client, auth_headers, str(uuid.uuid4()), self._samples('accelerometer', [100]))
+
+        assert mine['change_seq'] == theirs['change_seq'] == 2
+        assert again['change_seq'] == 4
+
+    @pytest.mark.parametrize('query', ['since=-1', 'since=abc', 'limit=0', 'limit=5000'])
+    def test_invalid_params(self, client, auth_headers, query):
+        """잘못된 since / limit"""
+        response = client.get(f'/api/sync/changes?{query}', headers=auth_headers)
+
+        assert response.status_code == 400
+
+    def test_pull_since_seq(self, client, user, auth_headers):
+        """since_seq 이후 변경된 세션 / 샘플만 Pull"""
+        changed_id = str(uuid.uuid4())
+        checkpoint = self._push(client, auth_headers, changed_id, self._samples('accelerometer', [100, 200]))
+        self._push(client, auth_headers, str(uuid.uuid4()), [])
+        self._push(client, auth_headers, changed_id, self._samples('accelerometer', [200, 300]))
+
+        response = client.post('/api/sync/pull', headers=auth_headers, data=json.dumps({
+            'since_seq': checkpoint['change_seq'], 'include_data': True
+        }))
+
+        sessions = {s['session_id']: s for s in response.get_json()['sessions']}
+        assert len(sessions) == 2
+        assert [row['timestamp'] for row in sessions[changed_id]['sensor_data']] == [200, 300]
+        assert sessions[changed_id]['change_seq'] > checkpoint['change_seq']
+
+    def test_allocate_contiguous(self, app, session):
+        """시퀀스 카운터는 연속 구간을 할당"""
+        from app.models.change_log import ChangeCounter
+
+        first = ChangeCounter.allocate(3)
+        second = ChangeCounter.allocate(2)
+
+        assert second == first + 3
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncPullArrow:
+    """Arrow IPC 스트림 Pull 테스트"""
+
+    ARROW = 'application/vnd.apache.arrow.stream'
+
+    def _read_streams(self, body):
+        pa = pytest.importorskip('pyarrow')
+        reader = pa.BufferReader(body)
+        tables = []
+        while reader.tell() < reader.size():
+            tables.append(pa.ipc.open_stream(reader).read_all())
+        return tables
+
+    def _pull(self, client, auth_headers, accept, **params):
+        return client.post(
+            '/api/sync/pull',
+            headers={**auth_headers, 'Accept': accept},
+            data=json.dumps(dict({'include_data': True}, **params))
+        )
+
+    def test_arrow_stream_per_sensor_type(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """세션 스트림 + 센서 타입별 열 지향 스트림"""
+        pytest.importorskip('pyarrow')
+        response = self._pull(client, auth_headers, self.ARROW)
+
+        assert response.status_code == 200
+        assert response.mimetype == self.ARROW
+        assert response.headers['ETag'].endswith('-arrow"')
+
+        sessions, accel = self._read_streams(response.data)
+
+        assert sessions.schema.metadata[b'koodtx.stream'] == b'sessions'
+        page = json.loads(sessions.schema.metadata[b'koodtx.page'])
+        assert page['has_more'] is False
+        assert sessions.column('session_id').to_pylist() == [str(recording_session.session_id)]
+
+        assert accel.schema.metadata[b'koodtx.sensor_type'] == b'accelerometer'
+        assert accel.schema.field('timestamp').type == 'int64'
+        assert accel.schema.field('data.x').type == 'double'
+        assert accel.num_rows == 100
+
+        expected = sorted(sensor_data_batch, key=lambda sd: sd.timestamp)
+        assert accel.column('timestamp').to_pylist() == [sd.timestamp for sd in expected]
+        assert accel.column('data.x').to_pylist() == [sd.data['x'] for sd in expected]
+
+    def test_arrow_float32(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """arrow_float32=true이면 축 값 float32"""
+        pytest.importorskip('pyarrow')
+        response = self._pull(client, auth_headers, self.ARROW, arrow_float32=True)
+
+        _, accel = self._read_streams(response.data)
+        assert accel.schema.field('data.z').type == 'float'
+
+    def test_arrow_bucket_columns(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """bucket 다운샘플링 결과는 min./max./count 열 포함"""
+        pytest.importorskip('pyarrow')
+        response = self._pull(client, auth_headers, self.ARROW, max_points=5, downsample='bucket')
+
+        _, accel = self._read_streams(response.data)
+        assert accel.num_rows == 5
+        assert {'data.x', 'min.x', 'max.x', 'count'} <= set(accel.column_names)
+        assert sum(accel.column('count').to_pylist()) == 100
+
+    def test_arrow_data_keys_do_not_collide(self):
+        """data 키가 session_id / timestamp / count여도 고정 열은 그대로"""
+        pytest.importorskip('pyarrow')
+        from app.utils.arrow import _sensor_table
+
+        rows = [('s1', {'timestamp': 1000, 'data': {'timestamp': 'late', 'session_id': 7, 'count': 3.0}, 'count': 2})]
+        table = _sensor_table('custom', rows, float32=False)
+
+        assert table.column('timestamp').to_pylist() == [1000]
+        assert table.column('session_id').to_pylist() == ['s1']
+        assert table.column('count').to_pylist() == [2]
+        assert table.column('data.timestamp').to_pylist() == ['late']
+        assert table.column('data.session_id').to_pylist() == [7.0]
+        assert table.column('data.count').to_pylist() == [3.0]
+
+    def test_json_preferred_by_default(self, client, user, auth_headers, completed_session):
+        """*/* 이면 JSON, ETag도 다름"""
+        pytest.importorskip('pyarrow')
+        json_response = self._pull(client, auth_headers, '*/*')
+        arrow_response = self._pull(client, auth_headers, self.ARROW)
+
+        assert json_response.mimetype == 'application/json'
+        assert json_response.headers['ETag'] != arrow_response.headers['ETag']
+
+    def test_arrow_not_modified(self, client, user, auth_headers, completed_session):
+        """Arrow ETag로 304"""
+        pytest.importorskip('pyarrow')
+        etag = self._pull(client, auth_headers, self.ARROW).headers['ETag']
+
+        response = client.post(
+            '/api/sync/pull',
+            headers={**auth_headers, 'Accept': self.ARROW, 'If-None-Match': etag},
+            data=json.dumps({'include_data': True})
+        )
+
+        assert response.status_code == 304
+
+
+@pytest.mark.api
+@pytest.mark.sync
+class TestSyncPullCompression:
+    """Accept-Encoding 협상 압축 Pull 테스트"""
+
+    def _pull(self, client, auth_headers, accept_encoding=None):
+        headers = dict(auth_headers)
+        if accept_encoding is not None:
+            headers['Accept-Encoding'] = accept_encoding
+        return client.post('/api/sync/pull', headers=headers, data=json.dumps({'include_data': True}))
+
+    def test_gzip_response(self, client, user, auth_headers, recording_session, sensor_data_batch):
+        """gzip 요청 시 압축 응답, 해제하면 일반 응답과 동일"""
+        plain = self._pull(client, auth_headers)
+        response = self._pull(client, auth_headers, 'gzip')
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+        body = json.loads(gzip.decompress(response.data))
+        expected = plain.get_json()
+        assert body['sessions'] == expected['sessions']
+        assert sum(len(s['sensor_data']) for s in body['sessions']) == 100
+
+    def test_etag_per_encoding(self, client, user, auth_headers, completed_session):
+        """압축 / 원본 ETag는 서로의 If-None-Match에 304를 반환하지 않음"""
+        plain = self._pull(client, auth_headers)
+        gzipped = self._pull(client, auth_headers, 'gzip')
+
+        def conditional(etag, accept_encoding=None):
+            headers = {'If-None-Match': etag, **({'Accept-Encoding': accept_encoding} if accept_encoding else {})}
+            return client.post('/api/sync/pull', headers={**auth_headers, **headers},
+                               data=json.dumps({'include_data': True}))
+
+        assert conditional(gzipped.headers['ETag'], 'gzip').status_code == 304
+        assert conditional(gzipped.headers['ETag']).status_code == 200
+        assert conditional(plain.headers['ETag'], 'gzip').status_code == 200
+
+    def test_identity_without_accept_encoding(self, client, user, auth_headers, completed_session):
+        """Accept-Encoding이 없으면 압축하지 않음"""
+        response = self._pull(client, auth_headers)
+
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+
+    def test_unsupported_encoding_falls_back(self, client, user, auth_headers, completed_session):
+        """사용 불가능한 인코딩만 허용하면 압축하지 않음"""
+        response = self._pull(client, auth_headers, 'compress, gzip;q=0')
+
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['sessions']
+
+    def test_quality_preference(self, client, user, auth_headers, completed_session):
+        """q 값이 가장 높은 사용 가능한 인코딩 선택"""
+        response = self._pull(client, auth_headers, 'identity;q=0.5, gzip;q=0.8, unknown;q=1.0')
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+    def test_brotli_response(self, client, user, auth_headers, completed_session):
+        """brotli 설치 시 br 응답"""
+        brotli = pytest.importorskip('brotli')
+        response = self._pull(client, auth_headers, 'br, gzip;q=0.5')
+
+        assert response.headers['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(response.data))['sessions']
+
+    def test_compression_disabled(self, app, client, user, auth_headers, completed_session):
+        """COMPRESSION_ENABLED=False이면 압축하지 않음"""
+        app.config['COMPRESSION_ENABLED'] = False
+        try:
+            response = self._pull(client, auth_headers, 'gzip')
+        finally:
+            app.config['COMPRESSION_ENABLED'] = True
+
+        assert 'Content-Encoding' not in response.headers
+
+    def test_gzip_body_outside_app_context(self, app, user, auth_headers, recording_session, sensor_data_batch):
+        """WSGI 서버처럼 요청 처리 후 앱 컨텍스트 없는 스레드에서 본문을 순회해도 압축 응답"""
+        environ = EnvironBuilder(
+            path='/api/sync/pull', method='POST', data=json.dumps({'include_data': True}),
+            headers=dict(auth_headers, **{'Accept-Encoding': 'gzip'})
+        ).get_environ()
+        started = []
+        app_iter = app(environ, lambda status, headers, exc_info=None: started.append((status, dict(headers))))
+
+        # 테스트 클라이언트는 첫 조각을 호출 스레드에서 읽으므로 앱을 직접 호출 (새 스레드에는 컨텍스트 없음)
+        chunks, errors = [], []
+
+        def consume():
+            try:
+                chunks.extend(app_iter)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                app_iter.close()
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        thread.join()
+
+        assert errors == []
+        status, headers = started[0]
+        assert status.startswith('200') and headers['Content-Encoding'] == 'gzip'
+        body = json.loads(gzip.decompress(b''.join(chunks)))
+        assert sum(len(s['sensor_data']) for s in body['sessions']) == 100
+
+    def test_iter_json_matches_dumps(self):
+        """나눠 인코딩한 JSON은 json.dumps와 바이트 단위로 같음"""
+        payload = {
+            'sessions': [{'session_id': str(i), 'tags': [], 'sensor_data': [
+                {'sensor_type': 'accelerometer', 'timestamp': j, 'data': {'x': j * 0.1, 'note': '가속도'}}
+                for j in range(2500)
+            ]} for i in range(3)],
+            'has_more': False,
+            'next_cursor': None
+        }
+        from app.utils.compression import iter_json
+
+        body = b''.join(iter_json(payload, chunk_size=1000))
+        assert body == json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def test_stream_encoded_chunks(self, app):
+        """조각 단위 스트리밍 압축 결과가 원본과 동일"""
+        from app.utils.compression import iter_json, stream_encoded
+
+        payload = {'values': list(range(50000))}
+        with app.app_context():
+            chunks = list(iter_json(payload, chunk_size=4096))
+            compressed = b''.join(stream_encoded(iter(chunks), 'gzip'))
+
+        assert len(chunks) > 1
+        assert json.loads(gzip.decompress(compressed)) == payload
+
+
 @pytest.mark.api
 @pytest.mark.sync
 class TestSyncStatus:
@@ -452,6 +1233,22 @@ class TestSyncStatus:
         assert 'recent_syncs' in result
         assert isinstance(result['recent_syncs'], list)
 
+    def test_sync_status_counts_single_query(self, client, user, auth_headers, recording_session,
+                                             completed_session, another_user, create_session_func,
+                                             count_queries):
+        """세션 수는 조건부 집계 쿼리 1회로 계산 (다른 사용자 세션 제외)"""
+        create_session_func(another_user.id)
+
+        with count_queries() as statements:
+            response = client.get('/api/sync/status', headers=auth_headers)
+
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result['total_sessions'] == 2
+        assert result['active_sessions'] == 1
+        assert result['uploaded_sessions'] == 1
+        assert len([s for s in statements if 'FROM recording_sessions' in s]) == 1
+
     def test_get_sync_status_without_auth(self, client):
         """인증 없이 상태 조회 시도 테스트"""
         response = client.get('/api/sync/status')
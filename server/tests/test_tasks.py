@@ -8,14 +8,24 @@ from app.tasks.data_processing import (
     analyze_sensor_data,
     generate_statistics,
     detect_anomalies,
-    calculate_session_metrics
+    calculate_session_metrics,
+    calculate_trajectory
 )
 from app.tasks.file_cleanup import (
     cleanup_old_sensor_data,
     cleanup_old_sync_logs,
     cleanup_failed_sessions
 )
+from app.utils.sensor_arrays import load_sensor_arrays, iter_sensor_chunks, sensor_type_counts
+from app.utils.trajectory import haversine_km, analyze_trajectory, TrajectoryAccumulator
+from app.utils.online_stats import RunningStats
+from app.utils.aggregates import aggregate_backend, aggregate_statement, field_aggregates
+from app.utils.user_statistics import session_statistics
+from app.models.session import RecordingSession
+from app.models.user import User
+from app.models.sensor_data import SensorData
 from datetime import datetime, timedelta
+import numpy as np
 
 
 @pytest.mark.celery
@@ -119,6 +129,388 @@ class TestDataProcessingTasks:
             assert 'std' in accel_metrics['x']
 
 
+@pytest.mark.unit
+class TestSensorArrays:
+    """센서 필드 배열 로더 테스트"""
+
+    def test_load_matches_rows(self, session, recording_session, sensor_data_batch):
+        """필드 배열이 행 데이터와 일치 (타임스탬프 순)"""
+        rows = SensorData.query.filter_by(session_id=recording_session.id).order_by(SensorData.timestamp).all()
+
+        arrays = load_sensor_arrays(recording_session.id, {'accelerometer': ('x', 'y', 'z')})
+
+        columns = arrays['accelerometer']
+        assert columns['timestamp'].dtype == np.int64
+        assert columns['timestamp'].tolist() == [row.timestamp for row in rows]
+        for axis in ('x', 'y', 'z'):
+            assert np.allclose(columns[axis], [row.data[axis] for row in rows])
+
+    def test_missing_and_non_numeric_fields_are_nan(self, session, recording_session):
+        """없는 필드 / 숫자가 아닌 값은 NaN"""
+        session.add_all([
+            SensorData(session_id=recording_session.id, sensor_type='gps', timestamp=1,
+                       data={'latitude': 37.5, 'longitude': 127}),
+            SensorData(session_id=recording_session.id, sensor_type='gps', timestamp=2,
+                       data={'latitude': 'n/a'}),
+            SensorData(session_id=recording_session.id, sensor_type='light', timestamp=3,
+                       data={'lux': 120.0}),
+        ])
+        session.commit()
+
+        arrays = load_sensor_arrays(recording_session.id, {'gps': ('latitude', 'longitude')})
+
+        assert sensor_type_counts(recording_session.id) == {'gps': 2, 'light': 1}
+        assert arrays['gps']['latitude'][0] == 37.5
+        assert arrays['gps']['longitude'][0] == 127.0
+        assert np.isnan(arrays['gps']['latitude'][1])
+        assert np.isnan(arrays['gps']['longitude'][1])
+        assert list(arrays['light'].keys()) == ['timestamp']
+
+    def test_chunks_bounded(self, session, recording_session, sensor_data_batch):
+        """청크 크기만큼 나눠 읽기"""
+        chunks = list(iter_sensor_chunks(recording_session.id, 'accelerometer', ('x',), chunk_size=30))
+
+        assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+        assert all(chunk.shape[1] == 2 for chunk in chunks)
+
+    def test_analysis_statistics(self, session, recording_session, sensor_data_batch):
+        """분석 / 메트릭 통계가 원본 값의 NumPy 통계와 일치"""
+        rows = SensorData.query.filter_by(session_id=recording_session.id).all()
+        x_values = [row.data['x'] for row in rows]
+
+        analysis = analyze_sensor_data(recording_session.id)['analysis']['accelerometer']
+        metrics = calculate_session_metrics(recording_session.id)['metrics']['accelerometer']
+
+        assert analysis['count'] == 100
+        assert analysis['duration_ms'] == 990
+        assert analysis['statistics']['x']['mean'] == pytest.approx(np.mean(x_values))
+        assert analysis['statistics']['x']['std'] == pytest.approx(np.std(x_values))
+        assert metrics['sample_count'] == 100
+        assert metrics['x']['peak_to_peak'] == pytest.approx(np.max(x_values) - np.min(x_values))
+
+    def test_detect_anomaly_timestamp(self, session, recording_session, sensor_data_batch):
+        """튀는 샘플의 타임스탬프 반환"""
+        session.add(SensorData(session_id=recording_session.id, sensor_type='accelerometer',
+                               timestamp=1, data={'x': 500.0, 'y': 0.0, 'z': 0.0}))
+        session.commit()
+
+        result = detect_anomalies(recording_session.id, sensitivity=3.0)
+
+        assert result['anomalies']['accelerometer']['timestamps'][0] == 1
+
+
+def _gps_track():
+    """동쪽으로 10m/s 이동 -> 2분 정지 -> 이동 (1초 간격), 고도 +5m / -2m"""
+    timestamps, lats, lons, alts = [], [], [], []
+    lon = 127.0
+    for i in range(300):
+        if not 60 <= i < 180:
+            lon += 10.0 / (111320 * np.cos(np.radians(37.5)))
+        timestamps.append(1_700_000_000_000 + i * 1000)
+        lats.append(37.5)
+        lons.append(lon)
+        alts.append(100.0 + (5.0 if i >= 100 else 0.0) - (2.0 if i >= 250 else 0.0))
+    return timestamps, lats, lons, alts
+
+
+@pytest.mark.unit
+class TestTrajectory:
+    """GPS 궤적 분석 테스트"""
+
+    def test_haversine_matches_scalar(self):
+        """배열 계산이 점별 계산과 일치"""
+        lats = [37.5665, 37.4563, 35.1796]
+        lons = [126.9780, 126.7052, 129.0756]
+
+        segments = haversine_km(lats, lons)
+
+        expected = []
+        for i in range(1, len(lats)):
+            lat1, lon1, lat2, lon2 = map(np.radians, (lats[i - 1], lons[i - 1], lats[i], lons[i]))
+            a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+            expected.append(6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)))
+        assert np.allclose(segments, expected)
+        assert len(haversine_km([37.5], [127.0])) == 0
+
+    def test_analyze_trajectory(self):
+        """거리 / 속도 / 정지 구간 / 고도 / 경계 상자"""
+        timestamps, lats, lons, alts = _gps_track()
+
+        summary = analyze_trajectory(timestamps, lats, lons, alts)
+
+        assert summary['distance_km'] == pytest.approx(1.79, abs=0.01)
+        assert summary['max_speed_mps'] == pytest.approx(10.0, abs=0.05)
+        assert summary['stop_count'] == 1
+        stop = summary['stops'][0]
+        assert stop['duration_ms'] == 120000
+        assert stop['start_ts'] == timestamps[59]
+        assert summary['moving_time_ms'] == summary['duration_ms'] - 120000
+        assert (summary['elevation_gain_m'], summary['elevation_loss_m']) == (5.0, 2.0)
+        assert summary['bbox']['min_longitude'] == pytest.approx(lons[0])
+        assert summary['bbox']['max_longitude'] == pytest.approx(lons[-1])
+
+    def test_samples_without_position_skipped(self):
+        """위도 / 경도가 없는 샘플 제외"""
+        summary = analyze_trajectory([1000, 2000, 3000], [37.5, np.nan, 37.5], [127.0, 127.0, 127.001])
+
+        assert summary['sample_count'] == 2
+        assert summary['elevation_gain_m'] is None
+        assert analyze_trajectory([1000], [np.nan], [np.nan]) is None
+
+    def test_trajectory_stored_and_reused(self, session, recording_session):
+        """세션별 저장, 데이터가 같으면 재사용, 샘플이 늘면 다시 계산"""
+        timestamps, lats, lons, alts = _gps_track()
+        session.bulk_save_objects([
+            SensorData(session_id=recording_session.id, sensor_type='gps', timestamp=ts,
+                       data={'latitude': lat, 'longitude': lon, 'altitude': alt})
+            for ts, lat, lon, alt in zip(timestamps, lats, lons, alts)
+        ])
+        session.commit()
+
+        first = calculate_trajectory(recording_session.id)
+        second = calculate_trajectory(recording_session.id)
+
+        assert first['trajectory']['stop_count'] == 1
+        assert first['trajectory']['sample_count'] == 300
+        assert second['trajectory']['computed_at'] == first['trajectory']['computed_at']
+
+        session.add(SensorData(session_id=recording_session.id, sensor_type='gps',
+                               timestamp=timestamps[-1] + 1000,
+                               data={'latitude': 37.51, 'longitude': lons[-1]}))
+        session.commit()
+
+        third = calculate_trajectory(recording_session.id)
+        assert third['trajectory']['sample_count'] == 301
+        assert third['trajectory']['distance_km'] > first['trajectory']['distance_km']
+
+    def test_analysis_includes_trajectory(self, session, recording_session, gps_sensor_data):
+        """analyze_sensor_data GPS 결과에 궤적 포함"""
+        result = analyze_sensor_data(recording_session.id)
+
+        gps = result['analysis']['gps']
+        assert gps['statistics']['distance_km'] == 0.0
+        assert gps['trajectory']['sample_count'] == 1
+        assert calculate_trajectory(recording_session.id)['trajectory']['sample_count'] == 1
+
+    def test_no_gps_data(self, session, recording_session, sensor_data_batch):
+        """GPS 데이터가 없으면 에러"""
+        result = calculate_trajectory(recording_session.id)
+
+        assert 'error' in result
+
+
+@pytest.mark.unit
+class TestStreamingAnalysis:
+    """청크 스트리밍 분석 테스트"""
+
+    def test_running_stats_merge(self):
+        """청크별 갱신 / 병합 결과가 전체 배열 통계와 일치"""
+        values = np.random.default_rng(0).normal(5.0, 2.0, 1000)
+
+        chunked = RunningStats()
+        for chunk in np.array_split(values, 7):
+            chunked.update(chunk)
+        merged = RunningStats().update(values[:300]).merge(RunningStats().update(values[300:]))
+
+        for stats in (chunked, merged):
+            assert stats.count == 1000
+            assert stats.mean == pytest.approx(np.mean(values))
+            assert stats.std == pytest.approx(np.std(values))
+            assert (stats.min, stats.max) == (np.min(values), np.max(values))
+        assert RunningStats().update([np.nan]).to_dict() is None
+
+    def test_trajectory_chunks_match(self):
+        """청크 경계를 넘는 구간 / 정지 구간도 한 번에 계산한 결과와 일치"""
+        timestamps, lats, lons, alts = _gps_track()
+        accumulator = TrajectoryAccumulator()
+        for start in range(0, 300, 47):
+            accumulator.update(timestamps[start:start + 47], lats[start:start + 47],
+                               lons[start:start + 47], alts[start:start + 47])
+
+        chunked = accumulator.result()
+        whole = analyze_trajectory(timestamps, lats, lons, alts)
+
+        assert chunked['stops'][0]['start_ts'] == whole['stops'][0]['start_ts']
+        assert chunked['stops'][0]['latitude'] == pytest.approx(whole['stops'][0]['latitude'])
+        assert chunked['stops'][0]['longitude'] == pytest.approx(whole['stops'][0]['longitude'])
+        for key in ('sample_count', 'distance_km', 'duration_ms', 'moving_time_ms', 'max_speed_mps',
+                    'elevation_gain_m', 'elevation_loss_m', 'stop_count', 'bbox'):
+            assert chunked[key] == pytest.approx(whole[key]), key
+
+    def test_streaming_matches_in_memory(self, app, session, recording_session, sensor_data_batch):
+        """스트리밍 모드 결과가 메모리 적재 결과와 같음"""
+        timestamps, lats, lons, alts = _gps_track()
+        session.bulk_save_objects([
+            SensorData(session_id=recording_session.id, sensor_type='gps', timestamp=ts,
+                       data={'latitude': lat, 'longitude': lon, 'altitude': alt})
+            for ts, lat, lon, alt in zip(timestamps, lats, lons, alts)
+        ])
+        session.commit()
+
+        app.config['ANALYSIS_CHUNK_SIZE'] = 32
+        try:
+            streamed = analyze_sensor_data(recording_session.id, streaming=True)
+        finally:
+            app.config['ANALYSIS_CHUNK_SIZE'] = 10000
+        in_memory = analyze_sensor_data(recording_session.id, streaming=False)
+
+        assert streamed['total_records'] == in_memory['total_records'] == 400
+        assert streamed['sensor_types'] == in_memory['sensor_types']
+        for sensor_type, result in in_memory['analysis'].items():
+            other = streamed['analysis'][sensor_type]
+            assert other['count'] == result['count']
+            assert other['duration_ms'] == result['duration_ms']
+            for key, values in result['statistics'].items():
+                assert other['statistics'][key] == pytest.approx(values), (sensor_type, key)
+        assert streamed['analysis']['gps']['trajectory']['stop_count'] == 1
+
+    def test_streaming_threshold(self, app, session, recording_session, sensor_data_batch):
+        """샘플 수가 임계값을 넘으면 자동으로 스트리밍"""
+        app.config['ANALYSIS_STREAMING_THRESHOLD'] = 10
+        try:
+            result = analyze_sensor_data(recording_session.id)
+        finally:
+            app.config['ANALYSIS_STREAMING_THRESHOLD'] = 500000
+
+        assert result['total_records'] == 100
+        assert result['analysis']['accelerometer']['statistics']['x']['std'] > 0
+
+
+@pytest.mark.unit
+class TestFieldAggregates:
+    """필드 통계 집계 (DB 집계 / NumPy 대체) 테스트"""
+
+    def test_postgresql_statement(self):
+        """PostgreSQL 집계 쿼리는 data->>'x'를 float로 변환해 avg / stddev_pop / min / max"""
+        from sqlalchemy.dialects import postgresql
+
+        statement = aggregate_statement(1, ['accelerometer'], ('x', 'y'), 'postgresql', fill_value=0.0)
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+
+        assert 'stddev_pop' in sql and 'avg' in sql
+        assert '->>' in sql and 'coalesce' in sql
+        assert 'GROUP BY sensor_data.sensor_type' in sql
+
+    def test_from_moments(self):
+        """집계 결과로 만든 통계도 병합 가능"""
+        values = np.random.default_rng(1).normal(0.0, 3.0, 500)
+        head, tail = values[:200], values[200:]
+
+        stats = RunningStats.from_moments(len(head), np.mean(head), np.std(head), np.min(head), np.max(head))
+        stats.merge(RunningStats().update(tail))
+
+        assert stats.count == 500
+        assert stats.std == pytest.approx(np.std(values))
+        assert RunningStats.from_moments(0, None, None, None, None).to_dict() is None
+
+    def test_numpy_fallback(self, app, recording_session, sensor_data_batch):
+        """SQLite는 NumPy 청크 집계, 배열 통계와 같은 결과"""
+        assert aggregate_backend() == 'numpy'
+        columns = load_sensor_arrays(recording_session.id, {'accelerometer': ('x',)})['accelerometer']
+
+        aggregates = field_aggregates(recording_session.id, {'accelerometer': ('x',)}, chunk_size=7)
+        accel = aggregates['accelerometer']
+
+        assert accel['count'] == 100
+        assert (accel['first_ts'], accel['last_ts']) == (columns['timestamp'][0], columns['timestamp'][-1])
+        assert accel['stats']['x'].mean == pytest.approx(np.mean(columns['x']))
+        assert accel['stats']['x'].std == pytest.approx(np.std(columns['x']))
+
+    def test_missing_values(self, session, recording_session):
+        """없는 값은 제외하거나 fill_value로 대체"""
+        session.bulk_save_objects([
+            SensorData(session_id=recording_session.id, sensor_type='gyroscope', timestamp=1000 + i,
+                       data={'x': 2.0} if i % 2 else {'y': 1.0})
+            for i in range(10)
+        ])
+        session.commit()
+
+        skipped = field_aggregates(recording_session.id, {'gyroscope': ('x',)})['gyroscope']['stats']['x']
+        filled = field_aggregates(recording_session.id, {'gyroscope': ('x',)},
+                                  fill_value=0.0)['gyroscope']['stats']['x']
+
+        assert (skipped.count, skipped.mean) == (5, 2.0)
+        assert (filled.count, filled.mean, filled.min) == (10, 1.0, 0.0)
+
+
+@pytest.mark.unit
+class TestUserStatistics:
+    """SQL 집계 사용자 통계 / 스냅샷 테스트"""
+
+    @pytest.fixture
+    def user_sessions(self, session, user):
+        """2주에 걸친 세션 5개 (월요일 2024-01-01 기준)"""
+        import uuid
+
+        specs = [
+            (datetime(2024, 1, 1, 9), 30, ['accelerometer', 'gps'], 100),
+            (datetime(2024, 1, 1, 18), 60, ['accelerometer'], 200),
+            (datetime(2024, 1, 3, 12), None, ['gyroscope'], 50),
+            (datetime(2024, 1, 7, 23), 15, ['accelerometer', 'gyroscope'], 10),
+            (datetime(2024, 1, 8, 8), 45, ['gps'], 5),
+        ]
+        sessions = []
+        for start, minutes, sensors, count in specs:
+            rec_session = RecordingSession(
+                user_id=user.id, session_id=str(uuid.uuid4()), start_time=start,
+                end_time=start + timedelta(minutes=minutes) if minutes else None,
+                enabled_sensors=sensors, data_count=count, is_active=minutes is None
+            )
+            session.add(rec_session)
+            sessions.append(rec_session)
+        session.commit()
+        return sessions
+
+    def test_matches_session_loop(self, user, user_sessions):
+        """집계 결과가 세션 행을 순회한 합계와 같음"""
+        result = generate_statistics(user_id=user.id)
+        statistics = result['statistics']
+
+        assert statistics['total_sessions'] == 5
+        assert statistics['total_data_records'] == 365
+        assert statistics['total_duration_ms'] == (30 + 60 + 15 + 45) * 60 * 1000
+        assert statistics['average_session_duration_ms'] == 150 * 60 * 1000 // 5
+        assert statistics['sensor_types_usage'] == {'accelerometer': 3, 'gps': 2, 'gyroscope': 2}
+
+    def test_buckets(self, user, user_sessions):
+        """일 / 주 단위 구간 (주는 월요일 시작), 구간 합계 = 전체"""
+        daily = generate_statistics(user_id=user.id, bucket='day')
+        weekly = generate_statistics(user_id=user.id, bucket='week')
+
+        assert [b['start'] for b in daily['buckets']] == ['2024-01-01', '2024-01-03', '2024-01-07', '2024-01-08']
+        assert daily['buckets'][0]['total_sessions'] == 2
+        assert [(b['start'], b['total_sessions']) for b in weekly['buckets']] == [('2024-01-01', 4), ('2024-01-08', 1)]
+        assert weekly['buckets'][1]['sensor_types_usage'] == {'gps': 1}
+        assert weekly['statistics'] == daily['statistics']
+
+    def test_date_range(self, user, user_sessions):
+        """시작 시각 범위"""
+        totals = session_statistics(user.id, start=datetime(2024, 1, 2), end=datetime(2024, 1, 7, 23, 59))
+
+        assert totals[None]['sessions'] == 2
+        assert totals[None]['sensor_types_usage'] == {'accelerometer': 1, 'gyroscope': 2}
+        assert session_statistics(user.id, start=datetime(2030, 1, 1)) == {}
+
+    def test_snapshot(self, session, user, user_sessions):
+        """사용자 데이터 버전이 같으면 저장된 스냅샷, 바뀌면 다시 계산"""
+        first = generate_statistics(user_id=user.id, bucket='week')
+        second = generate_statistics(user_id=user.id, bucket='week')
+        other = generate_statistics(user_id=user.id)
+
+        User.bump_data_version(user.id)
+        session.commit()
+        after_push = generate_statistics(user_id=user.id, bucket='week')
+
+        assert (first['cached'], second['cached'], other['cached']) == (False, True, False)
+        assert second['buckets'] == first['buckets']
+        assert after_push['cached'] is False
+        assert generate_statistics(user_id=user.id, bucket='week', refresh=True)['cached'] is False
+
+    def test_invalid_bucket(self, user):
+        """지원하지 않는 구간은 에러"""
+        assert 'Invalid bucket' in generate_statistics(user_id=user.id, bucket='month')['error']
+
+
 @pytest.mark.celery
 @pytest.mark.unit
 class TestFileCleanupTasks:
@@ -175,6 +567,25 @@ class TestFileCleanupTasks:
 
         assert 'message' in result or 'cleaned_sessions' in result
 
+    def test_cleanup_failed_sessions_records_change(self, session, user, create_session_func):
+        """세션 종료 처리가 변경 피드에 기록되는지 테스트"""
+        from app.models.change_log import SyncChange
+
+        stale_session = create_session_func(
+            user_id=user.id,
+            start_time=datetime.utcnow() - timedelta(hours=25),
+            is_active=True,
+            end_time=None
+        )
+
+        result = cleanup_failed_sessions(hours=24)
+
+        assert result['cleaned_sessions'] == 1
+        change = SyncChange.query.filter_by(user_id=user.id).one()
+        assert change.session_uuid == stale_session.session_id
+        assert (change.kind, change.op) == ('session', 'upsert')
+        assert stale_session.change_seq == change.seq
+
 
 @pytest.mark.celery
 @pytest.mark.integration